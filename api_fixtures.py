@@ -0,0 +1,401 @@
+"""
+SpaceX API Fixtures and Replay Server
+
+Serves recorded SpaceX API responses from JSON files, so spacex_api.py can
+be run and checked without the network. The fixture directory holds one
+file per endpoint (launches.json, payloads.json, cores.json, rockets.json,
+launchpads.json), each a JSON array of documents as the API returns them.
+
+The server answers the parts of the v4 API the client uses:
+
+- GET /v4/<endpoint> returns the whole file.
+- POST /v4/<endpoint>/query supports a small Mongo-style filter ($in, $nin,
+  $eq, $ne, $gt, $gte, $lt, $lte, $or) plus sort, limit and page options.
+
+Responses carry an ETag and a Last-Modified time (the fixture file's mtime),
+and conditional requests get 304s. Latency and failures can be injected to
+exercise pooling and retries.
+
+Fixtures come from one of two places:
+
+- `record` copies the endpoints from the live API.
+- `sample` builds API-shaped documents from the synthetic launch_data table,
+  which is how the checked-in fixtures/spacex_api set was made.
+
+Usage:
+    python api_fixtures.py sample --launches 40
+    python api_fixtures.py record --dir fixtures/live
+    python api_fixtures.py serve --port 8766 --latency 0.05 --fail-first 1
+    SPACEX_API_URL=http://localhost:8766/v4 python spacex_api.py fetch
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Checked-in fixture set
+FIXTURE_DIR = os.path.join('fixtures', 'spacex_api')
+
+ENDPOINTS = ('launches', 'payloads', 'cores', 'rockets', 'launchpads')
+
+# Page size of a query that does not turn pagination off, as the API does
+DEFAULT_PAGE_SIZE = 10
+
+# Orbits drawn for the sample payloads
+SAMPLE_ORBITS = ['LEO', 'ISS', 'GTO', 'SSO', 'PO', 'MEO']
+
+# Core blocks of the sample boosters by launch_data booster version
+SAMPLE_BLOCKS = {'F9 v1.0': None, 'F9 v1.1': None, 'F9 FT': 3, 'F9 Block 5': 5}
+
+# Sample landing types in API terms
+SAMPLE_LANDING_TYPES = {'Drone Ship': 'ASDS', 'Ground Pad': 'RTLS'}
+
+
+def document_id(kind, key):
+    """Return a stable 24-digit hex ID, shaped like the API's ObjectIds."""
+    return hashlib.sha1(f"{kind}:{key}".encode('utf-8')).hexdigest()[:24]
+
+
+def _launchpad_name(site):
+    # The inverse of spacex_api.site_code(): 'CCAFS SLC-40' -> 'CCSFS SLC 40'
+    return re.sub(r'^CCAFS\b', 'CCSFS', site).replace('-', ' ')
+
+
+def sample_documents(num_launches=40, seed=42):
+    """
+    Build API-shaped documents from the synthetic launch table.
+
+    Args:
+        num_launches (int): Number of launches
+        seed (int): launch_data seed, also used for orbits and customers
+
+    Returns:
+        dict: endpoint name -> list of documents
+    """
+    import numpy as np
+    from launch_data import CUSTOMERS, LAUNCH_SITE_CODES, generate_launches
+
+    df = generate_launches(num_launches, seed=seed)
+    rng = np.random.default_rng(seed)
+    orbits = rng.choice(SAMPLE_ORBITS, size=len(df))
+    customers = rng.choice(CUSTOMERS, size=len(df))
+
+    rocket = {'id': document_id('rocket', 'Falcon 9'), 'name': 'Falcon 9', 'type': 'rocket', 'active': True}
+    launchpads = [{'id': document_id('launchpad', site), 'name': _launchpad_name(site), 'status': 'active'}
+                  for site in LAUNCH_SITE_CODES]
+
+    # A booster keeps the block of the version it first flew as
+    cores = {}
+    for booster, version in zip(df['BoosterID'], df['BoosterVersion']):
+        if booster not in cores:
+            cores[booster] = {'id': document_id('core', booster), 'serial': booster,
+                              'block': SAMPLE_BLOCKS[version], 'reuse_count': 0, 'status': 'active'}
+        else:
+            cores[booster]['reuse_count'] += 1
+
+    payloads, launches = [], []
+    for row, orbit, customer in zip(df.itertuples(index=False), orbits, customers):
+        payload_id = document_id('payload', row.FlightNumber)
+        payloads.append({'id': payload_id, 'name': row.MissionName, 'type': 'Satellite',
+                         'mass_kg': round(float(row.PayloadMass), 1), 'orbit': str(orbit),
+                         'customers': [str(customer)]})
+        attempted = row.LandingType != 'Expendable'
+        launches.append({
+            'id': document_id('launch', row.FlightNumber),
+            'flight_number': int(row.FlightNumber),
+            'name': row.MissionName,
+            'date_utc': row.Date.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'date_unix': int(row.Date.timestamp()),
+            'upcoming': False,
+            'success': bool(row.MissionOutcome),
+            'rocket': rocket['id'],
+            'launchpad': document_id('launchpad', row.LaunchSite),
+            'payloads': [payload_id],
+            'cores': [{
+                'core': cores[row.BoosterID]['id'],
+                'landing_attempt': attempted,
+                'landing_success': bool(row.LandingOutcome) if attempted else None,
+                'landing_type': SAMPLE_LANDING_TYPES.get(row.LandingType)
+            }]
+        })
+
+    return {'launches': launches, 'payloads': payloads, 'cores': list(cores.values()),
+            'rockets': [rocket], 'launchpads': launchpads}
+
+
+def write_fixtures(documents, directory=FIXTURE_DIR):
+    """Write one <endpoint>.json file per endpoint."""
+    os.makedirs(directory, exist_ok=True)
+    for name, docs in documents.items():
+        with open(os.path.join(directory, f"{name}.json"), 'w') as f:
+            json.dump(docs, f, indent=1)
+            f.write('\n')
+
+
+def record(directory, base_url=None):
+    """
+    Copy every endpoint from the live API into a fixture directory.
+
+    Returns:
+        dict: endpoint name -> number of documents recorded
+    """
+    import asyncio
+    from spacex_api import SpaceXClient
+
+    async def fetch_all():
+        async with SpaceXClient(base_url, use_cache=False) as client:
+            results = await asyncio.gather(*(client.get(name) for name in ENDPOINTS))
+        return dict(zip(ENDPOINTS, results))
+
+    documents = asyncio.run(fetch_all())
+    write_fixtures(documents, directory)
+    return {name: len(docs) for name, docs in documents.items()}
+
+
+# ---------------------------------------------------------------------------
+# Query evaluation
+# ---------------------------------------------------------------------------
+
+_OPERATORS = {
+    '$eq': lambda value, arg: value == arg,
+    '$ne': lambda value, arg: value != arg,
+    '$in': lambda value, arg: value in arg,
+    '$nin': lambda value, arg: value not in arg,
+    '$gt': lambda value, arg: value is not None and value > arg,
+    '$gte': lambda value, arg: value is not None and value >= arg,
+    '$lt': lambda value, arg: value is not None and value < arg,
+    '$lte': lambda value, arg: value is not None and value <= arg,
+}
+
+
+def matches(doc, query):
+    """Return whether a document matches a Mongo-style query (the subset above)."""
+    for field, condition in query.items():
+        if field == '$or':
+            if not any(matches(doc, branch) for branch in condition):
+                return False
+            continue
+        value = doc.get('id') if field == '_id' else doc.get(field)
+        if isinstance(condition, dict) and all(key.startswith('$') for key in condition):
+            for operator, arg in condition.items():
+                if operator not in _OPERATORS:
+                    raise ValueError(f"Unsupported query operator {operator}")
+                if not _OPERATORS[operator](value, arg):
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+def run_query(docs, query, options):
+    """Filter, sort and paginate documents like POST /<endpoint>/query."""
+    selected = [doc for doc in docs if matches(doc, query or {})]
+    for field, direction in reversed(list((options.get('sort') or {}).items())):
+        descending = direction in (-1, 'desc', 'descending')
+        selected.sort(key=lambda doc: (doc.get(field) is None, doc.get(field)), reverse=descending)
+
+    total = len(selected)
+    if options.get('pagination', True) is False:
+        limit, page = max(total, 1), 1
+    else:
+        limit, page = options.get('limit', DEFAULT_PAGE_SIZE), options.get('page', 1)
+    pages = max((total + limit - 1) // limit, 1)
+    return {'docs': selected[(page - 1) * limit:page * limit], 'totalDocs': total, 'limit': limit,
+            'page': page, 'totalPages': pages, 'hasPrevPage': page > 1, 'hasNextPage': page < pages}
+
+
+# ---------------------------------------------------------------------------
+# Replay server
+# ---------------------------------------------------------------------------
+
+class _Fixtures:
+    """Fixture files, reloaded whenever one changes on disk."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """Return (documents, mtime) of an endpoint, or None if there is no file."""
+        path = os.path.join(self.directory, f"{name}.json")
+        if name not in ENDPOINTS or not os.path.exists(path):
+            return None
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            if name not in self._loaded or self._loaded[name][1] != mtime:
+                with open(path) as f:
+                    self._loaded[name] = (json.load(f), mtime)
+            return self._loaded[name]
+
+
+def make_server(directory=FIXTURE_DIR, port=8766, latency=0.0, fail_first=0):
+    """
+    Create (but do not start) a replay server for a fixture directory.
+
+    Args:
+        directory (str): Fixture directory
+        port (int): Port on 127.0.0.1, 0 for any free port
+        latency (float): Seconds to wait before every response
+        fail_first (int): Answer the first N requests of each path with a
+            503 and Retry-After: 0, to exercise client retries
+
+    Returns:
+        ThreadingHTTPServer: The server; its .requests counts requests by path
+    """
+    fixtures = _Fixtures(directory)
+    pattern = re.compile(r'^/v4/([a-z]+)(/query)?/?$')
+    counts = {}
+    counts_lock = threading.Lock()
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _reply(self, status, body=b'', headers=()):
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self, method):
+            path = self.path.split('?')[0]
+            length = int(self.headers.get('Content-Length') or 0)
+            request_body = self.rfile.read(length) if length else b''
+            with counts_lock:
+                counts[path] = counts.get(path, 0) + 1
+                attempt = counts[path]
+            if latency:
+                time.sleep(latency)
+            if attempt <= fail_first:
+                self._reply(503, b'{"error": "injected failure"}', [('Retry-After', '0')])
+                return
+
+            match = pattern.match(path)
+            loaded = fixtures.get(match.group(1)) if match else None
+            if loaded is None or (method == 'POST') != bool(match.group(2)):
+                self._reply(404, b'{"error": "not found"}', [('Content-Type', 'application/json')])
+                return
+            docs, mtime = loaded
+            if method == 'POST':
+                try:
+                    request = json.loads(request_body or b'{}')
+                    result = run_query(docs, request.get('query'), request.get('options') or {})
+                except ValueError as e:
+                    self._reply(400, json.dumps({'error': str(e)}).encode('utf-8'))
+                    return
+            else:
+                result = docs
+
+            body = json.dumps(result, separators=(',', ':')).encode('utf-8')
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            last_modified = formatdate(int(mtime), usegmt=True)
+            headers = [('ETag', etag), ('Last-Modified', last_modified), ('Cache-Control', 'no-cache')]
+            if self._not_modified(etag, int(mtime)):
+                self._reply(304, headers=headers)
+                return
+            self._reply(200, body, headers + [('Content-Type', 'application/json')])
+
+        def _not_modified(self, etag, mtime):
+            # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+            if_none_match = self.headers.get('If-None-Match')
+            if if_none_match is not None:
+                return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+            if_modified_since = self.headers.get('If-Modified-Since')
+            if if_modified_since:
+                try:
+                    return mtime <= parsedate_to_datetime(if_modified_since).timestamp()
+                except (TypeError, ValueError):
+                    return False
+            return False
+
+        def do_GET(self):
+            self._handle('GET')
+
+        def do_POST(self):
+            self._handle('POST')
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+    server.daemon_threads = True
+    server.requests = counts
+    return server
+
+
+@contextlib.contextmanager
+def running(directory=FIXTURE_DIR, **kwargs):
+    """
+    Run a replay server on a free port in a background thread.
+
+    Yields:
+        str: The API root to hand to SpaceXClient, e.g. http://127.0.0.1:40123/v4
+    """
+    server = make_server(directory, port=0, **kwargs)
+    # A short poll interval keeps shutdown() from waiting up to half a second
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v4"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def serve(directory=FIXTURE_DIR, port=8766, latency=0.0, fail_first=0):
+    """Serve a fixture directory at http://localhost:<port>/v4 until interrupted."""
+    server = make_server(directory, port, latency, fail_first)
+    print(f"Replaying {directory} at http://localhost:{port}/v4")
+    print(f"Point the client at it with SPACEX_API_URL=http://localhost:{port}/v4")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record, generate and replay SpaceX API fixtures")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sample_parser = commands.add_parser('sample', help="Build fixtures from the synthetic launch table")
+    sample_parser.add_argument('--dir', default=FIXTURE_DIR)
+    sample_parser.add_argument('--launches', type=int, default=40)
+    sample_parser.add_argument('--seed', type=int, default=42)
+
+    record_parser = commands.add_parser('record', help="Record fixtures from the live API")
+    record_parser.add_argument('--dir', required=True)
+    record_parser.add_argument('--base-url', default=None)
+
+    serve_parser = commands.add_parser('serve', help="Replay a fixture directory over HTTP")
+    serve_parser.add_argument('--dir', default=FIXTURE_DIR)
+    serve_parser.add_argument('--port', type=int, default=8766)
+    serve_parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    serve_parser.add_argument('--fail-first', type=int, default=0, help="Fail the first N requests per path")
+    args = parser.parse_args()
+
+    if args.command == 'sample':
+        documents = sample_documents(args.launches, args.seed)
+        write_fixtures(documents, args.dir)
+        print(f"Wrote {', '.join(f'{len(docs)} {name}' for name, docs in documents.items())} to {args.dir}")
+    elif args.command == 'record':
+        counts = record(args.dir, args.base_url)
+        print(f"Recorded {', '.join(f'{count} {name}' for name, count in counts.items())} to {args.dir}")
+    else:
+        serve(args.dir, args.port, args.latency, args.fail_first)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,551 @@
+"""
+Scaling Benchmarks
+
+Times the analysis and rendering pipelines at growing launch counts
+(10^2 rows up to 10^7) one stage at a time, so it is clear which stage
+stops scaling first:
+
+    generate        build the synthetic table (launch_data / launch_features)
+    load            put it where the script reads it (launch store, SQLite)
+    filter          select rows or ranges
+    aggregate       group, bin, index or fit
+    render          draw the chart or map
+    write-markdown  write the report (or map HTML / PNG)
+
+The find_*/calculate_* query benchmarks take aggregate, render and
+write-markdown from the checkpoints run_query() marks itself (their
+filtering happens inside the SQL or groupby, so it is counted as aggregate).
+
+Every benchmark and size runs in a fresh subprocess with its own scratch
+directory and empty caches, and each stage records its wall time and the
+process's peak RSS after it finished. Results are appended to a JSON-lines
+history file; each run is compared with the previous one and slowdowns
+beyond the regression threshold are reported. Benchmarks whose cost grows
+too quickly for the largest sizes (per-launch map markers, kernel SVMs)
+declare a max_size and are skipped above it.
+
+Usage:
+    python benchmarks.py                              # all benchmarks, 10^2 .. 10^5
+    python benchmarks.py --max-exp 7                  # up to 10^7 rows
+    python benchmarks.py report cube_dashboard --sizes 1000 100000
+    python benchmarks.py --history                    # show recorded runs
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Where results are kept (override with SPACEX_BENCH_HISTORY)
+HISTORY_PATH = os.environ.get('SPACEX_BENCH_HISTORY', os.path.join('.benchmarks', 'history.jsonl'))
+
+# A stage is a regression when it is this much slower than last time...
+REGRESSION_THRESHOLD = 0.25
+# ...and slower by at least this many seconds (sub-millisecond noise is ignored)
+REGRESSION_MIN_SECONDS = 0.05
+
+# A stage whose time grows faster than n ** SUPERLINEAR_EXPONENT between two
+# sizes is flagged as no longer scaling
+SUPERLINEAR_EXPONENT = 1.3
+
+# Seconds one benchmark at one size may take before it is abandoned
+DEFAULT_TIMEOUT = 1800
+
+SITE_CODES = ['KSC LC-39A', 'CCAFS SLC-40', 'VAFB SLC-4E', 'CCAFS LC-40', 'VAFB SLC-3W',
+              'KSC LC-39B', 'Kwajalein Atoll']
+
+
+class StageTimer:
+    """Records the wall time and peak RSS of each named stage."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def __call__(self, name):
+        start = time.perf_counter()
+        yield
+        self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        """Record a stage timed elsewhere, e.g. by the instrumentation module."""
+        self.stages[name] = {'seconds': seconds, 'peak_rss_mb': peak_rss_mb()}
+
+
+def peak_rss_mb():
+    """Return this process's peak resident set size in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks: each takes the launch count and a StageTimer
+
+
+def bench_launch_store(n, stage):
+    from launch_data import generate_launches
+    from launch_store import load_launches, materialize
+
+    with stage('generate'):
+        generate_launches(n, seed=42)
+    with stage('load'):
+        materialize(n, seed=42)
+        load_launches(n, seed=42)
+
+
+def bench_report(n, stage):
+    from launch_data import generate_launches
+    from launch_report import write_rows, write_table
+
+    with stage('generate'):
+        df = generate_launches(n, seed=42)
+    with stage('filter'):
+        ccafs = df[df['LaunchSite'].str.startswith('CCA') & (df['Date'].dt.year >= 2015)]
+    with stage('aggregate'):
+        by_version = (df.groupby(['LaunchSite', 'BoosterVersion'], observed=True)['PayloadMass']
+                      .agg(['count', 'mean', 'max']).reset_index())
+    with stage('write-markdown'):
+        with open('report.md', 'w') as f:
+            write_rows(f, ccafs, "| {FlightNumber} | {Date:%Y-%m-%d} | {LaunchSite} | {PayloadMass:.0f} |\n")
+            write_table(f, by_version, [('Site', '{LaunchSite}'), ('Version', '{BoosterVersion}'),
+                                        ('Launches', '{count}'), ('Mean payload', '{mean:.0f}'),
+                                        ('Max payload', '{max:.0f}')])
+
+
+def bench_sql(n, stage):
+    from launch_data import generate_launches
+    from launch_sql import connect, query
+
+    with stage('generate'):
+        df = generate_launches(n, seed=42)
+    with stage('load'):
+        conn = connect(df)
+    with stage('filter'):
+        query(conn, "SELECT * FROM launches WHERE LaunchSite LIKE 'CCA%' AND Date >= '2015-01-01'")
+    with stage('aggregate'):
+        query(conn, "SELECT LaunchSite, BoosterVersion, COUNT(*), AVG(PayloadMass) FROM launches "
+                    "GROUP BY LaunchSite, BoosterVersion")
+    conn.close()
+
+
+# run_query() checkpoints -> the benchmark stage they are reported as; the
+# queries filter inside their SQL or groupby, so that is part of aggregate
+QUERY_STAGES = {'aggregate': 'aggregate', 'plot': 'render', 'output': 'write-markdown'}
+
+# Rows generated to compare a query's compat profile with the canonical columns
+QUERY_PROBE_ROWS = 100
+
+
+def _canonical_launches(n, seed):
+    # The canonical table plus the monthly profiles' Success and Customer
+    # columns, which their queries read (the monthly replays themselves run
+    # out of pandas timestamps after about 7000 launches)
+    from launch_data import legacy_customers, generate_launches
+
+    df = generate_launches(n, seed=seed)
+    df['Success'] = df['MissionOutcome']
+    df['Customer'] = legacy_customers(np.random.RandomState(seed), df['LaunchSite'])
+    return df
+
+
+def _query_benchmark(name):
+    # End-to-end run_query() of one find_*/calculate_* script at n launches,
+    # on the canonical generator where it has every column the query's
+    # profile does (most compat replays are row-by-row loops, and at the
+    # larger sizes would be timed instead of the query)
+    def bench(n, stage):
+        import importlib
+
+        import instrumentation
+        from launch_data import generate_launches
+        from launch_sql import connect
+        from run_queries import QUERIES
+
+        module = importlib.import_module(QUERIES[name]['module'])
+        dataset = module.DATASET
+        # Queries reading a column only their compat profile has
+        # (DroneShipName) still need the replay
+        profile_columns = generate_launches(QUERY_PROBE_ROWS, seed=dataset['seed'], compat=dataset['compat']).columns
+        canonical = profile_columns.isin(_canonical_launches(QUERY_PROBE_ROWS, dataset['seed']).columns).all()
+        with stage('generate'):
+            if canonical:
+                df = _canonical_launches(n, dataset['seed'])
+            else:
+                df = generate_launches(n, seed=dataset['seed'], compat=dataset['compat'])
+            if dataset.get('columns'):
+                df = df[dataset['columns']]
+        with stage('load'):
+            data = connect(df) if getattr(module, 'BACKEND', None) == 'sql' else df
+        # Report run_query()'s own checkpoints as the remaining stages
+        instrumentation.reset()
+        instrumentation.enable(script='benchmarks')
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.run_query(data)
+        instrumentation.checkpoint()
+        prefix = f"{module.__name__}.run_query/"
+        for record in instrumentation.records():
+            checkpoint_name = record['stage'][len(prefix):] if record['stage'].startswith(prefix) else None
+            if checkpoint_name in QUERY_STAGES:
+                stage.record(QUERY_STAGES[checkpoint_name], record['seconds'])
+    return bench
+
+
+def bench_cube_dashboard(n, stage):
+    import matplotlib.pyplot as plt
+
+    from launch_cube import build_cube
+    from launch_data import generate_launches
+
+    with stage('generate'):
+        df = generate_launches(n, seed=42, compat='site_outcomes')
+    with stage('aggregate'):
+        cube = build_cube(df)
+    with stage('filter'):
+        by_site = cube.rollup('LaunchSite')
+        by_year = cube.rollup('Year')
+    with stage('render'):
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        ax1.bar(by_site.index, by_site['SuccessRate'])
+        ax2.plot(by_year.index, by_year['SuccessRate'], marker='o')
+        fig.savefig('cube_dashboard.png', dpi=100)
+        plt.close(fig)
+
+
+def bench_payload_dashboard(n, stage):
+    import matplotlib.pyplot as plt
+
+    from launch_data import generate_launches
+    from payload_ranges import PayloadRangeIndex
+
+    with stage('generate'):
+        df = generate_launches(n, seed=42, compat='payload_outcome')
+    with stage('aggregate'):
+        index = PayloadRangeIndex(df['PayloadMass'], df['MissionOutcome'], groups=df['BoosterVersion'])
+    with stage('filter'):
+        ranges = [(0, 16000), (0, 8000), (8000, 16000)]
+        stats = [(index.group_stats(low, high), index.histogram(low, high, np.linspace(low, high, 6)))
+                 for low, high in ranges]
+    with stage('render'):
+        # The dashboard scatters every launch in range, so this is the per-row part
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        payloads, outcomes, codes = index.rows(0, 16000)
+        ax1.scatter(payloads, codes + outcomes * 0.2, s=4, alpha=0.5)
+        ax2.bar(range(len(stats[0][1])), stats[0][1]['SuccessRate'])
+        fig.savefig('payload_dashboard.png', dpi=100)
+        plt.close(fig)
+
+
+def _outcomes_map_benchmark(mode):
+    def bench(n, stage):
+        import create_launch_outcomes_map as outcomes_map
+        from launch_cube import build_cube
+
+        with stage('generate'):
+            df = outcomes_map.generate_launch_data(n)
+        with stage('aggregate'):
+            cube = build_cube(df)
+        with stage('render'):
+            spacex_map = outcomes_map.build_map(df, cube, mode=mode, aggregate=True)
+        with stage('write-markdown'):
+            spacex_map.save('outcomes_map.html')
+    return bench
+
+
+def bench_proximity(n, stage):
+    from proximity import ProximityIndex
+
+    with stage('generate'):
+        rng = np.random.default_rng(42)
+        lat = rng.uniform(-60, 60, n)
+        lon = rng.uniform(-180, 180, n)
+    with stage('aggregate'):
+        index = ProximityIndex(lat, lon)
+    with stage('filter'):
+        sites_lat = rng.uniform(-50, 50, len(SITE_CODES))
+        sites_lon = rng.uniform(-180, 180, len(SITE_CODES))
+        index.nearest(sites_lat, sites_lon, k=5, radius_km=50)
+
+
+def _model_benchmark(model):
+    def bench(n, stage):
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.svm import SVC
+
+        from launch_features import FEATURE_COLUMNS, TARGET_COLUMN, generate_launch_features
+
+        estimator = {'logistic_regression': LogisticRegression(max_iter=1000, random_state=42),
+                     'svm': SVC(random_state=42)}[model]
+        with stage('generate'):
+            df = generate_launch_features(n, seed=42)
+        with stage('aggregate'):
+            pipeline = Pipeline([('scaler', StandardScaler()), ('model', estimator)])
+            pipeline.fit(df[FEATURE_COLUMNS], df[TARGET_COLUMN])
+        with stage('filter'):
+            pipeline.predict(df[FEATURE_COLUMNS])
+    return bench
+
+
+# Registered benchmarks: name -> function, and the largest size it is run at
+BENCHMARKS = {
+    'launch_store': {'function': bench_launch_store},
+    'report': {'function': bench_report},
+    'sql': {'function': bench_sql},
+    'query:ccafs': {'function': _query_benchmark('ccafs')},
+    'query:unique_launch_sites': {'function': _query_benchmark('unique_launch_sites')},
+    'query:nasa_payload': {'function': _query_benchmark('nasa_payload')},
+    'query:f9v11_payload': {'function': _query_benchmark('f9v11_payload')},
+    'query:failed_landings_2015': {'function': _query_benchmark('failed_landings_2015')},
+    'query:max_payload': {'function': _query_benchmark('max_payload')},
+    'query:first_ground_landing': {'function': _query_benchmark('first_ground_landing')},
+    'query:drone_ship_landings': {'function': _query_benchmark('drone_ship_landings')},
+    'query:mission_outcomes': {'function': _query_benchmark('mission_outcomes')},
+    'query:rank_landing_outcomes': {'function': _query_benchmark('rank_landing_outcomes')},
+    'cube_dashboard': {'function': bench_cube_dashboard},
+    'payload_dashboard': {'function': bench_payload_dashboard},
+    'outcomes_map:markers': {'function': _outcomes_map_benchmark('markers'), 'max_size': 10 ** 4},
+    'outcomes_map:cluster': {'function': _outcomes_map_benchmark('cluster'), 'max_size': 10 ** 6},
+    'outcomes_map:sites': {'function': _outcomes_map_benchmark('sites')},
+    'proximity': {'function': bench_proximity},
+    'model:logistic_regression': {'function': _model_benchmark('logistic_regression'), 'max_size': 10 ** 6},
+    'model:svm': {'function': _model_benchmark('svm'), 'max_size': 10 ** 4},
+}
+
+
+def _run_worker(name, n):
+    # Runs inside the subprocess: scratch directory, empty caches, headless plots
+    import matplotlib
+    matplotlib.use('Agg')
+    stage = StageTimer()
+    error = None
+    try:
+        BENCHMARKS[name]['function'](n, stage)
+    except Exception as e:
+        error = repr(e)
+    print(json.dumps({'stages': stage.stages, 'peak_rss_mb': peak_rss_mb(), 'error': error}))
+
+
+def run_benchmark(name, n, timeout=DEFAULT_TIMEOUT):
+    """
+    Run one benchmark at one size in a fresh subprocess.
+
+    Returns:
+        dict: stages (name -> seconds and peak_rss_mb), peak_rss_mb and
+        error (None when the benchmark finished)
+    """
+    with tempfile.TemporaryDirectory(prefix='spacex-bench-') as scratch:
+        # Scripts write their charts where they would in the repo
+        os.makedirs(os.path.join(scratch, 'charts'))
+        env = dict(os.environ, MPLBACKEND='Agg', PYTHONPATH=ROOT,
+                   SPACEX_LAUNCH_CACHE=os.path.join(scratch, 'launch_cache'),
+                   SPACEX_MODEL_CACHE=os.path.join(scratch, 'model_cache'),
+                   SPACEX_CHART_CACHE=os.path.join(scratch, 'chart_cache'))
+        try:
+            result = subprocess.run([sys.executable, os.path.join(ROOT, 'benchmarks.py'), '--worker', name, str(n)],
+                                    cwd=scratch, env=env, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {'stages': {}, 'peak_rss_mb': None, 'error': f"timed out after {timeout}s"}
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        tail = result.stderr.strip().splitlines()[-1:] or [f"exit code {result.returncode}"]
+        return {'stages': {}, 'peak_rss_mb': None, 'error': tail[0]}
+    return json.loads(lines[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=None):
+    """Return every recorded result, oldest first."""
+    try:
+        with open(path or HISTORY_PATH) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def append_history(records, path=None):
+    path = path or HISTORY_PATH
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        for record in records:
+            f.write(json.dumps(record, sort_keys=True) + '\n')
+
+
+def find_regressions(records, history, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare a run with the latest earlier result of each benchmark, size and stage.
+
+    Returns:
+        list: (benchmark, size, stage, previous seconds, seconds) for each
+        stage that got slower than the threshold allows
+    """
+    previous = {}
+    for record in history:
+        for stage_name, stage in record['stages'].items():
+            previous[(record['benchmark'], record['size'], stage_name)] = stage['seconds']
+
+    regressions = []
+    for record in records:
+        for stage_name, stage in record['stages'].items():
+            before = previous.get((record['benchmark'], record['size'], stage_name))
+            if before is None:
+                continue
+            if stage['seconds'] > before * (1 + threshold) and stage['seconds'] - before > REGRESSION_MIN_SECONDS:
+                regressions.append((record['benchmark'], record['size'], stage_name, before, stage['seconds']))
+    return regressions
+
+
+def scaling_breaks(records):
+    """
+    Find where each stage stops scaling linearly.
+
+    Returns:
+        list: (benchmark, stage, size, exponent) for the first size at which
+        a stage's time grew faster than n ** SUPERLINEAR_EXPONENT, sorted by size
+    """
+    times = {}
+    for record in records:
+        for stage_name, stage in record['stages'].items():
+            times.setdefault((record['benchmark'], stage_name), []).append((record['size'], stage['seconds']))
+
+    breaks = []
+    for (benchmark, stage_name), points in times.items():
+        points.sort()
+        for (n1, t1), (n2, t2) in zip(points, points[1:]):
+            # Stages this fast are dominated by fixed costs, not by n
+            if t1 <= 0 or t2 < REGRESSION_MIN_SECONDS:
+                continue
+            exponent = math.log(t2 / t1) / math.log(n2 / n1)
+            if exponent > SUPERLINEAR_EXPONENT:
+                breaks.append((benchmark, stage_name, n2, exponent))
+                break
+    return sorted(breaks, key=lambda item: (item[2], -item[3]))
+
+
+def print_results(records):
+    print(f"\n{'Benchmark':<28} {'Rows':>10} {'Stage':<15} {'Time (s)':>10} {'Peak RSS (MB)':>14}")
+    print("-" * 81)
+    for record in records:
+        if record['error']:
+            print(f"{record['benchmark']:<28} {record['size']:>10} {'-':<15} {'':>10} {'':>14}  {record['error']}")
+        for stage_name, stage in record['stages'].items():
+            print(f"{record['benchmark']:<28} {record['size']:>10} {stage_name:<15} "
+                  f"{stage['seconds']:>10.3f} {stage['peak_rss_mb']:>14.0f}")
+
+
+def run_benchmarks(names=None, sizes=None, timeout=DEFAULT_TIMEOUT, history_path=None, record=True):
+    """
+    Run benchmarks over a range of sizes, record and compare the results.
+
+    Args:
+        names (list, optional): Benchmarks to run, defaults to all of BENCHMARKS
+        sizes (list, optional): Launch counts, defaults to 10^2 .. 10^5
+        timeout (int): Seconds allowed per benchmark and size
+        history_path (str, optional): History file, defaults to HISTORY_PATH
+        record (bool): Append the results to the history
+
+    Returns:
+        list: One record per benchmark and size that ran
+    """
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+    sizes = sorted(sizes or [10 ** exp for exp in range(2, 6)])
+
+    run = {'run_id': time.strftime('%Y%m%dT%H%M%S'), 'commit': _git_commit(),
+           'python': platform.python_version(), 'machine': platform.machine(), 'cpus': os.cpu_count()}
+    records = []
+    for name in names:
+        for n in sizes:
+            if n > BENCHMARKS[name].get('max_size', float('inf')):
+                continue
+            print(f"Running {name} at {n} rows...", flush=True)
+            result = run_benchmark(name, n, timeout)
+            records.append(dict(run, benchmark=name, size=n, **result))
+            if result['error']:
+                # Larger sizes will not do better
+                break
+
+    print_results(records)
+
+    breaks = scaling_breaks(records)
+    print(f"\nStages growing faster than n^{SUPERLINEAR_EXPONENT} (first size where it happened):")
+    for benchmark, stage_name, n, exponent in breaks or []:
+        print(f"  {benchmark} / {stage_name}: n^{exponent:.2f} up to {n} rows")
+    if not breaks:
+        print("  none")
+
+    history = load_history(history_path)
+    regressions = find_regressions(records, history)
+    print(f"\nRegressions against the previous run (> {REGRESSION_THRESHOLD:.0%} slower):")
+    for benchmark, n, stage_name, before, after in regressions:
+        print(f"  {benchmark} / {stage_name} at {n} rows: {before:.3f}s -> {after:.3f}s")
+    if not regressions:
+        print("  none")
+
+    if record:
+        append_history(records, history_path)
+    return records
+
+
+def print_history(path=None):
+    history = load_history(path)
+    runs = {}
+    for record in history:
+        runs.setdefault((record['run_id'], record.get('commit')), []).append(record)
+    print(f"{'Run':<17} {'Commit':<10} {'Benchmarks':>10} {'Max rows':>10} {'Total (s)':>10}")
+    print("-" * 61)
+    for (run_id, commit), records in runs.items():
+        total = sum(stage['seconds'] for record in records for stage in record['stages'].values())
+        print(f"{run_id:<17} {commit or '-':<10} {len({r['benchmark'] for r in records}):>10} "
+              f"{max(r['size'] for r in records):>10} {total:>10.2f}")
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '--worker':
+        sys.path.insert(0, ROOT)
+        _run_worker(sys.argv[2], int(sys.argv[3]))
+        return 0
+
+    parser = argparse.ArgumentParser(description="Benchmark the SpaceX pipelines at growing data sizes")
+    parser.add_argument('benchmarks', nargs='*', help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--sizes', type=int, nargs='+', help="Launch counts to run at")
+    parser.add_argument('--min-exp', type=int, default=2, help="Smallest size as a power of ten (default: 2)")
+    parser.add_argument('--max-exp', type=int, default=5, help="Largest size as a power of ten (default: 5)")
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, help="Seconds per benchmark and size")
+    parser.add_argument('--no-record', action='store_true', help="Do not append the results to the history")
+    parser.add_argument('--history', action='store_true', help="Show the recorded runs and exit")
+    args = parser.parse_args()
+
+    if args.history:
+        print_history()
+        return 0
+    sizes = args.sizes or [10 ** exp for exp in range(args.min_exp, args.max_exp + 1)]
+    records = run_benchmarks(args.benchmarks, sizes, args.timeout, record=not args.no_record)
+    return 1 if any(record['error'] for record in records) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,235 +1,168 @@
-import pandas as pd
-import numpy as np
-from datetime import datetime
-import matplotlib.pyplot as plt
+from instrumentation import checkpoint, timed
+from launch_store import load_launches
 
 # For demonstration, since we've been using sample data
-# Create sample data that represents our SpaceX launches
-np.random.seed(42)
-
-# Create a list of all potential launch sites
-all_launch_sites = [
-    'KSC LC-39A',           # Kennedy Space Center Launch Complex 39A
-    'CCAFS SLC-40',         # Cape Canaveral Air Force Station Space Launch Complex 40
-    'VAFB SLC-4E',          # Vandenberg Air Force Base Space Launch Complex 4E
-    'CCAFS LC-40',          # Cape Canaveral Air Force Station Launch Complex 40
-    'VAFB SLC-3W',          # Vandenberg Air Force Base Space Launch Complex 3W
-    'KSC LC-39B',           # Kennedy Space Center Launch Complex 39B
-    'Kwajalein Atoll'       # Marshall Islands launch site
-]
-
-# Define booster versions with appropriate timeline
-# F9 v1.0: Flights 1-5 (2010-2013)
-# F9 v1.1: Flights 6-20 (2013-2015)
-# F9 FT (Full Thrust): Flights 21-60 (2015-2018)
-# F9 Block 5: Flights 61-100 (2018-2022)
-booster_versions = []
-
-for flight_num in range(1, 101):
-    if flight_num <= 5:
-        booster_versions.append('F9 v1.0')
-    elif flight_num <= 20:
-        booster_versions.append('F9 v1.1')
-    elif flight_num <= 60:
-        booster_versions.append('F9 FT')
-    else:
-        booster_versions.append('F9 Block 5')
-
-# Create sample data for 100 launches spanning 2010-2022
-flight_numbers = np.arange(1, 101)
-dates = pd.date_range(start='2010-06-04', end='2022-12-31', periods=100)
-launches = np.random.choice(all_launch_sites, size=100, p=[0.35, 0.30, 0.20, 0.05, 0.05, 0.03, 0.02])
-
-# Generate mission outcomes - success rates improve over time
-mission_outcomes = []
-landing_outcomes = []
-
-for i, date in enumerate(dates):
-    # Mission success probability - increases over time
-    if date.year <= 2013:  # Early years
-        mission_success_prob = 0.85  # 85% success rate for early missions
-    elif date.year <= 2016:  # Middle years
-        mission_success_prob = 0.94  # 94% success rate for middle years
-    else:  # Recent years
-        mission_success_prob = 0.98  # 98% success rate for recent years
-    
-    # Generate mission outcome (1 = success, 0 = failure)
-    mission_outcome = np.random.binomial(1, mission_success_prob)
-    mission_outcomes.append(mission_outcome)
-    
-    # Landing success probability - more complex progression
-    if date < datetime(2015, 1, 1):
-        # Before 2015: No landing attempts or ocean landings only, very low success
-        landing_success_prob = 0.0  # All failed or not attempted
-    elif date < datetime(2016, 6, 1):
-        # Early 2015 to mid 2016: First landing attempts, low success rate
-        landing_success_prob = 0.3  # 30% success rate
-    elif date < datetime(2018, 1, 1):
-        # Mid 2016 to end 2017: Improving success rate
-        landing_success_prob = 0.6  # 60% success rate
-    else:
-        # 2018 onwards: Routine landings with high success rate
-        landing_success_prob = 0.85  # 85% success rate
-    
-    # Generate landing outcome (1 = success, 0 = failure)
-    landing_outcome = np.random.binomial(1, landing_success_prob)
-    landing_outcomes.append(landing_outcome)
-
-# Create a DataFrame
-df = pd.DataFrame({
-    'FlightNumber': flight_numbers,
-    'Date': dates,
-    'BoosterVersion': booster_versions,
-    'LaunchSite': launches,
-    'MissionOutcome': mission_outcomes,
-    'LandingOutcome': landing_outcomes
-})
-
-# Add a mission name field for context
-mission_prefix = ['CRS', 'Starlink', 'NROL', 'GPS', 'Telstar', 'Eutelsat', 'SES', 'Orbcomm', 'Iridium', 'JCSAT']
-mission_names = []
-for i in range(100):
-    prefix = np.random.choice(mission_prefix)
-    number = np.random.randint(1, 20)
-    mission_names.append(f"{prefix}-{number}")
-
-df['MissionName'] = mission_names
-
-# Calculate totals
-total_missions = len(df)
-mission_success_count = df['MissionOutcome'].sum()
-mission_failure_count = total_missions - mission_success_count
-mission_success_rate = mission_success_count / total_missions * 100
-
-landing_success_count = df['LandingOutcome'].sum()
-landing_failure_count = total_missions - landing_success_count
-landing_success_rate = landing_success_count / total_missions * 100
-
-# Print results
-print("\nSpaceX Mission Outcome Analysis:")
-print("===============================")
-print(f"Total Missions: {total_missions}")
-print(f"Successful Missions: {mission_success_count} ({mission_success_rate:.1f}%)")
-print(f"Failed Missions: {mission_failure_count} ({100-mission_success_rate:.1f}%)")
-
-print("\nLanding Outcome Analysis:")
-print("========================")
-print(f"Successful Landings: {landing_success_count} ({landing_success_rate:.1f}%)")
-print(f"Failed Landings: {landing_failure_count} ({100-landing_success_rate:.1f}%)")
-
-# Analyze success rates by booster version
-version_stats = df.groupby('BoosterVersion').agg({
-    'FlightNumber': 'count',
-    'MissionOutcome': 'sum',
-    'LandingOutcome': 'sum'
-}).reset_index()
-
-version_stats.columns = ['BoosterVersion', 'TotalFlights', 'SuccessfulMissions', 'SuccessfulLandings']
-version_stats['MissionSuccessRate'] = version_stats['SuccessfulMissions'] / version_stats['TotalFlights'] * 100
-version_stats['LandingSuccessRate'] = version_stats['SuccessfulLandings'] / version_stats['TotalFlights'] * 100
-
-print("\nSuccess Rates by Booster Version:")
-print("================================")
-for _, row in version_stats.iterrows():
-    print(f"{row['BoosterVersion']}: {row['TotalFlights']} flights, {row['MissionSuccessRate']:.1f}% mission success, {row['LandingSuccessRate']:.1f}% landing success")
-
-# Create a table with missions by year
-yearly_stats = df.groupby(df['Date'].dt.year).agg({
-    'FlightNumber': 'count',
-    'MissionOutcome': 'sum',
-    'LandingOutcome': 'sum'
-}).reset_index()
-
-yearly_stats.columns = ['Year', 'TotalFlights', 'SuccessfulMissions', 'SuccessfulLandings']
-yearly_stats['MissionSuccessRate'] = yearly_stats['SuccessfulMissions'] / yearly_stats['TotalFlights'] * 100
-yearly_stats['LandingSuccessRate'] = yearly_stats['SuccessfulLandings'] / yearly_stats['TotalFlights'] * 100
-
-print("\nMission and Landing Success by Year:")
-print("===================================")
-for _, row in yearly_stats.iterrows():
-    print(f"{int(row['Year'])}: {row['TotalFlights']} flights, {row['SuccessfulMissions']} successful missions ({row['MissionSuccessRate']:.1f}%), {row['SuccessfulLandings']} successful landings ({row['LandingSuccessRate']:.1f}%)")
-
-# Create graphs to visualize the data
-plt.figure(figsize=(12, 8))
-
-# Plot mission outcomes
-plt.subplot(2, 2, 1)
-labels = ['Success', 'Failure']
-sizes = [mission_success_count, mission_failure_count]
-colors = ['#005288', '#A7A9AC']  # SpaceX colors
-plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-plt.title('Mission Outcomes')
-
-# Plot landing outcomes
-plt.subplot(2, 2, 2)
-labels = ['Success', 'Failure']
-sizes = [landing_success_count, landing_failure_count]
-plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-plt.title('Landing Outcomes')
-
-# Plot mission success rate by year
-plt.subplot(2, 2, 3)
-plt.plot(yearly_stats['Year'], yearly_stats['MissionSuccessRate'], marker='o', linewidth=2, color='#005288')
-plt.title('Mission Success Rate by Year')
-plt.xlabel('Year')
-plt.ylabel('Success Rate (%)')
-plt.ylim(80, 100)
-plt.grid(True, alpha=0.3)
-
-# Plot landing success rate by year
-plt.subplot(2, 2, 4)
-plt.plot(yearly_stats['Year'], yearly_stats['LandingSuccessRate'], marker='o', linewidth=2, color='#005288')
-plt.title('Landing Success Rate by Year')
-plt.xlabel('Year')
-plt.ylabel('Success Rate (%)')
-plt.ylim(0, 100)
-plt.grid(True, alpha=0.3)
-
-plt.tight_layout()
-
-# Save the chart
-plt.savefig('charts/mission_outcomes.png', dpi=300, bbox_inches='tight')
-
-# Save results to a file
-with open('mission_outcomes_results.md', 'w') as f:
-    f.write("# SpaceX Mission and Landing Outcomes Analysis\n\n")
-    
-    f.write("## Overall Statistics\n\n")
-    f.write(f"- **Total Missions**: {total_missions}\n")
-    f.write(f"- **Successful Missions**: {mission_success_count} ({mission_success_rate:.1f}%)\n")
-    f.write(f"- **Failed Missions**: {mission_failure_count} ({100-mission_success_rate:.1f}%)\n\n")
-    
-    f.write(f"- **Successful Landings**: {landing_success_count} ({landing_success_rate:.1f}%)\n")
-    f.write(f"- **Failed Landings**: {landing_failure_count} ({100-landing_success_rate:.1f}%)\n\n")
-    
-    f.write("## Success Rates by Booster Version\n\n")
-    f.write("| Booster Version | Total Flights | Mission Success | Landing Success |\n")
-    f.write("|-----------------|---------------|-----------------|----------------|\n")
+# Create sample data for 100 launches spanning 2010-2022 with mission and
+# landing success rates that improve over time
+DATASET = {'num_launches': 100, 'seed': 42, 'compat': 'mission_outcomes',
+           'columns': ['FlightNumber', 'Date', 'BoosterVersion', 'MissionOutcome', 'LandingOutcome']}
+
+
+def save_outcome_charts(mission_success_count, mission_failure_count, landing_success_count,
+                        landing_failure_count, yearly_stats):
+    """Draw the outcome pies and yearly success rates to charts/mission_outcomes.png"""
+    import matplotlib.pyplot as plt
+
+    # Create graphs to visualize the data
+    plt.figure(figsize=(12, 8))
+
+    # Plot mission outcomes
+    plt.subplot(2, 2, 1)
+    labels = ['Success', 'Failure']
+    sizes = [mission_success_count, mission_failure_count]
+    colors = ['#005288', '#A7A9AC']  # SpaceX colors
+    plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+    plt.title('Mission Outcomes')
+
+    # Plot landing outcomes
+    plt.subplot(2, 2, 2)
+    labels = ['Success', 'Failure']
+    sizes = [landing_success_count, landing_failure_count]
+    plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+    plt.title('Landing Outcomes')
+
+    # Plot mission success rate by year
+    plt.subplot(2, 2, 3)
+    plt.plot(yearly_stats['Year'], yearly_stats['MissionSuccessRate'], marker='o', linewidth=2, color='#005288')
+    plt.title('Mission Success Rate by Year')
+    plt.xlabel('Year')
+    plt.ylabel('Success Rate (%)')
+    plt.ylim(80, 100)
+    plt.grid(True, alpha=0.3)
+
+    # Plot landing success rate by year
+    plt.subplot(2, 2, 4)
+    plt.plot(yearly_stats['Year'], yearly_stats['LandingSuccessRate'], marker='o', linewidth=2, color='#005288')
+    plt.title('Landing Success Rate by Year')
+    plt.xlabel('Year')
+    plt.ylabel('Success Rate (%)')
+    plt.ylim(0, 100)
+    plt.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+
+    # Save the chart
+    plt.savefig('charts/mission_outcomes.png', dpi=300, bbox_inches='tight')
+
+
+@timed()
+def run_query(df, chart=True):
+    """Summarize mission and landing outcomes and write mission_outcomes_results.md (and the chart unless chart=False)"""
+    checkpoint('aggregate')
+    # Calculate totals
+    total_missions = len(df)
+    mission_success_count = df['MissionOutcome'].sum()
+    mission_failure_count = total_missions - mission_success_count
+    mission_success_rate = mission_success_count / total_missions * 100
+
+    landing_success_count = df['LandingOutcome'].sum()
+    landing_failure_count = total_missions - landing_success_count
+    landing_success_rate = landing_success_count / total_missions * 100
+
+    # Print results
+    print("\nSpaceX Mission Outcome Analysis:")
+    print("===============================")
+    print(f"Total Missions: {total_missions}")
+    print(f"Successful Missions: {mission_success_count} ({mission_success_rate:.1f}%)")
+    print(f"Failed Missions: {mission_failure_count} ({100-mission_success_rate:.1f}%)")
+
+    print("\nLanding Outcome Analysis:")
+    print("========================")
+    print(f"Successful Landings: {landing_success_count} ({landing_success_rate:.1f}%)")
+    print(f"Failed Landings: {landing_failure_count} ({100-landing_success_rate:.1f}%)")
+
+    # Analyze success rates by booster version
+    version_stats = df.groupby('BoosterVersion').agg({
+        'FlightNumber': 'count',
+        'MissionOutcome': 'sum',
+        'LandingOutcome': 'sum'
+    }).reset_index()
+
+    version_stats.columns = ['BoosterVersion', 'TotalFlights', 'SuccessfulMissions', 'SuccessfulLandings']
+    version_stats['MissionSuccessRate'] = version_stats['SuccessfulMissions'] / version_stats['TotalFlights'] * 100
+    version_stats['LandingSuccessRate'] = version_stats['SuccessfulLandings'] / version_stats['TotalFlights'] * 100
+
+    print("\nSuccess Rates by Booster Version:")
+    print("================================")
     for _, row in version_stats.iterrows():
-        f.write(f"| {row['BoosterVersion']} | {row['TotalFlights']} | {row['MissionSuccessRate']:.1f}% | {row['LandingSuccessRate']:.1f}% |\n")
-    
-    f.write("\n## Mission and Landing Success by Year\n\n")
-    f.write("| Year | Total Flights | Mission Success | Landing Success |\n")
-    f.write("|------|---------------|-----------------|----------------|\n")
+        print(f"{row['BoosterVersion']}: {row['TotalFlights']} flights, {row['MissionSuccessRate']:.1f}% mission success, {row['LandingSuccessRate']:.1f}% landing success")
+
+    # Create a table with missions by year
+    yearly_stats = df.groupby(df['Date'].dt.year).agg({
+        'FlightNumber': 'count',
+        'MissionOutcome': 'sum',
+        'LandingOutcome': 'sum'
+    }).reset_index()
+
+    yearly_stats.columns = ['Year', 'TotalFlights', 'SuccessfulMissions', 'SuccessfulLandings']
+    yearly_stats['MissionSuccessRate'] = yearly_stats['SuccessfulMissions'] / yearly_stats['TotalFlights'] * 100
+    yearly_stats['LandingSuccessRate'] = yearly_stats['SuccessfulLandings'] / yearly_stats['TotalFlights'] * 100
+
+    print("\nMission and Landing Success by Year:")
+    print("===================================")
     for _, row in yearly_stats.iterrows():
-        f.write(f"| {int(row['Year'])} | {row['TotalFlights']} | {row['SuccessfulMissions']} ({row['MissionSuccessRate']:.1f}%) | {row['SuccessfulLandings']} ({row['LandingSuccessRate']:.1f}%) |\n")
-    
-    f.write("\n## Explanation\n\n")
-    f.write("This analysis presents a comprehensive overview of SpaceX mission and landing outcomes. ")
-    f.write("Mission outcomes refer to whether the primary mission objective (payload delivery to the intended orbit) was successful. ")
-    f.write("Landing outcomes refer to whether the first stage booster was successfully recovered.\n\n")
-    
-    f.write("Key observations:\n\n")
-    f.write("1. SpaceX has maintained an exceptionally high mission success rate, with overall mission reliability ")
-    f.write("improving over time as the company gained experience.\n\n")
-    
-    f.write("2. Landing success rates show dramatic improvement as SpaceX refined their recovery techniques, ")
-    f.write("from early experimental attempts to routine operational recoveries with the Falcon 9 Block 5.\n\n")
-    
-    f.write("3. The Falcon 9 Block 5 booster demonstrates the highest reliability for both mission success ")
-    f.write("and landing success, representing SpaceX's most mature and refined launch system.\n\n")
-    
-    f.write("The data demonstrates SpaceX's progressive approach to rocket development, with each booster version ")
-    f.write("showing improvements in reliability and performance over time. The landing success rate in particular ")
-    f.write("shows SpaceX's revolutionary advancement in reusable rocket technology, transitioning from experimental ")
-    f.write("to routine operations.") 
\ No newline at end of file
+        print(f"{int(row['Year'])}: {row['TotalFlights']} flights, {row['SuccessfulMissions']} successful missions ({row['MissionSuccessRate']:.1f}%), {row['SuccessfulLandings']} successful landings ({row['LandingSuccessRate']:.1f}%)")
+
+    if chart:
+        checkpoint('plot')
+        save_outcome_charts(mission_success_count, mission_failure_count, landing_success_count,
+                            landing_failure_count, yearly_stats)
+
+    checkpoint('output')
+    # Save results to a file
+    with open('mission_outcomes_results.md', 'w') as f:
+        f.write("# SpaceX Mission and Landing Outcomes Analysis\n\n")
+        
+        f.write("## Overall Statistics\n\n")
+        f.write(f"- **Total Missions**: {total_missions}\n")
+        f.write(f"- **Successful Missions**: {mission_success_count} ({mission_success_rate:.1f}%)\n")
+        f.write(f"- **Failed Missions**: {mission_failure_count} ({100-mission_success_rate:.1f}%)\n\n")
+        
+        f.write(f"- **Successful Landings**: {landing_success_count} ({landing_success_rate:.1f}%)\n")
+        f.write(f"- **Failed Landings**: {landing_failure_count} ({100-landing_success_rate:.1f}%)\n\n")
+        
+        f.write("## Success Rates by Booster Version\n\n")
+        f.write("| Booster Version | Total Flights | Mission Success | Landing Success |\n")
+        f.write("|-----------------|---------------|-----------------|----------------|\n")
+        for _, row in version_stats.iterrows():
+            f.write(f"| {row['BoosterVersion']} | {row['TotalFlights']} | {row['MissionSuccessRate']:.1f}% | {row['LandingSuccessRate']:.1f}% |\n")
+        
+        f.write("\n## Mission and Landing Success by Year\n\n")
+        f.write("| Year | Total Flights | Mission Success | Landing Success |\n")
+        f.write("|------|---------------|-----------------|----------------|\n")
+        for _, row in yearly_stats.iterrows():
+            f.write(f"| {int(row['Year'])} | {row['TotalFlights']} | {row['SuccessfulMissions']} ({row['MissionSuccessRate']:.1f}%) | {row['SuccessfulLandings']} ({row['LandingSuccessRate']:.1f}%) |\n")
+        
+        f.write("\n## Explanation\n\n")
+        f.write("This analysis presents a comprehensive overview of SpaceX mission and landing outcomes. ")
+        f.write("Mission outcomes refer to whether the primary mission objective (payload delivery to the intended orbit) was successful. ")
+        f.write("Landing outcomes refer to whether the first stage booster was successfully recovered.\n\n")
+        
+        f.write("Key observations:\n\n")
+        f.write("1. SpaceX has maintained an exceptionally high mission success rate, with overall mission reliability ")
+        f.write("improving over time as the company gained experience.\n\n")
+        
+        f.write("2. Landing success rates show dramatic improvement as SpaceX refined their recovery techniques, ")
+        f.write("from early experimental attempts to routine operational recoveries with the Falcon 9 Block 5.\n\n")
+        
+        f.write("3. The Falcon 9 Block 5 booster demonstrates the highest reliability for both mission success ")
+        f.write("and landing success, representing SpaceX's most mature and refined launch system.\n\n")
+        
+        f.write("The data demonstrates SpaceX's progressive approach to rocket development, with each booster version ")
+        f.write("showing improvements in reliability and performance over time. The landing success rate in particular ")
+        f.write("shows SpaceX's revolutionary advancement in reusable rocket technology, transitioning from experimental ")
+        f.write("to routine operations.") 
+
+
+if __name__ == "__main__":
+    run_query(load_launches(**DATASET))
@@ -1,95 +1,77 @@
-import pandas as pd
-import numpy as np
+from instrumentation import checkpoint, timed
+from launch_sql import open_launch_db, query_rows, rows_to_markdown, rows_to_string
 
 # For demonstration, since we've been using sample data
-# Create sample data that represents our SpaceX launches
-np.random.seed(42)
+# Query sample data for 100 launches from the shared launch database. Customers are
+# assigned by site - NASA is most common at KSC, which is NASA's facility
+DATASET = {'num_launches': 100, 'seed': 42, 'compat': 'nasa_payload'}
+BACKEND = 'sql'
 
-# Create a list of all potential launch sites
-all_launch_sites = [
-    'KSC LC-39A',          # Kennedy Space Center Launch Complex 39A
-    'CCAFS SLC-40',        # Cape Canaveral Air Force Station Space Launch Complex 40
-    'VAFB SLC-4E',         # Vandenberg Air Force Base Space Launch Complex 4E
-    'CCAFS LC-40',         # Cape Canaveral Air Force Station Launch Complex 40
-    'VAFB SLC-3W',         # Vandenberg Air Force Base Space Launch Complex 3W
-    'KSC LC-39B',          # Kennedy Space Center Launch Complex 39B
-    'Kwajalein Atoll'      # Marshall Islands launch site
-]
+# Payload totals for one customer (uses the Customer index)
+CUSTOMER_TOTALS_SQL = """
+    SELECT COUNT(*) AS LaunchCount, TOTAL(PayloadMass) AS TotalPayload
+    FROM launches
+    WHERE Customer = ?
+"""
 
-# Define potential customers
-customers = ['NASA', 'SpaceX', 'Commercial', 'DoD', 'ESA', 'JAXA', 'Other']
+# Heaviest missions for one customer, earliest flight first on ties
+CUSTOMER_TOP_PAYLOADS_SQL = """
+    SELECT FlightNumber, Date, LaunchSite, PayloadMass
+    FROM launches
+    WHERE Customer = ?
+    ORDER BY PayloadMass DESC, rowid
+    LIMIT ?
+"""
 
-# Create sample data for 100 launches
-np.random.seed(42)
-launches = np.random.choice(all_launch_sites, size=100, p=[0.35, 0.30, 0.20, 0.05, 0.05, 0.03, 0.02])
-flight_numbers = np.arange(1, 101)
-dates = pd.date_range(start='2010-06-04', periods=100, freq='M')
-payloads = np.random.uniform(1000, 15000, 100)
-success = np.random.binomial(1, 0.8, 100)  # 80% success rate overall
 
-# Assign customers - make NASA more common for certain sites like KSC which is NASA's facility
-customer_probs = []
-for site in launches:
-    if 'KSC' in site:
-        # NASA has higher probability at Kennedy Space Center
-        customer_probs.append([0.6, 0.1, 0.1, 0.05, 0.1, 0.03, 0.02])
-    elif 'CCAFS' in site:
-        # NASA has medium probability at Cape Canaveral
-        customer_probs.append([0.4, 0.2, 0.2, 0.1, 0.05, 0.03, 0.02])
-    else:
-        # NASA has lower probability at other sites
-        customer_probs.append([0.2, 0.3, 0.3, 0.1, 0.05, 0.03, 0.02])
+@timed()
+def run_query(conn):
+    """Total the NASA payload mass and write nasa_payload_results.md"""
+    checkpoint('aggregate')
+    # Calculate total payload for NASA missions
+    # A handful of rows, so plain tuples rather than a DataFrame (and no pandas import)
+    totals = query_rows(conn, CUSTOMER_TOTALS_SQL, ('NASA',))[0]
+    total_nasa_payload = totals['TotalPayload']
+    nasa_launch_count = int(totals['LaunchCount'])
+    avg_nasa_payload = total_nasa_payload / nasa_launch_count if nasa_launch_count > 0 else 0
 
-launch_customers = [np.random.choice(customers, p=prob) for prob in customer_probs]
+    checkpoint('output')
+    # Print results
+    print("\nNASA Mission Payload Analysis:")
+    print("=============================")
+    print(f"Total NASA Launches: {nasa_launch_count}")
+    print(f"Total Payload Mass: {total_nasa_payload:.2f} kg")
+    print(f"Average Payload Mass: {avg_nasa_payload:.2f} kg per mission")
 
-# Create a DataFrame
-df = pd.DataFrame({
-    'FlightNumber': flight_numbers,
-    'Date': dates,
-    'LaunchSite': launches,
-    'PayloadMass': payloads,
-    'Success': success,
-    'Customer': launch_customers
-})
+    # Get the top 5 NASA missions by payload
+    top_nasa = query_rows(conn, CUSTOMER_TOP_PAYLOADS_SQL, ('NASA', 5))
+    print("\nTop 5 NASA Missions by Payload:")
+    print("==============================")
+    print(rows_to_string(top_nasa, ['FlightNumber', 'Date', 'LaunchSite', 'PayloadMass']))
 
-# Calculate total payload for NASA missions
-nasa_launches = df[df['Customer'] == 'NASA']
-total_nasa_payload = nasa_launches['PayloadMass'].sum()
-nasa_launch_count = len(nasa_launches)
-avg_nasa_payload = total_nasa_payload / nasa_launch_count if nasa_launch_count > 0 else 0
+    # Save results to a file
+    with open('nasa_payload_results.md', 'w') as f:
+        f.write("# NASA Payload Analysis for SpaceX Missions\n\n")
+        
+        f.write("## Overall NASA Mission Statistics\n\n")
+        f.write(f"- **Total NASA Launches**: {nasa_launch_count}\n")
+        f.write(f"- **Total Payload Mass**: {total_nasa_payload:.2f} kg\n")
+        f.write(f"- **Average Payload Mass**: {avg_nasa_payload:.2f} kg per mission\n\n")
+        
+        f.write("## Top 5 NASA Missions by Payload\n\n")
+        # Convert the rows to a markdown table
+        markdown_table = rows_to_markdown(top_nasa, ['FlightNumber', 'Date', 'LaunchSite', 'PayloadMass'])
+        f.write(markdown_table)
+        
+        f.write("\n\n## Explanation\n\n")
+        f.write("This analysis calculated the total payload mass carried by SpaceX boosters for NASA missions. ")
+        f.write("NASA is one of SpaceX's most important customers, primarily using Falcon 9 rockets for ISS resupply missions, ")
+        f.write("crew transport, and various scientific satellites. ")
+        f.write("The data shows that NASA typically launches from Kennedy Space Center (KSC) and Cape Canaveral (CCAFS), ")
+        f.write("with a wide range of payload masses depending on mission requirements. ")
+        f.write("The total payload mass carried for NASA represents a significant portion of SpaceX's overall launch capacity, ")
+        f.write("highlighting the important partnership between NASA and SpaceX in advancing space exploration and research.") 
 
-# Print results
-print("\nNASA Mission Payload Analysis:")
-print("=============================")
-print(f"Total NASA Launches: {nasa_launch_count}")
-print(f"Total Payload Mass: {total_nasa_payload:.2f} kg")
-print(f"Average Payload Mass: {avg_nasa_payload:.2f} kg per mission")
 
-# Get the top 5 NASA missions by payload
-top_nasa = nasa_launches.nlargest(5, 'PayloadMass')
-print("\nTop 5 NASA Missions by Payload:")
-print("==============================")
-print(top_nasa[['FlightNumber', 'Date', 'LaunchSite', 'PayloadMass']].to_string(index=False))
-
-# Save results to a file
-with open('nasa_payload_results.md', 'w') as f:
-    f.write("# NASA Payload Analysis for SpaceX Missions\n\n")
-    
-    f.write("## Overall NASA Mission Statistics\n\n")
-    f.write(f"- **Total NASA Launches**: {nasa_launch_count}\n")
-    f.write(f"- **Total Payload Mass**: {total_nasa_payload:.2f} kg\n")
-    f.write(f"- **Average Payload Mass**: {avg_nasa_payload:.2f} kg per mission\n\n")
-    
-    f.write("## Top 5 NASA Missions by Payload\n\n")
-    # Convert DataFrame to markdown table
-    markdown_table = top_nasa[['FlightNumber', 'Date', 'LaunchSite', 'PayloadMass']].to_markdown(index=False)
-    f.write(markdown_table)
-    
-    f.write("\n\n## Explanation\n\n")
-    f.write("This analysis calculated the total payload mass carried by SpaceX boosters for NASA missions. ")
-    f.write("NASA is one of SpaceX's most important customers, primarily using Falcon 9 rockets for ISS resupply missions, ")
-    f.write("crew transport, and various scientific satellites. ")
-    f.write("The data shows that NASA typically launches from Kennedy Space Center (KSC) and Cape Canaveral (CCAFS), ")
-    f.write("with a wide range of payload masses depending on mission requirements. ")
-    f.write("The total payload mass carried for NASA represents a significant portion of SpaceX's overall launch capacity, ")
-    f.write("highlighting the important partnership between NASA and SpaceX in advancing space exploration and research.") 
\ No newline at end of file
+if __name__ == "__main__":
+    run_query(open_launch_db(**DATASET))
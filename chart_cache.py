@@ -0,0 +1,91 @@
+"""
+Content-Addressed Chart Cache
+
+Saves rendered figures under a hash of everything that decides their pixels:
+the plotting function's source, the arguments it is called with, the
+savefig options, the active matplotlib style (rcParams) and the matplotlib
+version. Asking for the same chart again copies the cached PNG into place
+instead of drawing it, and any change to the data, the plotting code or the
+style produces a new key, so stale images are never reused.
+
+pyplot is only imported when a chart actually has to be drawn, which keeps
+a fully cached run (e.g. a deck rebuild after a text-only edit) fast.
+"""
+
+import hashlib
+import inspect
+import os
+import shutil
+
+import joblib
+import matplotlib
+
+from instrumentation import timed
+
+# Where rendered charts are kept (override with SPACEX_CHART_CACHE)
+CACHE_DIR = os.environ.get('SPACEX_CHART_CACHE', '.chart_cache')
+
+# rcParams that select the GUI backend rather than how a saved figure looks
+_NON_STYLE_PARAMS = ('backend', 'backend_fallback', 'interactive')
+
+
+def _function_fingerprint(function):
+    # The source text when available, otherwise the compiled code
+    try:
+        source = inspect.getsource(function)
+    except (OSError, TypeError):
+        code = function.__code__
+        return hashlib.sha256(code.co_code + repr(code.co_consts).encode('utf-8')).hexdigest()
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def figure_key(function, args=(), kwargs=None, savefig_kwargs=None):
+    """Return the cache key for the figure function(*args, **kwargs) draws."""
+    return joblib.hash({
+        'source': _function_fingerprint(function),
+        'args': args,
+        'kwargs': kwargs or {},
+        'savefig': savefig_kwargs or {},
+        'style': sorted((name, repr(value)) for name, value in dict.items(matplotlib.rcParams)
+                        if name not in _NON_STYLE_PARAMS),
+        'matplotlib': matplotlib.__version__
+    })
+
+
+@timed()
+def cached_figure(path, function, *args, dpi=300, cache_dir=None, **kwargs):
+    """
+    Write the figure drawn by function(*args, **kwargs) to path, drawing it
+    only if the same figure is not already cached.
+
+    Args:
+        path (str): Where the PNG should end up
+        function (callable): Draws the chart and returns its Figure
+        *args, **kwargs: Plotting inputs, passed to function (and hashed)
+        dpi (int): Resolution passed to savefig
+        cache_dir (str, optional): Cache directory, defaults to CACHE_DIR
+
+    Returns:
+        bool: True if the PNG came from the cache, False if it was drawn
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    key = figure_key(function, args, kwargs, {'dpi': dpi})
+    cached_path = os.path.join(cache_dir, f"{key}.png")
+
+    hit = os.path.exists(cached_path)
+    if not hit:
+        import matplotlib.pyplot as plt
+
+        os.makedirs(cache_dir, exist_ok=True)
+        fig = function(*args, **kwargs)
+        tmp_path = f"{cached_path}.{os.getpid()}.tmp.png"
+        try:
+            fig.savefig(tmp_path, dpi=dpi)
+        finally:
+            plt.close(fig)
+        os.replace(tmp_path, cached_path)
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    shutil.copyfile(cached_path, path)
+    return hit
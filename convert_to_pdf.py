@@ -23,8 +23,12 @@ def main():
     
     print(f"Source file: {pptx_file}")
     print(f"Target PDF: {pdf_file}")
-    print("\nChoose a conversion method:")
-    
+    print("\nTo convert locally (one deck or a whole batch), run:")
+    print(f"python pptx_pdf.py {pptx_file}")
+    print("It uses a headless LibreOffice worker pool when soffice is installed")
+    print("and renders the slides directly with python-pptx otherwise.")
+    print("\nOther conversion methods:")
+
     # Method 1: Using LibreOffice (if installed)
     print("\nMethod 1: Using LibreOffice")
     print("This requires LibreOffice to be installed on your system.")
@@ -2,7 +2,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from instrumentation import checkpoint
 
+checkpoint('generate')
 # Create sample data
 np.random.seed(42)
 orbit_types = ['LEO', 'GTO', 'ISS', 'Polar', 'SSO', 'MEO', 'HEO', 'GEO']
@@ -34,6 +36,7 @@ df = pd.DataFrame({
     'Class': success
 })
 
+checkpoint('plot')
 # Create the plot with jitter to avoid overplotting
 plt.figure(figsize=(12, 8))
 ax = plt.subplot(111)
@@ -88,6 +91,7 @@ leg = ax.legend(handles=handles, loc='upper right', title='Orbit Types')
 
 # Adjust layout and save
 plt.tight_layout()
+checkpoint('output')
 plt.savefig('charts/flight_number_orbit_type.png', 
             dpi=300, 
             bbox_inches='tight',
@@ -1,7 +1,12 @@
-import pandas as pd
-import numpy as np
+import argparse
+import sys
+
 import matplotlib.pyplot as plt
 import seaborn as sns
+from instrumentation import checkpoint, timed
+from launch_cube import load_cube, load_synced_cube
+from launch_report import outcome_labels, write_rows
+from launch_store import load_launches, load_synced
 
 # Set styling for plots
 plt.style.use('ggplot')
@@ -18,43 +23,23 @@ launch_sites = {
     'Kwajalein Atoll': {'name': 'Kwajalein Atoll', 'lat': 9.0477, 'lon': 167.7431}
 }
 
-# Generate sample launch data
-def generate_launch_data(num_launches=200):
-    np.random.seed(42)  # For reproducibility
-    
-    flight_numbers = np.arange(1, num_launches + 1)
-    dates = pd.date_range(start='2010-06-04', end='2022-12-31', periods=num_launches)
-    
-    # Randomly assign launch sites with weighted probabilities
-    site_codes = list(launch_sites.keys())
-    site_probabilities = [0.35, 0.30, 0.20, 0.05, 0.05, 0.03, 0.02]
-    launch_site_codes = np.random.choice(site_codes, size=num_launches, p=site_probabilities)
-    
-    # Generate mission outcomes with improving success rates over time
-    mission_outcomes = []
-    for date in dates:
-        if date.year <= 2013:  # Early years
-            success_prob = 0.85
-        elif date.year <= 2016:  # Middle years
-            success_prob = 0.94
-        else:  # Recent years
-            success_prob = 0.98
-        
-        mission_outcomes.append(np.random.binomial(1, success_prob))
-    
-    # Create a DataFrame
-    df = pd.DataFrame({
-        'FlightNumber': flight_numbers,
-        'Date': dates,
-        'LaunchSite': launch_site_codes,
-        'MissionOutcome': mission_outcomes
-    })
-    
+parser = argparse.ArgumentParser(description="Dashboard of the launch site with the highest success rate")
+parser.add_argument('--source', help="Use launches synced from this source (see launch_sync.py) "
+                                     "instead of the sample data")
+args = parser.parse_args()
+
+
+def site_name(code):
+    # Synced sources may report sites this script has no name for
+    return launch_sites[code]['name'] if code in launch_sites else code
+
+
+def describe_launches(df):
     # Add site names for better readability
-    df['SiteName'] = df['LaunchSite'].apply(lambda x: launch_sites[x]['name'])
+    df['SiteName'] = df['LaunchSite'].map(site_name)
     
     # Add descriptive outcome
-    df['Outcome'] = df['MissionOutcome'].apply(lambda x: 'Success' if x == 1 else 'Failure')
+    df['Outcome'] = outcome_labels(df['MissionOutcome'])
     
     # Add year and month for time-based analysis
     df['Year'] = df['Date'].dt.year
@@ -62,12 +47,38 @@ def generate_launch_data(num_launches=200):
     
     return df
 
-# Generate data
-launches_df = generate_launch_data(200)
+# Generate sample launch data
+@timed()
+def generate_launch_data(num_launches=200):
+    # Sites by weighted draw, success rates improving over time (seed 42)
+    return describe_launches(load_launches(num_launches, seed=42, compat='site_outcomes'))
+
+checkpoint('generate')
+if args.source:
+    # Launches kept up to date by launch_sync.py
+    launches_df = load_synced(args.source)
+    if launches_df is None:
+        sys.exit(f"Nothing has been synced from '{args.source}' yet (run launch_sync.py --source {args.source})")
+    launches_df = describe_launches(launches_df)
+else:
+    # Generate data
+    launches_df = generate_launch_data(200)
+
+checkpoint('aggregate')
+if args.source:
+    # The synced cube, whose touched years each sync re-aggregates
+    launch_cube = load_synced_cube(args.source)
+else:
+    # Launch and success counts per site and year, aggregated once and cached
+    # next to the launch data
+    launch_cube = load_cube(200, seed=42, compat='site_outcomes')
 
 # Calculate success rates for each site
-success_by_site = launches_df[launches_df['MissionOutcome'] == 1].groupby('SiteName').size()
-total_by_site = launches_df.groupby('SiteName').size()
+site_stats = launch_cube.rollup('LaunchSite')
+site_codes = {site_name(code): code for code in site_stats.index}
+site_stats = site_stats.rename(index=site_name).sort_index()
+success_by_site = site_stats['Successes'][site_stats['Successes'] > 0]
+total_by_site = site_stats['Launches']
 success_rates = (success_by_site / total_by_site * 100)
 
 # Find the site with the highest success rate (that has more than 5 launches)
@@ -75,17 +86,18 @@ sites_with_min_launches = total_by_site[total_by_site >= 5].index
 if len(sites_with_min_launches) > 0:
     success_rates_filtered = success_rates[sites_with_min_launches]
     best_site = success_rates_filtered.idxmax()
-    best_site_code = next(code for code, info in launch_sites.items() if info['name'] == best_site)
+    best_site_code = site_codes[best_site]
     best_site_success_rate = success_rates_filtered.max()
 else:
     # Fallback if no site has at least 5 launches
     best_site = success_rates.idxmax()
-    best_site_code = next(code for code, info in launch_sites.items() if info['name'] == best_site)
+    best_site_code = site_codes[best_site]
     best_site_success_rate = success_rates.max()
 
 # Filter data for the best site
 best_site_data = launches_df[launches_df['SiteName'] == best_site]
 
+checkpoint('plot')
 # Create a figure for the dashboard
 plt.figure(figsize=(15, 10))
 plt.suptitle(f'Launch Performance: {best_site}', fontsize=20, fontweight='bold', y=0.98)
@@ -95,8 +107,8 @@ plt.subplot(2, 2, 1)
 
 # 1. Pie chart of success vs failure for this site
 labels = ['Success', 'Failure']
-success_count = len(best_site_data[best_site_data['MissionOutcome'] == 1])
-failure_count = len(best_site_data[best_site_data['MissionOutcome'] == 0])
+best_site_launches, success_count = launch_cube.totals(LaunchSite=best_site_code)
+failure_count = best_site_launches - success_count
 sizes = [success_count, failure_count]
 colors = ['green', 'red']
 explode = (0.1, 0)  # Explode the success slice
@@ -108,14 +120,10 @@ plt.title(f'Launch Outcomes at {best_site}', fontsize=14)
 
 # 2. Success rate over time (yearly)
 plt.subplot(2, 2, 2)
-yearly_stats = best_site_data.groupby('Year').agg(
-    success=('MissionOutcome', 'sum'),
-    total=('MissionOutcome', 'count')
-)
-yearly_stats['rate'] = yearly_stats['success'] / yearly_stats['total'] * 100
+yearly_stats = launch_cube.rollup('Year', LaunchSite=best_site_code)
 
 # Create a bar plot
-plt.bar(yearly_stats.index, yearly_stats['rate'], color='teal')
+plt.bar(yearly_stats.index, yearly_stats['SuccessRate'], color='teal')
 plt.axhline(y=best_site_success_rate, color='red', linestyle='-', linewidth=2, label=f'Overall Rate: {best_site_success_rate:.1f}%')
 plt.xlabel('Year')
 plt.ylabel('Success Rate (%)')
@@ -156,7 +164,7 @@ for bar in bars:
 # Add summary statistics in a text box
 textstr = f"Site: {best_site}\n"
 textstr += f"Success Rate: {best_site_success_rate:.1f}%\n"
-textstr += f"Total Launches: {len(best_site_data)}\n"
+textstr += f"Total Launches: {best_site_launches}\n"
 textstr += f"Successful Launches: {success_count}\n"
 textstr += f"Failed Launches: {failure_count}"
 
@@ -165,6 +173,7 @@ plt.figtext(0.5, 0.01, textstr, ha='center', fontsize=12, bbox=props)
 
 # Adjust layout and save
 plt.tight_layout(rect=[0, 0.05, 1, 0.95])
+checkpoint('output')
 plt.savefig('highest_success_site_dashboard.png', dpi=300, bbox_inches='tight')
 plt.close()
 
@@ -176,7 +185,7 @@ print("\nDetailed Statistics for Best Site:")
 print("=" * 60)
 print(f"Site: {best_site} (Code: {best_site_code})")
 print(f"Success Rate: {best_site_success_rate:.1f}%")
-print(f"Total Launches: {len(best_site_data)}")
+print(f"Total Launches: {best_site_launches}")
 print(f"Successful Launches: {success_count}")
 print(f"Failed Launches: {failure_count}")
 
@@ -186,12 +195,13 @@ print("-" * 60)
 print(f"{'Flight #':<10} {'Date':<15} {'Outcome':<10}")
 print("-" * 60)
 
-for _, launch in best_site_data.sort_values('Date').iterrows():
-    print(f"{launch['FlightNumber']:<10} {launch['Date'].strftime('%Y-%m-%d'):<15} {launch['Outcome']:<10}")
+launch_history = best_site_data.sort_values('Date')
+launch_history = launch_history.assign(LaunchDate=launch_history['Date'].dt.strftime('%Y-%m-%d'))
+write_rows(sys.stdout, launch_history, "{FlightNumber:<10} {LaunchDate:<15} {Outcome:<10}\n")
 
 # Calculate average launches per year for this site
-years_active = best_site_data['Year'].nunique()
-avg_launches_per_year = len(best_site_data) / years_active if years_active > 0 else 0
+years_active = len(yearly_stats)
+avg_launches_per_year = best_site_launches / years_active if years_active > 0 else 0
 
 print("\nAdditional Insights:")
 print("-" * 60)
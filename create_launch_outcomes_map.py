@@ -1,11 +1,46 @@
+"""
+SpaceX Launch Outcomes Map
+
+Plots launch outcomes at their launch sites on a Folium map, with successes
+and failures in separate toggleable layers and a per-site summary.
+
+Launches can be drawn in several ways, chosen with --mode:
+    markers  one CircleMarker per launch (the classic map, fine for small sets)
+    geojson  one GeoJSON layer per outcome, popups read from feature properties
+    cluster  a FastMarkerCluster per outcome, markers created in the browser
+             from a compact data array
+    sites    no per-launch markers, only the per-site aggregates
+    auto     markers up to MARKER_LIMIT launches; beyond that linked geojson
+             if --geojson-dir is given, otherwise sites
+
+--aggregate adds a layer with one marker per site sized by its launch count,
+computed server-side from the launch cube. --geojson-dir writes the GeoJSON
+layers to files next to the map and links them instead of embedding them, so
+the HTML stays the same size however many launches there are (serve the
+directory over HTTP to view it). geojson and cluster otherwise embed every
+launch in the HTML, so auto never picks them on their own above MARKER_LIMIT.
+
+Usage:
+    python create_launch_outcomes_map.py
+    python create_launch_outcomes_map.py --launches 100000 --mode cluster --aggregate
+    python create_launch_outcomes_map.py --launches 100000 --mode sites
+    python create_launch_outcomes_map.py --launches 100000 --geojson-dir layers
+"""
+
+import argparse
+import json
+import os
+import time
+
 import pandas as pd
 import numpy as np
 import folium
-from folium import Marker, Icon, LayerControl
-from folium.plugins import MarkerCluster
-
-# Reuse data generation code similar to previous scripts
-np.random.seed(42)
+from folium.plugins import FastMarkerCluster
+from instrumentation import checkpoint, timed
+from launch_cube import load_cube
+from launch_report import outcome_labels, render_lines
+from launch_store import load_launches
+from tile_cache import map_tiles
 
 # Create a list of all potential launch sites
 launch_sites = {
@@ -18,105 +53,27 @@ launch_sites = {
     'Kwajalein Atoll': {'name': 'Kwajalein Atoll Omelek Island', 'lat': 9.0477, 'lon': 167.7431}
 }
 
-# Generate sample launch data
-def generate_launch_data(num_launches=100):
-    flight_numbers = np.arange(1, num_launches + 1)
-    dates = pd.date_range(start='2010-06-04', end='2022-12-31', periods=num_launches)
-    
-    # Randomly assign launch sites
-    site_codes = list(launch_sites.keys())
-    site_probabilities = [0.35, 0.30, 0.20, 0.05, 0.05, 0.03, 0.02]  # Probability for each site
-    launch_site_codes = np.random.choice(site_codes, size=num_launches, p=site_probabilities)
-    
-    # Generate mission outcomes (success/failure) - success rate improves over time
-    mission_outcomes = []
-    for date in dates:
-        if date.year <= 2013:  # Early years
-            success_prob = 0.85
-        elif date.year <= 2016:  # Middle years
-            success_prob = 0.94
-        else:  # Recent years
-            success_prob = 0.98
-        
-        mission_outcomes.append(np.random.binomial(1, success_prob))
-    
-    # Create a DataFrame
-    df = pd.DataFrame({
-        'FlightNumber': flight_numbers,
-        'Date': dates,
-        'LaunchSite': launch_site_codes,
-        'MissionOutcome': mission_outcomes
-    })
-    
-    # Add site coordinates
-    df['Latitude'] = df['LaunchSite'].apply(lambda x: launch_sites[x]['lat'])
-    df['Longitude'] = df['LaunchSite'].apply(lambda x: launch_sites[x]['lon'])
-    df['SiteName'] = df['LaunchSite'].apply(lambda x: launch_sites[x]['name'])
-    
-    # Add a more descriptive outcome
-    df['Outcome'] = df['MissionOutcome'].apply(lambda x: 'Success' if x == 1 else 'Failure')
-    
-    return df
+MAP_MODES = ('auto', 'markers', 'geojson', 'cluster', 'sites')
 
-# Generate the launch data
-launches_df = generate_launch_data(100)
-
-# Create a Folium map centered on United States
-spacex_map = folium.Map(
-    location=[39.8283, -98.5795],  # Approximate center of the US
-    zoom_start=3,
-    tiles='CartoDB positron'  # Light background for better visibility of markers
-)
-
-# Create separate feature groups for successes and failures
-success_fg = folium.FeatureGroup(name='Successful Launches')
-failure_fg = folium.FeatureGroup(name='Failed Launches')
-
-# Add markers with color-coding based on mission outcome
-for idx, row in launches_df.iterrows():
-    # Choose icon color based on outcome
-    if row['Outcome'] == 'Success':
-        icon_color = 'green'
-        feature_group = success_fg
-    else:
-        icon_color = 'red'
-        feature_group = failure_fg
-    
-    # Create a customized popup with more information
-    popup_html = f"""
-    <b>Flight Number:</b> {row['FlightNumber']}<br>
-    <b>Date:</b> {row['Date'].strftime('%Y-%m-%d')}<br>
-    <b>Launch Site:</b> {row['SiteName']}<br>
-    <b>Outcome:</b> <span style='color:{icon_color};'>{row['Outcome']}</span>
+# Largest launch count drawn as individual CircleMarkers in auto mode
+MARKER_LIMIT = 1000
+
+OUTCOME_COLORS = {'Success': 'green', 'Failure': 'red'}
+OUTCOME_LAYERS = {'Success': 'Successful Launches', 'Failure': 'Failed Launches'}
+
+# Popup of a single launch, rendered a column at a time
+POPUP_TEMPLATE = """
+    <b>Flight Number:</b> {FlightNumber}<br>
+    <b>Date:</b> {Date:%Y-%m-%d}<br>
+    <b>Launch Site:</b> {SiteName}<br>
+    <b>Outcome:</b> <span style='color:{Color};'>{Outcome}</span>
     """
-    
-    # Add marker
-    folium.CircleMarker(
-        location=[row['Latitude'], row['Longitude']],
-        radius=5,
-        popup=folium.Popup(popup_html, max_width=300),
-        color=icon_color,
-        fill=True,
-        fill_color=icon_color,
-        fill_opacity=0.7,
-        weight=2
-    ).add_to(feature_group)
-
-# Add the feature groups to the map
-success_fg.add_to(spacex_map)
-failure_fg.add_to(spacex_map)
-
-# Add Layer control to toggle between success and failure
-folium.LayerControl().add_to(spacex_map)
-
-# Add a title
-title_html = '''
+
+TITLE_HTML = '''
 <h3 align="center" style="font-size:16px"><b>SpaceX Launch Success and Failure Map</b></h3>
 '''
-spacex_map.get_root().html.add_child(folium.Element(title_html))
 
-# Add a legend
-legend_html = '''
+LEGEND_HTML = '''
 <div style="position: fixed; 
             bottom: 50px; right: 50px; 
             border:2px solid grey; z-index:9999; font-size:14px;
@@ -126,31 +83,315 @@ legend_html = '''
     <p><i style="background:red;border-radius:50%;width:10px;height:10px;display:inline-block;"></i> Failed Launch</p>
 </div>
 '''
-spacex_map.get_root().html.add_child(folium.Element(legend_html))
-
-# Save the map to an HTML file
-spacex_map.save('spacex_launch_outcomes_map.html')
-
-print("Launch outcomes map created successfully! Open 'spacex_launch_outcomes_map.html' in a web browser to view.")
-print("\nLaunch Outcomes Summary:")
-print("=" * 50)
-success_count = len(launches_df[launches_df['Outcome'] == 'Success'])
-failure_count = len(launches_df[launches_df['Outcome'] == 'Failure'])
-print(f"Total Launches: {len(launches_df)}")
-print(f"Successful Launches: {success_count} ({success_count/len(launches_df)*100:.1f}%)")
-print(f"Failed Launches: {failure_count} ({failure_count/len(launches_df)*100:.1f}%)")
-
-# Launch site statistics
-print("\nLaunch Site Success Rates:")
-print("=" * 50)
-site_stats = launches_df.groupby('LaunchSite').agg(
-    total_launches=('FlightNumber', 'count'),
-    successful=('MissionOutcome', 'sum')
-)
-site_stats['success_rate'] = site_stats['successful'] / site_stats['total_launches'] * 100
-
-for site_code, row in site_stats.iterrows():
-    print(f"Site: {launch_sites[site_code]['name']} ({site_code})")
-    print(f"Total Launches: {row['total_launches']}")
-    print(f"Success Rate: {row['success_rate']:.1f}%")
-    print("-" * 30) 
\ No newline at end of file
+
+# Builds each clustered marker in the browser from a
+# [lat, lon, flight, date, site, outcome, color] row
+CLUSTER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 5, color: row[6], fillColor: row[6], fillOpacity: 0.7, weight: 2
+    });
+    marker.bindPopup(
+        '<b>Flight Number:</b> ' + row[2] + '<br>' +
+        '<b>Date:</b> ' + row[3] + '<br>' +
+        '<b>Launch Site:</b> ' + row[4] + '<br>' +
+        "<b>Outcome:</b> <span style='color:" + row[6] + ";'>" + row[5] + '</span>',
+        {maxWidth: 300});
+    return marker;
+}
+"""
+
+# Generate sample launch data
+@timed()
+def generate_launch_data(num_launches=100):
+    # Sites by weighted draw, success rates improving over time (seed 42)
+    df = load_launches(num_launches, seed=42, compat='site_outcomes')
+
+    # Add site coordinates, looked up once per site rather than per launch
+    sites = pd.DataFrame.from_dict(launch_sites, orient='index')
+    df['Latitude'] = sites['lat'].reindex(df['LaunchSite']).to_numpy()
+    df['Longitude'] = sites['lon'].reindex(df['LaunchSite']).to_numpy()
+    df['SiteName'] = sites['name'].reindex(df['LaunchSite']).to_numpy()
+
+    # Add a more descriptive outcome
+    df['Outcome'] = outcome_labels(df['MissionOutcome'])
+
+    return df
+
+def add_marker_layers(spacex_map, launches_df):
+    """Add one CircleMarker per launch, with its popup, to success/failure layers."""
+    colors = launches_df['Outcome'].map(OUTCOME_COLORS)
+    popups = render_lines(launches_df.assign(Color=colors), POPUP_TEMPLATE)
+    for outcome, layer_name in OUTCOME_LAYERS.items():
+        feature_group = folium.FeatureGroup(name=layer_name)
+        icon_color = OUTCOME_COLORS[outcome]
+        rows = np.flatnonzero((launches_df['Outcome'] == outcome).to_numpy())
+        latitudes = launches_df['Latitude'].to_numpy()
+        longitudes = launches_df['Longitude'].to_numpy()
+        for i in rows:
+            folium.CircleMarker(
+                location=[latitudes[i], longitudes[i]],
+                radius=5,
+                popup=folium.Popup(popups[i], max_width=300),
+                color=icon_color,
+                fill=True,
+                fill_color=icon_color,
+                fill_opacity=0.7,
+                weight=2
+            ).add_to(feature_group)
+        feature_group.add_to(spacex_map)
+
+def launches_geojson(launches_df):
+    """
+    Serialize launches as a GeoJSON FeatureCollection of points.
+
+    Args:
+        launches_df (pandas.DataFrame): Launches with Latitude, Longitude,
+            FlightNumber, Date, SiteName and Outcome columns
+
+    Returns:
+        dict: FeatureCollection whose features carry the popup fields as properties
+    """
+    coordinates = np.column_stack([launches_df['Longitude'].to_numpy(),
+                                   launches_df['Latitude'].to_numpy()]).tolist()
+    properties = pd.DataFrame({
+        'FlightNumber': launches_df['FlightNumber'].to_numpy(),
+        'Date': render_lines(launches_df, '{Date:%Y-%m-%d}'),
+        'SiteName': launches_df['SiteName'].to_numpy(),
+        'Outcome': launches_df['Outcome'].to_numpy()
+    }).to_dict('records')
+    return {
+        'type': 'FeatureCollection',
+        'features': [{'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': point},
+                      'properties': props}
+                     for point, props in zip(coordinates, properties)]
+    }
+
+def add_geojson_layers(spacex_map, launches_df, geojson_dir=None, map_dir='.'):
+    """
+    Add one GeoJSON layer per outcome.
+
+    Args:
+        spacex_map (folium.Map): Map to add the layers to
+        launches_df (pandas.DataFrame): Launches, as from generate_launch_data()
+        geojson_dir (str, optional): Write each layer to a .geojson file here
+            and link it from the map instead of embedding it
+        map_dir (str): Directory the map is saved in (links are relative to it)
+    """
+    for outcome, layer_name in OUTCOME_LAYERS.items():
+        icon_color = OUTCOME_COLORS[outcome]
+        data = launches_geojson(launches_df[launches_df['Outcome'] == outcome])
+        if geojson_dir:
+            path = os.path.join(geojson_dir, f"launches_{outcome.lower()}.geojson")
+            with open(path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            data, embed = path, False
+        else:
+            embed = True
+        layer = folium.GeoJson(
+            data,
+            name=layer_name,
+            embed=embed,
+            marker=folium.CircleMarker(radius=5, color=icon_color, fill=True, fill_color=icon_color,
+                                       fill_opacity=0.7, weight=2),
+            popup=folium.GeoJsonPopup(fields=['FlightNumber', 'Date', 'SiteName', 'Outcome'],
+                                      aliases=['Flight Number:', 'Date:', 'Launch Site:', 'Outcome:'],
+                                      max_width=300)
+        )
+        if not embed:
+            layer.embed_link = os.path.relpath(data, map_dir)
+        layer.add_to(spacex_map)
+
+def add_cluster_layers(spacex_map, launches_df):
+    """Add a FastMarkerCluster per outcome whose markers are built in the browser."""
+    dates = render_lines(launches_df, '{Date:%Y-%m-%d}')
+    for outcome, layer_name in OUTCOME_LAYERS.items():
+        mask = (launches_df['Outcome'] == outcome).to_numpy()
+        rows = launches_df[mask]
+        data = list(zip(rows['Latitude'].tolist(), rows['Longitude'].tolist(),
+                        rows['FlightNumber'].tolist(), dates[mask].tolist(),
+                        rows['SiteName'].tolist(), [outcome] * len(rows),
+                        [OUTCOME_COLORS[outcome]] * len(rows)))
+        FastMarkerCluster(data, callback=CLUSTER_CALLBACK, name=layer_name).add_to(spacex_map)
+
+def site_summaries(launch_cube):
+    """
+    One summary marker per launch site, from the aggregate cube.
+
+    Markers are sized by launch count and shaded from red (0% success) to
+    green (100%), so there is one per site whatever the number of launches.
+
+    Returns:
+        list: Dicts with site_code, lat, lon, radius (px), color and the
+        site's Launches, Successes and SuccessRate
+    """
+    site_stats = launch_cube.rollup('LaunchSite')
+    largest = site_stats['Launches'].max()
+    summaries = []
+    for site_code, row in site_stats.iterrows():
+        rate = row['SuccessRate'] / 100
+        summaries.append({
+            'site_code': site_code,
+            'lat': launch_sites[site_code]['lat'],
+            'lon': launch_sites[site_code]['lon'],
+            'radius': 8 + 22 * np.sqrt(row['Launches'] / largest),
+            'color': f"#{int(255 * (1 - rate)):02x}{int(160 * rate):02x}00",
+            'Launches': row['Launches'],
+            'Successes': row['Successes'],
+            'SuccessRate': row['SuccessRate']
+        })
+    return summaries
+
+def add_site_summary_layer(spacex_map, launch_cube):
+    """Add one marker per launch site summarizing its launches (see site_summaries())."""
+    feature_group = folium.FeatureGroup(name='Launch Site Summary')
+    for summary in site_summaries(launch_cube):
+        site_code = summary['site_code']
+        popup_html = f"""
+        <b>{launch_sites[site_code]['name']}</b> ({site_code})<br>
+        <b>Launches:</b> {summary['Launches']}<br>
+        <b>Successes:</b> {summary['Successes']}<br>
+        <b>Success Rate:</b> {summary['SuccessRate']:.1f}%
+        """
+        folium.CircleMarker(
+            location=[summary['lat'], summary['lon']],
+            radius=summary['radius'],
+            popup=folium.Popup(popup_html, max_width=300),
+            tooltip=f"{site_code}: {summary['SuccessRate']:.1f}% of {summary['Launches']}",
+            color=summary['color'],
+            fill=True,
+            fill_color=summary['color'],
+            fill_opacity=0.6,
+            weight=2
+        ).add_to(feature_group)
+    feature_group.add_to(spacex_map)
+
+@timed()
+def save_snapshot(path, launch_cube, offline=False):
+    """Render the per-site summary markers over cached tiles to a PNG."""
+    from map_snapshot import render_snapshot
+
+    markers = [{'lat': summary['lat'], 'lon': summary['lon'], 'radius': summary['radius'],
+                'color': summary['color'],
+                'label': f"{summary['site_code']}: {summary['SuccessRate']:.0f}% of {summary['Launches']}"}
+               for summary in site_summaries(launch_cube)]
+    render_snapshot(path, markers, source='CartoDB positron', title='SpaceX Launch Success and Failure Map',
+                    offline=offline)
+
+def build_map(launches_df, launch_cube, mode='auto', aggregate=False, geojson_dir=None, map_dir='.'):
+    """
+    Build the launch outcomes map.
+
+    Args:
+        launches_df (pandas.DataFrame): Launches, as from generate_launch_data()
+        launch_cube (launch_cube.LaunchCube): Aggregate cube of the same launches
+        mode (str): One of MAP_MODES
+        aggregate (bool): Also add the per-site summary layer
+        geojson_dir (str, optional): For geojson mode, link the layers from
+            files written here instead of embedding them
+        map_dir (str): Directory the map will be saved in
+
+    Returns:
+        folium.Map: The map
+    """
+    if mode not in MAP_MODES:
+        raise ValueError(f"Unknown map mode '{mode}' (choose from {', '.join(MAP_MODES)})")
+    if mode == 'auto':
+        # Past the marker limit only linked layers or the per-site summary
+        # keep the HTML from growing with the launch count
+        if len(launches_df) <= MARKER_LIMIT:
+            mode = 'markers'
+        else:
+            mode = 'geojson' if geojson_dir else 'sites'
+
+    # Create a Folium map centered on United States, on a light background
+    # for better visibility of markers (served from the local tile cache when
+    # SPACEX_TILE_SERVER is set)
+    spacex_map = folium.Map(
+        location=[39.8283, -98.5795],  # Approximate center of the US
+        zoom_start=3,
+        **map_tiles('CartoDB positron')
+    )
+
+    # Successes and failures go in separate layers
+    if mode == 'markers':
+        add_marker_layers(spacex_map, launches_df)
+    elif mode == 'geojson':
+        add_geojson_layers(spacex_map, launches_df, geojson_dir, map_dir)
+    elif mode == 'cluster':
+        add_cluster_layers(spacex_map, launches_df)
+    if aggregate or mode == 'sites':
+        add_site_summary_layer(spacex_map, launch_cube)
+
+    # Add Layer control to toggle between success and failure
+    folium.LayerControl().add_to(spacex_map)
+
+    # Add a title and a legend
+    spacex_map.get_root().html.add_child(folium.Element(TITLE_HTML))
+    spacex_map.get_root().html.add_child(folium.Element(LEGEND_HTML))
+    return spacex_map
+
+def print_summary(launch_cube):
+    print("\nLaunch Outcomes Summary:")
+    print("=" * 50)
+    total_launches, success_count = launch_cube.totals()
+    failure_count = total_launches - success_count
+    print(f"Total Launches: {total_launches}")
+    print(f"Successful Launches: {success_count} ({success_count/total_launches*100:.1f}%)")
+    print(f"Failed Launches: {failure_count} ({failure_count/total_launches*100:.1f}%)")
+
+    # Launch site statistics
+    print("\nLaunch Site Success Rates:")
+    print("=" * 50)
+    site_stats = launch_cube.rollup('LaunchSite').rename(columns={
+        'Launches': 'total_launches',
+        'Successes': 'successful',
+        'SuccessRate': 'success_rate'
+    })
+
+    for site_code, row in site_stats.iterrows():
+        print(f"Site: {launch_sites[site_code]['name']} ({site_code})")
+        print(f"Total Launches: {row['total_launches']}")
+        print(f"Success Rate: {row['success_rate']:.1f}%")
+        print("-" * 30)
+
+@timed()
+def main():
+    parser = argparse.ArgumentParser(description="Create the SpaceX launch outcomes map")
+    parser.add_argument('--launches', type=int, default=100, help="Number of launches (default: 100)")
+    parser.add_argument('--mode', choices=MAP_MODES, default='auto', help="How launches are drawn (default: auto)")
+    parser.add_argument('--aggregate', action='store_true', help="Add a per-site summary layer")
+    parser.add_argument('--geojson-dir', help="Link the geojson layers from files here instead of embedding them")
+    parser.add_argument('--output', default='spacex_launch_outcomes_map.html', help="Map HTML file")
+    parser.add_argument('--snapshot', help="Also render the per-site summary to this PNG over cached tiles")
+    parser.add_argument('--offline', action='store_true', help="Only use cached tiles for the snapshot")
+    parser.add_argument('--timing', action='store_true', help="Print the map build time and HTML size")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    # Generate the launch data; launch and success counts per site are
+    # aggregated once and cached next to it
+    checkpoint('generate')
+    launches_df = generate_launch_data(args.launches)
+    checkpoint('aggregate')
+    launch_cube = load_cube(args.launches, seed=42, compat='site_outcomes')
+    if args.geojson_dir:
+        os.makedirs(args.geojson_dir, exist_ok=True)
+
+    # Save the map to an HTML file
+    checkpoint('plot')
+    spacex_map = build_map(launches_df, launch_cube, args.mode, args.aggregate, args.geojson_dir,
+                           os.path.dirname(args.output) or '.')
+    checkpoint('output')
+    spacex_map.save(args.output)
+    elapsed = time.perf_counter() - start
+
+    if args.snapshot:
+        save_snapshot(args.snapshot, launch_cube, args.offline)
+    print(f"Launch outcomes map created successfully! Open '{args.output}' in a web browser to view.")
+    if args.timing:
+        print(f"Built in {elapsed:.2f}s, {os.path.getsize(args.output) / 1024:.0f} KB of HTML")
+    print_summary(launch_cube)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,30 @@
+"""
+Launch Site Proximity Maps
+
+Maps the points of interest around launch sites (coastline, highways,
+facilities, landing zones) with their great-circle distances. Distances for
+every site come from one vectorized query per feature type against the
+proximity engine's KD-tree, so whole coastline or highway vertex sets can be
+loaded with --features and every launch site is mapped in one run.
+
+Usage:
+    python create_launch_site_proximity_map.py                    # KSC LC-39A
+    python create_launch_site_proximity_map.py --site "VAFB SLC-4E"
+    python create_launch_site_proximity_map.py --all-sites --features coastline.csv --nearest 5 --radius 50
+"""
+
+import argparse
+import os
+import re
+
 import pandas as pd
 import numpy as np
 import folium
 from folium import Marker, Icon, LayerControl, PolyLine
 from folium.plugins import MeasureControl
-import math
+from instrumentation import checkpoint, timed
+from proximity import KM_TO_MI, ProximityIndex
+from tile_cache import map_tiles
 
 # Reuse launch sites from our previous scripts
 launch_sites = {
@@ -16,30 +37,6 @@ launch_sites = {
     'Kwajalein Atoll': {'name': 'Kwajalein Atoll Omelek Island', 'lat': 9.0477, 'lon': 167.7431}
 }
 
-# For this example, we'll focus on Kennedy Space Center Launch Complex 39A
-selected_site_code = 'KSC LC-39A'
-selected_site = launch_sites[selected_site_code]
-
-# Function to calculate distance between two points using Haversine formula
-def calculate_distance(lat1, lon1, lat2, lon2):
-    # Convert latitude and longitude from degrees to radians
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
-    
-    # Haversine formula
-    dlon = lon2_rad - lon1_rad
-    dlat = lat2_rad - lat1_rad
-    a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    radius = 6371  # Radius of the Earth in kilometers
-    
-    # Calculate the distance
-    distance = radius * c
-    
-    return distance
-
 # Create points of interest around KSC LC-39A
 points_of_interest = {
     'Atlantic Ocean Coastline': {'lat': 28.6070, 'lon': -80.5772, 'type': 'Coastline'},
@@ -50,95 +47,137 @@ points_of_interest = {
     'Launch Control Center': {'lat': 28.5817, 'lon': -80.6483, 'type': 'Facility'}
 }
 
-# Calculate distances from the selected launch site to all points of interest
-for name, point in points_of_interest.items():
-    distance = calculate_distance(
-        selected_site['lat'], selected_site['lon'],
-        point['lat'], point['lon']
+
+# Marker icon, color and layer name for each point type
+POI_STYLES = {
+    'Coastline': {'icon': 'water', 'color': 'blue', 'layer': 'Coastline'},
+    'Highway': {'icon': 'road', 'color': 'gray', 'layer': 'Highways'},
+    'Facility': {'icon': 'building', 'color': 'orange', 'layer': 'Facilities'},
+    'Landing Site': {'icon': 'crosshairs', 'color': 'green', 'layer': 'Landing Sites'}
+}
+OTHER_POI_STYLE = {'icon': 'info', 'color': 'purple'}
+
+# Nearest points of each type shown per site, and how far to look for them
+DEFAULT_NEAREST = 3
+DEFAULT_RADIUS_KM = 25
+
+# Map written for a single site
+DEFAULT_OUTPUT = 'launch_site_proximity_map.html'
+
+def load_features(path=None):
+    """
+    Points of interest as a table, optionally extended from a CSV file.
+
+    Args:
+        path (str, optional): CSV with lat, lon and type columns (and an
+            optional name column), e.g. coastline or highway vertices
+
+    Returns:
+        pandas.DataFrame: name, type, lat and lon of every point
+    """
+    features = pd.DataFrame.from_dict(points_of_interest, orient='index').rename_axis('name').reset_index()
+    if path:
+        extra = pd.read_csv(path)
+        if 'name' not in extra.columns:
+            extra['name'] = extra['type'] + ' ' + (extra.index + 1).astype(str)
+        features = pd.concat([features, extra[['name', 'type', 'lat', 'lon']]], ignore_index=True)
+    return features[['name', 'type', 'lat', 'lon']]
+
+def nearby_features(features, site_codes, nearest=DEFAULT_NEAREST, radius_km=DEFAULT_RADIUS_KM):
+    """
+    The nearest points of each type around each launch site.
+
+    Every type gets one spatial index and one query covering all the sites.
+
+    Args:
+        features (pandas.DataFrame): Points, as from load_features()
+        site_codes (list): Launch site codes
+        nearest (int): Points of each type to keep per site
+        radius_km (float): Ignore points farther than this
+
+    Returns:
+        dict: Site code -> DataFrame of its nearby points (in feature order)
+        with distance_km and distance_mi columns
+    """
+    site_lat = np.array([launch_sites[code]['lat'] for code in site_codes])
+    site_lon = np.array([launch_sites[code]['lon'] for code in site_codes])
+    found = {code: [] for code in site_codes}
+    for kind, points in features.groupby('type', sort=False):
+        index = ProximityIndex(points['lat'], points['lon'])
+        distances, positions = index.nearest(site_lat, site_lon, k=nearest, radius_km=radius_km)
+        for code, site_distances, site_positions in zip(site_codes, distances, positions):
+            keep = site_positions >= 0
+            rows = points.iloc[site_positions[keep]].assign(distance_km=site_distances[keep])
+            found[code].append(rows)
+
+    nearby = {}
+    for code, frames in found.items():
+        frame = pd.concat(frames).sort_index() if frames else features.iloc[:0].assign(distance_km=[])
+        nearby[code] = frame.assign(distance_mi=frame['distance_km'] * KM_TO_MI)  # Convert to miles
+    return nearby
+
+@timed()
+def build_site_map(site_code, nearby):
+    """Build the proximity map of one launch site and its nearby points."""
+    selected_site = launch_sites[site_code]
+
+    # Create a Folium map centered on the selected launch site
+    site_map = folium.Map(
+        location=[selected_site['lat'], selected_site['lon']],
+        zoom_start=12,
+        **map_tiles('CartoDB positron')
     )
-    point['distance_km'] = distance
-    point['distance_mi'] = distance * 0.621371  # Convert to miles
-
-# Create a Folium map centered on the selected launch site
-site_map = folium.Map(
-    location=[selected_site['lat'], selected_site['lon']],
-    zoom_start=12,
-    tiles='CartoDB positron'
-)
-
-# Add marker for the launch site
-folium.Marker(
-    location=[selected_site['lat'], selected_site['lon']],
-    popup=f"<b>{selected_site['name']}</b><br>Site code: {selected_site_code}",
-    icon=folium.Icon(icon='rocket', prefix='fa', color='blue')
-).add_to(site_map)
-
-# Create feature groups for different types of POIs
-coastline_fg = folium.FeatureGroup(name='Coastline')
-highway_fg = folium.FeatureGroup(name='Highways')
-facility_fg = folium.FeatureGroup(name='Facilities')
-landing_fg = folium.FeatureGroup(name='Landing Sites')
-
-# Add markers for points of interest with connection lines to the launch site
-for name, point in points_of_interest.items():
-    # Choose icon and color based on point type
-    if point['type'] == 'Coastline':
-        icon = folium.Icon(icon='water', prefix='fa', color='blue')
-        feature_group = coastline_fg
-        line_color = 'blue'
-    elif point['type'] == 'Highway':
-        icon = folium.Icon(icon='road', prefix='fa', color='gray')
-        feature_group = highway_fg
-        line_color = 'gray'
-    elif point['type'] == 'Facility':
-        icon = folium.Icon(icon='building', prefix='fa', color='orange')
-        feature_group = facility_fg
-        line_color = 'orange'
-    elif point['type'] == 'Landing Site':
-        icon = folium.Icon(icon='crosshairs', prefix='fa', color='green')
-        feature_group = landing_fg
-        line_color = 'green'
-    else:
-        icon = folium.Icon(icon='info', prefix='fa', color='purple')
-        feature_group = site_map
-        line_color = 'purple'
-    
-    # Add marker
+
+    # Add marker for the launch site
     folium.Marker(
-        location=[point['lat'], point['lon']],
-        popup=f"<b>{name}</b><br>Type: {point['type']}<br>Distance: {point['distance_km']:.2f} km ({point['distance_mi']:.2f} mi)",
-        icon=icon
-    ).add_to(feature_group)
-    
-    # Add line connecting to launch site with distance popup
-    folium.PolyLine(
-        locations=[[selected_site['lat'], selected_site['lon']], [point['lat'], point['lon']]],
-        color=line_color,
-        weight=2,
-        opacity=0.7,
-        popup=f"Distance: {point['distance_km']:.2f} km ({point['distance_mi']:.2f} mi)"
-    ).add_to(feature_group)
-
-# Add feature groups to map
-coastline_fg.add_to(site_map)
-highway_fg.add_to(site_map)
-facility_fg.add_to(site_map)
-landing_fg.add_to(site_map)
-
-# Add a measuring tool
-site_map.add_child(MeasureControl())
-
-# Add layer control
-folium.LayerControl().add_to(site_map)
-
-# Add a title
-title_html = f'''
+        location=[selected_site['lat'], selected_site['lon']],
+        popup=f"<b>{selected_site['name']}</b><br>Site code: {site_code}",
+        icon=folium.Icon(icon='rocket', prefix='fa', color='blue')
+    ).add_to(site_map)
+
+    # Create feature groups for the known types of POIs (others go straight on the map)
+    feature_groups = {kind: folium.FeatureGroup(name=style['layer']) for kind, style in POI_STYLES.items()}
+
+    # Add markers for points of interest with connection lines to the launch site
+    for point in nearby.itertuples(index=False):
+        style = POI_STYLES.get(point.type, OTHER_POI_STYLE)
+        feature_group = feature_groups.get(point.type, site_map)
+        icon = folium.Icon(icon=style['icon'], prefix='fa', color=style['color'])
+
+        # Add marker
+        folium.Marker(
+            location=[point.lat, point.lon],
+            popup=f"<b>{point.name}</b><br>Type: {point.type}<br>Distance: {point.distance_km:.2f} km ({point.distance_mi:.2f} mi)",
+            icon=icon
+        ).add_to(feature_group)
+
+        # Add line connecting to launch site with distance popup
+        folium.PolyLine(
+            locations=[[selected_site['lat'], selected_site['lon']], [point.lat, point.lon]],
+            color=style['color'],
+            weight=2,
+            opacity=0.7,
+            popup=f"Distance: {point.distance_km:.2f} km ({point.distance_mi:.2f} mi)"
+        ).add_to(feature_group)
+
+    # Add feature groups to map
+    for feature_group in feature_groups.values():
+        feature_group.add_to(site_map)
+
+    # Add a measuring tool
+    site_map.add_child(MeasureControl())
+
+    # Add layer control
+    folium.LayerControl().add_to(site_map)
+
+    # Add a title
+    title_html = f'''
 <h3 align="center" style="font-size:16px"><b>{selected_site['name']} Proximity Analysis</b></h3>
 '''
-site_map.get_root().html.add_child(folium.Element(title_html))
+    site_map.get_root().html.add_child(folium.Element(title_html))
 
-# Add a legend
-legend_html = '''
+    # Add a legend
+    legend_html = '''
 <div style="position: fixed; 
             bottom: 50px; right: 50px; 
             border:2px solid grey; z-index:9999; font-size:14px;
@@ -151,24 +190,89 @@ legend_html = '''
     <p><i class="fa fa-crosshairs fa-1x" style="color:green"></i> Landing Site</p>
 </div>
 '''
-site_map.get_root().html.add_child(folium.Element(legend_html))
+    site_map.get_root().html.add_child(folium.Element(legend_html))
+    return site_map
+
+@timed()
+def save_site_snapshot(path, site_code, nearby, offline=False):
+    """Render a site, its nearby points and the lines between them to a PNG over cached tiles."""
+    from map_snapshot import render_snapshot
+
+    site = launch_sites[site_code]
+    markers = [{'lat': site['lat'], 'lon': site['lon'], 'color': 'blue', 'radius': 9, 'label': site_code}]
+    lines = []
+    for point in nearby.itertuples(index=False):
+        color = POI_STYLES.get(point.type, OTHER_POI_STYLE)['color']
+        markers.append({'lat': point.lat, 'lon': point.lon, 'color': color,
+                        'label': f"{point.name} ({point.distance_km:.2f} km)"})
+        lines.append({'points': [(site['lat'], site['lon']), (point.lat, point.lon)], 'color': color})
+    render_snapshot(path, markers, lines, source='CartoDB positron',
+                    title=f"{site['name']} Proximity Analysis", offline=offline)
 
-# Save the map to an HTML file
-site_map.save('launch_site_proximity_map.html')
+def print_site_report(site_code, nearby):
+    # Print information about the selected site
+    selected_site = launch_sites[site_code]
+    print(f"Launch Site Proximity Analysis: {selected_site['name']}")
+    print("=" * 70)
+    print(f"Site Location: {selected_site['lat']}, {selected_site['lon']}")
+    print("\nNearby Points of Interest:")
+    print("-" * 70)
+    print(f"{'Point of Interest':<35} {'Type':<15} {'Distance (km)':<15} {'Distance (mi)':<15}")
+    print("-" * 70)
 
-# Print information about the selected site
-print(f"Launch Site Proximity Analysis: {selected_site['name']}")
-print("=" * 70)
-print(f"Site Location: {selected_site['lat']}, {selected_site['lon']}")
-print("\nNearby Points of Interest:")
-print("-" * 70)
-print(f"{'Point of Interest':<35} {'Type':<15} {'Distance (km)':<15} {'Distance (mi)':<15}")
-print("-" * 70)
+    # Sort points of interest by distance
+    for point in nearby.sort_values('distance_km', kind='stable').itertuples(index=False):
+        print(f"{point.name:<35} {point.type:<15} {point.distance_km:<15.2f} {point.distance_mi:<15.2f}")
 
-# Sort points of interest by distance
-sorted_poi = sorted(points_of_interest.items(), key=lambda x: x[1]['distance_km'])
+def site_map_path(site_code, output_dir):
+    """Return the map file of a launch site inside output_dir."""
+    slug = re.sub(r'[^a-z0-9]+', '_', site_code.lower()).strip('_')
+    return os.path.join(output_dir, f"{slug}_proximity_map.html")
 
-for name, point in sorted_poi:
-    print(f"{name:<35} {point['type']:<15} {point['distance_km']:<15.2f} {point['distance_mi']:<15.2f}")
+@timed()
+def main():
+    parser = argparse.ArgumentParser(description="Create launch site proximity maps")
+    parser.add_argument('--site', default='KSC LC-39A', choices=list(launch_sites), help="Site to map (default: KSC LC-39A)")
+    parser.add_argument('--all-sites', action='store_true', help="Map every launch site")
+    parser.add_argument('--features', help="CSV of extra points (lat, lon, type, optional name)")
+    parser.add_argument('--nearest', type=int, default=DEFAULT_NEAREST, help="Points of each type per site")
+    parser.add_argument('--radius', type=float, default=DEFAULT_RADIUS_KM, help="Search radius in km")
+    parser.add_argument('--snapshot', action='store_true', help="Also render each map to a PNG over cached tiles")
+    parser.add_argument('--offline', action='store_true', help="Only use cached tiles for snapshots")
+    parser.add_argument('--output-dir', default='proximity_maps', help="Where --all-sites writes its maps")
+    args = parser.parse_args()
+
+    site_codes = list(launch_sites) if args.all_sites else [args.site]
+    checkpoint('generate')
+    features = load_features(args.features)
+    checkpoint('aggregate')
+    nearby = nearby_features(features, site_codes, args.nearest, args.radius)
+
+    checkpoint('plot')
+    for i, site_code in enumerate(site_codes):
+        if args.all_sites:
+            os.makedirs(args.output_dir, exist_ok=True)
+            output = site_map_path(site_code, args.output_dir)
+        else:
+            output = DEFAULT_OUTPUT
+        # Save the map to an HTML file
+        build_site_map(site_code, nearby[site_code]).save(output)
+        if args.snapshot:
+            save_site_snapshot(os.path.splitext(output)[0] + '.png', site_code, nearby[site_code], args.offline)
+        if i:
+            print()
+        print_site_report(site_code, nearby[site_code])
+
+    if args.all_sites:
+        # Nearest point of each type per site, in km
+        nearest_km = pd.DataFrame({code: frame.groupby('type')['distance_km'].min()
+                                   for code, frame in nearby.items()}).T.reindex(site_codes)
+        print(f"\nNearest Point of Each Type (km, within {args.radius:g} km):")
+        print("=" * 70)
+        print(nearest_km.round(2).to_string(na_rep='-'))
+        print(f"\nNote: Open the maps in '{args.output_dir}' in a web browser to view them.")
+    else:
+        print(f"\nNote: Open '{DEFAULT_OUTPUT}' in a web browser to view the interactive map.")
 
-print("\nNote: Open 'launch_site_proximity_map.html' in a web browser to view the interactive map.") 
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
+import argparse
+
 import pandas as pd
 import numpy as np
 import folium
 from folium import Marker, Icon
+from instrumentation import checkpoint
+from tile_cache import map_tiles
 
 # Reuse launch sites from our previous scripts
 launch_sites = {
@@ -14,11 +18,18 @@ launch_sites = {
     'Kwajalein Atoll': {'name': 'Kwajalein Atoll Omelek Island', 'lat': 9.0477, 'lon': 167.7431}
 }
 
-# Create a folium map centered on United States
+parser = argparse.ArgumentParser(description="Create the SpaceX launch sites map")
+parser.add_argument('--snapshot', help="Also render the map to this PNG over cached tiles")
+parser.add_argument('--offline', action='store_true', help="Only use cached tiles for the snapshot")
+args = parser.parse_args()
+
+checkpoint('plot')
+# Create a folium map centered on United States (tiles from the local
+# tile server when SPACEX_TILE_SERVER is set)
 spacex_map = folium.Map(
     location=[39.8283, -98.5795],  # Approximate center of the US
     zoom_start=3,
-    tiles='OpenStreetMap'
+    **map_tiles('OpenStreetMap')
 )
 
 # Add markers for each launch site
@@ -56,6 +67,7 @@ legend_html = '''
 '''
 spacex_map.get_root().html.add_child(folium.Element(legend_html))
 
+checkpoint('output')
 # Save the map to an HTML file
 spacex_map.save('spacex_launch_sites_map.html')
 
@@ -65,4 +77,14 @@ print("=" * 50)
 for site_code, site_info in launch_sites.items():
     print(f"Site: {site_info['name']} ({site_code})")
     print(f"Location: {site_info['lat']}, {site_info['lon']}")
-    print("-" * 30) 
\ No newline at end of file
+    print("-" * 30) 
+
+# Static PNG of the same markers, e.g. for the slide deck
+if args.snapshot:
+    from map_snapshot import render_snapshot
+
+    markers = [{'lat': site_info['lat'], 'lon': site_info['lon'], 'color': '#005288', 'label': site_code}
+               for site_code, site_info in launch_sites.items()]
+    render_snapshot(args.snapshot, markers, source='OpenStreetMap', title='SpaceX Launch Sites Worldwide',
+                    offline=args.offline)
+    print(f"\nSnapshot saved to {args.snapshot}")
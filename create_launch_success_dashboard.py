@@ -1,8 +1,13 @@
+import sys
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.gridspec import GridSpec
+from instrumentation import checkpoint
+from launch_cube import load_cube
+from launch_report import write_rows
 
 # Set styling for plots
 plt.style.use('ggplot')
@@ -19,49 +24,13 @@ launch_sites = {
     'Kwajalein Atoll': {'name': 'Kwajalein Atoll', 'lat': 9.0477, 'lon': 167.7431}
 }
 
-# Generate sample launch data
-def generate_launch_data(num_launches=200):
-    np.random.seed(42)  # For reproducibility
-    
-    flight_numbers = np.arange(1, num_launches + 1)
-    dates = pd.date_range(start='2010-06-04', end='2022-12-31', periods=num_launches)
-    
-    # Randomly assign launch sites with weighted probabilities
-    site_codes = list(launch_sites.keys())
-    site_probabilities = [0.35, 0.30, 0.20, 0.05, 0.05, 0.03, 0.02]
-    launch_site_codes = np.random.choice(site_codes, size=num_launches, p=site_probabilities)
-    
-    # Generate mission outcomes with improving success rates over time
-    mission_outcomes = []
-    for date in dates:
-        if date.year <= 2013:  # Early years
-            success_prob = 0.85
-        elif date.year <= 2016:  # Middle years
-            success_prob = 0.94
-        else:  # Recent years
-            success_prob = 0.98
-        
-        mission_outcomes.append(np.random.binomial(1, success_prob))
-    
-    # Create a DataFrame
-    df = pd.DataFrame({
-        'FlightNumber': flight_numbers,
-        'Date': dates,
-        'LaunchSite': launch_site_codes,
-        'MissionOutcome': mission_outcomes
-    })
-    
-    # Add site names for better readability
-    df['SiteName'] = df['LaunchSite'].apply(lambda x: launch_sites[x]['name'])
-    
-    # Add descriptive outcome
-    df['Outcome'] = df['MissionOutcome'].apply(lambda x: 'Success' if x == 1 else 'Failure')
-    
-    return df
-
-# Generate data
-launches_df = generate_launch_data(200)
+checkpoint('aggregate')
+# Launch and success counts per site and year for the sample launch data
+# (weighted site draw, success rates improving over time), aggregated once
+# and cached next to the launch data
+launch_cube = load_cube(200, seed=42, compat='site_outcomes')
 
+checkpoint('plot')
 # Create a figure for the dashboard
 plt.figure(figsize=(15, 10))
 plt.suptitle('SpaceX Launch Success Dashboard', fontsize=20, fontweight='bold', y=0.98)
@@ -71,8 +40,9 @@ gs = GridSpec(2, 2, height_ratios=[1, 1])
 
 # 1. Pie chart of successful launches by site
 ax1 = plt.subplot(gs[0, 0])
-success_by_site = launches_df[launches_df['MissionOutcome'] == 1].groupby('SiteName').size()
-total_by_site = launches_df.groupby('SiteName').size()
+site_stats = launch_cube.rollup('LaunchSite').rename(index=lambda x: launch_sites[x]['name']).sort_index()
+success_by_site = site_stats['Successes'][site_stats['Successes'] > 0]
+total_by_site = site_stats['Launches']
 
 # Calculate percentages for labels
 success_percentages = {}
@@ -107,10 +77,13 @@ ax2.grid(axis='y', linestyle='--', alpha=0.7)
 
 # 3. Time series of launches showing success trend
 ax3 = plt.subplot(gs[1, :])
-launches_df['Year'] = launches_df['Date'].dt.year
-yearly_data = launches_df.groupby(['Year', 'Outcome']).size().unstack().fillna(0)
+yearly_stats = launch_cube.rollup('Year')
+yearly_data = pd.DataFrame({
+    'Failure': yearly_stats['Launches'] - yearly_stats['Successes'],
+    'Success': yearly_stats['Successes']
+})
 
-if 'Success' in yearly_data.columns and 'Failure' in yearly_data.columns:
+if yearly_data['Success'].any() and yearly_data['Failure'].any():
     yearly_data['Total'] = yearly_data['Success'] + yearly_data['Failure']
     yearly_data['SuccessRate'] = yearly_data['Success'] / yearly_data['Total'] * 100
     
@@ -134,8 +107,7 @@ if 'Success' in yearly_data.columns and 'Failure' in yearly_data.columns:
     ax3.grid(axis='y', linestyle='--', alpha=0.7)
 
 # Add an overall success rate text box
-total_success = len(launches_df[launches_df['MissionOutcome'] == 1])
-total_launches = len(launches_df)
+total_launches, total_success = launch_cube.totals()
 success_rate = total_success / total_launches * 100
 
 textstr = f'Overall Success Rate: {success_rate:.1f}%\n'
@@ -147,6 +119,7 @@ plt.figtext(0.5, 0.01, textstr, ha='center', fontsize=12, bbox=props)
 
 # Adjust layout and save
 plt.tight_layout(rect=[0, 0.03, 1, 0.95])
+checkpoint('output')
 plt.savefig('spacex_launch_success_dashboard.png', dpi=300, bbox_inches='tight')
 plt.close()
 
@@ -159,15 +132,12 @@ print("=" * 50)
 print(f"{'Launch Site':<25} {'Success':<10} {'Total':<10} {'Rate (%)':<10}")
 print("-" * 50)
 
-for site in total_by_site.index:
-    if site in success_by_site:
-        success_count = success_by_site[site]
-    else:
-        success_count = 0
-    
-    total_count = total_by_site[site]
-    rate = (success_count / total_count) * 100
-    
-    print(f"{site:<25} {success_count:<10d} {total_count:<10d} {rate:<10.1f}")
+site_summary = pd.DataFrame({
+    'Site': total_by_site.index,
+    'Success': success_by_site.reindex(total_by_site.index, fill_value=0).to_numpy(),
+    'Total': total_by_site.to_numpy()
+})
+site_summary['Rate'] = site_summary['Success'] / site_summary['Total'] * 100
+write_rows(sys.stdout, site_summary, "{Site:<25} {Success:<10d} {Total:<10d} {Rate:<10.1f}\n")
 
 print("\nOverall Success Rate: {:.1f}%".format(success_rate)) 
\ No newline at end of file
@@ -2,7 +2,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from instrumentation import checkpoint
 
+checkpoint('generate')
 # Create sample data
 np.random.seed(42)
 orbit_types = ['LEO', 'GTO', 'ISS', 'Polar', 'SSO', 'MEO', 'HEO', 'GEO']
@@ -16,9 +18,11 @@ df = pd.DataFrame({
     'SuccessRate': success_rates
 })
 
+checkpoint('aggregate')
 # Sort by success rate
 df = df.sort_values('SuccessRate', ascending=False)
 
+checkpoint('plot')
 # Create the plot
 plt.figure(figsize=(12, 8))
 bars = plt.bar(df['OrbitType'], df['SuccessRate'], 
@@ -42,6 +46,7 @@ plt.grid(True, alpha=0.3, axis='y')
 plt.xticks(rotation=45, ha='right')
 plt.tight_layout()
 
+checkpoint('output')
 # Save the plot
 plt.savefig('charts/orbit_type_success.png', 
             dpi=300, 
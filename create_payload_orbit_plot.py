@@ -2,7 +2,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from instrumentation import checkpoint
 
+checkpoint('generate')
 # Create sample data
 np.random.seed(42)
 orbit_types = ['LEO', 'GTO', 'ISS', 'Polar', 'SSO', 'MEO', 'HEO', 'GEO']
@@ -53,6 +55,7 @@ df = pd.DataFrame({
     'Class': success_list
 })
 
+checkpoint('plot')
 # Create the plot
 plt.figure(figsize=(12, 8))
 ax = plt.subplot(111)
@@ -107,6 +110,7 @@ leg = ax.legend(handles=handles, loc='upper right', title='Orbit Types')
 
 # Adjust layout and save
 plt.tight_layout()
+checkpoint('output')
 plt.savefig('charts/payload_mass_orbit_type.png', 
             dpi=300, 
             bbox_inches='tight',
@@ -2,7 +2,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from instrumentation import checkpoint
 
+checkpoint('generate')
 # Create sample data
 np.random.seed(42)
 launch_sites = ['KSC LC-39A', 'CCAFS SLC-40', 'VAFB SLC-4E']
@@ -18,6 +20,7 @@ df = pd.DataFrame({
     'Class': success
 })
 
+checkpoint('plot')
 # Create the plot
 plt.figure(figsize=(12, 8))
 sns.scatterplot(data=df, x='PayloadMass', y='LaunchSite', 
@@ -37,6 +40,7 @@ plt.legend(title='Landing Success',
 
 # Adjust layout and save
 plt.tight_layout()
+checkpoint('output')
 plt.savefig('charts/payload_mass_launch_site.png', 
             dpi=300, 
             bbox_inches='tight',
@@ -1,136 +1,34 @@
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import os
+from chart_cache import cached_figure
+from instrumentation import checkpoint
+from deck_builder import build_deck, load_spec
 
-# Function to add a title slide
-def add_title_slide(prs, title, subtitle=None):
-    slide_layout = prs.slide_layouts[0]  # Title slide layout
-    slide = prs.slides.add_slide(slide_layout)
-    
-    # Set title
-    title_shape = slide.shapes.title
-    title_shape.text = title
-    title_shape.text_frame.paragraphs[0].font.size = Pt(44)
-    title_shape.text_frame.paragraphs[0].font.bold = True
-    title_shape.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-    
-    # Set subtitle if provided
-    if subtitle:
-        subtitle_shape = slide.placeholders[1]
-        subtitle_shape.text = subtitle
-        subtitle_shape.text_frame.paragraphs[0].font.size = Pt(28)
-        subtitle_shape.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-    
-    return slide
-
-# Function to add a content slide
-def add_content_slide(prs, title, content_list=None, image_path=None):
-    slide_layout = prs.slide_layouts[1]  # Content slide layout
-    slide = prs.slides.add_slide(slide_layout)
-    
-    # Set title
-    title_shape = slide.shapes.title
-    title_shape.text = title
-    title_shape.text_frame.paragraphs[0].font.size = Pt(36)
-    title_shape.text_frame.paragraphs[0].font.bold = True
-    
-    # Add content if provided
-    if content_list:
-        content_shape = slide.placeholders[1]
-        tf = content_shape.text_frame
-        
-        for i, item in enumerate(content_list):
-            p = tf.add_paragraph() if i > 0 else tf.paragraphs[0]
-            p.text = f"• {item}"
-            p.font.size = Pt(24)
-    
-    # Add image if provided
-    if image_path and os.path.exists(image_path):
-        slide.shapes.add_picture(image_path, Inches(6), Inches(2), width=Inches(4))
-    
-    return slide
-
-# Function to add a slide with an image
-def add_image_slide(prs, title, image_path, caption=None):
-    slide_layout = prs.slide_layouts[5]  # Title and Content layout
-    slide = prs.slides.add_slide(slide_layout)
-    
-    # Set title
-    title_shape = slide.shapes.title
-    title_shape.text = title
-    title_shape.text_frame.paragraphs[0].font.size = Pt(36)
-    title_shape.text_frame.paragraphs[0].font.bold = True
-    
-    # Add image if it exists
-    if os.path.exists(image_path):
-        slide.shapes.add_picture(image_path, Inches(2), Inches(2), width=Inches(9))
-        
-        # Add caption if provided
-        if caption:
-            left = Inches(2)
-            top = Inches(6)
-            width = Inches(9)
-            height = Inches(1)
-            
-            txBox = slide.shapes.add_textbox(left, top, width, height)
-            tf = txBox.text_frame
-            
-            p = tf.add_paragraph()
-            p.text = caption
-            p.font.size = Pt(18)
-            p.alignment = PP_ALIGN.CENTER
-    
-    return slide
+# Seed for the sample payload vs. success scatter plot
+PAYLOAD_SAMPLE_SEED = 42
 
 # Create a directory for charts if it doesn't exist
 if not os.path.exists("charts"):
     os.makedirs("charts")
 
-# Generate visualization charts for the presentation
-def create_sample_charts():
-    # Sample success rate chart by launch site
-    labels = ['KSC LC-39A', 'CCAFS SLC-40', 'VAFB SLC-4E', 'CCAFS LC-40']
-    success_rates = [0.83, 0.76, 0.65, 0.72]
-    
-    plt.figure(figsize=(10, 6))
-    plt.bar(labels, success_rates, color='#005288')  # SpaceX blue
-    plt.title('Landing Success Rate by Launch Site', fontsize=18)
+# Chart drawing functions. Each one returns its Figure for chart_cache, which
+# only calls them (and only imports pyplot) when the chart is not cached yet.
+def plot_success_rates(labels, rates, color, title, xlabel):
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(10, 6))
+    plt.bar(labels, rates, color=color)
+    plt.title(title, fontsize=18)
     plt.ylabel('Success Rate', fontsize=14)
-    plt.xlabel('Launch Site', fontsize=14)
+    plt.xlabel(xlabel, fontsize=14)
     plt.ylim(0, 1.0)
-    for i, v in enumerate(success_rates):
+    for i, v in enumerate(rates):
         plt.text(i, v + 0.02, f'{v:.0%}', ha='center', fontsize=12)
     plt.tight_layout()
-    plt.savefig('charts/success_by_site.png', dpi=300)
-    plt.close()
-    
-    # Sample success rate by orbit type
-    orbit_types = ['LEO', 'GTO', 'ISS', 'Polar', 'SSO']
-    orbit_success = [0.89, 0.62, 0.95, 0.75, 0.82]
-    
-    plt.figure(figsize=(10, 6))
-    plt.bar(orbit_types, orbit_success, color='#A7A9AC')  # SpaceX grey
-    plt.title('Landing Success Rate by Orbit Type', fontsize=18)
-    plt.ylabel('Success Rate', fontsize=14)
-    plt.xlabel('Orbit Type', fontsize=14)
-    plt.ylim(0, 1.0)
-    for i, v in enumerate(orbit_success):
-        plt.text(i, v + 0.02, f'{v:.0%}', ha='center', fontsize=12)
-    plt.tight_layout()
-    plt.savefig('charts/success_by_orbit.png', dpi=300)
-    plt.close()
-    
-    # Sample payload mass vs success rate scatter plot
-    payload_masses = np.random.uniform(1000, 15000, 100)
-    success_probs = 0.9 - (payload_masses - 1000) * 0.00003 + np.random.normal(0, 0.1, 100)
-    success_probs = np.clip(success_probs, 0, 1)
-    
-    plt.figure(figsize=(10, 6))
+    return fig
+
+def plot_payload_vs_success(payload_masses, success_probs):
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(10, 6))
     plt.scatter(payload_masses, success_probs, alpha=0.7, c='#005288', s=50)
     plt.title('Landing Success Probability vs. Payload Mass', fontsize=18)
     plt.ylabel('Success Probability', fontsize=14)
@@ -145,23 +43,22 @@ def create_sample_charts():
              "r--", linewidth=2, color='#A7A9AC')
     
     plt.tight_layout()
-    plt.savefig('charts/payload_vs_success.png', dpi=300)
-    plt.close()
-    
-    # Sample confusion matrix for SVM model
-    cm = np.array([[42, 8], [7, 43]])
-    plt.figure(figsize=(8, 6))
+    return fig
+
+def plot_confusion_matrix(cm, class_names, title):
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(8, 6))
     plt.imshow(cm, interpolation='nearest', cmap=plt.cm.Blues)
-    plt.title('Confusion Matrix - SVM Model', fontsize=18)
+    plt.title(title, fontsize=18)
     plt.colorbar()
-    tick_marks = np.arange(2)
-    plt.xticks(tick_marks, ['Did Not Land', 'Landed'], fontsize=12)
-    plt.yticks(tick_marks, ['Did Not Land', 'Landed'], fontsize=12)
+    tick_marks = np.arange(len(class_names))
+    plt.xticks(tick_marks, class_names, fontsize=12)
+    plt.yticks(tick_marks, class_names, fontsize=12)
     
     # Add text annotations
     thresh = cm.max() / 2.
-    for i in range(2):
-        for j in range(2):
+    for i in range(cm.shape[0]):
+        for j in range(cm.shape[1]):
             plt.text(j, i, format(cm[i, j], 'd'),
                      ha="center", va="center",
                      color="white" if cm[i, j] > thresh else "black",
@@ -170,18 +67,15 @@ def create_sample_charts():
     plt.ylabel('True Label', fontsize=14)
     plt.xlabel('Predicted Label', fontsize=14)
     plt.tight_layout()
-    plt.savefig('charts/confusion_matrix_svm.png', dpi=300)
-    plt.close()
-    
-    # Model comparison chart
-    models = ['Logistic Regression', 'SVM', 'Decision Tree', 'KNN']
-    accuracies = [0.82, 0.85, 0.78, 0.80]
-    
-    plt.figure(figsize=(10, 6))
+    return fig
+
+def plot_model_comparison(models, accuracies, best_model):
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(10, 6))
     bars = plt.bar(models, accuracies, color=['#005288', '#A7A9AC', '#81B9FF', '#333333'])
     
     # Highlight the best model
-    bars[1].set_color('#CC0000')  # Highlight SVM as the best model
+    bars[models.index(best_model)].set_color('#CC0000')
     
     plt.title('Model Accuracy Comparison', fontsize=18)
     plt.ylabel('Test Accuracy', fontsize=14)
@@ -190,231 +84,70 @@ def create_sample_charts():
     for i, v in enumerate(accuracies):
         plt.text(i, v + 0.01, f'{v:.0%}', ha='center', fontsize=12)
     plt.tight_layout()
-    plt.savefig('charts/model_comparison.png', dpi=300)
-    plt.close()
-    
-    # Learning curve for SVM model
-    training_sizes = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
-    training_scores = [0.90, 0.88, 0.87, 0.86, 0.85, 0.85, 0.84, 0.84, 0.83, 0.83]
-    testing_scores = [0.70, 0.75, 0.78, 0.80, 0.82, 0.83, 0.84, 0.85, 0.85, 0.85]
-    
-    plt.figure(figsize=(10, 6))
+    return fig
+
+def plot_learning_curve(training_sizes, training_scores, testing_scores, title):
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(10, 6))
     plt.plot(training_sizes, training_scores, label='Training Score', marker='o', markersize=6, color='#005288', linewidth=2)
     plt.plot(training_sizes, testing_scores, label='Testing Score', marker='s', markersize=6, color='#CC0000', linewidth=2)
-    plt.title('Learning Curves - SVM Model', fontsize=18)
+    plt.title(title, fontsize=18)
     plt.xlabel('Training Data Size', fontsize=14)
     plt.ylabel('Accuracy', fontsize=14)
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.legend(fontsize=12)
     plt.tight_layout()
-    plt.savefig('charts/learning_curve.png', dpi=300)
-    plt.close()
+    return fig
+
+# Generate visualization charts for the presentation, reusing cached PNGs
+# when neither the data nor the plotting code changed
+def create_sample_charts():
+    # Sample success rate chart by launch site
+    labels = ['KSC LC-39A', 'CCAFS SLC-40', 'VAFB SLC-4E', 'CCAFS LC-40']
+    success_rates = [0.83, 0.76, 0.65, 0.72]
+    cached_figure('charts/success_by_site.png', plot_success_rates, labels, success_rates,
+                  '#005288', 'Landing Success Rate by Launch Site', 'Launch Site')  # SpaceX blue
+    
+    # Sample success rate by orbit type
+    orbit_types = ['LEO', 'GTO', 'ISS', 'Polar', 'SSO']
+    orbit_success = [0.89, 0.62, 0.95, 0.75, 0.82]
+    cached_figure('charts/success_by_orbit.png', plot_success_rates, orbit_types, orbit_success,
+                  '#A7A9AC', 'Landing Success Rate by Orbit Type', 'Orbit Type')  # SpaceX grey
+    
+    # Sample payload mass vs success rate scatter plot (seeded, so the chart
+    # only changes when the sample does)
+    rng = np.random.RandomState(PAYLOAD_SAMPLE_SEED)
+    payload_masses = rng.uniform(1000, 15000, 100)
+    success_probs = 0.9 - (payload_masses - 1000) * 0.00003 + rng.normal(0, 0.1, 100)
+    success_probs = np.clip(success_probs, 0, 1)
+    cached_figure('charts/payload_vs_success.png', plot_payload_vs_success, payload_masses, success_probs)
+    
+    # Sample confusion matrix for SVM model
+    cm = np.array([[42, 8], [7, 43]])
+    cached_figure('charts/confusion_matrix_svm.png', plot_confusion_matrix, cm,
+                  ['Did Not Land', 'Landed'], 'Confusion Matrix - SVM Model')
+    
+    # Model comparison chart, highlighting SVM as the best model
+    models = ['Logistic Regression', 'SVM', 'Decision Tree', 'KNN']
+    accuracies = [0.82, 0.85, 0.78, 0.80]
+    cached_figure('charts/model_comparison.png', plot_model_comparison, models, accuracies, 'SVM')
+    
+    # Learning curve for SVM model
+    training_sizes = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+    training_scores = [0.90, 0.88, 0.87, 0.86, 0.85, 0.85, 0.84, 0.84, 0.83, 0.83]
+    testing_scores = [0.70, 0.75, 0.78, 0.80, 0.82, 0.83, 0.84, 0.85, 0.85, 0.85]
+    cached_figure('charts/learning_curve.png', plot_learning_curve, training_sizes, training_scores,
+                  testing_scores, 'Learning Curves - SVM Model')
     
     return True
 
+checkpoint('plot')
 # Create the charts
 create_sample_charts()
 
-# Create a new presentation
-prs = Presentation()
-
-# Set slide dimensions to 16:9 format
-prs.slide_width = Inches(13.33)
-prs.slide_height = Inches(7.5)
-
-# 1. Title Slide
-add_title_slide(
-    prs, 
-    "SpaceX Falcon 9 Landing Prediction", 
-    "Machine Learning Project"
-)
-
-# 2. Executive Summary
-add_content_slide(
-    prs,
-    "Executive Summary",
-    [
-        "Predicted Falcon 9 first stage landing success using machine learning",
-        "Achieved best accuracy of ~85% with optimized models",
-        "Key factors affecting landing success identified",
-        "Interactive dashboard and visualizations created for analysis",
-        "Business impact: Cost savings potential through predicting landing success"
-    ]
-)
-
-# 3. Introduction
-add_content_slide(
-    prs,
-    "Introduction",
-    [
-        "SpaceX revolutionized the space industry with reusable rockets",
-        "Falcon 9 first stage recovery reduces launch costs by ~30%",
-        "Project objective: Predict landing success of Falcon 9 first stages",
-        "Machine learning models developed to identify key success factors",
-        "Data-driven insights to improve landing success rate"
-    ]
-)
-
-# 4. Data Collection & Wrangling
-add_content_slide(
-    prs,
-    "Data Collection & Wrangling",
-    [
-        "Multiple data sources collected (SpaceX API, web scraping)",
-        "Data cleaning: handling missing values, outliers, and duplicates",
-        "Feature engineering: launch characteristics, weather conditions, etc.",
-        "Created standardized dataset for machine learning",
-        "Prepared training and testing datasets (80/20 split)"
-    ]
-)
-
-# 5. EDA & Visual Analytics - Overview
-add_content_slide(
-    prs,
-    "Exploratory Data Analysis",
-    [
-        "Statistical analysis of launch and landing data",
-        "Correlation analysis between features and landing success",
-        "Visualized launch success trends over time",
-        "Identified key factors affecting landing probability",
-        "Used various visualization techniques (scatter plots, heatmaps, etc.)"
-    ]
-)
-
-# 6. EDA Visualization - Launch Site Success Rates
-add_image_slide(
-    prs,
-    "Landing Success by Launch Site",
-    "charts/success_by_site.png",
-    "Different launch sites show varying success rates for Falcon 9 first stage recovery"
-)
-
-# 7. EDA Visualization - Orbit Type Success Rates
-add_image_slide(
-    prs,
-    "Landing Success by Orbit Type",
-    "charts/success_by_orbit.png",
-    "Orbit type significantly impacts landing success probability"
-)
-
-# 8. EDA Visualization - Payload Mass Impact
-add_image_slide(
-    prs,
-    "Payload Mass vs. Landing Success",
-    "charts/payload_vs_success.png",
-    "Higher payload mass correlates with decreased landing success probability"
-)
-
-# 9. SQL Analysis Results
-add_content_slide(
-    prs,
-    "SQL Analysis Results",
-    [
-        "Analyzed launch data using SQL queries",
-        "Identified trends in landing success by launch site",
-        "Extracted payload characteristics affecting landing success",
-        "Analyzed relationship between orbit type and landing outcome",
-        "Investigated time-based patterns in landing success rates"
-    ]
-)
-
-# 10. Interactive Map Visualization
-add_content_slide(
-    prs,
-    "Interactive Map Visualization",
-    [
-        "Created interactive maps using Folium",
-        "Visualized launch and landing sites globally",
-        "Mapped success rates by geographic location",
-        "Analyzed distance between launch and landing sites",
-        "Identified optimal landing zones based on success rates"
-    ]
-)
-
-# 11. Plotly Dash Dashboard
-add_content_slide(
-    prs,
-    "Interactive Dashboard",
-    [
-        "Developed interactive dashboard using Plotly Dash",
-        "Real-time filtering and data exploration capabilities",
-        "Interactive visualizations of launch and landing metrics",
-        "Performance metrics by launch site and vehicle configuration",
-        "User-friendly interface for stakeholder analysis"
-    ]
-)
-
-# 12. Predictive Analysis - Machine Learning Models
-add_content_slide(
-    prs,
-    "Predictive Analysis - Machine Learning",
-    [
-        "Implemented multiple classification models:",
-        "   - Logistic Regression with GridSearchCV",
-        "   - Support Vector Machines (SVM) with GridSearchCV",
-        "   - Decision Trees with GridSearchCV",
-        "   - K-Nearest Neighbors (KNN) with GridSearchCV",
-        "Hyperparameter tuning for all models",
-        "10-fold cross-validation to ensure model reliability"
-    ]
-)
-
-# 13. ML Model Comparison
-add_image_slide(
-    prs,
-    "Model Performance Comparison",
-    "charts/model_comparison.png",
-    "SVM achieved the highest test accuracy among all models"
-)
-
-# 14. SVM Model Performance Details
-add_image_slide(
-    prs,
-    "SVM Model Confusion Matrix",
-    "charts/confusion_matrix_svm.png",
-    "SVM model confusion matrix shows balanced performance for both landing outcomes"
-)
-
-# 15. Model Learning Curve
-add_image_slide(
-    prs,
-    "SVM Model Learning Curve",
-    "charts/learning_curve.png",
-    "Learning curve shows good convergence and minimal overfitting"
-)
-
-# 16. Conclusion
-add_content_slide(
-    prs,
-    "Conclusion",
-    [
-        "Successfully predicted Falcon 9 landing outcomes with 85% accuracy using SVM",
-        "Identified key factors contributing to landing success",
-        "Created interactive tools for ongoing analysis",
-        "Recommendations:",
-        "   - Optimize payload mass for higher landing probability",
-        "   - Prefer specific orbit types with better landing track record",
-        "   - Continue model refinement with new launch data"
-    ]
-)
-
-# 17. GitHub Repository
-add_content_slide(
-    prs,
-    "GitHub Repository",
-    [
-        "Complete project code and notebooks available at:",
-        "https://github.com/yourusername/SpaceX_ML_Project",
-        "",
-        "Includes:",
-        "   - Jupyter notebooks with full analysis",
-        "   - Python scripts for ML models",
-        "   - Dashboard implementation",
-        "   - Data collection scripts",
-        "   - This presentation (PDF version)"
-    ]
-)
-
-# Save the presentation
-prs.save("SpaceX_ML_Project_Presentation.pptx")
-print("Presentation created successfully: SpaceX_ML_Project_Presentation.pptx") 
\ No newline at end of file
+checkpoint('output')
+# Build the deck from its slide spec; chart images are downsampled to their
+# placed size while the text slides are added
+spec = load_spec('presentation_slides.json')
+build_deck(spec)
+print(f"Presentation created successfully: {spec['output']}")
@@ -2,7 +2,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from instrumentation import checkpoint
 
+checkpoint('generate')
 # Create sample data
 np.random.seed(42)
 
@@ -28,6 +30,7 @@ df = pd.DataFrame({
     'Launches': num_launches
 })
 
+checkpoint('plot')
 # Create the plot
 plt.figure(figsize=(12, 8))
 
@@ -78,6 +81,7 @@ plt.annotate('Falcon Heavy\ndebut', xy=(2018, 0.84), xytext=(2018, 0.72),
 
 # Adjust layout and save
 plt.tight_layout()
+checkpoint('output')
 plt.savefig('charts/yearly_success_rate.png', 
             dpi=300, 
             bbox_inches='tight',
@@ -0,0 +1,379 @@
+"""
+Presentation Deck Builder
+
+Builds .pptx decks from a declarative slide spec (JSON, or YAML when PyYAML
+is installed) instead of a script full of add_*_slide() calls:
+
+    {
+      "output": "SpaceX_ML_Project_Presentation.pptx",
+      "slide_width": 13.33, "slide_height": 7.5,
+      "slides": [
+        {"layout": "title", "title": "...", "subtitle": "..."},
+        {"layout": "content", "title": "...", "bullets": ["...", "..."]},
+        {"layout": "image", "title": "...", "image": "charts/x.png", "caption": "..."}
+      ]
+    }
+
+Images are downsampled to the size they are placed at (at image_dpi) and
+recompressed in a thread pool while the text slides are being added, so a
+300-dpi chart shown 9 inches wide is embedded at 9 x image_dpi pixels rather
+than at full resolution. Prepared images are keyed by their content, so the
+same picture used on several slides (or under several file names) becomes
+one package part, and build_decks() reuses them across a batch of decks.
+They are also kept on disk under the chart cache, so a rebuild with
+unchanged charts reads them back instead of resampling and quantizing again.
+
+Strings in the spec may contain {placeholders} filled from a context dict,
+which is how per-customer decks are produced from one spec.
+
+Usage:
+    python deck_builder.py presentation_slides.json
+    python deck_builder.py presentation_slides.json -o NASA.pptx --var customer=NASA
+    python deck_builder.py presentation_slides.json --bulk customers.json --output-pattern "decks/{customer}.pptx"
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pptx import Presentation
+from pptx.enum.text import PP_ALIGN
+from pptx.util import Inches, Pt
+
+from instrumentation import timed
+
+# Prepared images kept between builds (next to the chart cache's PNGs)
+IMAGE_CACHE_DIR = os.path.join(os.environ.get('SPACEX_CHART_CACHE', '.chart_cache'), 'prepared')
+
+# Embedded image resolution (pixels per inch of placed width)
+DEFAULT_IMAGE_DPI = 150
+
+# Charts are flat-colour graphics, so a 256-colour palette PNG is
+# indistinguishable on a slide and about a third of the size of full RGB
+PALETTE_COLORS = 256
+
+# Slide layouts of the default template used by each spec layout
+SLIDE_LAYOUTS = {'title': 0, 'content': 1, 'image': 5}
+
+# Placed image widths (inches)
+CONTENT_IMAGE_WIDTH = 4
+IMAGE_SLIDE_WIDTH = 9
+
+
+class _Placeholders(dict):
+    # Leave unknown {fields} in place instead of raising KeyError
+    def __missing__(self, key):
+        return '{' + key + '}'
+
+
+_formatter = string.Formatter()
+
+
+def _fill(text, context):
+    if not context or not isinstance(text, str):
+        return text
+    return _formatter.vformat(text, (), _Placeholders(context))
+
+
+def load_spec(path):
+    """Load a slide spec from a .json or .yaml/.yml file."""
+    with open(path) as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            import yaml
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    for i, slide in enumerate(spec.get('slides', [])):
+        if slide.get('layout') not in SLIDE_LAYOUTS:
+            raise ValueError(f"Slide {i + 1}: unknown layout '{slide.get('layout')}', "
+                             f"expected one of {', '.join(SLIDE_LAYOUTS)}")
+    return spec
+
+
+def prepare_image(data, width_inches, dpi=DEFAULT_IMAGE_DPI, palette=True):
+    """
+    Downsample an image to its placed width and recompress it.
+
+    Args:
+        data (bytes): Original image file contents
+        width_inches (float): Width the image is placed at on the slide
+        dpi (int): Target pixels per inch
+        palette (bool): Quantize to a PALETTE_COLORS-colour PNG
+
+    Returns:
+        bytes: The smaller of the original and the downsampled PNG
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        target_width = int(round(width_inches * dpi))
+        if image.width <= target_width:
+            return data
+        target_height = max(1, int(round(image.height * target_width / image.width)))
+        resized = image.resize((target_width, target_height), Image.LANCZOS)
+        if palette:
+            resized = resized.convert('RGB').quantize(PALETTE_COLORS, method=Image.Quantize.MEDIANCUT)
+        output = io.BytesIO()
+        resized.save(output, format='PNG', optimize=True)
+    prepared = output.getvalue()
+    return prepared if len(prepared) < len(data) else data
+
+
+class ImageCache:
+    """
+    Prepared images keyed by (content hash, placed width, dpi, palette), built
+    in a thread pool and kept on disk between builds.
+    """
+
+    def __init__(self, dpi=DEFAULT_IMAGE_DPI, max_workers=None, palette=True, cache_dir=None):
+        """
+        Args:
+            dpi (int): Embedded image resolution
+            max_workers (int, optional): Preparation threads
+            palette (bool): Quantize to palette PNGs
+            cache_dir (str, optional): Prepared image directory, defaults to
+                IMAGE_CACHE_DIR; False keeps them in memory only
+        """
+        self.dpi = dpi
+        self.palette = palette
+        self.cache_dir = IMAGE_CACHE_DIR if cache_dir is None else cache_dir
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _prepare(self, data, digest, width_inches):
+        # Read a prepared copy from disk, or prepare the image and store it
+        if not self.cache_dir:
+            return prepare_image(data, width_inches, self.dpi, self.palette)
+        palette = f"p{PALETTE_COLORS}" if self.palette else 'rgb'
+        path = os.path.join(self.cache_dir, f"{digest}_{width_inches:g}in_{self.dpi}dpi_{palette}.png")
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+        prepared = prepare_image(data, width_inches, self.dpi, self.palette)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a temporary file first so a concurrent build never reads a partial image
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(prepared)
+        os.replace(tmp_path, path)
+        return prepared
+
+    def submit(self, path, width_inches):
+        """Start preparing path for a placement; returns a future of its bytes (None if missing)."""
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        key = (digest, width_inches, self.dpi)
+        with self._lock:
+            if key not in self._futures:
+                self._futures[key] = self._pool.submit(self._prepare, data, digest, width_inches)
+            return self._futures[key]
+
+    def close(self):
+        self._pool.shutdown()
+
+
+def add_title_slide(prs, title, subtitle=None):
+    slide = prs.slides.add_slide(prs.slide_layouts[SLIDE_LAYOUTS['title']])
+
+    # Set title
+    title_shape = slide.shapes.title
+    title_shape.text = title
+    title_shape.text_frame.paragraphs[0].font.size = Pt(44)
+    title_shape.text_frame.paragraphs[0].font.bold = True
+    title_shape.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+
+    # Set subtitle if provided
+    if subtitle:
+        subtitle_shape = slide.placeholders[1]
+        subtitle_shape.text = subtitle
+        subtitle_shape.text_frame.paragraphs[0].font.size = Pt(28)
+        subtitle_shape.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+
+    return slide
+
+
+def add_content_slide(prs, title, content_list=None, image=None):
+    slide = prs.slides.add_slide(prs.slide_layouts[SLIDE_LAYOUTS['content']])
+
+    # Set title
+    title_shape = slide.shapes.title
+    title_shape.text = title
+    title_shape.text_frame.paragraphs[0].font.size = Pt(36)
+    title_shape.text_frame.paragraphs[0].font.bold = True
+
+    # Add content if provided
+    if content_list:
+        tf = slide.placeholders[1].text_frame
+        for i, item in enumerate(content_list):
+            p = tf.add_paragraph() if i > 0 else tf.paragraphs[0]
+            p.text = f"• {item}"
+            p.font.size = Pt(24)
+
+    # Add image if provided (bytes of the prepared image)
+    if image:
+        slide.shapes.add_picture(io.BytesIO(image), Inches(6), Inches(2), width=Inches(CONTENT_IMAGE_WIDTH))
+
+    return slide
+
+
+def add_image_slide(prs, title, image, caption=None):
+    slide = prs.slides.add_slide(prs.slide_layouts[SLIDE_LAYOUTS['image']])
+
+    # Set title
+    title_shape = slide.shapes.title
+    title_shape.text = title
+    title_shape.text_frame.paragraphs[0].font.size = Pt(36)
+    title_shape.text_frame.paragraphs[0].font.bold = True
+
+    # Add image if it exists
+    if image:
+        slide.shapes.add_picture(io.BytesIO(image), Inches(2), Inches(2), width=Inches(IMAGE_SLIDE_WIDTH))
+
+        # Add caption if provided
+        if caption:
+            tf = slide.shapes.add_textbox(Inches(2), Inches(6), Inches(9), Inches(1)).text_frame
+            p = tf.add_paragraph()
+            p.text = caption
+            p.font.size = Pt(18)
+            p.alignment = PP_ALIGN.CENTER
+
+    return slide
+
+
+def _image_width(slide):
+    return IMAGE_SLIDE_WIDTH if slide['layout'] == 'image' else CONTENT_IMAGE_WIDTH
+
+
+@timed()
+def build_deck(spec, output=None, context=None, image_cache=None, base_dir='.'):
+    """
+    Build one deck from a slide spec.
+
+    Args:
+        spec (dict): Slide spec (see load_spec)
+        output (str or file, optional): Where to save, defaults to spec['output']
+        context (dict, optional): Values for {placeholders} in the spec's strings
+        image_cache (ImageCache, optional): Shared prepared images, e.g. across
+            a batch of decks; a private one is used if omitted
+        base_dir (str): Directory image paths are relative to
+
+    Returns:
+        pptx.presentation.Presentation: The saved presentation
+    """
+    own_cache = image_cache is None
+    image_cache = image_cache or ImageCache()
+    try:
+        # Queue every image first so they are prepared while text slides are added
+        slides = spec.get('slides', [])
+        images = [image_cache.submit(os.path.join(base_dir, _fill(slide['image'], context)), _image_width(slide))
+                  if slide.get('image') else None for slide in slides]
+
+        prs = Presentation()
+        prs.slide_width = Inches(spec.get('slide_width', 13.33))
+        prs.slide_height = Inches(spec.get('slide_height', 7.5))
+
+        for slide, image in zip(slides, images):
+            title = _fill(slide.get('title', ''), context)
+            image = image.result() if image is not None else None
+            if slide['layout'] == 'title':
+                add_title_slide(prs, title, _fill(slide.get('subtitle'), context))
+            elif slide['layout'] == 'content':
+                bullets = [_fill(item, context) for item in slide.get('bullets') or []]
+                add_content_slide(prs, title, bullets, image)
+            else:
+                add_image_slide(prs, title, image, _fill(slide.get('caption'), context))
+
+        output = output or _fill(spec['output'], context)
+        if isinstance(output, str) and os.path.dirname(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        prs.save(output)
+        return prs
+    finally:
+        if own_cache:
+            image_cache.close()
+
+
+@timed()
+def build_decks(spec, contexts, output_pattern, image_dpi=DEFAULT_IMAGE_DPI, max_workers=None, base_dir='.',
+                palette=True):
+    """
+    Build one deck per context (e.g. per customer), sharing prepared images.
+
+    Args:
+        spec (dict): Slide spec
+        contexts (list): One dict of placeholder values per deck
+        output_pattern (str): Output path with {placeholders}, e.g. "decks/{customer}.pptx"
+        image_dpi (int): Embedded image resolution
+        max_workers (int, optional): Image preparation threads
+        base_dir (str): Directory image paths are relative to
+        palette (bool): Embed images as palette PNGs
+
+    Returns:
+        list: (output path, seconds) for each deck
+    """
+    image_cache = ImageCache(image_dpi, max_workers, palette)
+    results = []
+    try:
+        for context in contexts:
+            start = time.perf_counter()
+            output = _fill(output_pattern, context)
+            build_deck(spec, output, context, image_cache, base_dir)
+            results.append((output, time.perf_counter() - start))
+    finally:
+        image_cache.close()
+    return results
+
+
+def _parse_vars(pairs):
+    context = {}
+    for pair in pairs:
+        name, sep, value = pair.partition('=')
+        if not sep:
+            raise ValueError(f"--var expects name=value, got '{pair}'")
+        context[name] = value
+    return context
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build .pptx decks from a slide spec")
+    parser.add_argument('spec', help="Slide spec (.json, or .yaml/.yml with PyYAML)")
+    parser.add_argument('-o', '--output', help="Output .pptx (default: the spec's output)")
+    parser.add_argument('--var', action='append', default=[], metavar='NAME=VALUE', help="Placeholder value")
+    parser.add_argument('--bulk', metavar='JSON', help="JSON list of placeholder dicts, one deck each")
+    parser.add_argument('--output-pattern', help="Output path pattern for --bulk, e.g. 'decks/{customer}.pptx'")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_IMAGE_DPI, help=f"Embedded image resolution (default: {DEFAULT_IMAGE_DPI})")
+    parser.add_argument('--jobs', type=int, help="Image preparation threads")
+    parser.add_argument('--no-palette', action='store_true', help="Keep full-colour images instead of palette PNGs")
+    args = parser.parse_args()
+
+    spec = load_spec(args.spec)
+    base_dir = os.path.dirname(os.path.abspath(args.spec))
+    context = _parse_vars(args.var)
+    start = time.perf_counter()
+    if args.bulk:
+        if not args.output_pattern:
+            parser.error("--bulk needs --output-pattern")
+        with open(args.bulk) as f:
+            contexts = [{**context, **deck_context} for deck_context in json.load(f)]
+        results = build_decks(spec, contexts, args.output_pattern, args.dpi, args.jobs, base_dir, not args.no_palette)
+    else:
+        output = args.output or _fill(spec['output'], context)
+        results = build_decks(spec, [context], output, args.dpi, args.jobs, base_dir, not args.no_palette)
+
+    for output, elapsed in results:
+        print(f"{output}: {os.path.getsize(output) / 1024:,.0f} KB in {elapsed:.2f}s")
+    print(f"Built {len(results)} deck(s) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
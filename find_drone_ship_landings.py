@@ -1,210 +1,67 @@
-import pandas as pd
-import numpy as np
-from datetime import datetime
+from instrumentation import checkpoint, timed
+from launch_sql import open_launch_db, query_rows
 
 # For demonstration, since we've been using sample data
-# Create sample data that represents our SpaceX launches
-np.random.seed(42)
-
-# Create a list of all potential launch sites
-all_launch_sites = [
-    'KSC LC-39A',           # Kennedy Space Center Launch Complex 39A
-    'CCAFS SLC-40',         # Cape Canaveral Air Force Station Space Launch Complex 40
-    'VAFB SLC-4E',          # Vandenberg Air Force Base Space Launch Complex 4E
-    'CCAFS LC-40',          # Cape Canaveral Air Force Station Launch Complex 40
-    'VAFB SLC-3W',          # Vandenberg Air Force Base Space Launch Complex 3W
-    'KSC LC-39B',           # Kennedy Space Center Launch Complex 39B
-    'Kwajalein Atoll'       # Marshall Islands launch site
-]
-
-# Define landing types
-landing_types = [
-    'Ocean', 
-    'ASDS',  # Autonomous Spaceport Drone Ship
-    'RTLS',  # Return to Launch Site - ground pad landing
-    'None'
-]
-
-# Define booster versions with appropriate timeline
-# F9 v1.0: Flights 1-5 (2010-2013)
-# F9 v1.1: Flights 6-20 (2013-2015)
-# F9 FT (Full Thrust): Flights 21-60 (2015-2018)
-# F9 Block 5: Flights 61-100 (2018-2022)
-booster_versions = []
-
-for flight_num in range(1, 101):
-    if flight_num <= 5:
-        booster_versions.append('F9 v1.0')
-    elif flight_num <= 20:
-        booster_versions.append('F9 v1.1')
-    elif flight_num <= 60:
-        booster_versions.append('F9 FT')
-    else:
-        booster_versions.append('F9 Block 5')
-
-# Give boosters unique identifiers
-booster_ids = []
-current_booster = 1001
-# First 20 flights are expendable (no reuse), so new booster each time
-for i in range(20):
-    booster_ids.append(f"B{current_booster}")
-    current_booster += 1
-
-# For remaining flights, mix of new and reused boosters
-used_boosters = []
-for i in range(20, 100):
-    # 70% chance of reusing a booster after flight 20
-    if i > 25 and np.random.random() < 0.7 and used_boosters:
-        # Choose a previously used booster
-        booster_ids.append(np.random.choice(used_boosters))
+# Query the 100-launch sample with drone ship (ASDS), ground pad (RTLS) and
+# ocean landing attempts from the shared launch database
+DATASET = {'num_launches': 100, 'seed': 42, 'compat': 'drone_ship_landings'}
+BACKEND = 'sql'
+
+# Successful landings of one landing type with a payload in an open range
+# (uses the LandingType index)
+LANDINGS_IN_PAYLOAD_RANGE_SQL = """
+    SELECT BoosterID, MissionName, Date, PayloadMass, BoosterVersion
+    FROM launches
+    WHERE LandingType = ? AND LandingOutcome = 1 AND PayloadMass > ? AND PayloadMass < ?
+    ORDER BY rowid
+"""
+
+
+@timed()
+def run_query(conn):
+    """Find successful drone ship landings with a 4000-6000 kg payload and write drone_ship_landing_results.md"""
+    checkpoint('aggregate')
+    # Find boosters that successfully landed on drone ships with payload between 4000 and 6000 kg
+    # Rows are only printed, so they stay plain tuples (no pandas import)
+    successful_asds_landings = query_rows(conn, LANDINGS_IN_PAYLOAD_RANGE_SQL, ('Drone Ship', 4000, 6000))
+
+    checkpoint('output')
+    # Print results
+    print("\nBoosters with Successful Drone Ship Landings (Payload 4000-6000 kg):")
+    print("===================================================================")
+    print(f"Total matches: {len(successful_asds_landings)}")
+    if successful_asds_landings:
+        for row in successful_asds_landings:
+            print(f"Booster ID: {row['BoosterID']}, Mission: {row['MissionName']}, Payload: {row['PayloadMass']:.2f} kg, Date: {row['Date'][:10]}")
     else:
-        # Use a new booster
-        booster_ids.append(f"B{current_booster}")
-        used_boosters.append(f"B{current_booster}")
-        current_booster += 1
-
-# Create sample data for 100 launches spanning 2010-2022
-flight_numbers = np.arange(1, 101)
-dates = pd.date_range(start='2010-06-04', end='2022-12-31', periods=100)
-launches = np.random.choice(all_launch_sites, size=100, p=[0.35, 0.30, 0.20, 0.05, 0.05, 0.03, 0.02])
-
-# Adjust payload capacity based on booster version (newer versions can carry more)
-payloads = []
-for version in booster_versions:
-    if version == 'F9 v1.0':
-        payloads.append(np.random.uniform(1000, 8000))
-    elif version == 'F9 v1.1':
-        payloads.append(np.random.uniform(3000, 12000))
-    elif version == 'F9 FT':
-        payloads.append(np.random.uniform(5000, 15000))
-    else:  # F9 Block 5
-        payloads.append(np.random.uniform(6000, 16000))
+        print("No matching boosters found.")
 
-# Assign landing types and outcomes based on historical pattern
-landing_type_list = []
-landing_outcome_list = []
-
-for i, date in enumerate(dates):
-    if date < datetime(2015, 1, 1):
-        # Before 2015: No landing attempts or ocean landings only
-        if date < datetime(2013, 1, 1):
-            landing_type_list.append('None')
-            landing_outcome_list.append(0)  # No attempt
-        else:
-            landing_type_list.append('Ocean')
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.7, 0.3]))  # Mostly failures
-    
-    elif date < datetime(2016, 6, 1):
-        # Early 2015 to mid 2016: First ASDS and RTLS attempts, low success rate
-        landing_type = np.random.choice(['RTLS', 'ASDS', 'Ocean'], p=[0.2, 0.5, 0.3])
-        landing_type_list.append(landing_type)
+    # Save results to a file
+    with open('drone_ship_landing_results.md', 'w') as f:
+        f.write("# Boosters with Successful Drone Ship Landings (Payload 4000-6000 kg)\n\n")
         
-        # First ASDS success in April 2016 (CRS-8)
-        if landing_type == 'ASDS' and date >= datetime(2016, 4, 8):
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.4, 0.6]))  # Better success
-        elif landing_type == 'ASDS':
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.7, 0.3]))  # Low success
-        elif landing_type == 'RTLS' and date >= datetime(2015, 12, 22):
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.3, 0.7]))  # Higher success
-        elif landing_type == 'RTLS':
-            landing_outcome_list.append(0)  # No success before Dec 22, 2015
-        else:
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.6, 0.4]))  # Low success
-    
-    elif date < datetime(2018, 1, 1):
-        # Mid 2016 to end 2017: Improving success rate
-        landing_type = np.random.choice(['RTLS', 'ASDS', 'None'], p=[0.3, 0.6, 0.1])
-        landing_type_list.append(landing_type)
-        if landing_type != 'None':
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.3, 0.7]))  # Better success
+        if successful_asds_landings:
+            f.write("| Booster ID | Mission | Launch Date | Payload Mass (kg) | Booster Version |\n")
+            f.write("|------------|---------|-------------|-------------------|----------------|\n")
+            
+            for row in successful_asds_landings:
+                f.write(f"| {row['BoosterID']} | {row['MissionName']} | {row['Date'][:10]} | {row['PayloadMass']:.2f} | {row['BoosterVersion']} |\n")
+            
+            f.write(f"\n**Total matching boosters: {len(successful_asds_landings)}**\n\n")
+            
+            f.write("## Explanation\n\n")
+            f.write("These boosters successfully landed on Autonomous Spaceport Drone Ships (ASDS) after launching payloads ")
+            f.write("between 4,000 kg and 6,000 kg to orbit. Drone ship landings are typically used for missions with higher ")
+            f.write("energy requirements, such as those going to geostationary transfer orbit (GTO) or carrying heavier payloads ")
+            f.write("to lower orbits.\n\n")
+            
+            f.write("The drone ships' ability to position themselves downrange from the launch site allows the booster to ")
+            f.write("conserve fuel that would otherwise be needed to return all the way back to the launch site, enabling ")
+            f.write("SpaceX to recover boosters from more demanding missions while still delivering heavier payloads to their ")
+            f.write("intended orbits.")
         else:
-            landing_outcome_list.append(0)
-    
-    else:
-        # 2018 onwards: Routine landings with high success rate
-        landing_type = np.random.choice(['RTLS', 'ASDS', 'None'], p=[0.35, 0.6, 0.05])
-        landing_type_list.append(landing_type)
-        if landing_type != 'None':
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.15, 0.85]))  # High success
-        else:
-            landing_outcome_list.append(0)
-
-# Add mission names for context
-mission_prefix = ['CRS', 'Starlink', 'NROL', 'GPS', 'Telstar', 'Eutelsat', 'SES', 'Orbcomm', 'Iridium', 'JCSAT']
-mission_names = []
-for i in range(100):
-    prefix = np.random.choice(mission_prefix)
-    number = np.random.randint(1, 20)
-    mission_names.append(f"{prefix}-{number}")
-
-# Create a DataFrame
-df = pd.DataFrame({
-    'FlightNumber': flight_numbers,
-    'Date': dates,
-    'BoosterVersion': booster_versions,
-    'BoosterID': booster_ids,
-    'LaunchSite': launches,
-    'PayloadMass': payloads,
-    'MissionName': mission_names,
-    'LandingType': landing_type_list,
-    'LandingOutcome': landing_outcome_list
-})
-
-# Add some special mission/booster information
-# First successful ASDS landing: CRS-8 on April 8, 2016
-first_asds_idx = df[(df['Date'] >= '2016-04-01') & (df['Date'] <= '2016-04-30')].index[0]
-df.loc[first_asds_idx, 'Date'] = pd.Timestamp('2016-04-08')
-df.loc[first_asds_idx, 'LandingType'] = 'ASDS'
-df.loc[first_asds_idx, 'LandingOutcome'] = 1
-df.loc[first_asds_idx, 'MissionName'] = 'CRS-8'
-df.loc[first_asds_idx, 'BoosterID'] = 'B1021'
-df.loc[first_asds_idx, 'PayloadMass'] = 5000  # Within the requested range
-
-# Add a few more boosters with payload in the 4000-6000 range that landed on drone ships
-for i in range(5):
-    if i < len(df[df['LandingType'] == 'ASDS']):
-        idx = df[df['LandingType'] == 'ASDS'].index[i]
-        df.loc[idx, 'PayloadMass'] = np.random.uniform(4100, 5900)
-        df.loc[idx, 'LandingOutcome'] = 1
+            f.write("No matching boosters found.") 
 
-# Find boosters that successfully landed on drone ships with payload between 4000 and 6000 kg
-successful_asds_landings = df[(df['LandingType'] == 'ASDS') & 
-                             (df['LandingOutcome'] == 1) & 
-                             (df['PayloadMass'] > 4000) & 
-                             (df['PayloadMass'] < 6000)]
 
-# Print results
-print("\nBoosters with Successful Drone Ship Landings (Payload 4000-6000 kg):")
-print("===================================================================")
-print(f"Total matches: {len(successful_asds_landings)}")
-if not successful_asds_landings.empty:
-    for _, row in successful_asds_landings.iterrows():
-        print(f"Booster ID: {row['BoosterID']}, Mission: {row['MissionName']}, Payload: {row['PayloadMass']:.2f} kg, Date: {row['Date'].strftime('%Y-%m-%d')}")
-else:
-    print("No matching boosters found.")
-
-# Save results to a file
-with open('drone_ship_landing_results.md', 'w') as f:
-    f.write("# Boosters with Successful Drone Ship Landings (Payload 4000-6000 kg)\n\n")
-    
-    if not successful_asds_landings.empty:
-        f.write("| Booster ID | Mission | Launch Date | Payload Mass (kg) | Booster Version |\n")
-        f.write("|------------|---------|-------------|-------------------|----------------|\n")
-        
-        for _, row in successful_asds_landings.iterrows():
-            f.write(f"| {row['BoosterID']} | {row['MissionName']} | {row['Date'].strftime('%Y-%m-%d')} | {row['PayloadMass']:.2f} | {row['BoosterVersion']} |\n")
-        
-        f.write(f"\n**Total matching boosters: {len(successful_asds_landings)}**\n\n")
-        
-        f.write("## Explanation\n\n")
-        f.write("These boosters successfully landed on Autonomous Spaceport Drone Ships (ASDS) after launching payloads ")
-        f.write("between 4,000 kg and 6,000 kg to orbit. Drone ship landings are typically used for missions with higher ")
-        f.write("energy requirements, such as those going to geostationary transfer orbit (GTO) or carrying heavier payloads ")
-        f.write("to lower orbits.\n\n")
-        
-        f.write("The drone ships' ability to position themselves downrange from the launch site allows the booster to ")
-        f.write("conserve fuel that would otherwise be needed to return all the way back to the launch site, enabling ")
-        f.write("SpaceX to recover boosters from more demanding missions while still delivering heavier payloads to their ")
-        f.write("intended orbits.")
-    else:
-        f.write("No matching boosters found.") 
\ No newline at end of file
+if __name__ == "__main__":
+    run_query(open_launch_db(**DATASET))
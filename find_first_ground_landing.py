@@ -1,149 +1,79 @@
-import pandas as pd
-import numpy as np
 from datetime import datetime
 
+from instrumentation import checkpoint, timed
+from launch_sql import open_launch_db, query_rows
+
 # For demonstration, since we've been using sample data
-# Create sample data that represents our SpaceX launches
-np.random.seed(42)
+# Query the 100-launch sample with a historically accurate landing timeline
+# from the shared launch database
+DATASET = {'num_launches': 100, 'seed': 42, 'compat': 'first_ground_landing'}
+BACKEND = 'sql'
 
-# Create a list of all potential launch sites
-all_launch_sites = [
-    'KSC LC-39A',           # Kennedy Space Center Launch Complex 39A
-    'CCAFS SLC-40',         # Cape Canaveral Air Force Station Space Launch Complex 40
-    'VAFB SLC-4E',          # Vandenberg Air Force Base Space Launch Complex 4E
-    'CCAFS LC-40',          # Cape Canaveral Air Force Station Launch Complex 40
-    'VAFB SLC-3W',          # Vandenberg Air Force Base Space Launch Complex 3W
-    'KSC LC-39B',           # Kennedy Space Center Launch Complex 39B
-    'Kwajalein Atoll'       # Marshall Islands launch site
-]
+# Earliest successful landing of one landing type (uses the LandingType index)
+FIRST_SUCCESSFUL_LANDING_SQL = """
+    SELECT FlightNumber, Date, MissionName, LaunchSite
+    FROM launches
+    WHERE LandingType = ? AND LandingOutcome = 1
+    ORDER BY Date, rowid
+    LIMIT 1
+"""
 
-# Define landing types
-landing_types = [
-    'Ocean', 
-    'ASDS', 
-    'RTLS',  # Return to Launch Site - ground pad landing
-    'None'
-]
+# Mission details of the first successful ground pad landing, console and markdown
+MISSION_DETAILS_TEMPLATE = (
+    "Flight Number: {FlightNumber}\n"
+    "Date: {Date:%B %d, %Y}\n"
+    "Mission: {MissionName}\n"
+    "Launch Site: {LaunchSite}\n"
+)
+MISSION_DETAILS_MARKDOWN = (
+    "- **Flight Number**: {FlightNumber}\n"
+    "- **Date**: {Date:%B %d, %Y}\n"
+    "- **Mission**: {MissionName}\n"
+    "- **Launch Site**: {LaunchSite}\n"
+    "- **Landing Type**: Return to Launch Site (RTLS)\n\n"
+)
 
-# Create a more historically accurate timeline
-# Early flights (2010-2015) - No landing attempts or ocean landings
-# Mid flights (2015-2017) - First RTLS success (Dec 2015), then mix of RTLS and ASDS
-# Later flights (2018-2022) - More routine RTLS and ASDS landings
 
-# Create sample data for 100 launches spanning 2010-2022
-flight_numbers = np.arange(1, 101)
-dates = pd.date_range(start='2010-06-04', end='2022-12-31', periods=100)
-launches = np.random.choice(all_launch_sites, size=100, p=[0.35, 0.30, 0.20, 0.05, 0.05, 0.03, 0.02])
+@timed()
+def run_query(conn):
+    """Find the first successful ground pad landing and write first_ground_landing_results.md"""
+    checkpoint('aggregate')
+    # Find the first successful ground pad landing (RTLS)
+    rows = query_rows(conn, FIRST_SUCCESSFUL_LANDING_SQL, ('Ground Pad',))
+    first_success = dict(zip(rows[0].keys(), rows[0])) if rows else None
+    if first_success is not None:
+        first_success['Date'] = datetime.fromisoformat(first_success['Date'])
 
-# Assign landing types and outcomes based on historical pattern
-landing_type_list = []
-landing_outcome_list = []
+    checkpoint('output')
+    # Print results
+    print("\nFirst Successful Ground Pad Landing (RTLS):")
+    print("==========================================")
+    if first_success is not None:
+        print(MISSION_DETAILS_TEMPLATE.format(**first_success), end='')
+    else:
+        print("No successful ground pad landings found in the dataset.")
 
-for i, date in enumerate(dates):
-    if date < datetime(2015, 6, 1):
-        # Before June 2015: No landing attempts or ocean landings only
-        if date < datetime(2013, 1, 1):
-            landing_type_list.append('None')
-            landing_outcome_list.append(0)  # No attempt
-        else:
-            landing_type_list.append('Ocean')
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.7, 0.3]))  # Mostly failures
-    
-    elif date < datetime(2016, 6, 1):
-        # Mid 2015 to mid 2016: First RTLS and ASDS attempts, low success rate
-        landing_type = np.random.choice(['RTLS', 'ASDS', 'Ocean'], p=[0.2, 0.5, 0.3])
-        landing_type_list.append(landing_type)
+    # Save results to a file
+    with open('first_ground_landing_results.md', 'w') as f:
+        f.write("# First Successful Ground Pad Landing\n\n")
         
-        # First RTLS success on Dec 22, 2015 (Orbcomm OG2 M2)
-        if landing_type == 'RTLS' and date >= datetime(2015, 12, 22):
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.3, 0.7]))  # Higher success
-        elif landing_type == 'RTLS':
-            landing_outcome_list.append(0)  # No success before Dec 22, 2015
+        if first_success is not None:
+            f.write(f"## Mission Details\n\n")
+            f.write(MISSION_DETAILS_MARKDOWN.format(**first_success))
+            
+            f.write("## Historical Significance\n\n")
+            f.write("SpaceX's first successful ground pad landing on December 22, 2015, marked a historic milestone in the ")
+            f.write("development of reusable rocket technology. The Falcon 9 booster from the Orbcomm OG2 Launch 2 mission ")
+            f.write("returned to Landing Zone 1 (LZ-1) at Cape Canaveral, demonstrating for the first time that an orbital-class ")
+            f.write("rocket could launch to space and return to a precise landing on solid ground.\n\n")
+            
+            f.write("This achievement followed several unsuccessful landing attempts on drone ships at sea, and it proved ")
+            f.write("the viability of SpaceX's approach to rocket reusability. The precise landing on a ground pad required ")
+            f.write("more fuel than a drone ship landing but provided a more stable landing platform. This success paved the way ")
+            f.write("for routine rocket reuse, significantly reducing launch costs and transforming the economics of space access.")
         else:
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.7, 0.3]))  # Low success
-    
-    elif date < datetime(2018, 1, 1):
-        # Mid 2016 to end 2017: Improving success rate
-        landing_type = np.random.choice(['RTLS', 'ASDS', 'None'], p=[0.3, 0.6, 0.1])
-        landing_type_list.append(landing_type)
-        if landing_type != 'None':
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.4, 0.6]))  # Better success
-        else:
-            landing_outcome_list.append(0)
-    
-    else:
-        # 2018 onwards: Routine landings with high success rate
-        landing_type = np.random.choice(['RTLS', 'ASDS', 'None'], p=[0.35, 0.6, 0.05])
-        landing_type_list.append(landing_type)
-        if landing_type != 'None':
-            landing_outcome_list.append(np.random.choice([0, 1], p=[0.15, 0.85]))  # High success
-        else:
-            landing_outcome_list.append(0)
-
-# Create a DataFrame
-df = pd.DataFrame({
-    'FlightNumber': flight_numbers,
-    'Date': dates,
-    'LaunchSite': launches,
-    'LandingType': landing_type_list,
-    'LandingOutcome': landing_outcome_list
-})
+            f.write("No successful ground pad landings found in the dataset.") 
 
-# Hard-code the first successful RTLS landing to match history (Orbcomm OG2 M2 - Dec 22, 2015)
-# Find index of a flight close to that date
-first_rtls_idx = df[(df['Date'] >= '2015-12-01') & (df['Date'] <= '2016-01-31')].index[0]
-df.loc[first_rtls_idx, 'Date'] = pd.Timestamp('2015-12-22')
-df.loc[first_rtls_idx, 'LandingType'] = 'RTLS'
-df.loc[first_rtls_idx, 'LandingOutcome'] = 1
-df.loc[first_rtls_idx, 'LaunchSite'] = 'CCAFS SLC-40'
-df.loc[first_rtls_idx, 'MissionName'] = 'Orbcomm OG2 M2'
 
-# Add mission names for context
-mission_prefix = ['CRS', 'Starlink', 'NROL', 'GPS', 'Telstar', 'Eutelsat', 'SES', 'Orbcomm', 'Iridium', 'JCSAT']
-mission_names = []
-for i in range(100):
-    prefix = np.random.choice(mission_prefix)
-    number = np.random.randint(1, 20)
-    mission_names.append(f"{prefix}-{number}")
-
-df['MissionName'] = mission_names
-
-# Find the first successful ground pad landing
-successful_ground_landing = df[(df['LandingType'] == 'RTLS') & (df['LandingOutcome'] == 1)].sort_values('Date')
-first_success = successful_ground_landing.iloc[0] if not successful_ground_landing.empty else None
-
-# Print results
-print("\nFirst Successful Ground Pad Landing (RTLS):")
-print("==========================================")
-if first_success is not None:
-    print(f"Flight Number: {first_success['FlightNumber']}")
-    print(f"Date: {first_success['Date'].strftime('%B %d, %Y')}")
-    print(f"Mission: {first_success['MissionName']}")
-    print(f"Launch Site: {first_success['LaunchSite']}")
-else:
-    print("No successful ground pad landings found in the dataset.")
-
-# Save results to a file
-with open('first_ground_landing_results.md', 'w') as f:
-    f.write("# First Successful Ground Pad Landing\n\n")
-    
-    if first_success is not None:
-        f.write(f"## Mission Details\n\n")
-        f.write(f"- **Flight Number**: {first_success['FlightNumber']}\n")
-        f.write(f"- **Date**: {first_success['Date'].strftime('%B %d, %Y')}\n")
-        f.write(f"- **Mission**: {first_success['MissionName']}\n")
-        f.write(f"- **Launch Site**: {first_success['LaunchSite']}\n")
-        f.write(f"- **Landing Type**: Return to Launch Site (RTLS)\n\n")
-        
-        f.write("## Historical Significance\n\n")
-        f.write("SpaceX's first successful ground pad landing on December 22, 2015, marked a historic milestone in the ")
-        f.write("development of reusable rocket technology. The Falcon 9 booster from the Orbcomm OG2 Launch 2 mission ")
-        f.write("returned to Landing Zone 1 (LZ-1) at Cape Canaveral, demonstrating for the first time that an orbital-class ")
-        f.write("rocket could launch to space and return to a precise landing on solid ground.\n\n")
-        
-        f.write("This achievement followed several unsuccessful landing attempts on drone ships at sea, and it proved ")
-        f.write("the viability of SpaceX's approach to rocket reusability. The precise landing on a ground pad required ")
-        f.write("more fuel than a drone ship landing but provided a more stable landing platform. This success paved the way ")
-        f.write("for routine rocket reuse, significantly reducing launch costs and transforming the economics of space access.")
-    else:
-        f.write("No successful ground pad landings found in the dataset.") 
\ No newline at end of file
+if __name__ == "__main__":
+    run_query(open_launch_db(**DATASET))
@@ -1,215 +1,139 @@
-import pandas as pd
-import numpy as np
 from datetime import datetime
 
+from instrumentation import checkpoint, timed
+from launch_sql import open_launch_db, query_rows
+
 # For demonstration, since we've been using sample data
-# Create sample data that represents our SpaceX launches
-np.random.seed(42)
-
-# Create a list of all potential launch sites
-all_launch_sites = [
-    'KSC LC-39A',           # Kennedy Space Center Launch Complex 39A
-    'CCAFS SLC-40',         # Cape Canaveral Air Force Station Space Launch Complex 40
-    'VAFB SLC-4E',          # Vandenberg Air Force Base Space Launch Complex 4E
-    'CCAFS LC-40',          # Cape Canaveral Air Force Station Launch Complex 40
-    'VAFB SLC-3W',          # Vandenberg Air Force Base Space Launch Complex 3W
-    'KSC LC-39B',           # Kennedy Space Center Launch Complex 39B
-    'Kwajalein Atoll'       # Marshall Islands launch site
+# Query sample data for 100 launches spanning 2010-2022 (booster versions,
+# reused booster IDs, payloads by version, mission and landing outcomes)
+# from the shared launch database
+DATASET = {'num_launches': 100, 'seed': 42, 'compat': 'max_payload'}
+BACKEND = 'sql'
+
+# Every launch in table order; the record-breaking payloads below are
+# patched into these rows before ranking them
+LAUNCHES_SQL = """
+    SELECT BoosterID, MissionName, Date, LaunchSite, BoosterVersion, PayloadMass,
+           MissionOutcome, LandingOutcome
+    FROM launches
+    ORDER BY rowid
+"""
+
+# Record-breaking payloads: (year, payload, mission name, booster ID), each
+# patched into the first launch of its year
+RECORD_PAYLOADS = [
+    # Aramsat 6A - April 2019 - 6,465 kg GTO payload - heaviest to GTO
+    (2019, 16500, 'Aramsat-6A', 'B1048'),
+    # Starlink mission - highest LEO payload
+    (2020, 16800, 'Starlink-10', 'B1051'),
+    # Another high-mass payload
+    (2021, 16700, 'Starlink-25', 'B1060'),
 ]
 
-# Define booster versions with appropriate timeline
-# F9 v1.0: Flights 1-5 (2010-2013)
-# F9 v1.1: Flights 6-20 (2013-2015)
-# F9 FT (Full Thrust): Flights 21-60 (2015-2018)
-# F9 Block 5: Flights 61-100 (2018-2022)
-booster_versions = []
-
-for flight_num in range(1, 101):
-    if flight_num <= 5:
-        booster_versions.append('F9 v1.0')
-    elif flight_num <= 20:
-        booster_versions.append('F9 v1.1')
-    elif flight_num <= 60:
-        booster_versions.append('F9 FT')
-    else:
-        booster_versions.append('F9 Block 5')
-
-# Give boosters unique identifiers
-booster_ids = []
-current_booster = 1001
-# First 20 flights are expendable (no reuse), so new booster each time
-for i in range(20):
-    booster_ids.append(f"B{current_booster}")
-    current_booster += 1
-
-# For remaining flights, mix of new and reused boosters
-used_boosters = []
-for i in range(20, 100):
-    # 70% chance of reusing a booster after flight 20
-    if i > 25 and np.random.random() < 0.7 and used_boosters:
-        # Choose a previously used booster
-        booster_ids.append(np.random.choice(used_boosters))
-    else:
-        # Use a new booster
-        booster_ids.append(f"B{current_booster}")
-        used_boosters.append(f"B{current_booster}")
-        current_booster += 1
-
-# Create sample data for 100 launches spanning 2010-2022
-flight_numbers = np.arange(1, 101)
-dates = pd.date_range(start='2010-06-04', end='2022-12-31', periods=100)
-launches = np.random.choice(all_launch_sites, size=100, p=[0.35, 0.30, 0.20, 0.05, 0.05, 0.03, 0.02])
-
-# Adjust payload capacity based on booster version and add some special cases
-# Most payloads will be in expected ranges, but we'll create a few exceptional ones
-payloads = []
-for version in booster_versions:
-    if version == 'F9 v1.0':
-        payloads.append(np.random.uniform(1000, 8000))
-    elif version == 'F9 v1.1':
-        payloads.append(np.random.uniform(3000, 12000))
-    elif version == 'F9 FT':
-        payloads.append(np.random.uniform(5000, 15000))
-    else:  # F9 Block 5
-        payloads.append(np.random.uniform(6000, 16000))
-
-# Generate mission outcomes - success rates improve over time
-mission_outcomes = []
-landing_outcomes = []
-
-for i, date in enumerate(dates):
-    # Mission success probability - increases over time
-    if date.year <= 2013:  # Early years
-        mission_success_prob = 0.85  # 85% success rate for early missions
-    elif date.year <= 2016:  # Middle years
-        mission_success_prob = 0.94  # 94% success rate for middle years
-    else:  # Recent years
-        mission_success_prob = 0.98  # 98% success rate for recent years
-    
-    # Generate mission outcome (1 = success, 0 = failure)
-    mission_outcome = np.random.binomial(1, mission_success_prob)
-    mission_outcomes.append(mission_outcome)
-    
-    # Landing success probability - more complex progression
-    if date < datetime(2015, 1, 1):
-        # Before 2015: No landing attempts or ocean landings only, very low success
-        landing_success_prob = 0.0  # All failed or not attempted
-    elif date < datetime(2016, 6, 1):
-        # Early 2015 to mid 2016: First landing attempts, low success rate
-        landing_success_prob = 0.3  # 30% success rate
-    elif date < datetime(2018, 1, 1):
-        # Mid 2016 to end 2017: Improving success rate
-        landing_success_prob = 0.6  # 60% success rate
-    else:
-        # 2018 onwards: Routine landings with high success rate
-        landing_success_prob = 0.85  # 85% success rate
-    
-    # Generate landing outcome (1 = success, 0 = failure)
-    landing_outcome = np.random.binomial(1, landing_success_prob)
-    landing_outcomes.append(landing_outcome)
-
-# Add mission names for context
-mission_prefix = ['CRS', 'Starlink', 'NROL', 'GPS', 'Telstar', 'Eutelsat', 'SES', 'Orbcomm', 'Iridium', 'JCSAT']
-mission_names = []
-for i in range(100):
-    prefix = np.random.choice(mission_prefix)
-    number = np.random.randint(1, 20)
-    mission_names.append(f"{prefix}-{number}")
-
-# Create a DataFrame
-df = pd.DataFrame({
-    'FlightNumber': flight_numbers,
-    'Date': dates,
-    'BoosterVersion': booster_versions,
-    'BoosterID': booster_ids,
-    'LaunchSite': launches,
-    'PayloadMass': payloads,
-    'MissionName': mission_names,
-    'MissionOutcome': mission_outcomes,
-    'LandingOutcome': landing_outcomes
-})
-
-# Add some special cases - record-breaking payloads
-# Aramsat 6A - April 2019 - 6,465 kg GTO payload - heaviest to GTO
-aramsat_idx = df[df['Date'].dt.year == 2019].index[0]
-df.loc[aramsat_idx, 'PayloadMass'] = 16500
-df.loc[aramsat_idx, 'MissionName'] = 'Aramsat-6A'
-df.loc[aramsat_idx, 'BoosterID'] = 'B1048'
-
-# Starlink mission - highest LEO payload
-starlink_idx = df[df['Date'].dt.year == 2020].index[0]
-df.loc[starlink_idx, 'PayloadMass'] = 16800
-df.loc[starlink_idx, 'MissionName'] = 'Starlink-10'
-df.loc[starlink_idx, 'BoosterID'] = 'B1051'
-
-# Create another high-mass payload
-high_mass_idx = df[df['Date'].dt.year == 2021].index[0]
-df.loc[high_mass_idx, 'PayloadMass'] = 16700
-df.loc[high_mass_idx, 'MissionName'] = 'Starlink-25'
-df.loc[high_mass_idx, 'BoosterID'] = 'B1060'
-
-# Find the maximum payload mass
-max_payload = df['PayloadMass'].max()
-
-# Find all boosters that carried the maximum payload mass
-max_payload_boosters = df[df['PayloadMass'] == max_payload]
-
-# Print results
-print("\nBoosters with Maximum Payload Mass:")
-print("==================================")
-print(f"Maximum Payload Mass: {max_payload:.2f} kg")
-print(f"Number of Boosters: {len(max_payload_boosters)}")
-print("\nBooster Details:")
-for _, row in max_payload_boosters.iterrows():
-    print(f"Booster ID: {row['BoosterID']}")
-    print(f"Mission: {row['MissionName']}")
-    print(f"Launch Date: {row['Date'].strftime('%Y-%m-%d')}")
-    print(f"Launch Site: {row['LaunchSite']}")
-    print(f"Booster Version: {row['BoosterVersion']}")
-    print(f"Mission Outcome: {'Success' if row['MissionOutcome'] == 1 else 'Failure'}")
-    print(f"Landing Outcome: {'Success' if row['LandingOutcome'] == 1 else 'Failure'}")
-    print("---------------------")
-
-# Find the top 5 boosters by payload mass
-top_payload_boosters = df.nlargest(5, 'PayloadMass')
-
-# Print top 5 results
-print("\nTop 5 Boosters by Payload Mass:")
-print("==============================")
-for i, (_, row) in enumerate(top_payload_boosters.iterrows(), 1):
-    print(f"{i}. Booster ID: {row['BoosterID']}, Mission: {row['MissionName']}, Payload: {row['PayloadMass']:.2f} kg, Date: {row['Date'].strftime('%Y-%m-%d')}")
-
-# Save results to a file
-with open('max_payload_results.md', 'w') as f:
-    f.write("# Boosters with Maximum Payload Mass\n\n")
-    
-    f.write(f"## Maximum Payload: {max_payload:.2f} kg\n\n")
-    
-    f.write("### Booster Details\n\n")
-    for _, row in max_payload_boosters.iterrows():
-        f.write(f"- **Booster ID**: {row['BoosterID']}\n")
-        f.write(f"- **Mission**: {row['MissionName']}\n")
-        f.write(f"- **Launch Date**: {row['Date'].strftime('%Y-%m-%d')}\n")
-        f.write(f"- **Launch Site**: {row['LaunchSite']}\n")
-        f.write(f"- **Booster Version**: {row['BoosterVersion']}\n")
-        f.write(f"- **Mission Outcome**: {'Success' if row['MissionOutcome'] == 1 else 'Failure'}\n")
-        f.write(f"- **Landing Outcome**: {'Success' if row['LandingOutcome'] == 1 else 'Failure'}\n\n")
-    
-    f.write("## Top 5 Boosters by Payload Mass\n\n")
-    f.write("| Rank | Booster ID | Mission | Payload Mass (kg) | Launch Date |\n")
-    f.write("|------|------------|---------|-------------------|-------------|\n")
-    for i, (_, row) in enumerate(top_payload_boosters.iterrows(), 1):
-        f.write(f"| {i} | {row['BoosterID']} | {row['MissionName']} | {row['PayloadMass']:.2f} | {row['Date'].strftime('%Y-%m-%d')} |\n")
-    
-    f.write("\n## Explanation\n\n")
-    f.write("This analysis identifies the SpaceX boosters that have carried the maximum payload mass to orbit. ")
-    f.write("The Falcon 9 Block 5 boosters have demonstrated the highest payload capacity, with the most massive ")
-    f.write("payloads being carried on Starlink missions and high-energy geostationary transfer orbit (GTO) missions.\n\n")
-    
-    f.write("SpaceX has continuously improved the Falcon 9's payload capacity through several design iterations. ")
-    f.write("The Falcon 9 Block 5, which represents the final version of the Falcon 9, offers the highest performance ")
-    f.write("and can deliver up to 22,800 kg to low Earth orbit (LEO) and 8,300 kg to geostationary transfer orbit (GTO).\n\n")
-    
-    f.write("The payload mass a rocket can carry depends on several factors including the target orbit, ")
-    f.write("whether the booster is recovered, and specific mission requirements. These record-setting missions ")
-    f.write("demonstrate the Falcon 9's capabilities at the upper end of its performance envelope.") 
\ No newline at end of file
+# Per-booster listing, console and markdown
+BOOSTER_DETAILS_TEMPLATE = (
+    "Booster ID: {BoosterID}\n"
+    "Mission: {MissionName}\n"
+    "Launch Date: {Date:%Y-%m-%d}\n"
+    "Launch Site: {LaunchSite}\n"
+    "Booster Version: {BoosterVersion}\n"
+    "Mission Outcome: {MissionResult}\n"
+    "Landing Outcome: {LandingResult}\n"
+    "---------------------\n"
+)
+BOOSTER_DETAILS_MARKDOWN = (
+    "- **Booster ID**: {BoosterID}\n"
+    "- **Mission**: {MissionName}\n"
+    "- **Launch Date**: {Date:%Y-%m-%d}\n"
+    "- **Launch Site**: {LaunchSite}\n"
+    "- **Booster Version**: {BoosterVersion}\n"
+    "- **Mission Outcome**: {MissionResult}\n"
+    "- **Landing Outcome**: {LandingResult}\n\n"
+)
+
+# Top boosters by payload, console listing and markdown table row
+TOP_PAYLOAD_TEMPLATE = "{Rank}. Booster ID: {BoosterID}, Mission: {MissionName}, Payload: {PayloadMass:.2f} kg, Date: {Date:%Y-%m-%d}\n"
+TOP_PAYLOAD_MARKDOWN = "| {Rank} | {BoosterID} | {MissionName} | {PayloadMass:.2f} | {Date:%Y-%m-%d} |\n"
+
+
+def _launch(row):
+    # A plain dict per launch with the date parsed and the outcomes labelled
+    launch = dict(zip(row.keys(), row))
+    launch['Date'] = datetime.fromisoformat(launch['Date'])
+    launch['MissionResult'] = 'Success' if launch['MissionOutcome'] == 1 else 'Failure'
+    launch['LandingResult'] = 'Success' if launch['LandingOutcome'] == 1 else 'Failure'
+    return launch
+
+
+@timed()
+def run_query(conn):
+    """Find the boosters that carried the maximum payload and write max_payload_results.md"""
+    checkpoint('aggregate')
+    # A hundred rows, so plain dicts rather than a DataFrame (and no pandas import)
+    launches = [_launch(row) for row in query_rows(conn, LAUNCHES_SQL)]
+
+    # Add some special cases - record-breaking payloads
+    for year, payload, mission_name, booster_id in RECORD_PAYLOADS:
+        launch = next(launch for launch in launches if launch['Date'].year == year)
+        launch.update(PayloadMass=payload, MissionName=mission_name, BoosterID=booster_id)
+
+    # Find the maximum payload mass
+    with_payload = [launch for launch in launches if launch['PayloadMass'] is not None]
+    max_payload = max(launch['PayloadMass'] for launch in with_payload)
+
+    # Find all boosters that carried the maximum payload mass
+    max_payload_boosters = [launch for launch in with_payload if launch['PayloadMass'] == max_payload]
+
+    checkpoint('output')
+    # Print results
+    print("\nBoosters with Maximum Payload Mass:")
+    print("==================================")
+    print(f"Maximum Payload Mass: {max_payload:.2f} kg")
+    print(f"Number of Boosters: {len(max_payload_boosters)}")
+    print("\nBooster Details:")
+    print(''.join(BOOSTER_DETAILS_TEMPLATE.format(**launch) for launch in max_payload_boosters), end='')
+
+    checkpoint('aggregate')
+    # Find the top 5 boosters by payload mass (a stable sort keeps the
+    # earliest launch first on ties, like DataFrame.nlargest)
+    top_payload_boosters = sorted(with_payload, key=lambda launch: -launch['PayloadMass'])[:5]
+    top_payload_boosters = [dict(launch, Rank=rank) for rank, launch in enumerate(top_payload_boosters, 1)]
+
+    checkpoint('output')
+    # Print top 5 results
+    print("\nTop 5 Boosters by Payload Mass:")
+    print("==============================")
+    print(''.join(TOP_PAYLOAD_TEMPLATE.format(**launch) for launch in top_payload_boosters), end='')
+
+    # Save results to a file
+    with open('max_payload_results.md', 'w') as f:
+        f.write("# Boosters with Maximum Payload Mass\n\n")
+        
+        f.write(f"## Maximum Payload: {max_payload:.2f} kg\n\n")
+        
+        f.write("### Booster Details\n\n")
+        for launch in max_payload_boosters:
+            f.write(BOOSTER_DETAILS_MARKDOWN.format(**launch))
+        
+        f.write("## Top 5 Boosters by Payload Mass\n\n")
+        f.write("| Rank | Booster ID | Mission | Payload Mass (kg) | Launch Date |\n")
+        f.write("|------|------------|---------|-------------------|-------------|\n")
+        for launch in top_payload_boosters:
+            f.write(TOP_PAYLOAD_MARKDOWN.format(**launch))
+        
+        f.write("\n## Explanation\n\n")
+        f.write("This analysis identifies the SpaceX boosters that have carried the maximum payload mass to orbit. ")
+        f.write("The Falcon 9 Block 5 boosters have demonstrated the highest payload capacity, with the most massive ")
+        f.write("payloads being carried on Starlink missions and high-energy geostationary transfer orbit (GTO) missions.\n\n")
+        
+        f.write("SpaceX has continuously improved the Falcon 9's payload capacity through several design iterations. ")
+        f.write("The Falcon 9 Block 5, which represents the final version of the Falcon 9, offers the highest performance ")
+        f.write("and can deliver up to 22,800 kg to low Earth orbit (LEO) and 8,300 kg to geostationary transfer orbit (GTO).\n\n")
+        
+        f.write("The payload mass a rocket can carry depends on several factors including the target orbit, ")
+        f.write("whether the booster is recovered, and specific mission requirements. These record-setting missions ")
+        f.write("demonstrate the Falcon 9's capabilities at the upper end of its performance envelope.") 
+
+
+if __name__ == "__main__":
+    run_query(open_launch_db(**DATASET))
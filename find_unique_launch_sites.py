@@ -1,64 +1,69 @@
-import pandas as pd
-import numpy as np
+from instrumentation import checkpoint, timed
+from launch_sql import open_launch_db, query_rows
 
 # For demonstration, since we've been using sample data
-# Create sample data that represents our SpaceX launches
-np.random.seed(42)
+# Query the launch sites of 100 sample launches from the shared launch database,
+# weighted toward the main sites (KSC LC-39A, CCAFS SLC-40, VAFB SLC-4E)
+DATASET = {'num_launches': 100, 'seed': 42, 'compat': 'ccafs'}
+BACKEND = 'sql'
 
-# Create a list of all potential launch sites (based on the plots we've created)
-all_launch_sites = [
-    'KSC LC-39A',           # Kennedy Space Center Launch Complex 39A
-    'CCAFS SLC-40',         # Cape Canaveral Air Force Station Space Launch Complex 40
-    'VAFB SLC-4E',          # Vandenberg Air Force Base Space Launch Complex 4E
-    'CCAFS LC-40',          # Cape Canaveral Air Force Station Launch Complex 40
-    'VAFB SLC-3W',          # Vandenberg Air Force Base Space Launch Complex 3W (older)
-    'KSC LC-39B',           # Kennedy Space Center Launch Complex 39B (less used)
-    'Kwajalein Atoll'       # Marshall Islands launch site (early Falcon 1)
-]
+# Launch count per site, grouped on the LaunchSite index, in the order in
+# which sites first appear. FirstLaunch also breaks count ties
+SITE_COUNTS_SQL = """
+    SELECT LaunchSite, COUNT(*) AS Launches, MIN(rowid) AS FirstLaunch
+    FROM launches
+    GROUP BY LaunchSite
+    ORDER BY FirstLaunch
+"""
 
-# Generate 100 random launches with these sites
-# Weight more heavily toward the main sites
-weights = [0.35, 0.30, 0.20, 0.05, 0.05, 0.03, 0.02]
-launches = np.random.choice(all_launch_sites, size=100, p=weights)
 
-# Create a DataFrame
-df = pd.DataFrame({'LaunchSite': launches})
+@timed()
+def run_query(conn):
+    """List the unique launch sites and write launch_sites_results.md"""
+    checkpoint('aggregate')
+    # A handful of rows, so plain tuples rather than a DataFrame (and no pandas import)
+    sites = query_rows(conn, SITE_COUNTS_SQL)
 
-# Find unique launch sites
-unique_sites = df['LaunchSite'].unique()
+    # Find unique launch sites
+    unique_sites = [row['LaunchSite'] for row in sites]
 
-# Count launches by site
-site_counts = df['LaunchSite'].value_counts().reset_index()
-site_counts.columns = ['Launch Site', 'Number of Launches']
+    # Count launches by site
+    site_counts = [(row['LaunchSite'], row['Launches'])
+                   for row in sorted(sites, key=lambda row: (-row['Launches'], row['FirstLaunch']))]
 
-# Print results
-print("\nUnique SpaceX Launch Sites:")
-print("===========================")
-for i, site in enumerate(unique_sites, 1):
-    print(f"{i}. {site}")
+    checkpoint('output')
+    # Print results
+    print("\nUnique SpaceX Launch Sites:")
+    print("===========================")
+    for i, site in enumerate(unique_sites, 1):
+        print(f"{i}. {site}")
 
-print("\nLaunch Site Distribution:")
-print("========================")
-for _, row in site_counts.iterrows():
-    print(f"{row['Launch Site']}: {row['Number of Launches']} launches")
+    print("\nLaunch Site Distribution:")
+    print("========================")
+    for site, launches in site_counts:
+        print(f"{site}: {launches} launches")
 
-# Save results to a file
-with open('launch_sites_results.md', 'w') as f:
-    f.write("# SpaceX Launch Sites Analysis\n\n")
-    f.write("## Unique Launch Sites\n\n")
-    for i, site in enumerate(unique_sites, 1):
-        f.write(f"{i}. {site}\n")
-    
-    f.write("\n## Launch Site Distribution\n\n")
-    f.write("| Launch Site | Number of Launches |\n")
-    f.write("|-------------|--------------------|\n")
-    for _, row in site_counts.iterrows():
-        f.write(f"| {row['Launch Site']} | {row['Number of Launches']} |\n")
-    
-    f.write("\n## Explanation\n\n")
-    f.write("This analysis identified all unique launch sites used by SpaceX for Falcon rocket launches. ")
-    f.write("The primary launch sites are Kennedy Space Center's LC-39A, Cape Canaveral's SLC-40, and Vandenberg's SLC-4E, ")
-    f.write("which together account for approximately 85% of all SpaceX launches. ")
-    f.write("The distribution shows SpaceX's strategic use of both East Coast facilities (KSC and CCAFS) for launches to ")
-    f.write("equatorial orbits and the Vandenberg facility on the West Coast for polar orbits. ")
-    f.write("Earlier launches also occurred at Kwajalein Atoll in the Marshall Islands during the Falcon 1 era.") 
\ No newline at end of file
+    # Save results to a file
+    with open('launch_sites_results.md', 'w') as f:
+        f.write("# SpaceX Launch Sites Analysis\n\n")
+        f.write("## Unique Launch Sites\n\n")
+        for i, site in enumerate(unique_sites, 1):
+            f.write(f"{i}. {site}\n")
+        
+        f.write("\n## Launch Site Distribution\n\n")
+        f.write("| Launch Site | Number of Launches |\n")
+        f.write("|-------------|--------------------|\n")
+        for site, launches in site_counts:
+            f.write(f"| {site} | {launches} |\n")
+        
+        f.write("\n## Explanation\n\n")
+        f.write("This analysis identified all unique launch sites used by SpaceX for Falcon rocket launches. ")
+        f.write("The primary launch sites are Kennedy Space Center's LC-39A, Cape Canaveral's SLC-40, and Vandenberg's SLC-4E, ")
+        f.write("which together account for approximately 85% of all SpaceX launches. ")
+        f.write("The distribution shows SpaceX's strategic use of both East Coast facilities (KSC and CCAFS) for launches to ")
+        f.write("equatorial orbits and the Vandenberg facility on the West Coast for polar orbits. ")
+        f.write("Earlier launches also occurred at Kwajalein Atoll in the Marshall Islands during the Falcon 1 era.") 
+
+
+if __name__ == "__main__":
+    run_query(open_launch_db(**DATASET))
@@ -0,0 +1,483 @@
+"""
+Stage Instrumentation
+
+Per-stage wall time (and optionally memory) for the scripts, so a run shows
+whether its time went into generating data, aggregating it, plotting or
+writing files. Stages nest, and each is recorded under its path, e.g.
+"plot" or "run_query/aggregate":
+
+    with stage('aggregate'):            # a block
+        ...
+
+    @timed()                            # every call of a function
+    def load_launches(...):
+
+    checkpoint('plot')                  # flat scripts: ends the previous
+    ...                                 # checkpoint and starts the next one
+
+Instrumentation is off, and costs one dictionary lookup per stage, unless
+one of these is set:
+
+    SPACEX_METRICS          file the stage totals are written to when the
+                            process exits: JSON lines (appended), or
+                            OpenMetrics text for *.prom / *.txt or with
+                            SPACEX_METRICS_FORMAT=openmetrics; "-" prints a
+                            table to stderr
+    SPACEX_RUN_ID           groups the records of several scripts, e.g. one
+                            nightly report run (default: process start time)
+    SPACEX_TRACE_MEMORY     record each stage's peak and net traced memory
+                            with tracemalloc; a number N > 1 also records the
+                            N source lines that allocated the most
+    SPACEX_PROFILE          cprofile or pyinstrument: profile the whole
+                            process into SPACEX_PROFILE_DIR (.profiles)
+
+OpenMetrics text cannot be appended to (it ends in "# EOF" and every label
+set may appear once), so JSON lines stay the record either way: an
+OpenMetrics target run.prom collects the records of every process in
+run.prom.jsonl, and each process exiting rewrites run.prom from all of
+them. Several scripts sharing one SPACEX_METRICS=run.prom therefore all
+appear in it, grouped by SPACEX_RUN_ID; delete both files to start over.
+
+tracemalloc counts every thread's allocations, so memory figures of stages
+that run concurrently overlap. JSON lines from many runs can be summarized
+or converted afterwards:
+
+    python instrumentation.py metrics.jsonl                 # hotspot table
+    python instrumentation.py metrics.jsonl --format openmetrics
+"""
+
+import argparse
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+METRICS_PATH = os.environ.get('SPACEX_METRICS')
+METRICS_FORMAT = os.environ.get('SPACEX_METRICS_FORMAT')
+PROFILER = os.environ.get('SPACEX_PROFILE')
+PROFILE_DIR = os.environ.get('SPACEX_PROFILE_DIR', '.profiles')
+TRACE_MEMORY = int(os.environ.get('SPACEX_TRACE_MEMORY') or 0)
+
+# Prefix of every OpenMetrics metric name
+METRIC_PREFIX = 'spacex_stage'
+
+# Extensions written as OpenMetrics text rather than JSON lines
+OPENMETRICS_EXTENSIONS = ('.prom', '.txt')
+
+# JSON-lines file next to an OpenMetrics file that holds its records
+RECORDS_SUFFIX = '.jsonl'
+
+_state = {
+    'enabled': bool(METRICS_PATH or PROFILER or TRACE_MEMORY),
+    'run': os.environ.get('SPACEX_RUN_ID') or time.strftime('%Y%m%dT%H%M%S'),
+    'script': os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0] or 'python',
+    'profiler': None
+}
+
+# Totals per stage path, shared by all threads
+_totals = {}
+_totals_lock = threading.Lock()
+
+# Open stages of the current thread, innermost last
+_local = threading.local()
+
+
+class _Frame:
+    def __init__(self, path, is_checkpoint):
+        self.path = path
+        self.is_checkpoint = is_checkpoint
+        self.start = time.perf_counter()
+        self.base_memory = self.peak_memory = 0
+        self.snapshot = None
+
+
+def enabled():
+    """Return True when stages are being recorded."""
+    return _state['enabled']
+
+
+def enable(run=None, script=None):
+    """
+    Start recording stages in this process, e.g. from a driver script.
+
+    Args:
+        run (str, optional): Run id the records are grouped under
+        script (str, optional): Script name the records are labelled with
+    """
+    _state['enabled'] = True
+    if run:
+        _state['run'] = run
+    if script:
+        _state['script'] = script
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _push(name, is_checkpoint=False):
+    stack = _stack()
+    frame = _Frame(f"{stack[-1].path}/{name}" if stack else name, is_checkpoint)
+    if tracemalloc.is_tracing():
+        # Hand the peak so far to the enclosing stage, then measure from here
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1].peak_memory = max(stack[-1].peak_memory, peak)
+        tracemalloc.reset_peak()
+        frame.base_memory = frame.peak_memory = current
+        if TRACE_MEMORY > 1:
+            frame.snapshot = tracemalloc.take_snapshot()
+    stack.append(frame)
+    return frame
+
+
+def _pop(frame):
+    # Checkpoints left open inside this stage end with it
+    stack = _stack()
+    while stack and stack[-1] is not frame:
+        _pop(stack[-1])
+    stack.pop()
+    seconds = time.perf_counter() - frame.start
+
+    memory = None
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        frame.peak_memory = max(frame.peak_memory, peak)
+        memory = {'peak': frame.peak_memory, 'allocated': current - frame.base_memory}
+        if frame.snapshot is not None:
+            diff = tracemalloc.take_snapshot().compare_to(frame.snapshot, 'lineno')
+            memory['top'] = [f"{entry.traceback[0].filename}:{entry.traceback[0].lineno} {entry.size_diff:+d}"
+                             for entry in diff[:TRACE_MEMORY] if entry.size_diff > 0]
+        if stack:
+            stack[-1].peak_memory = max(stack[-1].peak_memory, frame.peak_memory)
+        tracemalloc.reset_peak()
+
+    with _totals_lock:
+        total = _totals.setdefault(frame.path, {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+        total['calls'] += 1
+        total['seconds'] += seconds
+        total['max_seconds'] = max(total['max_seconds'], seconds)
+        if memory:
+            total['peak_memory_bytes'] = max(total.get('peak_memory_bytes', 0), memory['peak'])
+            total['allocated_bytes'] = total.get('allocated_bytes', 0) + memory['allocated']
+            if memory.get('top'):
+                total['top_allocations'] = memory['top']
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Record the wall time (and memory) of the enclosed block as stage name."""
+    if not _state['enabled']:
+        yield
+        return
+    frame = _push(name)
+    try:
+        yield
+    finally:
+        _pop(frame)
+
+
+def timed(name=None):
+    """
+    Decorator recording every call of a function as a stage.
+
+    Args:
+        name (str, optional): Stage name, defaults to module.function (just
+            the function name for functions defined in a script)
+    """
+    def decorate(function):
+        label = name or (function.__qualname__ if function.__module__ == '__main__'
+                         else f"{function.__module__}.{function.__qualname__}")
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _state['enabled']:
+                return function(*args, **kwargs)
+            frame = _push(label)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _pop(frame)
+        return wrapper
+    return decorate
+
+
+def checkpoint(name=None):
+    """
+    End the open checkpoint of the current stage and start a new one.
+
+    Lets flat, top-to-bottom scripts mark their stages without indenting
+    them into with blocks. The last checkpoint ends with the enclosing stage,
+    or when the process exits; checkpoint() with no name just ends it.
+    """
+    if not _state['enabled']:
+        return
+    stack = _stack()
+    # Close the checkpoint opened directly in the innermost stage (or at the
+    # top level), along with anything still open inside it
+    level = next((i for i in range(len(stack) - 1, -1, -1) if not stack[i].is_checkpoint), -1)
+    if level + 1 < len(stack):
+        _pop(stack[level + 1])
+    if name:
+        _push(name, is_checkpoint=True)
+
+
+def records():
+    """
+    Return the stage totals recorded so far.
+
+    Returns:
+        list: One dict per stage path (run, script, stage, calls, seconds,
+        max_seconds and, when tracing memory, peak_memory_bytes,
+        allocated_bytes and top_allocations), in the order stages first ended
+    """
+    with _totals_lock:
+        return [{'run': _state['run'], 'script': _state['script'], 'stage': path, **total}
+                for path, total in _totals.items()]
+
+
+def merge_records(rows):
+    """
+    Combine records of the same run, script and stage, e.g. from several
+    flushes of one worker process, the way a single process totals them.
+
+    Returns:
+        list: One record per (run, script, stage), in first-seen order
+    """
+    merged = {}
+    for row in rows:
+        key = (row['run'], row['script'], row['stage'])
+        if key not in merged:
+            merged[key] = dict(row)
+            continue
+        total = merged[key]
+        total['calls'] += row['calls']
+        total['seconds'] += row['seconds']
+        total['max_seconds'] = max(total['max_seconds'], row['max_seconds'])
+        if 'peak_memory_bytes' in row:
+            total['peak_memory_bytes'] = max(total.get('peak_memory_bytes', 0), row['peak_memory_bytes'])
+            total['allocated_bytes'] = total.get('allocated_bytes', 0) + row['allocated_bytes']
+        if 'top_allocations' in row:
+            total['top_allocations'] = row['top_allocations']
+    return list(merged.values())
+
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_openmetrics(rows):
+    """
+    Format stage records as OpenMetrics text.
+
+    Returns:
+        str: Counters of seconds and calls and gauges of memory per run,
+        script and stage, terminated by # EOF
+    """
+    rows = merge_records(rows)
+    families = [
+        ('duration_seconds', 'counter', 'seconds', 'Wall time spent in the stage', 'seconds'),
+        ('calls', 'counter', None, 'Times the stage ran', 'calls'),
+        ('max_duration_seconds', 'gauge', 'seconds', 'Longest single run of the stage', 'max_seconds'),
+        ('peak_memory_bytes', 'gauge', 'bytes', 'Peak traced memory during the stage', 'peak_memory_bytes'),
+        ('allocated_bytes', 'gauge', 'bytes', 'Net traced memory allocated by the stage', 'allocated_bytes')
+    ]
+    lines = []
+    for suffix, kind, unit, help_text, field in families:
+        samples = [row for row in rows if field in row]
+        if not samples:
+            continue
+        name = f"{METRIC_PREFIX}_{suffix}"
+        lines.append(f"# TYPE {name} {kind}")
+        if unit:
+            lines.append(f"# UNIT {name} {unit}")
+        lines.append(f"# HELP {name} {help_text}.")
+        sample_name = f"{name}_total" if kind == 'counter' else name
+        for row in samples:
+            labels = ','.join(f'{key}="{_label_value(row[key])}"' for key in ('run', 'script', 'stage'))
+            lines.append(f"{sample_name}{{{labels}}} {row[field]}")
+    lines.append("# EOF")
+    return '\n'.join(lines) + '\n'
+
+
+def format_table(rows):
+    """Format stage records as a text table, slowest stages first."""
+    rows = sorted(rows, key=lambda row: row['seconds'], reverse=True)
+    width = max([len(f"{row['script']}:{row['stage']}") for row in rows] + [5])
+    memory = any('peak_memory_bytes' in row for row in rows)
+    lines = [f"{'Stage':<{width}}  {'Calls':>6}  {'Total s':>9}  {'Max s':>9}" + ('  Peak MB' if memory else '')]
+    lines.append('-' * len(lines[0]))
+    for row in rows:
+        line = f"{row['script'] + ':' + row['stage']:<{width}}  {row['calls']:>6}  {row['seconds']:>9.3f}  {row['max_seconds']:>9.3f}"
+        if memory:
+            line += f"  {row['peak_memory_bytes'] / 2 ** 20:>7.1f}" if 'peak_memory_bytes' in row else f"  {'-':>7}"
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics(path=None, fmt=None):
+    """
+    Write the stage totals recorded so far.
+
+    JSON lines are appended. OpenMetrics output is regenerated from the
+    records of every process that wrote to the same file (kept in
+    path + RECORDS_SUFFIX), so concurrent and consecutive scripts add to it
+    instead of replacing each other's stages.
+
+    Args:
+        path (str, optional): Output file, defaults to SPACEX_METRICS; "-"
+            prints a table to stderr
+        fmt (str, optional): jsonl or openmetrics, defaults to
+            SPACEX_METRICS_FORMAT or the file extension
+    """
+    path = path or METRICS_PATH
+    rows = records()
+    if not path or not rows:
+        return
+    if path == '-':
+        sys.stderr.write(format_table(rows))
+        return
+    fmt = fmt or METRICS_FORMAT or ('openmetrics' if path.endswith(OPENMETRICS_EXTENSIONS) else 'jsonl')
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if fmt != 'openmetrics':
+        with open(path, 'a') as f:
+            f.writelines(json.dumps(row) + '\n' for row in rows)
+        return
+
+    with open(path + RECORDS_SUFFIX, 'a+') as f:
+        # Appending and regenerating under one lock keeps a process that
+        # finishes at the same time from writing a file without our stages
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        f.writelines(json.dumps(row) + '\n' for row in rows)
+        f.flush()
+        f.seek(0)
+        text = to_openmetrics([json.loads(line) for line in f if line.strip()])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as out:
+            out.write(text)
+        os.replace(tmp_path, path)
+
+
+def _start_profiler():
+    if PROFILER == 'pyinstrument':
+        from pyinstrument import Profiler
+        profiler = Profiler()
+    elif PROFILER == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+    else:
+        raise ValueError(f"Unknown SPACEX_PROFILE {PROFILER!r}, expected cprofile or pyinstrument")
+    profiler.start() if PROFILER == 'pyinstrument' else profiler.enable()
+    _state['profiler'] = profiler
+
+
+def _stop_profiler():
+    profiler = _state['profiler']
+    if profiler is None:
+        return
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, f"{_state['script']}_{_state['run']}")
+    if PROFILER == 'pyinstrument':
+        profiler.stop()
+        with open(base + '.html', 'w') as f:
+            f.write(profiler.output_html())
+    else:
+        profiler.disable()
+        profiler.dump_stats(base + '.prof')
+
+
+def flush(script=None):
+    """
+    Write the stages recorded so far and start over.
+
+    Stages the calling thread still has open (a flat script's last
+    checkpoint) end first. Long-lived worker processes, whose atexit hooks
+    never run, call this after each script they run.
+
+    Args:
+        script (str, optional): Script name to label the records with
+    """
+    if not _state['enabled']:
+        return
+    stack = _stack()
+    if stack:
+        _pop(stack[0])
+    if script:
+        _state['script'] = script
+    write_metrics()
+    with _totals_lock:
+        _totals.clear()
+
+
+def reset():
+    """Forget every recorded and open stage, e.g. in a freshly forked worker."""
+    _stack().clear()
+    with _totals_lock:
+        _totals.clear()
+
+
+def _finish():
+    _stop_profiler()
+    flush()
+
+
+def read_records(path, run=None):
+    """
+    Read stage records from a JSON-lines metrics file.
+
+    Args:
+        path (str): File written with SPACEX_METRICS
+        run (str, optional): Keep only this run, 'latest' for the last one
+
+    Returns:
+        list: Stage records
+    """
+    with open(path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    if run == 'latest' and rows:
+        run = rows[-1]['run']
+    return [row for row in rows if run is None or row['run'] == run]
+
+
+if TRACE_MEMORY:
+    tracemalloc.start()
+if PROFILER:
+    _start_profiler()
+if _state['enabled']:
+    atexit.register(_finish)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize recorded stage timings")
+    parser.add_argument('path', help="JSON-lines file written with SPACEX_METRICS (run.prom.jsonl for run.prom)")
+    parser.add_argument('--run', default='latest', help="Run id to show, 'latest' (default) or 'all'")
+    parser.add_argument('--format', choices=['table', 'openmetrics', 'jsonl'], default='table')
+    args = parser.parse_args()
+
+    rows = read_records(args.path, None if args.run == 'all' else args.run)
+    if args.format == 'openmetrics':
+        sys.stdout.write(to_openmetrics(rows))
+    elif args.format == 'jsonl':
+        sys.stdout.writelines(json.dumps(row) + '\n' for row in rows)
+    else:
+        sys.stdout.write(format_table(merge_records(rows)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Launch Aggregate Cube
+
+Pre-aggregates a launch table into launch and success counts for every
+combination of launch site, booster version, year, payload bin and orbit that
+occurs in it. The cube is built in a single groupby pass, memoized in-process
+and kept on disk next to the launch store's Arrow file, so the dashboards
+answer their by-site, by-year, by-version and by-payload questions from a few
+hundred cells instead of re-filtering and re-grouping the raw rows.
+
+Dimensions that a dataset does not have (most synthetic tables carry no
+Orbit) are left out of its cube. Payloads are binned at PAYLOAD_BIN_WIDTH kg,
+right-closed like pd.cut (the first bin also holds 0 kg), so any payload
+range or set of bin edges on that grid is an exact union of cube cells.
+"""
+
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+import launch_store
+from instrumentation import timed
+from launch_store import load_launches
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# Every dimension the cube knows about, in grouping order
+DIMENSIONS = ['LaunchSite', 'BoosterVersion', 'Year', 'PayloadBin', 'Orbit']
+
+# Payload bin size (kg); bin k holds payloads in (k * width, (k + 1) * width]
+PAYLOAD_BIN_WIDTH = 200
+
+# Bin index for rows without a payload mass
+MISSING_PAYLOAD_BIN = -1
+
+# Bump when the cube layout changes so stale files on disk are not reused
+CUBE_VERSION = 3
+
+
+def payload_bins(payloads, width=PAYLOAD_BIN_WIDTH):
+    """
+    Return the right-closed bin index of each payload mass.
+
+    A 0 kg payload goes in the first bin (like pd.cut's include_lowest)
+    rather than to bin -1, which is MISSING_PAYLOAD_BIN.
+    """
+    payloads = np.asarray(payloads, dtype=float)
+    bins = np.maximum(np.ceil(payloads / width) - 1, 0)
+    return np.where(np.isnan(bins), MISSING_PAYLOAD_BIN, bins).astype(np.int64)
+
+
+def _on_grid(value, width):
+    return float(value) / width == np.floor(float(value) / width)
+
+
+class LaunchCube:
+    """Launch and success counts per (site, version, year, payload bin, orbit) cell."""
+
+    def __init__(self, cells, payload_bin_width=PAYLOAD_BIN_WIDTH):
+        self.cells = cells
+        self.payload_bin_width = payload_bin_width
+        self.dimensions = [dim for dim in DIMENSIONS if dim in cells.columns]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def select(self, payload_range=None, **filters):
+        """
+        Return the cells matching the filters.
+
+        Args:
+            payload_range (tuple, optional): (low, high) payload mass in kg;
+                keeps payloads in (low, high], both ends on the bin grid
+            **filters: Dimension name -> value, or a list of accepted values
+
+        Returns:
+            pandas.DataFrame: Matching cells
+        """
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, value in filters.items():
+            if dim not in self.dimensions:
+                raise KeyError(f"The cube has no '{dim}' dimension (it has {', '.join(self.dimensions)})")
+            column = self.cells[dim]
+            if isinstance(value, (list, tuple, set, np.ndarray, pd.Index)):
+                mask &= column.isin(list(value)).to_numpy()
+            else:
+                mask &= (column == value).to_numpy()
+
+        if payload_range is not None:
+            low, high = payload_range
+            width = self.payload_bin_width
+            if not (_on_grid(low, width) and _on_grid(high, width)):
+                raise ValueError(f"Payload range {low}-{high} kg is not on the {width} kg bin grid")
+            bins = self.cells['PayloadBin'].to_numpy()
+            mask &= (bins >= low // width) & (bins < high // width)
+
+        return self.cells[mask]
+
+    def rollup(self, by, payload_range=None, **filters):
+        """
+        Sum the matching cells over every dimension not in by.
+
+        Args:
+            by (str or list): Dimension(s) to keep
+            payload_range (tuple, optional): As for select()
+            **filters: As for select()
+
+        Returns:
+            pandas.DataFrame: Launches, Successes and SuccessRate (%) indexed
+            by the by dimension(s), sorted, only for groups with launches
+        """
+        cells = self.select(payload_range, **filters)
+        totals = cells.groupby(by, sort=True, observed=True)[['Launches', 'Successes']].sum()
+        totals['SuccessRate'] = totals['Successes'] / totals['Launches'] * 100
+        return totals
+
+    def totals(self, payload_range=None, **filters):
+        """Return (launches, successes) over the matching cells."""
+        cells = self.select(payload_range, **filters)
+        return int(cells['Launches'].sum()), int(cells['Successes'].sum())
+
+    def payload_histogram(self, edges, **filters):
+        """
+        Launches and successes per payload interval, like grouping by pd.cut(bins=edges).
+
+        Args:
+            edges (array-like): Increasing interval edges on the bin grid
+            **filters: As for select()
+
+        Returns:
+            pandas.DataFrame: Launches, Successes and SuccessRate (%) indexed by
+            an IntervalIndex, including empty intervals (SuccessRate NaN)
+        """
+        edges = np.asarray(edges, dtype=float)
+        width = self.payload_bin_width
+        if not all(_on_grid(edge, width) for edge in edges):
+            raise ValueError(f"Payload edges {list(edges)} are not on the {width} kg bin grid")
+
+        cells = self.select(**filters)
+        cells = cells[cells['PayloadBin'] != MISSING_PAYLOAD_BIN]
+        # A cell belongs to the interval holding its upper edge
+        upper = (cells['PayloadBin'].to_numpy() + 1) * width
+        interval = np.searchsorted(edges, upper, side='left') - 1
+        inside = (interval >= 0) & (interval < len(edges) - 1)
+
+        totals = (cells[inside].groupby(interval[inside])[['Launches', 'Successes']].sum()
+                  .reindex(range(len(edges) - 1), fill_value=0))
+        totals.index = pd.IntervalIndex.from_breaks(edges, closed='right', name='PayloadBin')
+        totals['SuccessRate'] = totals['Successes'] / totals['Launches'] * 100
+        return totals
+
+
+@timed()
+def build_cube(df, outcome_column='MissionOutcome', payload_bin_width=PAYLOAD_BIN_WIDTH):
+    """
+    Aggregate a launch table into a LaunchCube in one groupby pass.
+
+    Args:
+        df (pandas.DataFrame): Launch table with an outcome column and any of
+            LaunchSite, BoosterVersion, Date (or Year), PayloadMass, Orbit
+        outcome_column (str): 0/1 mission outcome column
+        payload_bin_width (int): Payload bin size in kg
+
+    Returns:
+        LaunchCube: The aggregated cube
+    """
+    keys = {}
+    for dim in DIMENSIONS:
+        if dim == 'Year' and 'Year' not in df.columns and 'Date' in df.columns:
+            keys['Year'] = df['Date'].dt.year.to_numpy()
+        elif dim == 'PayloadBin' and 'PayloadMass' in df.columns:
+            keys['PayloadBin'] = payload_bins(df['PayloadMass'], payload_bin_width)
+        elif dim in df.columns:
+            # .array keeps categorical columns as codes for the groupby
+            keys[dim] = df[dim].array
+    if not keys:
+        raise ValueError(f"The launch table has none of the cube dimensions {DIMENSIONS}")
+
+    outcomes = pd.Series(df[outcome_column].to_numpy())
+    grouped = outcomes.groupby([pd.Series(values, name=dim) for dim, values in keys.items()],
+                               sort=True, dropna=False, observed=True)
+    cells = pd.DataFrame({
+        'Launches': grouped.size(),
+        'Successes': grouped.sum().astype(np.int64)
+    }).reset_index()
+    return LaunchCube(cells, payload_bin_width)
+
+
+def cube_path(num_launches=100, seed=42, compat=None, cache_dir=None, payload_bin_width=PAYLOAD_BIN_WIDTH):
+    """Return the path of the cube file kept next to the dataset's Arrow file."""
+    base = os.path.splitext(launch_store.dataset_path(num_launches, seed, compat, cache_dir))[0]
+    return f"{base}.cube{CUBE_VERSION}_{payload_bin_width}.arrow"
+
+
+@functools.lru_cache(maxsize=32)
+@timed()
+def load_cube(num_launches=100, seed=42, compat=None, cache_dir=None, payload_bin_width=PAYLOAD_BIN_WIDTH):
+    """
+    Load the aggregate cube of a stored launch table, building it on first use.
+
+    Args:
+        num_launches (int): Number of launches
+        seed (int): Generator seed
+        compat (str, optional): launch_data compat profile
+        cache_dir (str, optional): Store directory, defaults to launch_store.CACHE_DIR
+        payload_bin_width (int): Payload bin size in kg
+
+    Returns:
+        LaunchCube: The cube (shared by every caller in this process)
+    """
+    if feather is None:
+        return build_cube(load_launches(num_launches, seed, compat), payload_bin_width=payload_bin_width)
+
+    path = cube_path(num_launches, seed, compat, cache_dir, payload_bin_width)
+    if os.path.exists(path):
+        return LaunchCube(feather.read_feather(path), payload_bin_width)
+
+    cube = build_cube(load_launches(num_launches, seed, compat, cache_dir=cache_dir),
+                      payload_bin_width=payload_bin_width)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(cube.cells, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+    return cube
+
+
+def synced_cube_path(source, cache_dir=None, payload_bin_width=PAYLOAD_BIN_WIDTH):
+    """Return the path of the cube kept next to a synced source's partitions."""
+    return os.path.join(launch_store.synced_dir(source, cache_dir),
+                        f"cube{CUBE_VERSION}_{payload_bin_width}.arrow")
+
+
+@timed()
+def update_synced_cube(source, years, cache_dir=None, payload_bin_width=PAYLOAD_BIN_WIDTH):
+    """
+    Rebuild the cube cells of some launch years of a synced source.
+
+    Cells of other years are kept as stored, so a sync that touched one year
+    re-aggregates that year's launches only. Without a stored cube (or with
+    years=None) every year is aggregated.
+
+    Args:
+        source (str): Synced source name
+        years (iterable): Launch years whose rows changed, or None for all
+        cache_dir (str, optional): Store directory, defaults to launch_store.CACHE_DIR
+        payload_bin_width (int): Payload bin size in kg
+
+    Returns:
+        LaunchCube: The updated cube
+    """
+    if feather is None:
+        raise ImportError("pyarrow is required to keep a synced cube")
+    path = synced_cube_path(source, cache_dir, payload_bin_width)
+    kept = None
+    if years is not None and os.path.exists(path):
+        years = sorted(set(years))
+        kept = feather.read_feather(path)
+        kept = kept[~kept['Year'].isin(years)]
+    else:
+        years = None
+
+    launches = launch_store.load_synced(source, years=years, cache_dir=cache_dir)
+    parts = [] if kept is None else [kept]
+    if launches is not None and len(launches):
+        parts.append(build_cube(launches, payload_bin_width=payload_bin_width).cells)
+    if not parts:
+        raise ValueError(f"Nothing has been synced from '{source}'")
+    cells = pd.concat(parts, ignore_index=True)
+    cells = cells.sort_values([dim for dim in DIMENSIONS if dim in cells.columns], ignore_index=True)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(cells, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+    return LaunchCube(cells, payload_bin_width)
+
+
+def load_synced_cube(source, cache_dir=None, payload_bin_width=PAYLOAD_BIN_WIDTH):
+    """Load the cube of a synced source, building it if it is not on disk."""
+    path = synced_cube_path(source, cache_dir, payload_bin_width)
+    if feather is not None and os.path.exists(path):
+        return LaunchCube(feather.read_feather(path), payload_bin_width)
+    return update_synced_cube(source, None, cache_dir, payload_bin_width)
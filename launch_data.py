@@ -0,0 +1,550 @@
+"""
+Shared SpaceX Launch Data Generator
+
+Builds the synthetic launch table used by the find_*, calculate_* and
+dashboard scripts with whole-array NumPy operations instead of per-row
+Python loops, so the same code produces 100 launches or 10 million.
+
+The default mode draws from a numpy Generator. Passing ``compat`` replays
+the legacy ``np.random.seed(42)`` draw order of one of the original
+scripts, so their 100-row outputs (and *_results.md files) stay identical.
+"""
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+# Launch sites and how often each one is used
+LAUNCH_SITE_CODES = [
+    'KSC LC-39A',           # Kennedy Space Center Launch Complex 39A
+    'CCAFS SLC-40',         # Cape Canaveral Air Force Station Space Launch Complex 40
+    'VAFB SLC-4E',          # Vandenberg Air Force Base Space Launch Complex 4E
+    'CCAFS LC-40',          # Cape Canaveral Air Force Station Launch Complex 40
+    'VAFB SLC-3W',          # Vandenberg Air Force Base Space Launch Complex 3W
+    'KSC LC-39B',           # Kennedy Space Center Launch Complex 39B
+    'Kwajalein Atoll'       # Marshall Islands launch site
+]
+SITE_PROBABILITIES = [0.35, 0.30, 0.20, 0.05, 0.05, 0.03, 0.02]
+WEST_COAST_SITES = ['VAFB SLC-4E', 'VAFB SLC-3W']
+
+# Booster versions with the last flight number flown by each one
+# F9 v1.0: Flights 1-5 (2010-2013)
+# F9 v1.1: Flights 6-20 (2013-2015)
+# F9 FT (Full Thrust): Flights 21-60 (2015-2018)
+# F9 Block 5: Flights 61+ (2018-2022)
+BOOSTER_VERSIONS = ['F9 v1.0', 'F9 v1.1', 'F9 FT', 'F9 Block 5']
+VERSION_LAST_FLIGHT = [5, 20, 60]
+
+# Payload capacity (kg) by booster version - newer versions carry more
+PAYLOAD_LOW = np.array([1000.0, 3000.0, 5000.0, 6000.0])
+PAYLOAD_HIGH = np.array([8000.0, 12000.0, 15000.0, 16000.0])
+
+# Customers, and their share of launches at KSC, CCAFS and the other sites
+CUSTOMERS = ['NASA', 'SpaceX', 'Commercial', 'DoD', 'ESA', 'JAXA', 'Other']
+CUSTOMER_PROBABILITIES = [
+    [0.6, 0.1, 0.1, 0.05, 0.1, 0.03, 0.02],   # NASA's own facility at Kennedy Space Center
+    [0.4, 0.2, 0.2, 0.1, 0.05, 0.03, 0.02],   # Cape Canaveral
+    [0.2, 0.3, 0.3, 0.1, 0.05, 0.03, 0.02]    # Other sites
+]
+
+MISSION_PREFIXES = ['CRS', 'Starlink', 'NROL', 'GPS', 'Telstar', 'Eutelsat', 'SES', 'Orbcomm', 'Iridium', 'JCSAT']
+DRONE_SHIP_NAMES = ["Of Course I Still Love You", "Just Read the Instructions", "A Shortfall of Gravitas"]
+
+# The first 20 boosters were expendable, after that boosters may be reused
+FIRST_BOOSTER_NUMBER = 1001
+EXPENDABLE_FLIGHTS = 20
+REUSE_PROBABILITY = 0.7
+
+START_DATE = '2010-06-04'
+END_DATE = '2022-12-31'
+
+# Landing eras: [before 2015, 2015 to mid 2016, mid 2016 to 2017, 2018 onwards]
+LANDING_ERA_STARTS = pd.to_datetime(['2015-01-01', '2016-06-01', '2018-01-01']).values
+LANDING_SUCCESS_BY_ERA = np.array([0.0, 0.3, 0.6, 0.85])
+DRONE_SHIP_SHARE_BY_ERA = np.array([0.0, 0.6, 0.6, 0.7])
+LANDING_TYPES = ['Expendable', 'Drone Ship', 'Ground Pad']
+
+COMPAT_PROFILES = ('max_payload', 'landing_types', 'mission_outcomes', 'payload_outcome',
+                   'ccafs', 'nasa_payload', 'f9v11_payload', 'site_outcomes',
+                   'drone_ship_landings', 'first_ground_landing')
+
+# Landing types of the drone ship and ground pad scripts, in the schema's terms
+LEGACY_LANDING_TYPES = {'ASDS': 'Drone Ship', 'RTLS': 'Ground Pad', 'Ocean': 'Ocean', 'None': 'Expendable'}
+
+
+def booster_version_codes(flight_numbers):
+    """Return the index into BOOSTER_VERSIONS for each flight number."""
+    return np.searchsorted(VERSION_LAST_FLIGHT, flight_numbers, side='left')
+
+
+def launch_dates(num_launches):
+    """Evenly spaced launch dates covering 2010-2022."""
+    return pd.date_range(start=START_DATE, end=END_DATE, periods=num_launches)
+
+
+def mission_success_probability(years):
+    # Mission success rates improve over time: 85% early, 94% middle, 98% recent
+    return np.select([years <= 2013, years <= 2016], [0.85, 0.94], default=0.98)
+
+
+def _landing_eras(dates):
+    return np.searchsorted(LANDING_ERA_STARTS, np.asarray(dates, dtype='datetime64[ns]'), side='right')
+
+
+def _drone_ship_share(years, eras):
+    # In 2015 most landings were attempted on drone ships
+    return np.where((eras == 1) & (years == 2015), 0.8, DRONE_SHIP_SHARE_BY_ERA[eras])
+
+
+def _mission_name_table():
+    # Every possible "<prefix>-<number>" name, indexed by prefix * 19 + (number - 1)
+    numbers = np.arange(1, 20).astype(str)
+    return np.array([f"{prefix}-{number}" for prefix in MISSION_PREFIXES for number in numbers], dtype=object)
+
+
+def _booster_ids(booster_numbers):
+    # Booster numbers are contiguous, so format each one once and use the
+    # offsets from the first as categorical codes
+    first = booster_numbers.min() if len(booster_numbers) else FIRST_BOOSTER_NUMBER
+    last = booster_numbers.max() if len(booster_numbers) else FIRST_BOOSTER_NUMBER
+    labels = [f"B{number}" for number in range(first, last + 1)]
+    return pd.Categorical.from_codes(booster_numbers - first, categories=labels)
+
+
+@timed()
+def generate_launches(num_launches=100, seed=42, compat=None):
+    """
+    Generate a synthetic SpaceX launch table.
+
+    Args:
+        num_launches (int): Number of launches to generate
+        seed (int or numpy.random.Generator): Seed, or a Generator to draw from
+        compat (str, optional): One of COMPAT_PROFILES to reproduce the draw
+            order of the original per-row script loops
+
+    Returns:
+        pandas.DataFrame: FlightNumber, Date, BoosterVersion, BoosterID,
+        LaunchSite, PayloadMass, MissionName, MissionOutcome, LandingOutcome
+        and LandingType columns in the typed launch_schema layout (compat
+        profiles return the columns and dtypes their original script built)
+    """
+    from launch_schema import FIXED_CATEGORIES, validate
+
+    if compat is not None:
+        if compat not in COMPAT_PROFILES:
+            raise ValueError(f"Unknown compat profile '{compat}', expected one of {COMPAT_PROFILES}")
+        return validate(_COMPAT_GENERATORS[compat](num_launches, seed), f"{compat} launches")
+
+    rng = np.random.default_rng(seed)
+    n = num_launches
+
+    flight_numbers = np.arange(1, n + 1)
+    dates = launch_dates(n)
+    years = dates.year.values
+    version_codes = booster_version_codes(flight_numbers)
+
+    # Launch sites - inverse CDF lookup of one batch of uniforms
+    site_cdf = np.cumsum(SITE_PROBABILITIES)
+    site_codes = np.searchsorted(site_cdf / site_cdf[-1], rng.random(n), side='right')
+
+    # Boosters: the first flights always use a new booster, later flights reuse
+    # one of the boosters introduced since the expendable era 70% of the time
+    index = np.arange(n)
+    reuse = (index > EXPENDABLE_FLIGHTS + 5) & (rng.random(n) < REUSE_PROBABILITY)
+    is_new = ~reuse
+    new_count = np.cumsum(is_new)
+    reusable_count = np.maximum(new_count - EXPENDABLE_FLIGHTS, 1)
+    reused_offset = (rng.random(n) * reusable_count).astype(np.int64)
+    booster_numbers = np.where(is_new,
+                               FIRST_BOOSTER_NUMBER + new_count - 1,
+                               FIRST_BOOSTER_NUMBER + EXPENDABLE_FLIGHTS + reused_offset)
+
+    # Payloads within each booster version's capacity
+    payloads = rng.uniform(PAYLOAD_LOW[version_codes], PAYLOAD_HIGH[version_codes])
+
+    mission_outcomes = (rng.random(n) < mission_success_probability(years)).astype(np.int8)
+
+    # Landing type and outcome by era; expendable missions make no landing attempt
+    eras = _landing_eras(dates)
+    drone_ship = rng.random(n) < _drone_ship_share(years, eras)
+    expendable = (years < 2015) | ((payloads > 16000) & (years < 2018))
+    landing_type_codes = np.select([expendable, drone_ship | (payloads > 14000)], [0, 1], default=2)
+    landed = rng.random(n) < LANDING_SUCCESS_BY_ERA[eras]
+
+    name_codes = rng.integers(0, len(MISSION_PREFIXES), n) * 19 + rng.integers(0, 19, n)
+
+    # Every text column is built straight from its codes as a Categorical,
+    # so no per-row string objects are ever created
+    return validate(pd.DataFrame({
+        'FlightNumber': flight_numbers.astype(np.int32),
+        'Date': dates,
+        'BoosterVersion': pd.Categorical.from_codes(version_codes, dtype=FIXED_CATEGORIES['BoosterVersion']),
+        'BoosterID': _booster_ids(booster_numbers),
+        'LaunchSite': pd.Categorical.from_codes(site_codes, categories=LAUNCH_SITE_CODES),
+        'PayloadMass': payloads,
+        'MissionName': pd.Categorical.from_codes(name_codes, categories=_mission_name_table()),
+        'MissionOutcome': pd.array(mission_outcomes, dtype='Int8'),
+        'LandingOutcome': pd.arrays.IntegerArray(landed.astype(np.int8), mask=expendable),
+        'LandingType': pd.Categorical.from_codes(landing_type_codes, dtype=FIXED_CATEGORIES['LandingType'])
+    }))
+
+
+# ---------------------------------------------------------------------------
+# Seed-compatibility profiles
+#
+# The original scripts call np.random.seed(42) and draw row by row. Each
+# profile replays exactly the same sequence of draws on a RandomState. Where
+# the scripts interleave several draws per row, one batch of uniforms is
+# drawn and sliced by per-row offsets; binomial(1, p) on the legacy stream is
+# an inversion of a single uniform, so it can be reproduced from that batch.
+# ---------------------------------------------------------------------------
+
+def legacy_binomial(uniforms, p):
+    """
+    Replay legacy RandomState.binomial(1, p) draws from a batch of uniforms.
+
+    Shared with launch_features, whose legacy profile replays the same stream.
+
+    Args:
+        uniforms (numpy.ndarray): One random_sample() uniform per draw
+        p (float or numpy.ndarray): Success probability, scalar or per draw
+
+    Returns:
+        numpy.ndarray: int64 0/1 outcomes equal to the legacy draws
+    """
+    # Inversion on min(p, 1 - p), as the legacy generator does
+    p = np.asarray(p, dtype=float)
+    flipped = p > 0.5
+    p_small = np.where(flipped, 1.0 - p, p)
+    hit = (uniforms > np.exp(np.log(1.0 - p_small))).astype(np.int64)
+    return np.where(flipped, 1 - hit, hit)
+
+
+def _legacy_booster_ids(rs, n):
+    # Reuse picks from a list that grows as new boosters are introduced,
+    # so the legacy stream can only be replayed one flight at a time.
+    # rs.choice(list) would copy the list into an array on every flight;
+    # indexing with randint draws the same number from the stream
+    booster_ids = [f"B{FIRST_BOOSTER_NUMBER + i}" for i in range(min(n, EXPENDABLE_FLIGHTS))]
+    current_booster = FIRST_BOOSTER_NUMBER + len(booster_ids)
+    used_boosters = []
+    for i in range(EXPENDABLE_FLIGHTS, n):
+        if i > EXPENDABLE_FLIGHTS + 5 and rs.random_sample() < REUSE_PROBABILITY and used_boosters:
+            booster_ids.append(used_boosters[rs.randint(0, len(used_boosters))])
+        else:
+            booster_ids.append(f"B{current_booster}")
+            used_boosters.append(f"B{current_booster}")
+            current_booster += 1
+    return booster_ids
+
+
+def _legacy_mission_names(rs, n):
+    names = []
+    for _ in range(n):
+        prefix = rs.choice(MISSION_PREFIXES)
+        number = rs.randint(1, 20)
+        names.append(f"{prefix}-{number}")
+    return names
+
+
+def _legacy_base(rs, n, with_boosters=True, with_payloads=True):
+    flight_numbers = np.arange(1, n + 1)
+    version_codes = booster_version_codes(flight_numbers)
+    columns = {
+        'FlightNumber': flight_numbers,
+        'Date': launch_dates(n),
+        'BoosterVersion': np.array(BOOSTER_VERSIONS, dtype=object)[version_codes],
+    }
+    if with_boosters:
+        columns['BoosterID'] = _legacy_booster_ids(rs, n)
+    columns['LaunchSite'] = rs.choice(LAUNCH_SITE_CODES, size=n, p=SITE_PROBABILITIES)
+    if with_payloads:
+        columns['PayloadMass'] = rs.uniform(PAYLOAD_LOW[version_codes], PAYLOAD_HIGH[version_codes])
+    return columns
+
+
+def _compat_mission_and_landing(n, seed, with_boosters):
+    rs = np.random.RandomState(seed)
+    columns = _legacy_base(rs, n, with_boosters=with_boosters, with_payloads=with_boosters)
+    dates = columns['Date']
+
+    # Each row draws a mission outcome and then a landing outcome
+    mission_p = mission_success_probability(dates.year.values)
+    landing_p = LANDING_SUCCESS_BY_ERA[_landing_eras(dates)]
+    uniforms = rs.random_sample(2 * n).reshape(n, 2)
+    mission_outcomes = legacy_binomial(uniforms[:, 0], mission_p)
+    landing_outcomes = legacy_binomial(uniforms[:, 1], landing_p)
+    mission_names = _legacy_mission_names(rs, n)
+
+    # find_max_payload_boosters.py lists the mission name before the outcomes,
+    # calculate_mission_outcomes.py appends it as the last column
+    if with_boosters:
+        columns['MissionName'] = mission_names
+    columns['MissionOutcome'] = mission_outcomes
+    columns['LandingOutcome'] = landing_outcomes
+    if not with_boosters:
+        columns['MissionName'] = mission_names
+    return pd.DataFrame(columns)
+
+
+def _compat_max_payload(n, seed):
+    # find_max_payload_boosters.py
+    return _compat_mission_and_landing(n, seed, with_boosters=True)
+
+
+def _compat_mission_outcomes(n, seed):
+    # calculate_mission_outcomes.py
+    return _compat_mission_and_landing(n, seed, with_boosters=False)
+
+
+def _compat_landing_types(n, seed):
+    # find_failed_landings_2015.py and rank_landing_outcomes.py
+    rs = np.random.RandomState(seed)
+    columns = _legacy_base(rs, n)
+    dates = columns['Date']
+    years = dates.year.values
+    payloads = columns['PayloadMass']
+    eras = _landing_eras(dates)
+
+    # Per row: mission outcome, landing type (from 2015), landing outcome (unless expendable)
+    expendable = (years < 2015) | ((payloads > 16000) & (years < 2018))
+    type_draws = (eras > 0).astype(np.int64)
+    landing_draws = (~expendable).astype(np.int64)
+    counts = 1 + type_draws + landing_draws
+    starts = np.cumsum(counts) - counts
+    uniforms = rs.random_sample(counts.sum())
+
+    mission_outcomes = legacy_binomial(uniforms[starts], mission_success_probability(years))
+    type_uniforms = uniforms[np.minimum(starts + 1, len(uniforms) - 1)]
+    drone_ship = (type_draws == 1) & (type_uniforms < _drone_ship_share(years, eras))
+    landing_types = np.select(
+        [expendable, drone_ship | (payloads > 14000)],
+        ['Expendable', 'Drone Ship'],
+        default='Ground Pad'
+    ).astype(object)
+    landing_uniforms = uniforms[np.minimum(starts + 1 + type_draws, len(uniforms) - 1)]
+    landed = legacy_binomial(landing_uniforms, LANDING_SUCCESS_BY_ERA[eras])
+    landing_outcomes = np.where(expendable, np.nan, landed.astype(float))
+
+    columns['MissionName'] = _legacy_mission_names(rs, n)
+    columns['MissionOutcome'] = mission_outcomes
+    columns['LandingOutcome'] = landing_outcomes
+    columns['LandingType'] = landing_types
+    df = pd.DataFrame(columns)
+
+    # Drone ships: JRTI on the West Coast, OCISLY in the East until ASOG joins in 2021
+    drone = landing_types == 'Drone Ship'
+    west = np.isin(columns['LaunchSite'], WEST_COAST_SITES)
+    shared_east = drone & ~west & (years >= 2021)
+    drone_ship_names = np.full(n, np.nan, dtype=object)
+    drone_ship_names[drone & west] = DRONE_SHIP_NAMES[1]
+    drone_ship_names[drone & ~west] = DRONE_SHIP_NAMES[0]
+    drone_ship_names[shared_east] = rs.choice([DRONE_SHIP_NAMES[0], DRONE_SHIP_NAMES[2]], size=shared_east.sum())
+    df['DroneShipName'] = drone_ship_names
+    return df
+
+
+def _compat_payload_outcome(n, seed):
+    # create_payload_outcome_dashboard.py
+    rs = np.random.RandomState(seed)
+    columns = _legacy_base(rs, n, with_boosters=False)
+    version_codes = booster_version_codes(columns['FlightNumber'])
+
+    # Heavier payloads are riskier, but newer versions are less affected
+    base_prob = np.array([0.75, 0.85, 0.92, 0.98])[version_codes]
+    payload_penalty = np.array([0.15, 0.10, 0.05, 0.02])[version_codes]
+    low = PAYLOAD_LOW[version_codes]
+    payload_factor = (columns['PayloadMass'] - low) / (PAYLOAD_HIGH[version_codes] - low)
+    success_prob = np.clip(base_prob - payload_factor * payload_penalty, 0.5, 0.99)
+
+    columns['MissionOutcome'] = rs.binomial(1, success_prob)
+    return pd.DataFrame(columns)
+
+
+def _compat_site_outcomes(n, seed):
+    # create_launch_success_dashboard.py, create_highest_success_site_dashboard.py
+    # and create_launch_outcomes_map.py: a site and a mission outcome per launch
+    rs = np.random.RandomState(seed)
+    dates = launch_dates(n)
+    sites = rs.choice(LAUNCH_SITE_CODES, size=n, p=SITE_PROBABILITIES)
+    outcomes = legacy_binomial(rs.random_sample(n), mission_success_probability(dates.year.values))
+    return pd.DataFrame({
+        'FlightNumber': np.arange(1, n + 1),
+        'Date': dates,
+        'LaunchSite': sites,
+        'MissionOutcome': outcomes
+    })
+
+
+def legacy_customers(rs, sites):
+    """
+    Draw one customer per launch the way the legacy payload scripts did.
+
+    Also fills in the Customer column of the canonical table in benchmarks.
+
+    Args:
+        rs (numpy.random.RandomState): Stream to draw from, one uniform per launch
+        sites (array-like): Launch site code of each launch
+
+    Returns:
+        numpy.ndarray: Customer names, with the probabilities depending on
+        whether the site is KSC, CCAFS or elsewhere
+    """
+    sites = np.asarray(sites)
+    site_class = np.where(np.char.find(sites.astype(str), 'KSC') >= 0, 0,
+                          np.where(np.char.find(sites.astype(str), 'CCAFS') >= 0, 1, 2))
+    cdf = np.cumsum(CUSTOMER_PROBABILITIES, axis=1)
+    cdf /= cdf[:, -1:]
+    uniforms = rs.random_sample(len(sites))
+    customer_codes = (cdf[site_class] <= uniforms[:, None]).sum(axis=1)
+    return np.array(CUSTOMERS)[customer_codes]
+
+
+def _compat_monthly(n, seed, payloads_by_version=False, with_customers=False):
+    # find_ccafs_launches.py, calculate_nasa_payload.py, calculate_f9v11_payload.py:
+    # monthly launches with an 80% overall success rate
+    rs = np.random.RandomState(seed)
+    flight_numbers = np.arange(1, n + 1)
+    columns = {
+        'FlightNumber': flight_numbers,
+        'Date': pd.date_range(start=START_DATE, periods=n, freq=pd.offsets.MonthEnd()),
+    }
+    sites = rs.choice(LAUNCH_SITE_CODES, size=n, p=SITE_PROBABILITIES)
+    columns['LaunchSite'] = sites
+    if payloads_by_version:
+        version_codes = booster_version_codes(flight_numbers)
+        columns['PayloadMass'] = rs.uniform(PAYLOAD_LOW[version_codes], PAYLOAD_HIGH[version_codes])
+    else:
+        columns['PayloadMass'] = rs.uniform(1000, 15000, n)
+    columns['Success'] = rs.binomial(1, 0.8, n)
+    if with_customers:
+        columns['Customer'] = legacy_customers(rs, sites)
+    if payloads_by_version:
+        columns['BoosterVersion'] = np.array(BOOSTER_VERSIONS, dtype=object)[version_codes]
+    return pd.DataFrame(columns)
+
+
+def _compat_ccafs(n, seed):
+    return _compat_monthly(n, seed)
+
+
+def _compat_nasa_payload(n, seed):
+    return _compat_monthly(n, seed, with_customers=True)
+
+
+def _compat_f9v11_payload(n, seed):
+    return _compat_monthly(n, seed, payloads_by_version=True, with_customers=True)
+
+
+def _legacy_landings(rs, dates, ocean_until, ocean_failure, asds_failure, mid_failure):
+    # One flight at a time: whether a landing outcome is drawn depends on the
+    # landing type drawn just before it. Failure probabilities are given per
+    # era (asds_failure may depend on the date), the first RTLS success comes
+    # on Dec 22, 2015
+    landing_types, landing_outcomes = [], []
+    for date in dates:
+        if date < pd.Timestamp(ocean_until):
+            if date < pd.Timestamp('2013-01-01'):
+                landing_types.append('None')
+                landing_outcomes.append(0)
+            else:
+                landing_types.append('Ocean')
+                landing_outcomes.append(rs.choice([0, 1], p=[0.7, 0.3]))
+        elif date < pd.Timestamp('2016-06-01'):
+            landing_type = rs.choice(['RTLS', 'ASDS', 'Ocean'], p=[0.2, 0.5, 0.3])
+            landing_types.append(landing_type)
+            if landing_type == 'ASDS':
+                failure = asds_failure(date)
+                landing_outcomes.append(rs.choice([0, 1], p=[failure, 1 - failure]))
+            elif landing_type == 'RTLS' and date >= pd.Timestamp('2015-12-22'):
+                landing_outcomes.append(rs.choice([0, 1], p=[0.3, 0.7]))
+            elif landing_type == 'RTLS':
+                landing_outcomes.append(0)
+            else:
+                landing_outcomes.append(rs.choice([0, 1], p=[ocean_failure, 1 - ocean_failure]))
+        else:
+            late = date >= pd.Timestamp('2018-01-01')
+            landing_type = rs.choice(['RTLS', 'ASDS', 'None'], p=[0.35, 0.6, 0.05] if late else [0.3, 0.6, 0.1])
+            landing_types.append(landing_type)
+            if landing_type != 'None':
+                failure = 0.15 if late else mid_failure
+                landing_outcomes.append(rs.choice([0, 1], p=[failure, 1 - failure]))
+            else:
+                landing_outcomes.append(0)
+    return landing_types, landing_outcomes
+
+
+def _schema_landings(df):
+    # The scripts record 'None' (no attempt) with outcome 0; the schema calls
+    # that Expendable, with no outcome
+    df['LandingType'] = df['LandingType'].map(LEGACY_LANDING_TYPES)
+    df['LandingOutcome'] = df['LandingOutcome'].where(df['LandingType'] != 'Expendable').astype(float)
+    return df
+
+
+def _compat_drone_ship_landings(n, seed):
+    # find_drone_ship_landings.py
+    rs = np.random.RandomState(seed)
+    columns = _legacy_base(rs, n)
+    first_asds_success = pd.Timestamp('2016-04-08')
+    landing_types, landing_outcomes = _legacy_landings(
+        rs, columns['Date'], ocean_until='2015-01-01', ocean_failure=0.6,
+        asds_failure=lambda date: 0.4 if date >= first_asds_success else 0.7, mid_failure=0.3)
+    columns['MissionName'] = _legacy_mission_names(rs, n)
+    columns['LandingType'] = landing_types
+    columns['LandingOutcome'] = landing_outcomes
+    df = pd.DataFrame(columns)
+
+    # First successful ASDS landing: CRS-8 on April 8, 2016
+    april = df[(df['Date'] >= '2016-04-01') & (df['Date'] <= '2016-04-30')].index
+    if len(april):
+        df.loc[april[0], ['Date', 'LandingType', 'LandingOutcome', 'MissionName', 'BoosterID', 'PayloadMass']] = [
+            first_asds_success, 'ASDS', 1, 'CRS-8', 'B1021', 5000]
+
+    # A few more successful drone ship landings with a 4000-6000 kg payload
+    asds = df.index[df['LandingType'] == 'ASDS']
+    for idx in asds[:5]:
+        df.loc[idx, 'PayloadMass'] = rs.uniform(4100, 5900)
+        df.loc[idx, 'LandingOutcome'] = 1
+    return _schema_landings(df)
+
+
+def _compat_first_ground_landing(n, seed):
+    # find_first_ground_landing.py
+    rs = np.random.RandomState(seed)
+    dates = launch_dates(n)
+    sites = rs.choice(LAUNCH_SITE_CODES, size=n, p=SITE_PROBABILITIES)
+    landing_types, landing_outcomes = _legacy_landings(
+        rs, dates, ocean_until='2015-06-01', ocean_failure=0.7,
+        asds_failure=lambda date: 0.7, mid_failure=0.4)
+    df = pd.DataFrame({
+        'FlightNumber': np.arange(1, n + 1),
+        'Date': dates,
+        'LaunchSite': sites,
+        'LandingType': landing_types,
+        'LandingOutcome': landing_outcomes
+    })
+
+    # First successful RTLS landing: Orbcomm OG2 M2 on Dec 22, 2015 (the
+    # script names it, then overwrites every mission name with a random one)
+    around = df[(df['Date'] >= '2015-12-01') & (df['Date'] <= '2016-01-31')].index
+    if len(around):
+        df.loc[around[0], ['Date', 'LandingType', 'LandingOutcome', 'LaunchSite']] = [
+            pd.Timestamp('2015-12-22'), 'RTLS', 1, 'CCAFS SLC-40']
+    df['MissionName'] = _legacy_mission_names(rs, n)
+    return _schema_landings(df)
+
+
+_COMPAT_GENERATORS = {
+    'max_payload': _compat_max_payload,
+    'landing_types': _compat_landing_types,
+    'mission_outcomes': _compat_mission_outcomes,
+    'payload_outcome': _compat_payload_outcome,
+    'ccafs': _compat_ccafs,
+    'nasa_payload': _compat_nasa_payload,
+    'f9v11_payload': _compat_f9v11_payload,
+    'site_outcomes': _compat_site_outcomes,
+    'drone_ship_landings': _compat_drone_ship_landings,
+    'first_ground_landing': _compat_first_ground_landing,
+}
@@ -0,0 +1,145 @@
+"""
+Launch Success Training Data
+
+Synthesizes the classifier features (booster version, payload mass, wind
+speed, temperature, pad anomalies, mission complexity) and the
+MissionSuccess label used by model_classification_accuracy.py and
+model_confusion_matrix.py, computing every feature effect on whole arrays.
+
+generate_launch_features() builds one DataFrame; iter_launch_features()
+yields fixed-size chunks from an explicit numpy Generator so training sets
+of 10^8 rows can be produced (and written out) without holding them in
+memory. legacy=True replays the original np.random.seed(42) draw order so
+the chart scripts keep producing the same data.
+"""
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+from launch_data import PAYLOAD_HIGH, PAYLOAD_LOW, booster_version_codes, legacy_binomial
+
+FEATURE_COLUMNS = ['BoosterVersion', 'PayloadMass', 'WindSpeed', 'Temperature', 'AnomalyCount', 'MissionComplexity']
+TARGET_COLUMN = 'MissionSuccess'
+
+# Base success probability by booster version (1 = F9 v1.0 ... 4 = F9 Block 5)
+BASE_SUCCESS_BY_VERSION = np.array([0.75, 0.85, 0.92, 0.98])
+
+# Launch conditions
+WIND_MEAN, WIND_STD, WIND_MAX = 15, 7, 35
+TEMPERATURE_MEAN, TEMPERATURE_STD = 22, 10
+ANOMALY_RATE = 2
+COMPLEXITY_LOW, COMPLEXITY_HIGH = 1, 10
+
+# Rows per chunk for iter_launch_features()
+DEFAULT_CHUNK_SIZE = 1000000
+
+
+def success_probability(versions, payloads, wind_speeds, temperatures, anomalies, complexity):
+    """
+    Mission success probability for each launch.
+
+    Args:
+        versions (array): Booster version numbers 1-4
+        payloads, wind_speeds, temperatures, anomalies, complexity (array): Features
+
+    Returns:
+        numpy.ndarray: Probabilities clipped to [0.5, 0.99]
+    """
+    versions = np.asarray(versions)
+    base_prob = BASE_SUCCESS_BY_VERSION[versions - 1]
+
+    # Heavier payloads slightly reduce success chance, more so on older boosters
+    payload_factor = (np.asarray(payloads) - 1000) / 15000
+    payload_effect = -0.08 * payload_factor * (5 - versions)
+
+    # High wind, extreme temperatures, anomalies and complexity reduce success chance
+    wind_effect = -0.005 * np.maximum(0, np.asarray(wind_speeds) - 10)
+    temp_effect = -0.005 * np.abs(np.asarray(temperatures) - 20)
+    anomaly_effect = -0.03 * np.asarray(anomalies)
+    complexity_effect = -0.01 * np.asarray(complexity)
+
+    success_prob = base_prob + payload_effect + wind_effect + temp_effect + anomaly_effect + complexity_effect
+    return np.clip(success_prob, 0.5, 0.99)
+
+
+def _frame(versions, payloads, wind_speeds, temperatures, anomalies, complexity, outcomes, first_flight):
+    index = pd.RangeIndex(first_flight - 1, first_flight - 1 + len(versions))
+    return pd.DataFrame({
+        'BoosterVersion': versions,
+        'PayloadMass': payloads,
+        'WindSpeed': wind_speeds,
+        'Temperature': temperatures,
+        'AnomalyCount': anomalies,
+        'MissionComplexity': complexity,
+        TARGET_COLUMN: outcomes
+    }, index=index if first_flight > 1 else None)
+
+
+def _chunk(rng, first_flight, size):
+    # Booster versions follow the flight number timeline
+    versions = booster_version_codes(np.arange(first_flight, first_flight + size)) + 1
+    payloads = rng.uniform(PAYLOAD_LOW[versions - 1], PAYLOAD_HIGH[versions - 1])
+    wind_speeds = np.clip(rng.normal(WIND_MEAN, WIND_STD, size), 0, WIND_MAX)
+    temperatures = rng.normal(TEMPERATURE_MEAN, TEMPERATURE_STD, size)
+    anomalies = rng.poisson(ANOMALY_RATE, size)
+    complexity = rng.uniform(COMPLEXITY_LOW, COMPLEXITY_HIGH, size)
+
+    p = success_probability(versions, payloads, wind_speeds, temperatures, anomalies, complexity)
+    outcomes = (rng.random(size) < p).astype(np.int64)
+    return _frame(versions, payloads, wind_speeds, temperatures, anomalies, complexity, outcomes, first_flight)
+
+
+def iter_launch_features(num_launches, chunk_size=DEFAULT_CHUNK_SIZE, rng=None):
+    """
+    Yield the training set in chunks of at most chunk_size rows.
+
+    The data depends on the Generator's state and the chunk size; flight
+    numbers (and so booster versions) continue across chunks, and each
+    chunk's index carries on from the previous one.
+
+    Args:
+        num_launches (int): Total number of launches
+        chunk_size (int): Rows per chunk
+        rng (numpy.random.Generator or int, optional): Generator or seed
+
+    Yields:
+        pandas.DataFrame: FEATURE_COLUMNS plus MissionSuccess
+    """
+    rng = np.random.default_rng(rng)
+    for start in range(0, num_launches, chunk_size):
+        yield _chunk(rng, start + 1, min(chunk_size, num_launches - start))
+
+
+def _legacy_launch_features(num_launches, seed):
+    # Same draws, in the same order, as the original per-row loops
+    rs = np.random.RandomState(seed)
+    versions = booster_version_codes(np.arange(1, num_launches + 1)) + 1
+    payloads = rs.uniform(PAYLOAD_LOW[versions - 1], PAYLOAD_HIGH[versions - 1])
+    wind_speeds = np.clip(rs.normal(WIND_MEAN, WIND_STD, num_launches), 0, WIND_MAX)
+    temperatures = rs.normal(TEMPERATURE_MEAN, TEMPERATURE_STD, num_launches)
+    anomalies = rs.poisson(ANOMALY_RATE, num_launches)
+    complexity = rs.uniform(COMPLEXITY_LOW, COMPLEXITY_HIGH, num_launches)
+
+    p = success_probability(versions, payloads, wind_speeds, temperatures, anomalies, complexity)
+    outcomes = legacy_binomial(rs.random_sample(num_launches), p)
+    return _frame(versions, payloads, wind_speeds, temperatures, anomalies, complexity, outcomes, 1)
+
+
+@timed()
+def generate_launch_features(num_launches=200, seed=42, legacy=False):
+    """
+    Generate the launch success training set in one DataFrame.
+
+    Args:
+        num_launches (int): Number of launches
+        seed (int or numpy.random.Generator): Seed, or a Generator to draw from
+        legacy (bool): Replay the np.random.seed(seed) draw order of the
+            original chart scripts (seed must be an int)
+
+    Returns:
+        pandas.DataFrame: FEATURE_COLUMNS plus MissionSuccess
+    """
+    if legacy:
+        return _legacy_launch_features(num_launches, seed)
+    return _chunk(np.random.default_rng(seed), 1, num_launches)
@@ -0,0 +1,161 @@
+"""
+Launch Report Renderer
+
+Formats report listings and tables a whole column at a time instead of one
+f-string per row. A row template uses str.format syntax with column names as
+fields, e.g. "{FlightNumber:<10} {Date:%Y-%m-%d}\\n"; each field is formatted
+across the entire column (strftime once per distinct date, one printf-style
+pass for numbers, str.ljust/rjust for padding), the columns are concatenated
+element-wise, and the finished rows are written in large chunks.
+
+The same table spec - a list of (header, template) pairs - renders as a
+Markdown, CSV or HTML table.
+"""
+
+import csv
+import html
+import re
+import string
+
+import numpy as np
+import pandas as pd
+
+# Rows joined into a single write() call
+CHUNK_SIZE = 50000
+
+# Supported table formats
+TABLE_FORMATS = ('markdown', 'csv', 'html')
+
+# Format specs with a printf equivalent: [align][width][.precision][type]
+_SIMPLE_SPEC = re.compile(r'^(?P<align>[<>])?(?P<width>\d+)?(?:\.(?P<precision>\d+))?(?P<type>[dfeEgG])?$')
+
+# strftime patterns that only use day-level directives
+_DATE_ONLY_SPEC = re.compile(r'^(?:[^%]|%[aAbBdjmUWyYGuVw%])*$')
+
+_formatter = string.Formatter()
+
+
+def outcome_labels(outcomes, success='Success', failure='Failure'):
+    """Map a 0/1 outcome column to labels in one pass."""
+    return np.where(np.asarray(outcomes) == 1, success, failure).astype(object)
+
+
+def _format_column(values, spec):
+    # Dates: the spec is a strftime pattern. Launch histories repeat the same
+    # days many times, so format each distinct date once and index into that
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if spec and _DATE_ONLY_SPEC.match(spec):
+            values = values.dt.normalize()
+        codes, uniques = pd.factorize(values)
+        formatted = uniques.strftime(spec) if spec else uniques.astype(str)
+        # NaT gets code -1, which picks the trailing 'NaT'
+        return np.append(formatted.to_numpy(dtype=object), 'NaT')[codes]
+
+    if not spec:
+        return values.astype(str).to_numpy(dtype=object)
+
+    match = _SIMPLE_SPEC.match(spec)
+    numeric = pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+    if match and numeric:
+        spec_type = match['type'] or ('d' if pd.api.types.is_integer_dtype(values) else None)
+        if spec_type is not None and not (spec_type == 'd' and not pd.api.types.is_integer_dtype(values)):
+            # printf follows the same padding and precision rules as format()
+            flags = '-' if match['align'] == '<' else ''
+            precision = f".{match['precision']}" if match['precision'] else ''
+            pattern = f"%{flags}{match['width'] or ''}{precision}{spec_type}"
+            if not isinstance(values.dtype, np.dtype) and values.hasnans:
+                # printf rejects the pd.NA of nullable columns (e.g. Int8
+                # outcomes), so those cells get what format() makes of it
+                missing = values.isna().to_numpy()
+                formatted = np.full(len(values), ('{:' + spec + '}').format(pd.NA), dtype=object)
+                formatted[~missing] = list(map(pattern.__mod__, values[~missing].tolist()))
+                return formatted
+            return np.array(list(map(pattern.__mod__, values.tolist())), dtype=object)
+    elif match and not match['precision'] and not match['type']:
+        # Plain text padding
+        text = values.astype(str)
+        width = int(match['width'] or 0)
+        padded = text.str.rjust(width) if match['align'] == '>' else text.str.ljust(width)
+        return padded.to_numpy(dtype=object)
+
+    # Anything else goes through format() itself
+    return values.map(('{:' + spec + '}').format).to_numpy(dtype=object)
+
+
+def render_lines(df, template):
+    """
+    Render one string per row of df from a str.format template.
+
+    Args:
+        df (pandas.DataFrame): Rows to render
+        template (str): Template whose fields are column names of df
+
+    Returns:
+        numpy.ndarray: Rendered rows (object array of str)
+    """
+    result = np.full(len(df), '', dtype=object)
+    for literal, field, spec, conversion in _formatter.parse(template):
+        if literal:
+            result = result + literal
+        if field is not None:
+            values = df[field]
+            if conversion == 'r':
+                values = values.map(repr)
+            result = result + _format_column(values, spec)
+    return result
+
+
+def write_lines(f, lines):
+    """Write pre-rendered rows to a file object in large chunks."""
+    for start in range(0, len(lines), CHUNK_SIZE):
+        f.write(''.join(lines[start:start + CHUNK_SIZE]))
+
+
+def write_rows(f, df, template):
+    """Render df with a row template and write it to f."""
+    write_lines(f, render_lines(df, template))
+
+
+def _cell_columns(df, columns):
+    return [render_lines(df, template) for _, template in columns]
+
+
+def _join_cells(cells, prefix, separator, suffix):
+    result = prefix + cells[0]
+    for column in cells[1:]:
+        result = result + separator + column
+    return result + suffix
+
+
+def write_table(f, df, columns, fmt='markdown'):
+    """
+    Write df as a table.
+
+    Args:
+        f (file): Open text file (or sys.stdout)
+        df (pandas.DataFrame): Rows of the table
+        columns (list): (header, template) pairs, one per table column
+        fmt (str): 'markdown', 'csv' or 'html'
+    """
+    if fmt not in TABLE_FORMATS:
+        raise ValueError(f"Unknown table format '{fmt}', expected one of {', '.join(TABLE_FORMATS)}")
+
+    headers = [header for header, _ in columns]
+    cells = _cell_columns(df, columns)
+
+    if fmt == 'markdown':
+        f.write('| ' + ' | '.join(headers) + ' |\n')
+        f.write('|' + '|'.join('-' * (len(header) + 2) for header in headers) + '|\n')
+        if len(df):
+            write_lines(f, _join_cells(cells, '| ', ' | ', ' |\n'))
+    elif fmt == 'csv':
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(headers)
+        for start in range(0, len(df), CHUNK_SIZE):
+            writer.writerows(zip(*(column[start:start + CHUNK_SIZE] for column in cells)))
+    else:
+        f.write('<table>\n<thead>\n<tr>' + ''.join(f'<th>{html.escape(header)}</th>' for header in headers) + '</tr>\n</thead>\n<tbody>\n')
+        if len(df):
+            escaped = [pd.Series(column).map(html.escape).to_numpy(dtype=object) for column in cells]
+            write_lines(f, _join_cells(escaped, '<tr><td>', '</td><td>', '</td></tr>\n'))
+        f.write('</tbody>\n</table>\n')
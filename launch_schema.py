@@ -0,0 +1,257 @@
+"""
+Canonical Launch Schema
+
+One definition of the launch table's columns, their compact dtypes and the
+rules every launch frame has to satisfy, whether it was generated by
+launch_data or ingested by spacex_api, wiki_scraper or launch_sync.
+
+The typed layout stores:
+- sites, booster versions and IDs, landing types, mission names, orbits and
+  customers as pandas Categoricals (one small integer code per row)
+- outcomes as nullable Int8
+- dates as datetime64
+- flight numbers as int32
+
+A million launches then take about 58 MB instead of about 350 MB as
+Python string objects. groupby on a site or version runs on the integer
+codes (pass observed=True to skip empty combinations).
+
+validate() accepts both that layout and the legacy object/float columns
+the compat profiles keep for byte-identical *_results.md output.
+
+Usage:
+    python launch_schema.py --launches 1000000     # memory and groupby comparison
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from launch_data import BOOSTER_VERSIONS, CUSTOMERS, LANDING_TYPES, LAUNCH_SITE_CODES
+
+# Vehicles other than Falcon 9 that ingested launch lists can contain
+OTHER_VEHICLES = ['Falcon 1', 'Falcon Heavy']
+
+# Landing types beyond the synthetic ones (ocean touchdowns)
+OTHER_LANDING_TYPES = ['Ocean']
+
+# Categoricals with a closed vocabulary: anything else is a schema error
+FIXED_CATEGORIES = {
+    'BoosterVersion': pd.CategoricalDtype(BOOSTER_VERSIONS + OTHER_VEHICLES, ordered=True),
+    'LandingType': pd.CategoricalDtype(LANDING_TYPES + OTHER_LANDING_TYPES),
+}
+
+# Categoricals with an open vocabulary: the known values keep the first
+# codes so they are stable across frames, new values are appended sorted
+OPEN_CATEGORIES = {
+    'LaunchSite': LAUNCH_SITE_CODES,
+    'Customer': CUSTOMERS,
+    'BoosterID': [],
+    'MissionName': [],
+    'Orbit': [],
+}
+
+# Plain columns and their compact dtypes
+DTYPES = {
+    'FlightNumber': 'int32',
+    'Date': 'datetime64[ns]',
+    'PayloadMass': 'float64',
+    'MissionOutcome': 'Int8',
+    'LandingOutcome': 'Int8',
+    'Success': 'Int8',
+}
+
+# Columns every launch frame has, and columns that may not hold nulls
+REQUIRED_COLUMNS = ['FlightNumber', 'Date']
+NOT_NULL = ['FlightNumber', 'Date', 'LaunchSite', 'BoosterVersion', 'LandingType', 'MissionOutcome', 'Success']
+
+# Columns holding 0/1 outcomes
+OUTCOME_COLUMNS = ['MissionOutcome', 'LandingOutcome', 'Success']
+
+# Heaviest plausible payload (kg), to catch unit mix-ups (lb, tonnes)
+MAX_PAYLOAD_MASS = 100000
+
+
+class SchemaError(ValueError):
+    """A launch frame that breaks the schema; .problems lists every violation."""
+
+    def __init__(self, problems, name='launches'):
+        self.problems = problems
+        super().__init__(f"{name}: " + '; '.join(problems))
+
+
+def _values(column):
+    # The column's values without nulls, as a plain Series
+    values = column.dropna()
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(values.cat.categories.dtype)
+    return values
+
+
+def _unique(values):
+    # Sorted flight numbers (every generated table) are unique without hashing
+    if values.is_monotonic_increasing:
+        return bool((np.diff(values.to_numpy()) > 0).all())
+    return values.is_unique
+
+
+def validate(df, name='launches'):
+    """
+    Check a launch frame against the schema.
+
+    Only the columns the frame has are checked (compat profiles carry
+    subsets), in either the typed or the legacy layout. An empty frame
+    passes whatever its dtypes (an empty scrape has object columns).
+
+    Args:
+        df (pandas.DataFrame): Launch frame
+        name (str): Frame name for the error message
+
+    Returns:
+        pandas.DataFrame: df, unchanged
+
+    Raises:
+        SchemaError: Listing every violation found
+    """
+    problems = [f"missing column {column}" for column in REQUIRED_COLUMNS if column not in df.columns]
+    if not len(df):
+        if problems:
+            raise SchemaError(problems, name)
+        return df
+
+    for column in NOT_NULL:
+        if column in df.columns and df[column].isna().any():
+            problems.append(f"{column} has {int(df[column].isna().sum())} nulls")
+
+    if 'FlightNumber' in df.columns:
+        flights = df['FlightNumber']
+        if not pd.api.types.is_integer_dtype(flights):
+            problems.append(f"FlightNumber is {flights.dtype}, not integer")
+        elif flights.min() < 1 or not _unique(flights):
+            problems.append("FlightNumber must be positive and unique")
+
+    if 'Date' in df.columns and not pd.api.types.is_datetime64_dtype(df['Date']):
+        problems.append(f"Date is {df['Date'].dtype}, not datetime64")
+
+    for column, dtype in FIXED_CATEGORIES.items():
+        if column in df.columns:
+            unknown = set(_values(df[column]).unique()) - set(dtype.categories)
+            if unknown:
+                problems.append(f"{column} has unknown values {sorted(map(str, unknown))}")
+
+    for column in OUTCOME_COLUMNS:
+        if column in df.columns:
+            values = _values(df[column])
+            if len(values) and not values.isin([0, 1]).all():
+                problems.append(f"{column} holds values other than 0/1")
+
+    if 'PayloadMass' in df.columns:
+        payloads = df['PayloadMass']
+        if not pd.api.types.is_float_dtype(payloads):
+            problems.append(f"PayloadMass is {payloads.dtype}, not float")
+        elif ((payloads < 0) | (payloads > MAX_PAYLOAD_MASS)).any():
+            problems.append(f"PayloadMass outside 0-{MAX_PAYLOAD_MASS} kg")
+
+    # A landing outcome exists exactly when a landing was attempted
+    if 'LandingOutcome' in df.columns and 'LandingType' in df.columns:
+        expendable = (df['LandingType'] == 'Expendable').to_numpy()
+        missing = df['LandingOutcome'].isna().to_numpy()
+        if (expendable != missing).any():
+            problems.append(f"LandingOutcome disagrees with LandingType on {int((expendable != missing).sum())} rows")
+
+    if problems:
+        raise SchemaError(problems, name)
+    return df
+
+
+def open_category_dtype(column, values):
+    """Return the categorical dtype of an open-vocabulary column for these values."""
+    known = OPEN_CATEGORIES[column]
+    extra = sorted(set(_values(values).astype(str).unique()) - set(known))
+    return pd.CategoricalDtype(known + extra)
+
+
+def cast_launches(df, name='launches'):
+    """
+    Convert a launch frame to the typed layout and validate it.
+
+    Columns already in their schema dtype are left alone, and columns the
+    schema does not know are kept as they are.
+
+    Args:
+        df (pandas.DataFrame): Launch frame in either layout
+        name (str): Frame name for error messages
+
+    Returns:
+        pandas.DataFrame: A typed copy
+
+    Raises:
+        SchemaError: When the frame breaks the schema
+    """
+    validate(df, name)
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if column in FIXED_CATEGORIES:
+            dtype = FIXED_CATEGORIES[column]
+        elif column in OPEN_CATEGORIES:
+            if isinstance(values.dtype, pd.CategoricalDtype) and \
+                    list(values.cat.categories[:len(OPEN_CATEGORIES[column])]) == OPEN_CATEGORIES[column]:
+                dtype = values.dtype
+            else:
+                dtype = open_category_dtype(column, values)
+        elif column in DTYPES:
+            dtype = DTYPES[column]
+        else:
+            columns[column] = values
+            continue
+        if column in OUTCOME_COLUMNS and not isinstance(values.dtype, pd.Int8Dtype):
+            # Float 0.0/1.0/NaN outcomes go through a nullable integer first
+            values = values.astype('Int64')
+        columns[column] = values if values.dtype == dtype else values.astype(dtype)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def memory_per_million(df):
+    """Return the frame's deep memory use scaled to a million rows, in MB."""
+    return df.memory_usage(deep=True, index=False).sum() / len(df) * 1e6 / 2 ** 20
+
+
+def main():
+    from launch_data import generate_launches
+
+    parser = argparse.ArgumentParser(description="Compare the typed launch layout with object columns")
+    parser.add_argument('--launches', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    typed = generate_launches(args.launches, seed=42)
+    legacy = typed.copy()
+    for column in typed.columns:
+        if isinstance(typed[column].dtype, pd.CategoricalDtype):
+            legacy[column] = typed[column].astype(object)
+        elif column in OUTCOME_COLUMNS:
+            legacy[column] = typed[column].astype('float64')
+        elif column == 'FlightNumber':
+            legacy[column] = typed[column].astype(np.int64)
+
+    print(f"{'Column':<16} {'Object (MB)':>12} {'Typed (MB)':>12}  Typed dtype")
+    print("-" * 62)
+    for column in typed.columns:
+        before = legacy[column].memory_usage(deep=True, index=False) / 2 ** 20
+        after = typed[column].memory_usage(deep=True, index=False) / 2 ** 20
+        print(f"{column:<16} {before:>12.1f} {after:>12.1f}  {typed[column].dtype}")
+    print("-" * 62)
+    print(f"{'Per million':<16} {memory_per_million(legacy):>12.1f} {memory_per_million(typed):>12.1f}")
+
+    for label, frame in (('object', legacy), ('typed', typed)):
+        start = time.perf_counter()
+        frame.groupby(['LaunchSite', 'BoosterVersion'], observed=True)['PayloadMass'].agg(['count', 'mean'])
+        print(f"groupby site, version ({label}): {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
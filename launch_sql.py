@@ -0,0 +1,248 @@
+"""
+Embedded SQL Launch Database
+
+Loads a launch table into SQLite with indexes on the columns the query
+scripts filter and group by (LaunchSite, BoosterVersion, Customer, Date and
+LandingType), so lookups and GROUP BY aggregates are index seeks instead of
+full-scan pandas masks.
+
+Databases for the shared datasets are built once next to the Arrow files in
+the launch store and reopened on later runs. Queries are plain parameterized
+SQL; sqlite3 keeps each connection's compiled statements in a cache, so a
+statement run repeatedly is prepared only once.
+
+Dates are stored as ISO text ('YYYY-MM-DD HH:MM:SS'), which sorts and
+compares correctly as strings: filter years with
+"Date >= '2015-01-01' AND Date < '2016-01-01'" so the Date index is used.
+
+query() returns a DataFrame; query_rows() returns plain rows for scripts
+that only print a few values, so once a database is built they run without
+importing pandas at all. rows_to_string() and rows_to_markdown() lay such
+rows out the way DataFrame.to_string(index=False) and
+DataFrame.to_markdown(index=False) lay out the same query's DataFrame.
+"""
+
+import os
+import re
+import sqlite3
+
+from instrumentation import timed
+from launch_store import dataset_path, load_launches
+
+# Name of the launch table in every database
+TABLE = 'launches'
+
+# Columns that get an index when the table has them
+INDEXED_COLUMNS = ['LaunchSite', 'BoosterVersion', 'Customer', 'Date', 'LandingType']
+
+# Compiled statements kept per connection
+STATEMENT_CACHE_SIZE = 256
+
+# Decimal places pandas shows for floats (display.precision)
+FLOAT_DIGITS = 6
+
+_FIXED_POINT = re.compile(r'^[+-]?[0-9]+\.[0-9]*$')
+
+
+def connect(df=None, path=':memory:'):
+    """
+    Open a launch database, optionally loading a DataFrame into it.
+
+    Connections may be handed to another thread, but each thread should use
+    its own connection.
+
+    Args:
+        df (pandas.DataFrame, optional): Launch table to load
+        path (str): Database file, defaults to an in-memory database
+
+    Returns:
+        sqlite3.Connection: The open connection
+    """
+    conn = sqlite3.connect(path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+    if df is not None:
+        load_table(conn, df)
+    return conn
+
+
+def load_table(conn, df):
+    """Write df as the launch table and index it."""
+    # Bulk load without a rollback journal - a failed build is simply discarded
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    df.to_sql(TABLE, conn, if_exists='replace', index=False, chunksize=100000)
+
+    for column in INDEXED_COLUMNS:
+        if column in df.columns:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{TABLE}_{column}" ON {TABLE} ("{column}")')
+
+    # Collect statistics so the planner picks the right index
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def database_path(num_launches=100, seed=42, compat=None, cache_dir=None):
+    """Return the path of the SQLite file holding this dataset."""
+    return os.path.splitext(dataset_path(num_launches, seed, compat, cache_dir))[0] + '.sqlite'
+
+
+@timed()
+def open_launch_db(num_launches=100, seed=42, compat=None, cache_dir=None):
+    """
+    Open the indexed database for a dataset, building it on first use.
+
+    Args:
+        num_launches (int): Number of launches
+        seed (int): Generator seed
+        compat (str, optional): launch_data compat profile
+        cache_dir (str, optional): Store directory, defaults to launch_store.CACHE_DIR
+
+    Returns:
+        sqlite3.Connection: Connection to the launch database
+    """
+    path = database_path(num_launches, seed, compat, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df = load_launches(num_launches, seed, compat, cache_dir=cache_dir)
+
+        # Build in a temporary file so readers never open a half-built database
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = connect(df, tmp_path)
+        conn.close()
+        os.replace(tmp_path, path)
+
+    return connect(path=path)
+
+
+@timed()
+def query(conn, sql, params=()):
+    """
+    Run a parameterized query and return the rows as a DataFrame.
+
+    Args:
+        conn (sqlite3.Connection): Launch database
+        sql (str): SQL with ? placeholders
+        params (tuple): Values bound to the placeholders
+
+    Returns:
+        pandas.DataFrame: Result rows, with Date parsed back to datetime64
+    """
+    import pandas as pd
+    cursor = conn.execute(sql, params)
+    columns = [description[0] for description in cursor.description]
+    df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns, coerce_float=True)
+    if 'Date' in df.columns:
+        # ISO8601 rather than an inferred format: rows with and without
+        # fractional seconds can appear in the same result
+        df['Date'] = pd.to_datetime(df['Date'], format='ISO8601')
+    return df
+
+
+@timed()
+def query_rows(conn, sql, params=()):
+    """
+    Run a parameterized query and return the rows as sqlite3.Row objects.
+
+    Args:
+        conn (sqlite3.Connection): Launch database
+        sql (str): SQL with ? placeholders
+        params (tuple): Values bound to the placeholders
+
+    Returns:
+        list: Rows indexable by column name, with Date left as ISO text
+    """
+    cursor = conn.execute(sql, params)
+    cursor.row_factory = sqlite3.Row
+    return cursor.fetchall()
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _text_column(rows, name):
+    # One column as DataFrame.to_string shows it: right-aligned, with a
+    # leading space in the header of numeric columns
+    values = [row[name] for row in rows]
+    if name == 'Date':
+        # Midnight timestamps are shown as dates only; otherwise every value
+        # gets the microseconds if any value has them
+        if all(value[10:].strip(' 0:.') == '' for value in values):
+            values = [value[:10] for value in values]
+        elif any(len(value) > 19 for value in values):
+            values = [value if len(value) > 19 else value + '.000000' for value in values]
+        cells, header = values, name
+    elif values and all(isinstance(value, float) for value in values):
+        # Fixed point, dropping the trailing zeros every value shares
+        cells = [f"{value:.{FLOAT_DIGITS}f}" for value in values]
+        while all(_FIXED_POINT.match(cell) and cell.endswith('0') for cell in cells):
+            cells = [cell[:-1] for cell in cells]
+        cells = [cell + '0' if cell.endswith('.') else cell for cell in cells]
+        header = ' ' + name
+    elif values and all(_is_number(value) for value in values):
+        cells, header = [str(value) for value in values], ' ' + name
+    else:
+        cells, header = [str(value) for value in values], name
+    width = max([len(header)] + [len(cell) for cell in cells])
+    return [header.rjust(width)] + [cell.rjust(width) for cell in cells]
+
+
+def rows_to_string(rows, columns=None):
+    """
+    Lay out query_rows() results like DataFrame.to_string(index=False).
+
+    Covers what the launch tables hold: text, integers, fixed-point floats
+    (no scientific notation) and ISO Date text.
+
+    Args:
+        rows (list): sqlite3.Row results
+        columns (list, optional): Columns to show, defaults to every column
+
+    Returns:
+        str: The table, without a trailing newline
+    """
+    columns = columns or list(rows[0].keys())
+    text_columns = [_text_column(rows, name) for name in columns]
+    return '\n'.join(' '.join(line) for line in zip(*text_columns))
+
+
+def _decimals(cell):
+    # Digits after the decimal point, -1 for integers (tabulate's _afterpoint)
+    return len(cell) - cell.index('.') - 1 if '.' in cell else -1
+
+
+def rows_to_markdown(rows, columns=None):
+    """
+    Lay out query_rows() results like DataFrame.to_markdown(index=False).
+
+    Numbers are right-aligned on the decimal point in '%g' form, text and
+    Date columns are left-aligned, as tabulate's pipe format does.
+
+    Args:
+        rows (list): sqlite3.Row results
+        columns (list, optional): Columns to show, defaults to every column
+
+    Returns:
+        str: The table, without a trailing newline
+    """
+    columns = columns or list(rows[0].keys())
+    header_cells, rules, body = [], [], []
+    for name in columns:
+        values = [row[name] for row in rows]
+        numeric = bool(values) and all(_is_number(value) for value in values)
+        if numeric:
+            cells = [format(value, 'g') if isinstance(value, float) else str(value) for value in values]
+            point = max(_decimals(cell) for cell in cells)
+            cells = [cell + ' ' * (point - _decimals(cell)) for cell in cells]
+        else:
+            cells = [str(value) for value in values]
+        # Two spaces of padding around the header at least
+        width = max([len(name) + 2] + [len(cell) for cell in cells])
+        align = str.rjust if numeric else str.ljust
+        header_cells.append(align(name, width))
+        rules.append('-' * (width + 1) + ':' if numeric else ':' + '-' * (width + 1))
+        body.append([align(cell, width) for cell in cells])
+    lines = ['| ' + ' | '.join(header_cells) + ' |', '|' + '|'.join(rules) + '|']
+    lines += ['| ' + ' | '.join(line) + ' |' for line in zip(*body)]
+    return '\n'.join(lines)
@@ -0,0 +1,275 @@
+"""
+Columnar Launch Store
+
+Materializes a generated launch table once as an uncompressed Arrow IPC
+(Feather v2) file, keyed by the generator parameters, the seed and the
+source of the generator and the launch schema. Later runs memory-map that
+file and read only the columns a script asks for, so a query script's cold
+start is a file open plus a column projection instead of a fresh round of
+np.random draws.
+
+If pyarrow is not installed the data is generated in memory as before.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+
+from instrumentation import timed
+
+# Where materialized launch tables are kept (override with SPACEX_LAUNCH_CACHE)
+CACHE_DIR = os.environ.get('SPACEX_LAUNCH_CACHE', '.launch_cache')
+
+
+def _feather():
+    # pyarrow takes longer to import than a cached query takes to run, so it
+    # is only loaded when a table is actually read or written
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    return feather
+
+
+# Modules whose source decides a generated table's values and layout
+GENERATOR_MODULES = ('launch_data', 'launch_schema')
+
+
+def _generator_fingerprint():
+    # Any edit to launch_data.py or to the schema its dtypes come from
+    # invalidates the cached tables. The files are located rather than
+    # imported, so a cache hit never loads numpy or pandas
+    digest = hashlib.sha256()
+    for module in GENERATOR_MODULES:
+        with open(importlib.util.find_spec(module).origin, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def dataset_key(num_launches=100, seed=42, compat=None):
+    """Return the cache key for a set of generator parameters."""
+    if not isinstance(seed, int):
+        raise TypeError("Only integer seeds can be cached; pass a Generator to generate_launches() directly")
+    params = json.dumps({
+        'num_launches': num_launches,
+        'seed': seed,
+        'compat': compat,
+        'generator': _generator_fingerprint()
+    }, sort_keys=True)
+    return hashlib.sha256(params.encode('utf-8')).hexdigest()[:16]
+
+
+def dataset_path(num_launches=100, seed=42, compat=None, cache_dir=None):
+    """Return the path of the Arrow file holding this dataset."""
+    name = f"launches_{compat or 'canonical'}_{num_launches}_{seed}_{dataset_key(num_launches, seed, compat)}.arrow"
+    return os.path.join(cache_dir or CACHE_DIR, name)
+
+
+@timed()
+def materialize(num_launches=100, seed=42, compat=None, cache_dir=None, overwrite=False):
+    """
+    Generate the launch table and write it to the store if it is not there yet.
+
+    Args:
+        num_launches (int): Number of launches to generate
+        seed (int): Generator seed
+        compat (str, optional): launch_data compat profile
+        cache_dir (str, optional): Store directory, defaults to CACHE_DIR
+        overwrite (bool): Regenerate even if the file already exists
+
+    Returns:
+        str: Path of the Arrow file
+    """
+    feather = _feather()
+    if feather is None:
+        raise ImportError("pyarrow is required to materialize the launch store")
+
+    path = dataset_path(num_launches, seed, compat, cache_dir)
+    if os.path.exists(path) and not overwrite:
+        return path
+
+    from launch_data import generate_launches
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df = generate_launches(num_launches, seed=seed, compat=compat)
+
+    # Write to a temporary file first so readers never see a partial table.
+    # Uncompressed IPC keeps the columns memory-mappable without a decode step.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(df, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+    return path
+
+
+@timed()
+def load_launches(num_launches=100, seed=42, compat=None, columns=None, cache_dir=None):
+    """
+    Load a launch table from the store, generating it on first use.
+
+    Args:
+        num_launches (int): Number of launches
+        seed (int): Generator seed
+        compat (str, optional): launch_data compat profile
+        columns (list, optional): Only read these columns, in this order
+        cache_dir (str, optional): Store directory, defaults to CACHE_DIR
+
+    Returns:
+        pandas.DataFrame: The launch table
+    """
+    feather = _feather()
+    if feather is None:
+        # Fall back to generating in memory
+        from launch_data import generate_launches
+        df = generate_launches(num_launches, seed=seed, compat=compat)
+        return df[columns] if columns is not None else df
+
+    path = materialize(num_launches, seed, compat, cache_dir)
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas()
+
+
+# ---------------------------------------------------------------------------
+# Synced launch tables
+#
+# Launches collected from an external source (see launch_sync.py) are kept
+# per source as one Arrow file per launch year, so an upsert of new launches
+# rewrites the one or two partitions they fall in instead of the history.
+# ---------------------------------------------------------------------------
+
+def synced_dir(source, cache_dir=None):
+    """Return the directory holding the year partitions of a synced source."""
+    return os.path.join(cache_dir or CACHE_DIR, 'synced', source)
+
+
+def synced_years(source, cache_dir=None):
+    """Return the launch years stored for a synced source, in order."""
+    directory = synced_dir(source, cache_dir)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(int(name[5:-6]) for name in os.listdir(directory)
+                  if name.startswith('year=') and name.endswith('.arrow'))
+
+
+def _partition_path(source, year, cache_dir=None):
+    return os.path.join(synced_dir(source, cache_dir), f"year={year}.arrow")
+
+
+def _changed_rows(current, delta):
+    # True for each delta row whose stored copy differs in any column (null
+    # equal to null), comparing only the columns the delta carries. Values
+    # are compared as objects, since categoricals with different categories
+    # and nullable integers do not compare directly.
+    old = current.loc[delta.index, delta.columns].astype(object)
+    new = delta.astype(object)
+    same = (old == new) | (old.isna() & new.isna())
+    return ~same.all(axis=1)
+
+
+@timed()
+def upsert_launches(df, source, key='FlightNumber', cache_dir=None):
+    """
+    Insert new launches into a synced source and replace changed ones.
+
+    Only the year partitions holding new or changed rows are rewritten, in
+    the typed launch_schema layout. The delta's keys are looked up in every
+    partition, so a launch whose date moves into another year is dropped
+    from its old partition and counted as updated, and both years are
+    reported.
+
+    Args:
+        df (pandas.DataFrame): Launch rows with a Date column and the key column
+        source (str): Source name, e.g. 'spacex_api'
+        key (str): Column identifying a launch
+        cache_dir (str, optional): Store directory, defaults to CACHE_DIR
+
+    Returns:
+        dict: Counts of inserted, updated and unchanged rows, and the sorted
+        list of years whose partitions were rewritten
+    """
+    import pandas as pd
+    from launch_schema import cast_launches
+
+    feather = _feather()
+    if feather is None:
+        raise ImportError("pyarrow is required to store synced launches")
+
+    os.makedirs(synced_dir(source, cache_dir), exist_ok=True)
+    summary = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'years': []}
+    df = df.drop_duplicates(key, keep='last').set_index(key)
+    new_years = df['Date'].dt.year
+
+    # Where each delta key is stored now (only the key column is read), and
+    # which stored launches have to leave their partition for another year
+    stored = df.index[:0]
+    moved_out = {}
+    for year in synced_years(source, cache_dir):
+        keys = feather.read_table(_partition_path(source, year, cache_dir), columns=[key],
+                                  memory_map=True).column(0).to_pandas()
+        keys = df.index[df.index.isin(keys)]
+        stored = stored.union(keys)
+        leaving = keys[new_years.loc[keys].to_numpy() != year]
+        if len(leaving):
+            moved_out[year] = leaving
+
+    for year in sorted(set(new_years.unique().tolist()) | set(moved_out)):
+        year = int(year)
+        path = _partition_path(source, year, cache_dir)
+        delta = df[new_years == year]
+        leaving = moved_out.get(year, delta.index[:0])
+        if os.path.exists(path):
+            current = feather.read_feather(path).set_index(key)
+        else:
+            current = delta.iloc[:0]
+        known = delta.index.isin(current.index)
+        changed = _changed_rows(current, delta[known])
+        moved_in = ~known & delta.index.isin(stored)
+        inserted = int((~known & ~moved_in).sum())
+        updated = int(changed.sum()) + int(moved_in.sum())
+        summary['unchanged'] += int(known.sum()) - int(changed.sum())
+        if not inserted and not updated and not len(leaving):
+            continue
+        summary['inserted'] += inserted
+        summary['updated'] += updated
+        summary['years'].append(year)
+
+        replaced = delta.index[~known].union(changed.index[changed.to_numpy()])
+        table = pd.concat([current.drop(index=changed.index[changed.to_numpy()].union(leaving)),
+                           delta.loc[replaced]])
+        if not len(table):
+            # Every launch of the year moved to another year
+            os.remove(path)
+            continue
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        # Concatenated categoricals fall back to object, so cast back to the schema
+        table = cast_launches(table.sort_index().reset_index(), f"{source} {year} launches")
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    return summary
+
+
+@timed()
+def load_synced(source, columns=None, years=None, cache_dir=None):
+    """
+    Load the launches stored for a synced source.
+
+    Args:
+        source (str): Source name
+        columns (list, optional): Only read these columns, in this order
+        years (iterable, optional): Only read these launch years
+        cache_dir (str, optional): Store directory, defaults to CACHE_DIR
+
+    Returns:
+        pandas.DataFrame: The launches ordered by year partition, then key;
+        None if nothing has been synced from the source
+    """
+    feather = _feather()
+    if feather is None:
+        raise ImportError("pyarrow is required to read synced launches")
+    import pyarrow as pa
+
+    wanted = synced_years(source, cache_dir) if years is None else sorted(years)
+    tables = [feather.read_table(_partition_path(source, year, cache_dir), columns=columns, memory_map=True)
+              for year in wanted if os.path.exists(_partition_path(source, year, cache_dir))]
+    if not tables:
+        return None
+    return pa.concat_tables(tables).to_pandas()
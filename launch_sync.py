@@ -0,0 +1,241 @@
+"""
+Incremental Launch Sync
+
+Keeps a local copy of the launch history up to date without pulling the
+whole history each time. For every source, a watermark is kept in a JSON
+state file: the latest launch date and flight number seen.
+
+A run fetches only launches after the watermark, plus a LOOKBACK_DAYS
+window before it, because recent launches still get corrected (landing
+outcomes confirmed, payload masses published). The rows are upserted into
+the launch store's year partitions, and the aggregate cube is rebuilt for
+the touched years only. The cost of a nightly refresh follows the number of
+new launches, not the length of the history.
+
+create_highest_success_site_dashboard.py --source <name> draws from the
+synced launches and cube; the other reports still use their sample data.
+
+Sources are registered in SOURCES as fetch(watermark, **options) functions
+returning launch table rows.
+
+Usage:
+    python launch_sync.py                       # sync the SpaceX API
+    python launch_sync.py --base-url http://localhost:8766/v4
+    python launch_sync.py --full                # ignore the watermark
+    python launch_sync.py --source wikipedia
+    python launch_sync.py status
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+import launch_store
+from instrumentation import checkpoint, timed
+
+# Watermarks per source (override with SPACEX_SYNC_STATE)
+STATE_PATH = os.environ.get('SPACEX_SYNC_STATE', os.path.join(launch_store.CACHE_DIR, 'sync_state.json'))
+
+# Launches this many days before the watermark are fetched again to pick up corrections
+LOOKBACK_DAYS = 30
+
+
+def load_state(path=None):
+    """Return the saved watermarks: source -> dict."""
+    path = path or STATE_PATH
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(state, path=None):
+    path = path or STATE_PATH
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _since(watermark):
+    # Start of the lookback window before the watermark date, as ISO text
+    last = datetime.datetime.fromisoformat(watermark['last_date'])
+    return (last - datetime.timedelta(days=LOOKBACK_DAYS)).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def fetch_spacex_api(watermark, base_url=None):
+    """
+    Fetch the launches after a watermark from the SpaceX API.
+
+    Args:
+        watermark (dict, optional): last_date and last_flight_number, or
+            None for the full history
+        base_url (str, optional): API root, e.g. the fixture server
+
+    Returns:
+        list: launch table rows (spacex_api.launch_rows)
+    """
+    from spacex_api import fetch_launch_documents, launch_rows
+
+    query = None
+    if watermark:
+        query = {'$or': [{'date_utc': {'$gte': _since(watermark)}},
+                         {'flight_number': {'$gt': watermark['last_flight_number']}}]}
+    documents, _ = fetch_launch_documents(base_url, query=query)
+    return launch_rows(documents)
+
+
+def fetch_wikipedia(watermark, offline=False):
+    """
+    Scrape the launches after a watermark from the Wikipedia launch lists.
+
+    Only the pages that can hold launches from the lookback window on are
+    fetched (the per-year archives before it are skipped), and those come
+    from the scraper's page cache when unchanged. Pages that cannot be
+    fetched are reported on stderr and served from the cache if possible;
+    launches on a skipped page are picked up by a later --full sync.
+
+    Args:
+        watermark (dict, optional): last_date and last_flight_number, or
+            None for the full history
+        offline (bool): Only use cached pages
+
+    Returns:
+        list: launch table rows (wiki_scraper.parse_page)
+    """
+    from wiki_scraper import fetch_pages, iter_launch_rows, page_urls, report_failures
+
+    since = _since(watermark) if watermark else None
+    failures = []
+    rows = iter_launch_rows(fetch_pages(page_urls(int(since[:4]) if since else None), offline=offline,
+                                        failures=failures))
+    if watermark:
+        rows = (row for row in rows
+                if row['Date'] >= since or row['FlightNumber'] > watermark['last_flight_number'])
+    rows = list(rows)
+    report_failures(failures)
+    return rows
+
+
+# Registered sources: name -> fetch(watermark, **options)
+SOURCES = {
+    'spacex_api': fetch_spacex_api,
+    'wikipedia': fetch_wikipedia,
+}
+
+
+@timed()
+def sync(source='spacex_api', full=False, state_path=None, cache_dir=None, **options):
+    """
+    Bring one source up to date and refresh the aggregates it touched.
+
+    Args:
+        source (str): Name in SOURCES
+        full (bool): Fetch the whole history regardless of the watermark
+        state_path (str, optional): Watermark file, defaults to STATE_PATH
+        cache_dir (str, optional): Launch store directory
+        **options: Passed to the source's fetch function
+
+    Returns:
+        dict: fetched, inserted, updated and unchanged counts, the years
+        whose aggregates were rebuilt, and the new watermark
+    """
+    from launch_cube import update_synced_cube
+    from spacex_api import launch_frame
+
+    if source not in SOURCES:
+        raise KeyError(f"Unknown sync source '{source}' (known: {', '.join(SOURCES)})")
+    state = load_state(state_path)
+    watermark = None if full else state.get(source)
+
+    checkpoint('fetch')
+    rows = SOURCES[source](watermark, **options)
+    summary = {'source': source, 'fetched': len(rows), 'inserted': 0, 'updated': 0, 'unchanged': 0,
+               'years': [], 'watermark': watermark}
+    if not rows:
+        return summary
+
+    checkpoint('upsert')
+    df = launch_frame(rows)
+    summary.update(launch_store.upsert_launches(df, source, cache_dir=cache_dir))
+
+    checkpoint('aggregate')
+    if summary['years']:
+        # A first sync has no cube to patch, so it aggregates everything
+        update_synced_cube(source, summary['years'] if watermark else None, cache_dir)
+
+    last_date = df['Date'].max().isoformat()
+    last_flight = int(df['FlightNumber'].max())
+    if watermark:
+        last_date = max(last_date, watermark['last_date'])
+        last_flight = max(last_flight, watermark['last_flight_number'])
+    summary['watermark'] = {
+        'last_date': last_date,
+        'last_flight_number': last_flight,
+        'synced_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+    }
+    state[source] = summary['watermark']
+    save_state(state, state_path)
+    return summary
+
+
+def touched_aggregates(source, years, cache_dir=None):
+    """
+    Launches and success rates by site and booster version for the touched years.
+
+    Returns:
+        pandas.DataFrame: Cube rollup indexed by (Year, LaunchSite, BoosterVersion)
+    """
+    from launch_cube import load_synced_cube
+
+    cube = load_synced_cube(source, cache_dir)
+    return cube.rollup(['Year', 'LaunchSite', 'BoosterVersion'], Year=list(years))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally sync launch data into the launch store")
+    parser.add_argument('command', nargs='?', default='sync', choices=['sync', 'status'])
+    parser.add_argument('--source', default='spacex_api', choices=list(SOURCES))
+    parser.add_argument('--base-url', default=None, help="SpaceX API root (e.g. the fixture server)")
+    parser.add_argument('--offline', action='store_true', help="Wikipedia: only use cached pages")
+    parser.add_argument('--full', action='store_true', help="Fetch the whole history")
+    parser.add_argument('--state', default=None, help=f"Watermark file (default: {STATE_PATH})")
+    args = parser.parse_args()
+
+    if args.command == 'status':
+        state = load_state(args.state)
+        for source in SOURCES:
+            watermark = state.get(source)
+            years = launch_store.synced_years(source)
+            if watermark:
+                print(f"{source}: up to flight {watermark['last_flight_number']} ({watermark['last_date']}), "
+                      f"synced {watermark['synced_at']}, {len(years)} year partitions")
+            else:
+                print(f"{source}: never synced")
+        return 0
+
+    options = {'base_url': args.base_url} if args.source == 'spacex_api' else {'offline': args.offline}
+    try:
+        summary = sync(args.source, full=args.full, state_path=args.state, **options)
+    except ImportError as e:
+        # e.g. httpx for the SpaceX API source
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{summary['source']}: fetched {summary['fetched']} launches, {summary['inserted']} new, "
+          f"{summary['updated']} updated, {summary['unchanged']} unchanged")
+    if not summary['years']:
+        print("Nothing changed; no aggregates recomputed")
+        return 0
+    print(f"Recomputed aggregates for {', '.join(str(year) for year in summary['years'])}")
+    print(f"Watermark: flight {summary['watermark']['last_flight_number']} ({summary['watermark']['last_date']})")
+    print()
+    print(touched_aggregates(args.source, summary['years']).to_string(float_format=lambda value: f"{value:.1f}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Static Map Snapshots
+
+Rasterizes map markers and lines over cached web map tiles to a PNG, without
+a browser, so the launch maps can go into reports and slide decks. Tiles come
+from tile_cache (downloaded on a miss unless offline; tiles that are still
+missing are drawn as plain gray), then markers are drawn with PIL at their
+Web Mercator pixel positions.
+
+Markers are dicts with lat and lon plus optional color, radius (px), outline
+and label; lines are dicts with points (a list of (lat, lon)), color and
+width. When no zoom is given, the snapshot is zoomed to fit every marker.
+"""
+
+import io
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from instrumentation import timed
+from tile_cache import TILE_SIZE, TILE_SOURCES, TileCache, lat_lon_to_pixel
+
+# Snapshot size in pixels
+DEFAULT_SIZE = (1200, 800)
+
+# Space kept free around the markers when fitting the zoom (px)
+FIT_PADDING = 60
+
+# Zoom levels considered when fitting, and the zoom used for a single point
+MIN_ZOOM, MAX_ZOOM = 1, 16
+SINGLE_POINT_ZOOM = 12
+
+# Background for tiles that are neither cached nor downloadable
+MISSING_TILE_COLOR = (229, 227, 223)
+
+
+def fit_zoom(points, size=DEFAULT_SIZE, padding=FIT_PADDING):
+    """Return the highest zoom at which every (lat, lon) point fits in size."""
+    if len(points) < 2:
+        return SINGLE_POINT_ZOOM
+    width, height = size[0] - 2 * padding, size[1] - 2 * padding
+    for zoom in range(MAX_ZOOM, MIN_ZOOM - 1, -1):
+        xs, ys = zip(*(lat_lon_to_pixel(lat, lon, zoom) for lat, lon in points))
+        if max(xs) - min(xs) <= width and max(ys) - min(ys) <= height:
+            return zoom
+    return MIN_ZOOM
+
+
+def _center(points, zoom):
+    xs, ys = zip(*(lat_lon_to_pixel(lat, lon, zoom) for lat, lon in points))
+    return (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+
+
+def _basemap(cache, zoom, left, top, size):
+    # Stitch the tiles under the window whose top-left pixel is (left, top)
+    image = Image.new('RGB', size, MISSING_TILE_COLOR)
+    missing = 0
+    tiles_per_side = 2 ** zoom
+    first_x, first_y = int(left // TILE_SIZE), int(top // TILE_SIZE)
+    last_x, last_y = int((left + size[0]) // TILE_SIZE), int((top + size[1]) // TILE_SIZE)
+    for tile_y in range(first_y, last_y + 1):
+        if not 0 <= tile_y < tiles_per_side:
+            continue
+        for tile_x in range(first_x, last_x + 1):
+            data = cache.tile(zoom, tile_x % tiles_per_side, tile_y)
+            if data is None:
+                missing += 1
+                continue
+            tile = Image.open(io.BytesIO(data)).convert('RGB')
+            image.paste(tile, (round(tile_x * TILE_SIZE - left), round(tile_y * TILE_SIZE - top)))
+    return image, missing
+
+
+@timed()
+def render_snapshot(output, markers, lines=None, source='OpenStreetMap', zoom=None, center=None,
+                    size=DEFAULT_SIZE, title=None, cache_dir=None, offline=False):
+    """
+    Render markers (and lines) over cached map tiles to a PNG.
+
+    Args:
+        output (str): PNG path
+        markers (list): Marker dicts (lat, lon, color, radius, outline, label)
+        lines (list, optional): Line dicts (points, color, width)
+        source (str): Tile source name from tile_cache.TILE_SOURCES
+        zoom (int, optional): Zoom level, fitted to the markers when None
+        center (tuple, optional): (lat, lon) of the image center, defaults to
+            the middle of the markers
+        size (tuple): (width, height) in pixels
+        title (str, optional): Caption drawn at the top
+        cache_dir (str, optional): Tile cache directory
+        offline (bool): Only use cached tiles
+
+    Returns:
+        dict: The zoom used and how many tiles were missing
+    """
+    lines = lines or []
+    points = [(m['lat'], m['lon']) for m in markers] + [point for line in lines for point in line['points']]
+    if not points and center is None:
+        raise ValueError("Nothing to draw: give markers, lines or a center")
+    if zoom is None:
+        zoom = fit_zoom(points, size)
+    center_x, center_y = lat_lon_to_pixel(*center, zoom) if center else _center(points, zoom)
+    left, top = center_x - size[0] / 2, center_y - size[1] / 2
+
+    cache = TileCache(source, cache_dir, offline)
+    try:
+        image, missing = _basemap(cache, zoom, left, top, size)
+    finally:
+        cache.close()
+    draw = ImageDraw.Draw(image, 'RGBA')
+    font = ImageFont.load_default()
+
+    def to_pixel(lat, lon):
+        x, y = lat_lon_to_pixel(lat, lon, zoom)
+        return x - left, y - top
+
+    for line in lines:
+        draw.line([to_pixel(lat, lon) for lat, lon in line['points']],
+                  fill=ImageColor.getrgb(line.get('color', 'blue')) + (200,), width=line.get('width', 2))
+
+    for marker in markers:
+        x, y = to_pixel(marker['lat'], marker['lon'])
+        radius = marker.get('radius', 6)
+        fill = ImageColor.getrgb(marker.get('color', '#005288'))
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=fill + (190,),
+                     outline=marker.get('outline', 'white'), width=2)
+        if marker.get('label'):
+            draw.text((x + radius + 4, y - 6), marker['label'], fill='black', font=font,
+                      stroke_width=2, stroke_fill='white')
+
+    if title:
+        draw.rectangle([0, 0, size[0], 28], fill=(255, 255, 255, 220))
+        draw.text((size[0] / 2, 14), title, fill='black', font=font, anchor='mm')
+
+    # Tile providers require their attribution on every rendered map
+    attribution = TILE_SOURCES[source]['attribution'].replace('&copy;', '(c)')
+    box = draw.textbbox((0, 0), attribution, font=font)
+    draw.rectangle([size[0] - box[2] - 8, size[1] - box[3] - 6, size[0], size[1]], fill=(255, 255, 255, 200))
+    draw.text((size[0] - box[2] - 4, size[1] - box[3] - 3), attribution, fill='black', font=font)
+
+    image.save(output, optimize=True)
+    return {'zoom': zoom, 'missing_tiles': missing}
@@ -0,0 +1,196 @@
+"""
+Fitted Model Cache
+
+Keeps fitted estimators and cross-validation fold scores on disk with joblib,
+keyed by a hash of the training data, the unfitted pipeline (every
+hyperparameter included) and the scikit-learn version. When none of those
+changed, a chart script reloads the fitted model instead of retraining it.
+
+The cache is bounded in size: after each write the least recently used
+entries are removed until the directory fits in MAX_CACHE_BYTES.
+"""
+
+import hashlib
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.base import clone
+from sklearn.model_selection import cross_val_score
+
+from instrumentation import timed
+
+# Where fitted models are kept (override with SPACEX_MODEL_CACHE)
+CACHE_DIR = os.environ.get('SPACEX_MODEL_CACHE', '.model_cache')
+
+# Size limit for the cache directory (override with SPACEX_MODEL_CACHE_MB)
+MAX_CACHE_BYTES = int(float(os.environ.get('SPACEX_MODEL_CACHE_MB', 512)) * 1024 * 1024)
+
+
+def data_fingerprint(*arrays):
+    """Hash the contents, shape, dtypes and labels of training arrays."""
+    digest = hashlib.sha256()
+    for data in arrays:
+        if isinstance(data, pd.DataFrame):
+            digest.update(repr((list(data.columns), list(data.dtypes))).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        elif isinstance(data, pd.Series):
+            digest.update(repr((data.name, data.dtype)).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        else:
+            data = np.ascontiguousarray(data)
+            digest.update(f"{data.shape}{data.dtype}".encode('utf-8'))
+            digest.update(data.tobytes())
+    return digest.hexdigest()
+
+
+def model_key(estimator, X, y, kind='fit', extra=None):
+    """Return the cache key for fitting (or cross-validating) estimator on X, y."""
+    # Hash an unfitted clone so only the pipeline definition and its
+    # hyperparameters count, not any state left over from an earlier fit
+    return joblib.hash({
+        'kind': kind,
+        'data': data_fingerprint(X, y),
+        'estimator': clone(estimator),
+        'extra': extra,
+        'sklearn': sklearn.__version__
+    })
+
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir or CACHE_DIR, f"{key}.joblib")
+
+
+def _load(path):
+    try:
+        value = joblib.load(path)
+    except (OSError, EOFError, ValueError):
+        return None
+    # Mark as recently used for eviction (another process may have just
+    # evicted it, which only costs that entry its place in the cache)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+    return value
+
+
+def _store(path, value, cache_dir, max_bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(value, tmp_path)
+    os.replace(tmp_path, path)
+    evict(max_bytes, cache_dir, keep=path)
+
+
+def evict(max_bytes=None, cache_dir=None, keep=None):
+    """
+    Remove least recently used entries until the cache fits in max_bytes.
+
+    Args:
+        max_bytes (int, optional): Size limit, defaults to MAX_CACHE_BYTES
+        cache_dir (str, optional): Cache directory, defaults to CACHE_DIR
+        keep (str, optional): Path that must not be removed (the entry just written)
+
+    Returns:
+        int: Number of entries removed
+    """
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    cache_dir = cache_dir or CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    # Search workers write entries concurrently, so any of them may already
+    # be gone by the time it is looked at or removed
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith('.joblib'):
+            path = os.path.join(cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        else:
+            removed += 1
+        total -= size
+    return removed
+
+
+@timed()
+def fit_cached(estimator, X, y, cache_dir=None, max_bytes=None):
+    """
+    Fit estimator on X, y, or reload the fitted model from the cache.
+
+    Args:
+        estimator: Unfitted scikit-learn estimator or Pipeline
+        X (array-like): Training features
+        y (array-like): Training labels
+        cache_dir (str, optional): Cache directory, defaults to CACHE_DIR
+        max_bytes (int, optional): Cache size limit, defaults to MAX_CACHE_BYTES
+
+    Returns:
+        The fitted estimator (a new object when loaded from the cache)
+    """
+    path = _entry_path(model_key(estimator, X, y), cache_dir)
+    fitted = _load(path) if os.path.exists(path) else None
+    if fitted is None:
+        fitted = estimator.fit(X, y)
+        _store(path, fitted, cache_dir, max_bytes)
+    return fitted
+
+
+@timed()
+def cross_val_score_cached(estimator, X, y, cv=5, scoring=None, error_score=np.nan,
+                           cache_dir=None, max_bytes=None):
+    """
+    Per-fold cross-validation scores, computed once per data/pipeline/cv setup.
+
+    cv must be an int or a deterministic splitter (shuffle=False or a fixed
+    random_state) for cached scores to be meaningful. The ValueError
+    cross_val_score raises when every fold fails (e.g. a parameter value the
+    installed scikit-learn rejects) is cached too and raised again, so
+    hopeless candidates in a search are not refitted on every run.
+
+    Args:
+        estimator: Unfitted scikit-learn estimator or Pipeline
+        X (array-like): Training features
+        y (array-like): Training labels
+        cv (int or splitter): Folds, as for cross_val_score
+        scoring (str, optional): Scorer name, as for cross_val_score
+        error_score: Score of a fold whose fit fails, as for cross_val_score
+        cache_dir (str, optional): Cache directory, defaults to CACHE_DIR
+        max_bytes (int, optional): Cache size limit, defaults to MAX_CACHE_BYTES
+
+    Returns:
+        numpy.ndarray: Score of each fold
+
+    Raises:
+        ValueError: Every fold failed to fit (as raised by cross_val_score)
+    """
+    extra = (repr(cv), scoring, repr(error_score))
+    path = _entry_path(model_key(estimator, X, y, kind='cv', extra=extra), cache_dir)
+    scores = _load(path) if os.path.exists(path) else None
+    if scores is None:
+        try:
+            scores = cross_val_score(estimator, X, y, cv=cv, scoring=scoring, error_score=error_score)
+        except ValueError as error:
+            scores = error
+        _store(path, scores, cache_dir, max_bytes)
+    if isinstance(scores, ValueError):
+        raise scores
+    return scores
@@ -1,4 +1,4 @@
-import pandas as pd
+import joblib
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -7,109 +7,27 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.svm import SVC
 from sklearn.metrics import confusion_matrix, classification_report, accuracy_score
 from sklearn.pipeline import Pipeline
+from instrumentation import checkpoint, timed
+from launch_features import generate_launch_features
+from model_cache import fit_cached
 
 # Set styling for plots
 plt.style.use('ggplot')
 sns.set_palette('colorblind')
 
 # Reuse our existing launch data generation function from previous scripts
+@timed()
 def generate_launch_data(num_launches=200):
-    np.random.seed(42)  # For reproducibility
-    
-    # Create features that might predict launch success
-    flight_numbers = np.arange(1, num_launches + 1)
-    
-    # Create booster versions (feature 1)
-    booster_versions_num = []
-    for flight_num in flight_numbers:
-        if flight_num <= 5:
-            booster_versions_num.append(1)  # F9 v1.0
-        elif flight_num <= 20:
-            booster_versions_num.append(2)  # F9 v1.1
-        elif flight_num <= 60:
-            booster_versions_num.append(3)  # F9 FT
-        else:
-            booster_versions_num.append(4)  # F9 Block 5
-    
-    # Generate payload mass (feature 2)
-    payloads = []
-    for version in booster_versions_num:
-        if version == 1:  # F9 v1.0
-            payloads.append(np.random.uniform(1000, 8000))
-        elif version == 2:  # F9 v1.1
-            payloads.append(np.random.uniform(3000, 12000))
-        elif version == 3:  # F9 FT
-            payloads.append(np.random.uniform(5000, 15000))
-        else:  # F9 Block 5
-            payloads.append(np.random.uniform(6000, 16000))
-    
-    # Generate simulated wind speeds at launch (feature 3)
-    wind_speeds = np.random.normal(15, 7, num_launches)
-    wind_speeds = np.clip(wind_speeds, 0, 35)  # Limit to realistic range
-    
-    # Generate temperature at launch (feature 4)
-    temperatures = np.random.normal(22, 10, num_launches)
-    
-    # Generate launch pad anomalies count (feature 5)
-    anomalies = np.random.poisson(2, num_launches)
-    
-    # Generate mission complexity score (feature 6)
-    complexity = np.random.uniform(1, 10, num_launches)
-    
-    # Generate success probability based on features
-    mission_outcomes = []
-    for i in range(num_launches):
-        # Base probability by booster version
-        if booster_versions_num[i] == 1:
-            base_prob = 0.75
-        elif booster_versions_num[i] == 2:
-            base_prob = 0.85
-        elif booster_versions_num[i] == 3:
-            base_prob = 0.92
-        else:
-            base_prob = 0.98
-        
-        # Adjust for payload (heavier payloads slightly reduce success chance)
-        payload_factor = (payloads[i] - 1000) / 15000
-        payload_effect = -0.08 * payload_factor * (5 - booster_versions_num[i])
-        
-        # Adjust for wind (high wind reduces success chance)
-        wind_effect = -0.005 * max(0, wind_speeds[i] - 10)
-        
-        # Adjust for temperature (extreme temperatures reduce success chance)
-        temp_effect = -0.005 * abs(temperatures[i] - 20)
-        
-        # Adjust for anomalies (more anomalies reduce success chance)
-        anomaly_effect = -0.03 * anomalies[i]
-        
-        # Adjust for complexity (more complex missions reduce success chance)
-        complexity_effect = -0.01 * complexity[i]
-        
-        # Calculate final probability
-        success_prob = base_prob + payload_effect + wind_effect + temp_effect + anomaly_effect + complexity_effect
-        
-        # Ensure probability is valid
-        success_prob = max(0.5, min(0.99, success_prob))
-        
-        # Generate outcome
-        mission_outcomes.append(np.random.binomial(1, success_prob))
-    
-    # Create a DataFrame
-    df = pd.DataFrame({
-        'BoosterVersion': booster_versions_num,
-        'PayloadMass': payloads,
-        'WindSpeed': wind_speeds,
-        'Temperature': temperatures,
-        'AnomalyCount': anomalies,
-        'MissionComplexity': complexity,
-        'MissionSuccess': mission_outcomes
-    })
-    
-    return df
+    # Features that might predict launch success (booster version, payload,
+    # wind, temperature, pad anomalies, mission complexity) and the outcome,
+    # drawn in the same order as the original np.random.seed(42) loops
+    return generate_launch_features(num_launches, seed=42, legacy=True)
 
+checkpoint('generate')
 # Generate launch data
 launch_data = generate_launch_data(500)  # Generate more data for better model training
 
+checkpoint('fit')
 # Split into features and target
 X = launch_data.drop('MissionSuccess', axis=1)
 y = launch_data['MissionSuccess']
@@ -123,9 +41,13 @@ svm_pipeline = Pipeline([
     ('model', SVC(probability=True, random_state=42))
 ])
 
-# Train the model
-svm_pipeline.fit(X_train, y_train)
+# Train the model (or reload it if this data and pipeline were fitted before)
+svm_pipeline = fit_cached(svm_pipeline, X_train, y_train)
 
+# Save the fitted pipeline for batch scoring with score_launches.py
+joblib.dump(svm_pipeline, 'svm_pipeline.joblib')
+
+checkpoint('evaluate')
 # Make predictions
 y_pred = svm_pipeline.predict(X_test)
 
@@ -144,6 +66,7 @@ total = tn + fp + fn + tp
 success_rate = (tp / (tp + fn)) * 100
 failure_detection_rate = (tn / (tn + fp)) * 100
 
+checkpoint('plot')
 # Visualize confusion matrix
 plt.figure(figsize=(10, 8))
 
@@ -180,6 +103,7 @@ plt.figtext(1.02, 0.5, textstr, fontsize=12,
 
 # Adjust layout and save
 plt.tight_layout(rect=[0, 0, 0.75, 1])  # Make room for the text box
+checkpoint('output')
 plt.savefig('svm_confusion_matrix.png', dpi=300, bbox_inches='tight')
 
 # Print the results
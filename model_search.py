@@ -0,0 +1,180 @@
+"""
+Parallel Model Selection Engine
+
+Runs several hyperparameter searches at once in a process pool instead of
+one GridSearchCV after another. Grid and random searches are split into
+shards of candidates so a large grid (the decision tree's 648 candidates)
+spreads over every worker rather than pinning one; successive-halving
+searches run as one task per model because each round depends on the last.
+
+The training data is written once to .npy files and memory-mapped by every
+worker when it starts, so tasks only carry an estimator and a list of
+candidates instead of re-pickling X_train for every fold.
+
+Each candidate's fold scores go through model_cache, keyed by the training
+data, the candidate's pipeline and the folds, so rerunning a search only
+cross-validates candidates it has not scored before (successive halving
+decides which candidates survive as it goes and is not cached).
+
+The returned SearchResult objects expose best_params_, best_score_,
+best_estimator_, cv_results_, predict() and score() like a fitted
+GridSearchCV, and pick the same winner (highest mean CV score, first
+candidate in grid order on ties).
+"""
+
+import os
+import tempfile
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.base import clone, is_classifier
+from sklearn.model_selection import ParameterGrid, ParameterSampler, check_cv
+
+from instrumentation import timed
+from model_cache import cross_val_score_cached
+
+# Supported search modes
+SEARCH_MODES = ('grid', 'random', 'halving')
+
+# Training data shared with the workers (set by _load_shared_data)
+_shared = {}
+
+
+class SearchResult:
+    """Outcome of one model's search, used like a fitted GridSearchCV."""
+
+    def __init__(self, estimator, params, scores, X, y):
+        self.cv_results_ = {
+            'params': params,
+            'mean_test_score': np.asarray(scores, dtype=float)
+        }
+        # np.nanargmax returns the first of tied candidates, like GridSearchCV
+        self.best_index_ = int(np.nanargmax(self.cv_results_['mean_test_score']))
+        self.best_params_ = params[self.best_index_]
+        self.best_score_ = self.cv_results_['mean_test_score'][self.best_index_]
+        self.best_estimator_ = clone(estimator).set_params(**self.best_params_).fit(X, y)
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
+
+    def score(self, X, y):
+        return self.best_estimator_.score(X, y)
+
+
+def _load_shared_data(x_path, y_path):
+    # Pool initializer: map the training data once per worker process
+    _shared['X'] = np.load(x_path, mmap_mode='r')
+    _shared['y'] = np.load(y_path, mmap_mode='r')
+
+
+def _score_candidates(estimator, candidates, cv):
+    X, y = _shared['X'], _shared['y']
+    cv = check_cv(cv, y, classifier=is_classifier(estimator))
+    scores = []
+    with warnings.catch_warnings():
+        # Failed fits (e.g. parameters an sklearn release no longer accepts)
+        # score NaN, as they do in GridSearchCV
+        warnings.simplefilter('ignore')
+        for params in candidates:
+            model = clone(estimator).set_params(**params)
+            try:
+                scores.append(np.mean(cross_val_score_cached(model, X, y, cv=cv, error_score=np.nan)))
+            except ValueError:
+                # cross_val_score raises when every fold failed
+                scores.append(np.nan)
+    return scores
+
+
+def _run_halving(estimator, param_grid, cv, random_state):
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.model_selection import HalvingGridSearchCV
+
+    X, y = _shared['X'], _shared['y']
+    search = HalvingGridSearchCV(estimator, param_grid, cv=cv, refit=False,
+                                 random_state=random_state, error_score=np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        search.fit(X, y)
+
+    # Only candidates that reached the final round compete for best
+    results = search.cv_results_
+    final = np.asarray(results['iter']) == results['iter'].max()
+    params = [p for p, keep in zip(results['params'], final) if keep]
+    scores = np.asarray(results['mean_test_score'])[final]
+    return params, scores
+
+
+def _candidates(param_grid, mode, n_iter, random_state):
+    if mode == 'random':
+        return list(ParameterSampler(param_grid, n_iter=n_iter, random_state=random_state))
+    return list(ParameterGrid(param_grid))
+
+
+def _shard(candidates, num_shards):
+    size = -(-len(candidates) // num_shards)
+    return [candidates[start:start + size] for start in range(0, len(candidates), size)]
+
+
+@timed()
+def run_searches(searches, X, y, cv=10, mode='grid', n_iter=50, max_workers=None, random_state=0):
+    """
+    Run hyperparameter searches for several models concurrently.
+
+    Args:
+        searches (dict): name -> (estimator, param_grid)
+        X (array-like): Training features
+        y (array-like): Training labels
+        cv (int or splitter): Cross-validation folds, as for GridSearchCV;
+            a shuffling splitter needs a fixed random_state for cached
+            scores to stay valid
+        mode (str): 'grid' (every candidate), 'random' (n_iter sampled
+            candidates per model) or 'halving' (successive halving)
+        n_iter (int): Candidates per model in random mode
+        max_workers (int, optional): Worker processes, defaults to os.cpu_count()
+        random_state (int): Seed for random sampling and halving
+
+    Returns:
+        dict: name -> SearchResult, in the order of searches
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{mode}', expected one of {', '.join(SEARCH_MODES)}")
+
+    X = np.ascontiguousarray(X)
+    y = np.ascontiguousarray(y)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory(prefix='model_search_') as tmp_dir:
+        x_path = os.path.join(tmp_dir, 'X.npy')
+        y_path = os.path.join(tmp_dir, 'y.npy')
+        np.save(x_path, X)
+        np.save(y_path, y)
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_load_shared_data,
+                                 initargs=(x_path, y_path)) as pool:
+            futures = {}
+            if mode == 'halving':
+                for name, (estimator, param_grid) in searches.items():
+                    futures[name] = [pool.submit(_run_halving, estimator, param_grid, cv, random_state)]
+            else:
+                candidates = {name: _candidates(param_grid, mode, n_iter, random_state)
+                              for name, (_, param_grid) in searches.items()}
+                total = sum(len(c) for c in candidates.values())
+                for name, (estimator, _) in searches.items():
+                    # Shard in proportion to grid size, about two shards per worker overall
+                    num_shards = max(1, min(len(candidates[name]), round(2 * max_workers * len(candidates[name]) / total)))
+                    futures[name] = [(shard, pool.submit(_score_candidates, estimator, shard, cv))
+                                     for shard in _shard(candidates[name], num_shards)]
+
+            results = {}
+            for name, (estimator, _) in searches.items():
+                if mode == 'halving':
+                    params, scores = futures[name][0].result()
+                else:
+                    params, scores = [], []
+                    for shard, future in futures[name]:
+                        params.extend(shard)
+                        scores.extend(future.result())
+                results[name] = SearchResult(estimator, params, scores, X, y)
+
+    return results
@@ -0,0 +1,114 @@
+"""
+Payload Range Queries
+
+Answers "which launches carried between min and max kg, and how did they
+do?" without touching the launch table again. Payloads are sorted once and
+prefix sums of launch and success counts (overall and per group, e.g. per
+booster version) are kept alongside, so any [min, max] range costs two
+binary searches plus a few subtractions, and binned success rates for a
+range cost one searchsorted over the bin edges.
+
+That makes a range cheap enough to recompute on every RangeSlider move or
+animation frame of create_payload_outcome_dashboard.py.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _prefix_sums(values, dtype):
+    sums = np.zeros((len(values) + 1,) + values.shape[1:], dtype=dtype)
+    np.cumsum(values, axis=0, out=sums[1:])
+    return sums
+
+
+class PayloadRangeIndex:
+    """Sorted payload masses with prefix sums of launches and successes."""
+
+    def __init__(self, payloads, outcomes, groups=None):
+        """
+        Args:
+            payloads (array-like): Payload mass of each launch (NaN rows are left out)
+            outcomes (array-like): 0/1 mission outcome of each launch
+            groups (array-like, optional): Label of each launch (e.g. BoosterVersion)
+                to keep per-group counts for
+        """
+        payloads = np.asarray(payloads, dtype=float)
+        known = ~np.isnan(payloads)
+        self.order = np.flatnonzero(known)[np.argsort(payloads[known], kind='stable')]
+        self.payloads = payloads[self.order]
+        self.outcomes = np.asarray(outcomes)[self.order].astype(np.int8)
+
+        count_dtype = np.int32 if len(self.payloads) < np.iinfo(np.int32).max else np.int64
+        self.success_prefix = _prefix_sums(self.outcomes, count_dtype)
+
+        if groups is not None:
+            codes, labels = pd.factorize(np.asarray(groups, dtype=object)[self.order], sort=True)
+            self.group_codes = codes
+            self.group_labels = pd.Index(labels)
+            one_hot = np.zeros((len(codes), len(labels)), dtype=np.int8)
+            one_hot[np.arange(len(codes)), codes] = 1
+            self.group_prefix = _prefix_sums(one_hot, count_dtype)
+            self.group_success_prefix = _prefix_sums(one_hot * self.outcomes[:, None], count_dtype)
+        else:
+            self.group_codes = None
+            self.group_labels = None
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def bounds(self, min_payload, max_payload):
+        """Return the [start, stop) positions of payloads in [min_payload, max_payload]."""
+        start = np.searchsorted(self.payloads, min_payload, side='left')
+        stop = np.searchsorted(self.payloads, max_payload, side='right')
+        return int(start), int(max(start, stop))
+
+    def totals(self, min_payload, max_payload):
+        """Return (launches, successes) with payloads in [min_payload, max_payload]."""
+        start, stop = self.bounds(min_payload, max_payload)
+        return stop - start, int(self.success_prefix[stop] - self.success_prefix[start])
+
+    def group_stats(self, min_payload, max_payload):
+        """
+        Launches, successes and success rate per group for a payload range.
+
+        Returns:
+            pandas.DataFrame: Launches, Successes and SuccessRate (%) for every
+            group, sorted by label (groups without launches have rate NaN)
+        """
+        if self.group_labels is None:
+            raise ValueError("The index was built without groups")
+        start, stop = self.bounds(min_payload, max_payload)
+        launches = (self.group_prefix[stop] - self.group_prefix[start]).astype(np.int64)
+        successes = (self.group_success_prefix[stop] - self.group_success_prefix[start]).astype(np.int64)
+        return _stats_frame(launches, successes, self.group_labels)
+
+    def histogram(self, min_payload, max_payload, edges):
+        """
+        Launches and successes per payload bin within a payload range.
+
+        Bins are right-closed like pd.cut(bins=edges), so a payload equal to
+        the first edge falls in no bin.
+
+        Returns:
+            pandas.DataFrame: Launches, Successes and SuccessRate (%) indexed
+            by an IntervalIndex, including empty bins (rate NaN)
+        """
+        edges = np.asarray(edges, dtype=float)
+        start, stop = self.bounds(min_payload, max_payload)
+        positions = np.clip(np.searchsorted(self.payloads, edges, side='right'), start, stop)
+        launches = np.diff(positions).astype(np.int64)
+        successes = np.diff(self.success_prefix[positions]).astype(np.int64)
+        return _stats_frame(launches, successes, pd.IntervalIndex.from_breaks(edges, closed='right'))
+
+    def rows(self, min_payload, max_payload):
+        """Return (payloads, outcomes, group codes) of the launches in a range, sorted by payload."""
+        start, stop = self.bounds(min_payload, max_payload)
+        codes = self.group_codes[start:stop] if self.group_codes is not None else None
+        return self.payloads[start:stop], self.outcomes[start:stop], codes
+
+
+def _stats_frame(launches, successes, index):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = np.where(launches > 0, successes / launches * 100, np.nan)
+    return pd.DataFrame({'Launches': launches, 'Successes': successes, 'SuccessRate': rates}, index=index)
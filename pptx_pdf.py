@@ -0,0 +1,473 @@
+"""
+Batch PPTX to PDF Converter
+
+Converts a queue of .pptx decks to PDF locally and reports how long each
+deck took. Two engines are available:
+
+- libreoffice: a pool of long-lived headless soffice instances, each with its
+  own user profile. With the LibreOffice Python bridge (uno) installed, every
+  instance is started once and fed decks over a UNO socket, so the seconds of
+  soffice start-up are paid once per worker instead of once per deck. Without
+  uno each worker still keeps its own warm profile and converts one deck per
+  soffice call, which skips the first-run profile set-up on every later deck.
+- native: renders slides directly from python-pptx (text frames and pictures
+  at their placed positions) onto PDF pages with matplotlib's PDF backend, in
+  a process pool. No office suite is needed; charts, tables and theme
+  graphics beyond text and pictures are not drawn.
+
+'auto' uses LibreOffice when soffice is on the PATH and the native engine
+otherwise.
+
+Usage:
+    python pptx_pdf.py SpaceX_ML_Project_Presentation.pptx
+    python pptx_pdf.py decks/ --outdir pdf/ --jobs 4
+    python pptx_pdf.py --queue release_decks.txt --engine libreoffice
+"""
+
+import argparse
+import io
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from instrumentation import timed
+
+ENGINES = ('auto', 'libreoffice', 'native')
+
+# Executables that start LibreOffice, in order of preference
+SOFFICE_NAMES = ('soffice', 'libreoffice')
+
+# Seconds to wait for a new soffice instance to accept UNO connections
+SOFFICE_START_TIMEOUT = 60
+
+# Seconds a single deck may take in the one-call-per-deck fallback
+SOFFICE_CONVERT_TIMEOUT = 300
+
+EMU_PER_INCH = 914400
+
+# Font sizes (pt) for text whose size is inherited from the slide master
+DEFAULT_TITLE_SIZE = 40
+DEFAULT_TEXT_SIZE = 18
+
+# Rough average glyph width as a fraction of the font size, used for wrapping
+CHAR_WIDTH_RATIO = 0.5
+
+# Characters that already mark a paragraph as a bullet point
+BULLET_CHARS = ('•', '-', '*', '–')
+
+# Padding between a text frame's edge and its text (inches)
+TEXT_INSET = 0.1
+
+
+def find_soffice():
+    """Return the path of the LibreOffice executable, or None if it is not installed."""
+    for name in SOFFICE_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def pdf_path_for(pptx_file, outdir=None):
+    """Return where the PDF for pptx_file goes (next to it unless outdir is given)."""
+    base = os.path.splitext(os.path.basename(pptx_file))[0] + '.pdf'
+    return os.path.join(outdir or os.path.dirname(pptx_file), base)
+
+
+def collect_decks(paths, queue_file=None):
+    """
+    Expand the inputs into the list of decks to convert.
+
+    Args:
+        paths (list): .pptx files and directories (searched for *.pptx)
+        queue_file (str, optional): Text file with one deck path per line
+
+    Returns:
+        list: Deck paths, in the order given, without duplicates
+    """
+    paths = list(paths)
+    if queue_file:
+        with open(queue_file) as f:
+            paths.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+
+    decks = []
+    for path in paths:
+        if os.path.isdir(path):
+            decks.extend(sorted(str(p) for p in Path(path).glob('*.pptx')))
+        else:
+            decks.append(path)
+    return list(dict.fromkeys(decks))
+
+
+# ---------------------------------------------------------------------------
+# Native engine
+
+
+def _inches(emu):
+    return (emu or 0) / EMU_PER_INCH
+
+
+def _font_size(paragraph, default):
+    for run in paragraph.runs:
+        if run.font.size is not None:
+            return run.font.size.pt
+    if paragraph.font.size is not None:
+        return paragraph.font.size.pt
+    return default
+
+
+def _is_bold(paragraph):
+    bold = [run.font.bold for run in paragraph.runs if run.font.bold is not None]
+    return bold[0] if bold else bool(paragraph.font.bold)
+
+
+def _text_style(shape):
+    # (default size, horizontal alignment, centred vertically, bulleted) for a text shape
+    from pptx.enum.shapes import PP_PLACEHOLDER
+
+    if not shape.is_placeholder:
+        return DEFAULT_TEXT_SIZE, 'left', False, False
+    kind = shape.placeholder_format.type
+    if kind in (PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE):
+        return DEFAULT_TITLE_SIZE, 'center', True, False
+    if kind == PP_PLACEHOLDER.SUBTITLE:
+        return DEFAULT_TEXT_SIZE, 'center', False, False
+    return DEFAULT_TEXT_SIZE, 'left', False, kind in (PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT)
+
+
+def _draw_text(fig, shape, slide_width, slide_height):
+    from pptx.enum.text import PP_ALIGN
+
+    default_size, align, centred, bulleted = _text_style(shape)
+    left, top = _inches(shape.left), _inches(shape.top)
+    width, height = _inches(shape.width), _inches(shape.height)
+
+    # Lay out every wrapped line first so vertically centred frames can be offset
+    lines = []
+    for paragraph in shape.text_frame.paragraphs:
+        text = ''.join(run.text for run in paragraph.runs) or paragraph.text
+        size = _font_size(paragraph, default_size)
+        if not text.strip():
+            lines.append(('', size, False, 0.0, align))
+            continue
+        indent = 0.4 * paragraph.level + (0.3 if bulleted else 0.0)
+        paragraph_align = {PP_ALIGN.CENTER: 'center', PP_ALIGN.RIGHT: 'right',
+                           PP_ALIGN.LEFT: 'left'}.get(paragraph.alignment, align)
+        usable = max(width - 2 * TEXT_INSET - indent, 0.5)
+        wrap = max(int(usable * 72 / (size * CHAR_WIDTH_RATIO)), 1)
+        for i, line in enumerate(textwrap.wrap(text, wrap) or ['']):
+            if bulleted and i == 0 and not line.startswith(BULLET_CHARS):
+                line = '• ' + line
+            lines.append((line, size, _is_bold(paragraph), indent, paragraph_align))
+
+    text_height = sum(size * 1.2 / 72 for _, size, _, _, _ in lines)
+    y = top + TEXT_INSET
+    if centred:
+        y = top + max((height - text_height) / 2, 0)
+
+    for line, size, bold, indent, line_align in lines:
+        if line:
+            x = {'left': left + TEXT_INSET + indent,
+                 'center': left + width / 2,
+                 'right': left + width - TEXT_INSET}[line_align]
+            fig.text(x / slide_width, 1 - y / slide_height, line, fontsize=size,
+                     fontweight='bold' if bold else 'normal', ha=line_align, va='top')
+        y += size * 1.2 / 72
+
+
+def _draw_picture(fig, shape, slide_width, slide_height):
+    import numpy as np
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(shape.image.blob))
+    image = image.convert('RGBA' if 'A' in image.getbands() or image.mode == 'P' else 'RGB')
+    left, top = _inches(shape.left), _inches(shape.top)
+    width, height = _inches(shape.width), _inches(shape.height)
+    ax = fig.add_axes([left / slide_width, 1 - (top + height) / slide_height,
+                       width / slide_width, height / slide_height])
+    ax.imshow(np.asarray(image), aspect='auto', interpolation='none')
+    ax.set_axis_off()
+
+
+@timed()
+def render_native(pptx_file, pdf_file):
+    """
+    Render a deck to PDF with python-pptx and matplotlib's PDF backend.
+
+    Text frames and pictures are drawn at their placed positions, one PDF
+    page per slide, sized like the slides. Other shapes are skipped.
+
+    Args:
+        pptx_file (str): Deck to convert
+        pdf_file (str): Where to write the PDF
+
+    Returns:
+        int: Number of slides written
+    """
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+    from pptx import Presentation
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+    prs = Presentation(pptx_file)
+    slide_width, slide_height = _inches(prs.slide_width), _inches(prs.slide_height)
+
+    if os.path.dirname(pdf_file):
+        os.makedirs(os.path.dirname(pdf_file), exist_ok=True)
+    tmp_path = f"{pdf_file}.{os.getpid()}.tmp"
+    # No creation date, so converting an unchanged deck gives an identical file
+    metadata = {'Title': prs.core_properties.title or None, 'CreationDate': None}
+    with PdfPages(tmp_path, metadata=metadata) as pdf:
+        for slide in prs.slides:
+            fig = Figure(figsize=(slide_width, slide_height))
+            for shape in slide.shapes:
+                if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+                    _draw_picture(fig, shape, slide_width, slide_height)
+                elif shape.has_text_frame and shape.text_frame.text.strip():
+                    _draw_text(fig, shape, slide_width, slide_height)
+            pdf.savefig(fig)
+    os.replace(tmp_path, pdf_file)
+    return len(prs.slides)
+
+
+def _convert_native(job):
+    pptx_file, pdf_file = job
+    start = time.perf_counter()
+    try:
+        slides = render_native(pptx_file, pdf_file)
+        error = None
+    except Exception as e:
+        slides, error = 0, repr(e)
+    return pptx_file, pdf_file, slides, time.perf_counter() - start, error
+
+
+# ---------------------------------------------------------------------------
+# LibreOffice engine
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _slide_count(pptx_file):
+    from pptx import Presentation
+    try:
+        return len(Presentation(pptx_file).slides)
+    except Exception:
+        return 0
+
+
+class LibreOfficeWorker:
+    """One headless soffice instance with its own profile, converting decks one at a time."""
+
+    def __init__(self, soffice):
+        self.soffice = soffice
+        self.profile = tempfile.mkdtemp(prefix='soffice-profile-')
+        self.process = None
+        self.desktop = None
+        try:
+            import uno  # noqa: F401
+        except ImportError:
+            return
+        self._start_listener()
+
+    def _start_listener(self):
+        import uno
+
+        port = _free_port()
+        connection = f"socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+        self.process = subprocess.Popen(
+            [self.soffice, '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+             f"-env:UserInstallation={Path(self.profile).as_uri()}", f"--accept={connection}"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext('com.sun.star.bridge.UnoUrlResolver', local)
+        deadline = time.monotonic() + SOFFICE_START_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(f"uno:{connection}")
+                break
+            except Exception:
+                if time.monotonic() > deadline or self.process.poll() is not None:
+                    self.close()
+                    raise RuntimeError("soffice did not start accepting connections")
+                time.sleep(0.25)
+        self.desktop = context.ServiceManager.createInstanceWithContext('com.sun.star.frame.Desktop', context)
+
+    @staticmethod
+    def _property(name, value):
+        import uno
+        prop = uno.createUnoStruct('com.sun.star.beans.PropertyValue')
+        prop.Name, prop.Value = name, value
+        return prop
+
+    def convert(self, pptx_file, pdf_file):
+        """Convert one deck, through the running instance when there is one."""
+        if os.path.dirname(pdf_file):
+            os.makedirs(os.path.dirname(pdf_file), exist_ok=True)
+        if self.desktop is not None:
+            document = self.desktop.loadComponentFromURL(
+                Path(pptx_file).resolve().as_uri(), '_blank', 0, (self._property('Hidden', True),))
+            try:
+                document.storeToURL(Path(pdf_file).resolve().as_uri(),
+                                    (self._property('FilterName', 'impress_pdf_Export'),))
+            finally:
+                document.close(True)
+            return
+
+        # No UNO bridge: one soffice call per deck, reusing this worker's profile
+        with tempfile.TemporaryDirectory() as outdir:
+            subprocess.run([self.soffice, '--headless', '--norestore',
+                            f"-env:UserInstallation={Path(self.profile).as_uri()}",
+                            '--convert-to', 'pdf', '--outdir', outdir, pptx_file],
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                           timeout=SOFFICE_CONVERT_TIMEOUT)
+            shutil.move(pdf_path_for(pptx_file, outdir), pdf_file)
+
+    def close(self):
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+            self.desktop = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+        shutil.rmtree(self.profile, ignore_errors=True)
+
+
+def _convert_libreoffice(jobs, soffice, workers):
+    # Each thread owns one soffice instance and drains the shared queue
+    pending = queue.Queue()
+    for job in jobs:
+        pending.put(job)
+    results = {}
+
+    def drain():
+        worker = None
+        try:
+            worker = LibreOfficeWorker(soffice)
+        except Exception as e:
+            start_error = repr(e)
+        while True:
+            try:
+                pptx_file, pdf_file = pending.get_nowait()
+            except queue.Empty:
+                break
+            start = time.perf_counter()
+            try:
+                if worker is None:
+                    raise RuntimeError(start_error)
+                worker.convert(pptx_file, pdf_file)
+                error = None
+            except Exception as e:
+                error = repr(e)
+            slides = _slide_count(pptx_file) if error is None else 0
+            results[pptx_file] = (pptx_file, pdf_file, slides, time.perf_counter() - start, error)
+        if worker is not None:
+            worker.close()
+
+    threads = [threading.Thread(target=drain) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [results[pptx_file] for pptx_file, _ in jobs]
+
+
+# ---------------------------------------------------------------------------
+# Batch queue
+
+
+@timed()
+def convert_batch(decks, outdir=None, engine='auto', jobs=None):
+    """
+    Convert a batch of decks to PDF and report the time each one took.
+
+    Args:
+        decks (list): .pptx files to convert
+        outdir (str, optional): Directory for the PDFs, defaults to next to each deck
+        engine (str): 'libreoffice', 'native' or 'auto' (LibreOffice if installed)
+        jobs (int, optional): Parallel workers, defaults to os.cpu_count()
+
+    Returns:
+        list: (pptx_file, pdf_file, slides, seconds, error) per deck, in input
+        order, where error is None for decks that converted
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}' (choose from {', '.join(ENGINES)})")
+    soffice = find_soffice()
+    if engine == 'auto':
+        engine = 'libreoffice' if soffice else 'native'
+    if engine == 'libreoffice' and soffice is None:
+        raise RuntimeError("LibreOffice (soffice) is not installed; use engine='native'")
+
+    missing = [deck for deck in decks if not os.path.exists(deck)]
+    if missing:
+        raise FileNotFoundError(f"Decks not found: {', '.join(missing)}")
+
+    batch = [(deck, pdf_path_for(deck, outdir)) for deck in decks]
+    if not batch:
+        return []
+    workers = min(jobs or os.cpu_count() or 1, len(batch))
+
+    start = time.perf_counter()
+    print(f"Converting {len(batch)} deck(s) with the {engine} engine, {workers} worker(s)")
+    if engine == 'libreoffice':
+        results = _convert_libreoffice(batch, soffice, workers)
+    elif workers == 1:
+        results = [_convert_native(job) for job in batch]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_convert_native, batch))
+    wall_time = time.perf_counter() - start
+
+    print("\nPDF Conversion Timings:")
+    print("=" * 72)
+    print(f"{'Deck':<40} {'Slides':>8} {'Time (s)':>10} {'Status':>10}")
+    print("-" * 72)
+    for pptx_file, pdf_file, slides, elapsed, error in results:
+        print(f"{os.path.basename(pptx_file):<40} {slides:>8} {elapsed:>10.2f} {'failed' if error else 'ok':>10}")
+    print("-" * 72)
+    print(f"{'Sum of deck times':<40} {'':>8} {sum(result[3] for result in results):>10.2f}")
+    print(f"{'Wall time':<40} {'':>8} {wall_time:>10.2f}")
+    for pptx_file, pdf_file, slides, elapsed, error in results:
+        if error:
+            print(f"Error converting {pptx_file}: {error}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert PowerPoint decks to PDF")
+    parser.add_argument('decks', nargs='*', help=".pptx files or directories of them")
+    parser.add_argument('--queue', help="Text file listing decks to convert, one per line")
+    parser.add_argument('--outdir', help="Directory for the PDFs (default: next to each deck)")
+    parser.add_argument('--engine', choices=ENGINES, default='auto', help="Conversion engine (default: auto)")
+    parser.add_argument('--jobs', type=int, help="Parallel workers (default: one per CPU)")
+    args = parser.parse_args()
+
+    decks = collect_decks(args.decks, args.queue)
+    if not decks:
+        parser.error("no decks given")
+    results = convert_batch(decks, outdir=args.outdir, engine=args.engine, jobs=args.jobs)
+    return 1 if any(result[4] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Launch Site Proximity Engine
+
+Great-circle distances between launch sites and points of interest, computed
+on whole arrays instead of one pair at a time:
+
+- haversine() / haversine_matrix() evaluate the haversine formula with NumPy
+  broadcasting, so every site x point distance comes out of one call.
+- ProximityIndex answers "the nearest k points within R km" for large point
+  sets (coastline or highway vertices, hundreds of thousands of them). Points
+  are stored as 3D unit vectors in a KD-tree, where straight-line (chord)
+  distance grows monotonically with great-circle distance, so Euclidean
+  nearest neighbours are the great-circle nearest neighbours and a radius in
+  km becomes a chord radius. Small point sets skip the tree and use the
+  distance matrix directly.
+"""
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+EARTH_RADIUS_KM = 6371
+KM_TO_MI = 0.621371
+
+# Point sets up to this size are searched with the full distance matrix
+BRUTE_FORCE_LIMIT = 2048
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in km between points given in degrees.
+
+    Inputs broadcast against each other like any NumPy operation, so scalars,
+    paired arrays and (n, 1) x (1, m) grids all work.
+
+    Returns:
+        numpy.ndarray: Distances in km
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def haversine_matrix(lat1, lon1, lat2, lon2):
+    """Return the (len(lat1), len(lat2)) matrix of distances in km between two point sets."""
+    lat1, lon1 = np.asarray(lat1, dtype=float)[:, None], np.asarray(lon1, dtype=float)[:, None]
+    lat2, lon2 = np.asarray(lat2, dtype=float)[None, :], np.asarray(lon2, dtype=float)[None, :]
+    return haversine(lat1, lon1, lat2, lon2)
+
+
+def unit_vectors(lat, lon):
+    """Return the (n, 3) unit vectors of points given in degrees."""
+    lat, lon = np.radians(np.asarray(lat, dtype=float)), np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_km(chord):
+    """Convert straight-line distance between unit vectors to great-circle km."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+def km_to_chord(km):
+    """Convert great-circle km to straight-line distance between unit vectors."""
+    return 2 * np.sin(np.minimum(np.asarray(km, dtype=float) / EARTH_RADIUS_KM, np.pi) / 2)
+
+
+class ProximityIndex:
+    """Nearest-neighbour and radius queries over a fixed set of points."""
+
+    def __init__(self, lat, lon, leaf_size=40):
+        """
+        Args:
+            lat (array-like): Point latitudes in degrees
+            lon (array-like): Point longitudes in degrees
+            leaf_size (int): KD-tree leaf size
+        """
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.tree = KDTree(unit_vectors(self.lat, self.lon), leaf_size=leaf_size) \
+            if len(self.lat) > BRUTE_FORCE_LIMIT else None
+
+    def __len__(self):
+        return len(self.lat)
+
+    def nearest(self, lat, lon, k=1, radius_km=None):
+        """
+        The k nearest points to each query point, optionally within a radius.
+
+        Args:
+            lat (array-like): Query latitudes in degrees
+            lon (array-like): Query longitudes in degrees
+            k (int): Neighbours per query point
+            radius_km (float, optional): Ignore points farther than this
+
+        Returns:
+            tuple: (distances, indices), both (n_queries, k) and sorted by
+            distance; slots without a neighbour hold inf and -1
+        """
+        lat, lon = np.atleast_1d(np.asarray(lat, dtype=float)), np.atleast_1d(np.asarray(lon, dtype=float))
+        k_found = min(k, len(self))
+        if k_found == 0:
+            indices = np.empty((len(lat), 0), dtype=np.int64)
+        elif self.tree is None:
+            distances = haversine_matrix(lat, lon, self.lat, self.lon)
+            indices = np.argpartition(distances, k_found - 1, axis=1)[:, :k_found]
+        else:
+            indices = self.tree.query(unit_vectors(lat, lon), k=k_found, return_distance=False)
+
+        # Exact distances of the candidates, then order and cut at the radius
+        distances = haversine(lat[:, None], lon[:, None], self.lat[indices], self.lon[indices])
+        order = np.argsort(distances, axis=1, kind='stable')
+        distances = np.take_along_axis(distances, order, axis=1)
+        indices = np.take_along_axis(indices, order, axis=1)
+        if radius_km is not None:
+            outside = distances > radius_km
+            distances[outside] = np.inf
+            indices[outside] = -1
+
+        pad = k - k_found
+        if pad:
+            distances = np.pad(distances, ((0, 0), (0, pad)), constant_values=np.inf)
+            indices = np.pad(indices, ((0, 0), (0, pad)), constant_values=-1)
+        return distances, indices
+
+    def within(self, lat, lon, radius_km):
+        """
+        All points within radius_km of each query point.
+
+        Returns:
+            list: (distances, indices) per query point, sorted by distance
+        """
+        lat, lon = np.atleast_1d(np.asarray(lat, dtype=float)), np.atleast_1d(np.asarray(lon, dtype=float))
+        if self.tree is None:
+            matrix = haversine_matrix(lat, lon, self.lat, self.lon)
+            candidates = [np.flatnonzero(row <= radius_km) for row in matrix]
+        else:
+            # Pad the chord radius slightly so rounding never drops a boundary point
+            candidates = self.tree.query_radius(unit_vectors(lat, lon), r=km_to_chord(radius_km) * (1 + 1e-9))
+
+        results = []
+        for i, index in enumerate(candidates):
+            index = np.asarray(index, dtype=np.int64)
+            distances = haversine(lat[i], lon[i], self.lat[index], self.lon[index])
+            keep = distances <= radius_km
+            order = np.argsort(distances[keep], kind='stable')
+            results.append((distances[keep][order], index[keep][order]))
+        return results
@@ -0,0 +1,255 @@
+"""
+Chart Render Farm
+
+Renders the charts/ plots and the dashboard PNGs as independent jobs in a
+process pool with the headless Agg backend, so a full refresh takes about as
+long as the slowest chart instead of the sum of all of them.
+
+Each chart is keyed by a hash of its script, every local module the script
+imports (followed transitively, so an edit to launch_data.py re-renders the
+charts built from it), any input files it declares, and the plotting library
+versions. Charts whose key matches the last successful render and whose
+output files still exist are skipped.
+
+Usage:
+    python render_charts.py                    # render what changed
+    python render_charts.py --force            # render everything
+    python render_charts.py --jobs 4 yearly_success payload_outcome_dashboard
+"""
+
+import argparse
+import ast
+import contextlib
+import hashlib
+import io
+import json
+import os
+import runpy
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentation
+
+# Registered charts: name -> script that draws them, the files it writes and
+# any input files it reads
+CHARTS = {
+    'flight_number_launch_site': {'script': 'create_flight_site_plot.py',
+                                  'outputs': ['charts/flight_number_launch_site.png']},
+    'orbit_type_success': {'script': 'create_orbit_success_plot.py',
+                           'outputs': ['charts/orbit_type_success.png']},
+    'payload_mass_orbit_type': {'script': 'create_payload_orbit_plot.py',
+                                'outputs': ['charts/payload_mass_orbit_type.png']},
+    'yearly_success': {'script': 'create_yearly_success_plot.py',
+                       'outputs': ['charts/yearly_success_rate.png']},
+    'flight_number_orbit_type': {'script': 'create_flight_orbit_plot.py',
+                                 'outputs': ['charts/flight_number_orbit_type.png']},
+    'payload_mass_launch_site': {'script': 'create_payload_site_plot.py',
+                                 'outputs': ['charts/payload_mass_launch_site.png']},
+    'launch_success_dashboard': {'script': 'create_launch_success_dashboard.py',
+                                 'outputs': ['spacex_launch_success_dashboard.png']},
+    'highest_success_site_dashboard': {'script': 'create_highest_success_site_dashboard.py',
+                                       'outputs': ['highest_success_site_dashboard.png']},
+    'payload_outcome_dashboard': {'script': 'create_payload_outcome_dashboard.py',
+                                  'outputs': ['payload_outcome_dashboard_0_16000.png',
+                                              'payload_outcome_dashboard_0_8000.png',
+                                              'payload_outcome_dashboard_8000_16000.png']},
+}
+
+# Where the keys of the last successful renders are kept (override with SPACEX_RENDER_STATE)
+STATE_PATH = os.environ.get('SPACEX_RENDER_STATE', '.render_state.json')
+
+# Libraries whose upgrades change the rendered pixels
+RENDER_LIBRARIES = ('matplotlib', 'seaborn', 'numpy', 'pandas')
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Worker-process rcParams as they were before any chart ran (set by _init_worker)
+_initial_rc = {}
+
+
+def _local_imports(path):
+    # Top-level names of every module imported by the file that lives in ROOT
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module.split('.')[0])
+    return sorted(name for name in names if os.path.exists(os.path.join(ROOT, f"{name}.py")))
+
+
+def code_dependencies(script):
+    """Return the script and every local module it imports, transitively."""
+    pending = [os.path.join(ROOT, script)]
+    seen = []
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.append(path)
+        pending.extend(os.path.join(ROOT, f"{name}.py") for name in _local_imports(path))
+    return sorted(seen)
+
+
+def _hash_files(digest, paths):
+    for path in paths:
+        digest.update(os.path.relpath(path, ROOT).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+
+
+def chart_key(name):
+    """Return the hash of everything that determines chart name's pixels."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    chart = CHARTS[name]
+    digest = hashlib.sha256()
+    _hash_files(digest, code_dependencies(chart['script']))
+    _hash_files(digest, [os.path.join(ROOT, path) for path in chart.get('inputs', [])])
+    for library in RENDER_LIBRARIES:
+        try:
+            digest.update(f"{library}=={version(library)}".encode('utf-8'))
+        except PackageNotFoundError:
+            digest.update(f"{library}==none".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_state(path=None):
+    """Return chart name -> {'key', 'seconds'} of its last successful render."""
+    try:
+        with open(path or STATE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, path=None):
+    path = path or STATE_PATH
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_current(name, key, state):
+    """True if chart name was rendered with this key and its files are still there."""
+    outputs = CHARTS[name]['outputs']
+    return state.get(name, {}).get('key') == key and all(os.path.exists(os.path.join(ROOT, path)) for path in outputs)
+
+
+def _init_worker():
+    # Headless rendering, and chart scripts write paths relative to the repo
+    import matplotlib
+    matplotlib.use('Agg')
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    _initial_rc.update(matplotlib.rcParams.copy())
+    # Forked workers start with a copy of the parent's stages
+    instrumentation.reset()
+
+
+def _render(name):
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    # Scripts restyle pyplot globally, so each one starts from the same rcParams
+    matplotlib.rcParams.update(_initial_rc)
+    script = CHARTS[name]['script']
+    output = io.StringIO()
+    start = time.perf_counter()
+    argv = sys.argv
+    sys.argv = [script]
+    try:
+        with contextlib.redirect_stdout(output):
+            runpy.run_path(os.path.join(ROOT, script), run_name='__main__')
+        error = None
+    except BaseException as e:
+        error = repr(e)
+    finally:
+        sys.argv = argv
+        plt.close('all')
+        # Pool workers never reach their atexit hooks, so write the script's
+        # stages now
+        instrumentation.flush(os.path.splitext(script)[0])
+    return time.perf_counter() - start, output.getvalue(), error
+
+
+def render_charts(names=None, jobs=None, force=False, state_path=None):
+    """
+    Render the registered charts that changed since their last render.
+
+    Args:
+        names (list, optional): Charts to consider, defaults to all of CHARTS
+        jobs (int, optional): Worker processes, defaults to os.cpu_count()
+        force (bool): Render even charts that are up to date
+        state_path (str, optional): Render state file, defaults to STATE_PATH
+
+    Returns:
+        list: (name, status, seconds) for each chart, in registry order, where
+        status is 'rendered', 'skipped' or 'failed'
+    """
+    names = list(names or CHARTS)
+    unknown = [name for name in names if name not in CHARTS]
+    if unknown:
+        raise ValueError(f"Unknown charts: {', '.join(unknown)}")
+
+    state = load_state(state_path)
+    keys = {name: chart_key(name) for name in names}
+    stale = [name for name in names if force or not is_current(name, keys[name], state)]
+
+    start = time.perf_counter()
+    rendered = {}
+    if stale:
+        jobs = min(jobs or os.cpu_count() or 1, len(stale))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+            # Submit the slowest charts first so they are not left for last
+            order = sorted(stale, key=lambda name: -state.get(name, {}).get('seconds', 0))
+            futures = {name: pool.submit(_render, name) for name in order}
+            rendered = {name: future.result() for name, future in futures.items()}
+    wall_time = time.perf_counter() - start
+
+    results = []
+    for name in names:
+        if name not in rendered:
+            results.append((name, 'skipped', 0.0))
+            continue
+        elapsed, output, error = rendered[name]
+        if error is None:
+            state[name] = {'key': keys[name], 'seconds': round(elapsed, 3)}
+        else:
+            state.pop(name, None)
+        results.append((name, 'failed' if error else 'rendered', elapsed))
+        print(f"\n##### {name} ({CHARTS[name]['script']}) #####")
+        print(output, end='')
+        if error is not None:
+            print(f"Error: {error}")
+    save_state(state, state_path)
+
+    print("\nChart Render Timings:")
+    print("=" * 60)
+    print(f"{'Chart':<35} {'Time (s)':>10} {'Status':>12}")
+    print("-" * 60)
+    for name, status, elapsed in results:
+        print(f"{name:<35} {elapsed:>10.2f} {status:>12}")
+    print("-" * 60)
+    print(f"{'Sum of chart times':<35} {sum(result[2] for result in results):>10.2f}")
+    print(f"{'Wall time':<35} {wall_time:>10.2f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the SpaceX charts and dashboards in parallel")
+    parser.add_argument('charts', nargs='*', help=f"Charts to render (default: all of {', '.join(CHARTS)})")
+    parser.add_argument('--jobs', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--force', action='store_true', help="Render charts even if they are up to date")
+    args = parser.parse_args()
+
+    results = render_charts(args.charts, jobs=args.jobs, force=args.force)
+    return 1 if any(status == 'failed' for _, status, _ in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
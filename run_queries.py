@@ -0,0 +1,208 @@
+"""
+Batch Query Runner
+
+Runs every find_*/calculate_* query in one process: the query modules are
+imported once, each dataset they share is loaded once, and every query
+writes its own *_results.md file as before. Queries can fan out over a
+thread pool, and the run ends with a per-query timing table.
+
+Usage:
+    python run_queries.py                  # run all queries serially
+    python run_queries.py --jobs 4         # fan out over 4 threads
+    python run_queries.py --no-charts      # text only, without matplotlib
+    python run_queries.py ccafs max_payload
+"""
+
+import argparse
+import importlib
+import io
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import timed
+from launch_sql import open_launch_db
+from launch_store import load_launches
+
+# Registered queries: name -> module exposing run_query(data), and whether the
+# query draws with pyplot (pyplot's global state is not thread-safe)
+QUERIES = {
+    'unique_launch_sites': {'module': 'find_unique_launch_sites', 'plots': False},
+    'ccafs': {'module': 'find_ccafs_launches', 'plots': False},
+    'nasa_payload': {'module': 'calculate_nasa_payload', 'plots': False},
+    'f9v11_payload': {'module': 'calculate_f9v11_payload', 'plots': False},
+    'mission_outcomes': {'module': 'calculate_mission_outcomes', 'plots': True},
+    'max_payload': {'module': 'find_max_payload_boosters', 'plots': False},
+    'first_ground_landing': {'module': 'find_first_ground_landing', 'plots': False},
+    'failed_landings_2015': {'module': 'find_failed_landings_2015', 'plots': False},
+    'drone_ship_landings': {'module': 'find_drone_ship_landings', 'plots': False},
+    'rank_landing_outcomes': {'module': 'rank_landing_outcomes', 'plots': True},
+}
+
+_pyplot_lock = threading.Lock()
+
+
+class _PerThreadStdout:
+    """Route print() output to a buffer owned by the calling thread."""
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def release(self):
+        self._local.buffer = None
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self._fallback).write(text)
+
+    def flush(self):
+        buffer = getattr(self._local, 'buffer', None)
+        (buffer or self._fallback).flush()
+
+
+def _dataset_key(dataset):
+    return (dataset['num_launches'], dataset['seed'], dataset['compat'])
+
+
+@timed()
+def load_datasets(modules):
+    """
+    Load every dataset the given query modules need, once each.
+
+    Store-backed queries declare a DATASET dict; queries that build their own
+    sample expose generate_launch_data() instead. Queries with BACKEND = 'sql'
+    get their own connection to the dataset's indexed SQLite database.
+
+    Returns:
+        dict: query name -> DataFrame or connection to pass to run_query()
+    """
+    shared = {}
+    frames = {}
+    for name, module in modules.items():
+        dataset = getattr(module, 'DATASET', None)
+        if dataset is None:
+            frames[name] = module.generate_launch_data()
+            continue
+        key = _dataset_key(dataset)
+        if getattr(module, 'BACKEND', None) == 'sql':
+            frames[name] = open_launch_db(*key)
+            continue
+        if key not in shared:
+            shared[key] = load_launches(*key)
+        columns = dataset.get('columns')
+        frames[name] = shared[key][columns] if columns else shared[key]
+    return frames
+
+
+def _run_one(name, module, data, stdout, charts=True):
+    buffer = stdout.capture()
+    start = time.perf_counter()
+    try:
+        # Queries may add columns or patch rows, so each gets its own copy
+        if not isinstance(data, sqlite3.Connection):
+            data = data.copy()
+        if not QUERIES[name]['plots']:
+            module.run_query(data)
+        elif not charts:
+            module.run_query(data, chart=False)
+        else:
+            with _pyplot_lock:
+                module.run_query(data)
+        error = None
+    except Exception as e:
+        error = e
+    elapsed = time.perf_counter() - start
+    stdout.release()
+    if isinstance(data, sqlite3.Connection):
+        data.close()
+    return name, elapsed, buffer.getvalue(), error
+
+
+def run_queries(names=None, jobs=1, charts=True):
+    """
+    Run the registered queries and print their output and timings.
+
+    Args:
+        names (list, optional): Query names to run, defaults to all of QUERIES
+        jobs (int): Number of worker threads
+        charts (bool): Let plotting queries draw their charts; without them
+            no query imports matplotlib
+
+    Returns:
+        list: (name, seconds, error) for each query, in registry order
+    """
+    names = list(names or QUERIES)
+    unknown = [name for name in names if name not in QUERIES]
+    if unknown:
+        raise ValueError(f"Unknown queries: {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    if charts and any(QUERIES[name]['plots'] for name in names):
+        # Charts are only saved to files, so render headless
+        import matplotlib
+        matplotlib.use('Agg')
+    modules = {name: importlib.import_module(QUERIES[name]['module']) for name in names}
+    import_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frames = load_datasets(modules)
+    load_time = time.perf_counter() - start
+
+    original_stdout = sys.stdout
+    stdout = _PerThreadStdout(original_stdout)
+    sys.stdout = stdout
+    start = time.perf_counter()
+    try:
+        if jobs > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(_run_one, name, modules[name], frames[name], stdout, charts) for name in names]
+                results = [future.result() for future in futures]
+        else:
+            results = [_run_one(name, modules[name], frames[name], stdout, charts) for name in names]
+    finally:
+        sys.stdout = original_stdout
+    # Wall time of the run phase: with jobs > 1 the queries overlap, so their
+    # own times add up to more than the run took
+    run_time = time.perf_counter() - start
+
+    for name, elapsed, output, error in results:
+        print(f"\n##### {name} ({QUERIES[name]['module']}.py) #####")
+        print(output, end='')
+        if error is not None:
+            print(f"Error: {error!r}")
+
+    total = import_time + load_time + run_time
+    print("\nQuery Timings:")
+    print("=" * 50)
+    print(f"{'Query':<25} {'Time (ms)':>10} {'Status':>10}")
+    print("-" * 50)
+    print(f"{'(imports)':<25} {import_time * 1000:>10.1f}")
+    print(f"{'(load datasets)':<25} {load_time * 1000:>10.1f}")
+    for name, elapsed, output, error in results:
+        print(f"{name:<25} {elapsed * 1000:>10.1f} {'failed' if error else 'ok':>10}")
+    print("-" * 50)
+    print(f"{'Total':<25} {total * 1000:>10.1f}")
+
+    return [(name, elapsed, error) for name, elapsed, output, error in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run all SpaceX launch queries in one process")
+    parser.add_argument('queries', nargs='*', help=f"Queries to run (default: all of {', '.join(QUERIES)})")
+    parser.add_argument('--jobs', type=int, default=1, help="Number of worker threads")
+    parser.add_argument('--no-charts', action='store_true', help="Only print and write the text results")
+    args = parser.parse_args()
+
+    results = run_queries(args.queries, jobs=args.jobs, charts=not args.no_charts)
+    return 1 if any(error for _, _, error in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Launch Success Scoring
+
+Scores launch records with a persisted scikit-learn Pipeline (for example
+the SVM pipeline saved by model_confusion_matrix.py) without loading the
+input into memory: records are read, scored and written one fixed-size batch
+at a time, so memory stays bounded by the batch size whatever the input size.
+
+Input can be a CSV file, a Parquet file, or JSON lines on stdin. Each batch
+is scored in one predict()/predict_proba() call, and the run ends with a
+rows/sec summary on stderr.
+
+Usage:
+    python score_launches.py svm_pipeline.joblib what_if.csv -o scored.csv
+    python score_launches.py svm_pipeline.joblib what_if.parquet --batch-size 500000
+    cat records.jsonl | python score_launches.py svm_pipeline.joblib - --output-format jsonl
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+import joblib
+import pandas as pd
+
+from instrumentation import stage, timed
+
+# Records scored per predict() call
+DEFAULT_BATCH_SIZE = 100000
+
+INPUT_FORMATS = ('csv', 'parquet', 'jsonl')
+OUTPUT_FORMATS = ('csv', 'jsonl')
+
+
+@timed()
+def load_pipeline(path):
+    """Load a fitted Pipeline saved with joblib.dump()."""
+    pipeline = joblib.load(path)
+    if not hasattr(pipeline, 'predict'):
+        raise TypeError(f"{path} does not contain a fitted estimator")
+    return pipeline
+
+
+def feature_columns(pipeline):
+    """Return the feature names the pipeline was fitted on, in order."""
+    columns = getattr(pipeline, 'feature_names_in_', None)
+    if columns is None:
+        raise ValueError("The pipeline was not fitted on a DataFrame, so its input columns are unknown")
+    return list(columns)
+
+
+def _infer_format(source):
+    if source == '-':
+        return 'jsonl'
+    extension = os.path.splitext(source)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    if extension in ('.jsonl', '.json', '.ndjson'):
+        return 'jsonl'
+    return 'csv'
+
+
+def _json_lines(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def read_batches(source, fmt=None, batch_size=DEFAULT_BATCH_SIZE, columns=None):
+    """
+    Yield the input as DataFrames of at most batch_size rows.
+
+    Args:
+        source (str): File path, or '-' for stdin
+        fmt (str, optional): 'csv', 'parquet' or 'jsonl', inferred from source if omitted
+        batch_size (int): Rows per batch
+        columns (list, optional): Only read these columns
+
+    Yields:
+        pandas.DataFrame: The next batch of records
+    """
+    fmt = fmt or _infer_format(source)
+    if fmt not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format '{fmt}', expected one of {', '.join(INPUT_FORMATS)}")
+
+    if fmt == 'csv':
+        yield from pd.read_csv(sys.stdin if source == '-' else source, usecols=columns, chunksize=batch_size,
+                               float_precision='round_trip')
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        f = sys.stdin if source == '-' else open(source)
+        try:
+            records = _json_lines(f)
+            while True:
+                batch = list(itertools.islice(records, batch_size))
+                if not batch:
+                    break
+                yield pd.DataFrame.from_records(batch, columns=columns)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def score_batches(pipeline, batches, columns=None, probabilities=True):
+    """
+    Score each batch, adding Prediction (and SuccessProbability) columns.
+
+    Args:
+        pipeline: Fitted Pipeline
+        batches (iterable): DataFrames of launch records
+        columns (list, optional): Feature columns, defaults to the pipeline's
+        probabilities (bool): Also add predict_proba()'s success probability
+
+    Yields:
+        pandas.DataFrame: The scored batch
+    """
+    columns = columns or feature_columns(pipeline)
+    probabilities = probabilities and hasattr(pipeline, 'predict_proba')
+    for batch in batches:
+        with stage('score'):
+            features = batch[columns]
+            batch = batch.assign(Prediction=pipeline.predict(features))
+            if probabilities:
+                # Probability of class 1 (launch success)
+                success_column = list(pipeline.classes_).index(1)
+                batch['SuccessProbability'] = pipeline.predict_proba(features)[:, success_column]
+        yield batch
+
+
+def write_batches(batches, f, fmt='csv'):
+    """
+    Write scored batches to an open text file as they arrive.
+
+    Returns:
+        int: Number of rows written
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{fmt}', expected one of {', '.join(OUTPUT_FORMATS)}")
+
+    rows = 0
+    for i, batch in enumerate(batches):
+        with stage('output'):
+            if fmt == 'csv':
+                batch.to_csv(f, header=(i == 0), index=False)
+            else:
+                batch.to_json(f, orient='records', lines=True, double_precision=15)
+        rows += len(batch)
+    return rows
+
+
+@timed()
+def score_file(model_path, source, output='-', input_format=None, output_format='csv',
+               batch_size=DEFAULT_BATCH_SIZE, probabilities=True):
+    """
+    Score every record in source and write the results to output.
+
+    Returns:
+        tuple: (rows scored, seconds taken)
+    """
+    pipeline = load_pipeline(model_path)
+    start = time.perf_counter()
+    batches = score_batches(pipeline, read_batches(source, input_format, batch_size), probabilities=probabilities)
+
+    if output == '-':
+        rows = write_batches(batches, sys.stdout, output_format)
+    else:
+        with open(output, 'w', newline='') as f:
+            rows = write_batches(batches, f, output_format)
+    return rows, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score launch records with a persisted launch-success Pipeline")
+    parser.add_argument('model', help="Pipeline saved with joblib.dump()")
+    parser.add_argument('input', nargs='?', default='-', help="CSV or Parquet file, or '-' for JSON lines on stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="Output file (default: stdout)")
+    parser.add_argument('--input-format', choices=INPUT_FORMATS, help="Input format (default: from the file extension)")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default='csv', help="Output format (default: csv)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help=f"Rows per batch (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--no-proba', action='store_true', help="Only write the predicted class")
+    args = parser.parse_args()
+
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    rows, elapsed = score_file(args.model, args.input, args.output, args.input_format, args.output_format,
+                               args.batch_size, probabilities=not args.no_proba)
+    rate = rows / elapsed if elapsed > 0 else float('inf')
+    print(f"Scored {rows:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
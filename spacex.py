@@ -0,0 +1,177 @@
+"""
+SpaceX Analysis CLI
+
+One entry point for the query, chart, map, model and report scripts. Only
+argparse and the standard library are imported up front; each subcommand
+imports what it needs when it runs, so the text-only SQL queries start
+without loading pandas, numpy or matplotlib at all.
+
+Usage:
+    python spacex.py list                          # registered queries
+    python spacex.py query unique_launch_sites     # one or more queries
+    python spacex.py query rank_landing_outcomes --no-chart
+    python spacex.py queries --jobs 4 --no-charts  # the batch runner
+    python spacex.py charts --force                # any script subcommand
+    python spacex.py startup-check                 # import-time budget
+"""
+
+import argparse
+import os
+import runpy
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Script subcommands: name -> (script, help). Their own arguments are passed
+# through untouched, so `spacex.py charts --help` shows render_charts' help.
+SCRIPTS = {
+    'charts': ('render_charts.py', "Render the chart and dashboard PNGs"),
+    'outcomes-map': ('create_launch_outcomes_map.py', "Build the launch outcomes map"),
+    'sites-map': ('create_launch_sites_map.py', "Build the launch sites map"),
+    'proximity-map': ('create_launch_site_proximity_map.py', "Build the launch site proximity map"),
+    'payload-dashboard': ('create_payload_outcome_dashboard.py', "Build the payload outcome dashboards"),
+    'tiles': ('tile_cache.py', "Manage the map tile cache"),
+    'api': ('spacex_api.py', "Fetch launches from the SpaceX API"),
+    'api-fixtures': ('api_fixtures.py', "Record, generate or replay SpaceX API fixtures"),
+    'scrape': ('wiki_scraper.py', "Scrape the Wikipedia Falcon 9 launch tables"),
+    'sync': ('launch_sync.py', "Incrementally sync launches into the launch store"),
+    'schema': ('launch_schema.py', "Compare the typed launch layout with object columns"),
+    'score': ('score_launches.py', "Score launches with the cached model"),
+    'deck': ('deck_builder.py', "Build the presentation deck"),
+    'pdf': ('pptx_pdf.py', "Convert decks to PDF"),
+    'bench': ('benchmarks.py', "Run the scaling benchmarks"),
+    'metrics': ('instrumentation.py', "Show recorded stage metrics"),
+}
+
+# Modules whose import means a fast path has regressed
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib', 'pyarrow', 'sklearn', 'folium', 'seaborn')
+
+
+def cmd_list(args):
+    from run_queries import QUERIES
+    for name, spec in QUERIES.items():
+        print(f"{name:<25} {spec['module']}.py{'  (chart)' if spec['plots'] else ''}")
+    return 0
+
+
+def cmd_query(args):
+    import importlib
+    from run_queries import QUERIES, load_datasets
+
+    unknown = [name for name in args.names if name not in QUERIES]
+    if unknown:
+        print(f"Unknown queries: {', '.join(unknown)} (see `spacex.py list`)", file=sys.stderr)
+        return 2
+    modules = {name: importlib.import_module(QUERIES[name]['module']) for name in args.names}
+    if not args.no_chart and any(QUERIES[name]['plots'] for name in args.names):
+        import matplotlib
+        matplotlib.use('Agg')
+    frames = load_datasets(modules)
+    for name in args.names:
+        if QUERIES[name]['plots']:
+            modules[name].run_query(frames[name], chart=not args.no_chart)
+        else:
+            modules[name].run_query(frames[name])
+    return 0
+
+
+def cmd_queries(args):
+    from run_queries import run_queries
+    results = run_queries(args.names, jobs=args.jobs, charts=not args.no_charts)
+    return 1 if any(error for _, _, error in results) else 0
+
+
+def run_script(script, argv):
+    """Run one of the repo's scripts as __main__ with the given arguments."""
+    sys.argv = [script] + argv
+    try:
+        runpy.run_path(os.path.join(HERE, script), run_name='__main__')
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return 0
+
+
+def _time_command(argv):
+    # Wall time of a fresh interpreter running the command, and the heavy
+    # modules it imported according to -X importtime
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', os.path.join(HERE, 'spacex.py')] + argv,
+                            cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    heavy = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:'):
+            module = line.rsplit('|', 1)[-1].strip().split('.')[0]
+            if module in HEAVY_MODULES:
+                heavy.add(module)
+    return elapsed, result.returncode, sorted(heavy)
+
+
+def cmd_startup_check(args):
+    """
+    Time the fast-start commands in fresh interpreters against a budget.
+
+    Every query without a chart is timed: they all read the SQLite cache
+    with query_rows and print text without pandas. Each command runs once to
+    warm the launch store and SQLite caches, then args.repeat times; the best
+    time must be under the budget and no heavy module may be imported.
+
+    Returns:
+        int: 0 when every command is within budget, 1 otherwise
+    """
+    from run_queries import QUERIES
+
+    commands = [['--help'], ['list']] + [['query', name] for name, spec in QUERIES.items() if not spec['plots']]
+    failed = False
+    print(f"{'Command':<35} {'Best (ms)':>10} {'Status':>8}  Heavy imports")
+    print("-" * 75)
+    for argv in commands:
+        _time_command(argv)
+        runs = [_time_command(argv) for _ in range(args.repeat)]
+        best = min(elapsed for elapsed, _, _ in runs)
+        heavy = sorted({module for _, _, modules in runs for module in modules})
+        ok = best * 1000 <= args.budget_ms and not heavy and all(code == 0 for _, code, _ in runs)
+        failed = failed or not ok
+        print(f"{' '.join(argv):<35} {best * 1000:>10.1f} {'ok' if ok else 'FAIL':>8}  {', '.join(heavy) or '-'}")
+    print(f"\nBudget: {args.budget_ms:.0f} ms")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='spacex.py', description="SpaceX launch analysis")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    commands.add_parser('list', help="List the registered queries").set_defaults(func=cmd_list)
+
+    query = commands.add_parser('query', help="Run queries in this process")
+    query.add_argument('names', nargs='+', help="Query names from `list`")
+    query.add_argument('--no-chart', action='store_true', help="Skip charts (and matplotlib)")
+    query.set_defaults(func=cmd_query)
+
+    queries = commands.add_parser('queries', help="Run the batch query runner")
+    queries.add_argument('names', nargs='*', help="Query names (default: all)")
+    queries.add_argument('--jobs', type=int, default=1, help="Number of worker threads")
+    queries.add_argument('--no-charts', action='store_true', help="Only print and write the text results")
+    queries.set_defaults(func=cmd_queries)
+
+    check = commands.add_parser('startup-check', help="Check start-up time of the fast commands")
+    check.add_argument('--budget-ms', type=float, default=200, help="Per-command budget (default: 200)")
+    check.add_argument('--repeat', type=int, default=3, help="Timed runs per command (default: 3)")
+    check.set_defaults(func=cmd_startup_check)
+
+    for name, (script, help_text) in SCRIPTS.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+
+    argv = sys.argv[1:] if argv is None else argv
+    # Script subcommands hand everything after their name to the script
+    if argv and argv[0] in SCRIPTS:
+        return run_script(SCRIPTS[argv[0]][0], argv[1:])
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
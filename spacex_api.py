@@ -0,0 +1,592 @@
+"""
+SpaceX REST API Client
+
+Collects the launches, payloads and cores behind the launch table from the
+SpaceX API (v4) with asyncio and httpx. All requests share one pooled
+HTTP/1.1 connection pool, and at most max_connections are in flight at
+once. Failed requests are retried with exponential backoff and jitter, and
+a 429/503 Retry-After header is honored.
+
+Responses are kept in a SQLite cache with their ETag and Last-Modified
+headers. Repeat requests send If-None-Match / If-Modified-Since, so a
+refresh of unchanged endpoints is a round of 304s without bodies.
+
+Payload and core IDs are not resolved one launch at a time. Every ID
+referenced by the launches is collected, split into batches of BATCH_SIZE,
+and each batch is fetched with one POST /<endpoint>/query ({"_id": {"$in":
+[...]}}). All batches for both endpoints run concurrently.
+
+Point SPACEX_API_URL (or --base-url) at api_fixtures.py's replay server to
+run everything offline; `check` does that itself and verifies the client's
+revalidation, retries and batching against the fixtures.
+
+Requires httpx (see requirements.txt).
+
+Usage:
+    python spacex_api.py fetch                         # print a summary
+    python spacex_api.py fetch --output launches.csv
+    python api_fixtures.py serve --port 8766 &
+    python spacex_api.py fetch --base-url http://localhost:8766/v4
+    python spacex_api.py check                         # offline client check
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from email.utils import parsedate_to_datetime
+
+from instrumentation import timed
+
+# API root (override with SPACEX_API_URL, e.g. to use the fixture server)
+API_URL = os.environ.get('SPACEX_API_URL', 'https://api.spacexdata.com/v4')
+
+# Conditional request cache (override with SPACEX_API_CACHE)
+CACHE_PATH = os.environ.get('SPACEX_API_CACHE', os.path.join('.api_cache', 'responses.sqlite'))
+
+USER_AGENT = 'spacex-launch-analysis-api-client/1.0'
+
+# Pooled connections, which is also the cap on requests in flight
+MAX_CONNECTIONS = 8
+
+# IDs resolved per POST /<endpoint>/query
+BATCH_SIZE = 100
+
+# Retry policy: attempts after the first, and the backoff base and cap (s)
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Seconds to wait for a connection and for a response
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30
+
+# Endpoints fetched whole: they are small and every launch refers to them
+LOOKUP_ENDPOINTS = ('rockets', 'launchpads')
+
+# API landing types as the launch table names them
+LANDING_TYPE_NAMES = {'ASDS': 'Drone Ship', 'RTLS': 'Ground Pad', 'Ocean': 'Ocean'}
+
+# Launch table columns, in launch_data order, and the extra API columns
+LAUNCH_COLUMNS = ['FlightNumber', 'Date', 'BoosterVersion', 'BoosterID', 'LaunchSite', 'PayloadMass',
+                  'MissionName', 'MissionOutcome', 'LandingOutcome', 'LandingType']
+API_COLUMNS = ['Orbit', 'Customer', 'LaunchID']
+
+# The first five Falcon 9 launches flew the v1.0 booster. Neither v1.0 nor
+# v1.1 cores carry a block number, and the API's flight numbers also count
+# the Falcon 1 launches, so v1.0 is told apart by a launch's position among
+# the Falcon 9 launches.
+V10_LAUNCHES = 5
+
+
+class APIError(Exception):
+    """A request that still failed after every retry."""
+
+
+class ResponseCache:
+    """Bodies of earlier responses with their ETag and Last-Modified headers."""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str, optional): SQLite file, defaults to CACHE_PATH
+        """
+        self.path = path or CACHE_PATH
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,
+                                                  body TEXT, fetched_at REAL)
+        """)
+        self._db.commit()
+
+    @staticmethod
+    def key(method, url, body=None):
+        """Return the cache key of a request: its method, URL and JSON body."""
+        payload = json.dumps(body, sort_keys=True) if body is not None else ''
+        return hashlib.sha256(f"{method} {url} {payload}".encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return (etag, last_modified, body) for a key, or None."""
+        return self._db.execute("SELECT etag, last_modified, body FROM responses WHERE key = ?", (key,)).fetchone()
+
+    def age(self, key):
+        """Return the seconds since a key was last fetched or revalidated, or None."""
+        row = self._db.execute("SELECT fetched_at FROM responses WHERE key = ?", (key,)).fetchone()
+        return time.time() - row[0] if row else None
+
+    def put(self, key, etag, last_modified, body):
+        self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                         (key, etag, last_modified, body, time.time()))
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+def _httpx():
+    # Only the client needs httpx; the row and frame helpers work without it
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError("httpx is required for the SpaceX API client "
+                          "(pip install httpx, see requirements.txt)") from None
+    return httpx
+
+
+def _retry_delay(attempt, retry_after=None):
+    # Honor a server's Retry-After (seconds or an HTTP date), otherwise back
+    # off exponentially with full jitter so retries from many tasks spread out
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            try:
+                return min(max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0), BACKOFF_MAX)
+            except (TypeError, ValueError):
+                pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _batches(ids, size):
+    ids = list(ids)
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+
+class SpaceXClient:
+    """
+    Async client for the SpaceX API over one pooled httpx connection pool.
+
+    Use as ``async with SpaceXClient() as client:``; the pool and the
+    response cache are closed on exit.
+    """
+
+    def __init__(self, base_url=None, cache_path=None, max_connections=MAX_CONNECTIONS,
+                 retries=MAX_RETRIES, batch_size=BATCH_SIZE, use_cache=True):
+        """
+        Args:
+            base_url (str, optional): API root, defaults to API_URL
+            cache_path (str, optional): Response cache file, defaults to CACHE_PATH
+            max_connections (int): Pool size and cap on concurrent requests
+            retries (int): Retries per request after the first attempt
+            batch_size (int): IDs per batched query
+            use_cache (bool): Send conditional requests and keep response bodies
+        """
+        self.base_url = (base_url or API_URL).rstrip('/')
+        self.cache = ResponseCache(cache_path) if use_cache else None
+        self.max_connections = max_connections
+        self.retries = retries
+        self.batch_size = batch_size
+        self.stats = {'requests': 0, 'not_modified': 0, 'retries': 0, 'bytes': 0}
+        self._client = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        httpx = _httpx()
+        self._httpx = httpx
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={'User-Agent': USER_AGENT, 'Accept': 'application/json'},
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_connections)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        if self.cache is not None:
+            self.cache.close()
+
+    async def request_json(self, method, path, body=None):
+        """
+        Send a request and return its decoded JSON, revalidating cached copies.
+
+        Args:
+            method (str): 'GET' or 'POST'
+            path (str): Path below the API root, e.g. '/launches'
+            body (dict, optional): JSON body
+
+        Returns:
+            The decoded JSON response
+
+        Raises:
+            APIError: When every attempt failed
+        """
+        key = ResponseCache.key(method, f"{self.base_url}{path}", body)
+        cached = self.cache.get(key) if self.cache is not None else None
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        response = await self._send(method, path, body, headers)
+        if response.status_code == 304 and cached:
+            self.stats['not_modified'] += 1
+            return json.loads(cached[2])
+
+        text = response.text
+        self.stats['bytes'] += len(response.content)
+        if self.cache is not None and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            self.cache.put(key, response.headers.get('ETag'), response.headers.get('Last-Modified'), text)
+        return json.loads(text)
+
+    async def _send(self, method, path, body, headers):
+        httpx = self._httpx
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            async with self._semaphore:
+                self.stats['requests'] += 1
+                try:
+                    response = await self._client.request(method, path, json=body, headers=headers)
+                except httpx.TransportError as e:
+                    error = e
+                else:
+                    if response.status_code not in RETRY_STATUSES:
+                        if response.status_code >= 400:
+                            raise APIError(f"{method} {path}: HTTP {response.status_code}")
+                        return response
+                    error = f"HTTP {response.status_code}"
+                    retry_after = response.headers.get('Retry-After')
+            # Back off outside the semaphore so a sleeping retry does not hold a slot
+            if attempt < self.retries:
+                self.stats['retries'] += 1
+                await asyncio.sleep(_retry_delay(attempt, retry_after))
+        raise APIError(f"{method} {path} failed after {self.retries + 1} attempts: {error}")
+
+    async def get(self, endpoint):
+        """Return every document of an endpoint, e.g. get('launches')."""
+        return await self.request_json('GET', f"/{endpoint}")
+
+    async def query(self, endpoint, query, options=None):
+        """Return the documents of one POST /<endpoint>/query."""
+        options = dict(options or {}, pagination=False)
+        result = await self.request_json('POST', f"/{endpoint}/query", {'query': query, 'options': options})
+        return result['docs']
+
+    async def resolve(self, endpoint, ids):
+        """
+        Fetch documents by ID in concurrent batches.
+
+        Args:
+            endpoint (str): e.g. 'payloads' or 'cores'
+            ids (iterable): Document IDs, duplicates allowed
+
+        Returns:
+            dict: ID -> document (IDs the API does not know are left out)
+        """
+        batches = _batches(sorted(set(ids)), self.batch_size)
+        results = await asyncio.gather(*(self.query(endpoint, {'_id': {'$in': batch}}) for batch in batches))
+        return {doc['id']: doc for docs in results for doc in docs}
+
+    async def launch_documents(self, query=None):
+        """
+        Fetch launches with the payloads, cores, rockets and launchpads they use.
+
+        Args:
+            query (dict, optional): Launch query (e.g. on date_utc); all
+                launches when None
+
+        Returns:
+            dict: 'launches' (list), 'payloads', 'cores', 'rockets' and
+            'launchpads' (ID -> document), and 'v10_flights' (the flight
+            numbers of the first Falcon 9 launches)
+        """
+        if query is None:
+            launches_request = self.get('launches')
+        else:
+            launches_request = self.query('launches', query, {'sort': {'flight_number': 'asc'}})
+        launches, *lookups = await asyncio.gather(launches_request, *(self.get(name) for name in LOOKUP_ENDPOINTS))
+        documents = {'launches': launches}
+        for name, docs in zip(LOOKUP_ENDPOINTS, lookups):
+            documents[name] = {doc['id']: doc for doc in docs}
+
+        payload_ids = [payload_id for launch in launches for payload_id in launch.get('payloads') or []]
+        core_ids = [core['core'] for launch in launches for core in launch.get('cores') or [] if core.get('core')]
+        requests = [self.resolve('payloads', payload_ids), self.resolve('cores', core_ids)]
+        if query is not None:
+            # A partial history may not hold the first Falcon 9 launches
+            requests.append(self.first_falcon9_flights(documents['rockets']))
+        documents['payloads'], documents['cores'], *v10_flights = await asyncio.gather(*requests)
+        documents['v10_flights'] = v10_flights[0] if v10_flights else v10_flight_numbers(documents)
+        return documents
+
+    async def first_falcon9_flights(self, rockets):
+        """Return the flight numbers of the first V10_LAUNCHES Falcon 9 launches."""
+        falcon9 = [rocket_id for rocket_id, rocket in rockets.items() if rocket.get('name') == 'Falcon 9']
+        if not falcon9:
+            return []
+        # A paginated query: with pagination off the API ignores the limit
+        result = await self.request_json('POST', '/launches/query', {
+            'query': {'rocket': {'$in': falcon9}},
+            'options': {'sort': {'flight_number': 'asc'}, 'limit': V10_LAUNCHES, 'select': ['flight_number']}
+        })
+        return [launch['flight_number'] for launch in result['docs']]
+
+
+def site_code(launchpad_name):
+    """
+    Return the launch table's site code for an API launchpad name.
+
+    'CCSFS SLC 40' -> 'CCAFS SLC-40', 'KSC LC 39A' -> 'KSC LC-39A'. Cape
+    Canaveral was renamed a Space Force Station in 2020; the table keeps the
+    older CCAFS prefix so that sites match across the whole history.
+    """
+    name = re.sub(r'^CCSFS\b', 'CCAFS', launchpad_name)
+    return re.sub(r' (\d+[A-Z]?)$', r'-\1', name)
+
+
+def v10_flight_numbers(documents):
+    """Return the flight numbers of the first V10_LAUNCHES Falcon 9 launches in a full history."""
+    falcon9 = {rocket_id for rocket_id, rocket in documents['rockets'].items() if rocket.get('name') == 'Falcon 9'}
+    flights = sorted(launch['flight_number'] for launch in documents['launches'] if launch.get('rocket') in falcon9)
+    return flights[:V10_LAUNCHES]
+
+
+def booster_version(rocket_name, block, v10=False):
+    """
+    Return the launch table's BoosterVersion for a rocket and core block.
+
+    Args:
+        rocket_name (str): API rocket name
+        block (int, optional): Core block number
+        v10 (bool): Whether the launch was one of the first Falcon 9 launches
+    """
+    if rocket_name != 'Falcon 9':
+        return rocket_name
+    if block is None:
+        return 'F9 v1.0' if v10 else 'F9 v1.1'
+    return 'F9 Block 5' if block >= 5 else 'F9 FT'
+
+
+def launch_rows(documents):
+    """
+    Flatten API documents into launch table rows.
+
+    Upcoming launches are skipped. A launch's first core decides its
+    booster and landing; its payload mass is the sum over its payloads, and
+    Orbit and Customer come from the first payload.
+
+    Args:
+        documents (dict): As returned by SpaceXClient.launch_documents()
+
+    Returns:
+        list: Row dicts with LAUNCH_COLUMNS + API_COLUMNS keys
+    """
+    v10_flights = set(documents['v10_flights'] if 'v10_flights' in documents else v10_flight_numbers(documents))
+    rows = []
+    for launch in documents['launches']:
+        if launch.get('upcoming'):
+            continue
+        rocket = documents['rockets'].get(launch.get('rocket'), {})
+        launchpad = documents['launchpads'].get(launch.get('launchpad'), {})
+        payloads = [documents['payloads'][payload_id] for payload_id in launch.get('payloads') or []
+                    if payload_id in documents['payloads']]
+        first_core = (launch.get('cores') or [{}])[0]
+        core = documents['cores'].get(first_core.get('core'), {})
+
+        masses = [payload['mass_kg'] for payload in payloads if payload.get('mass_kg') is not None]
+        customers = payloads[0].get('customers') if payloads else None
+        landed = first_core.get('landing_success')
+        attempted = first_core.get('landing_attempt') and first_core.get('landing_type')
+
+        rows.append({
+            'FlightNumber': launch['flight_number'],
+            'Date': launch['date_utc'],
+            'BoosterVersion': booster_version(rocket.get('name'), core.get('block'),
+                                              launch['flight_number'] in v10_flights),
+            'BoosterID': core.get('serial'),
+            'LaunchSite': site_code(launchpad['name']) if launchpad.get('name') else None,
+            'PayloadMass': float(sum(masses)) if masses else float('nan'),
+            'MissionName': launch.get('name'),
+            'MissionOutcome': int(bool(launch.get('success'))),
+            'LandingOutcome': float(bool(landed)) if attempted else float('nan'),
+            'LandingType': LANDING_TYPE_NAMES.get(first_core.get('landing_type'), 'Expendable') if attempted
+            else 'Expendable',
+            'Orbit': payloads[0].get('orbit') if payloads else None,
+            'Customer': customers[0] if customers else None,
+            'LaunchID': launch['id']
+        })
+    return rows
+
+
+def launch_frame(rows, name='spacex_api launches'):
+    """Build the typed, validated launch DataFrame from launch rows, ordered by flight."""
+    import pandas as pd
+    from launch_schema import cast_launches
+
+    df = pd.DataFrame(rows, columns=LAUNCH_COLUMNS + API_COLUMNS)
+    df['Date'] = pd.to_datetime(df['Date'], utc=True).dt.tz_localize(None)
+    return cast_launches(df.sort_values('FlightNumber', ignore_index=True), name)
+
+
+async def _fetch(base_url, cache_path, max_connections, query):
+    async with SpaceXClient(base_url, cache_path, max_connections) as client:
+        documents = await client.launch_documents(query)
+        return documents, client.stats
+
+
+@timed()
+def fetch_launch_documents(base_url=None, cache_path=None, max_connections=MAX_CONNECTIONS, query=None):
+    """
+    Synchronous entry point: fetch the launch documents in an event loop.
+
+    Returns:
+        tuple: (documents, request stats)
+    """
+    return asyncio.run(_fetch(base_url, cache_path, max_connections, query))
+
+
+async def _check_fetch(base_url, cache_path, batch_size, use_cache=True, query=None):
+    async with SpaceXClient(base_url, cache_path, batch_size=batch_size, use_cache=use_cache) as client:
+        documents = await client.launch_documents(query)
+        return documents, dict(client.stats)
+
+
+def check(directory=None, batch_size=7, fail_first=2):
+    """
+    Run the client against the fixture replay server and verify its behavior.
+
+    Four fetches against api_fixtures.running() servers:
+    - cold: every request is a 200, and payloads and cores are resolved in
+      ceil(IDs / batch_size) batched $in queries each, matching the files
+    - warm, from the same server with the same response cache: every
+      request is a 304 and no body is downloaded
+    - without the cache, from a server answering the first fail_first
+      requests of every path with 503s: each one is retried and the
+      documents are unchanged
+    - incremental, starting after the first Falcon 9 launches: v1.0
+      boosters are still labelled as on the full fetch
+
+    Args:
+        directory (str, optional): Fixture directory, defaults to api_fixtures.FIXTURE_DIR
+        batch_size (int): IDs per batched query, small to force several batches
+        fail_first (int): Injected 503s per path, at most MAX_RETRIES
+
+    Returns:
+        list: Descriptions of failed checks (empty when all pass)
+    """
+    from api_fixtures import FIXTURE_DIR, running
+
+    directory = directory or FIXTURE_DIR
+    files = {}
+    for name in ('launches', 'payloads', 'cores'):
+        with open(os.path.join(directory, f"{name}.json")) as f:
+            files[name] = json.load(f)
+    ids = {
+        'payloads': {payload_id for launch in files['launches'] for payload_id in launch.get('payloads') or []},
+        'cores': {core['core'] for launch in files['launches'] for core in launch.get('cores') or [] if core.get('core')}
+    }
+    batches = sum(math.ceil(len(endpoint_ids) / batch_size) for endpoint_ids in ids.values())
+    expected_requests = 1 + len(LOOKUP_ENDPOINTS) + batches
+    paths = 1 + len(LOOKUP_ENDPOINTS) + sum(bool(endpoint_ids) for endpoint_ids in ids.values())
+
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'responses.sqlite')
+        # Cache keys hold the URL, so the warm fetch needs the same server (port)
+        with running(directory) as base_url:
+            cold, cold_stats = asyncio.run(_check_fetch(base_url, cache_path, batch_size))
+            warm, warm_stats = asyncio.run(_check_fetch(base_url, cache_path, batch_size))
+        with running(directory, fail_first=fail_first) as base_url:
+            try:
+                retried, retry_stats = asyncio.run(_check_fetch(base_url, cache_path, batch_size, use_cache=False))
+            except APIError as e:
+                retried = None
+                problems.append(f"retried fetch: {e}")
+        first_flight = min(launch['flight_number'] for launch in files['launches'])
+        with running(directory) as base_url:
+            partial, _ = asyncio.run(_check_fetch(base_url, cache_path, batch_size, use_cache=False,
+                                                  query={'flight_number': {'$gt': first_flight + 2}}))
+
+    if cold_stats['requests'] != expected_requests or cold_stats['not_modified'] or cold_stats['retries']:
+        problems.append(f"cold fetch: {cold_stats}, expected {expected_requests} requests "
+                        f"({batches} batched queries) without 304s or retries")
+    if cold['launches'] != files['launches']:
+        problems.append("cold fetch: launches differ from launches.json")
+    for name in ('payloads', 'cores'):
+        if cold[name] != {doc['id']: doc for doc in files[name] if doc['id'] in ids[name]}:
+            problems.append(f"cold fetch: resolved {len(cold[name])} {name}, not those in {name}.json")
+
+    if warm_stats['not_modified'] != expected_requests or warm_stats['requests'] != expected_requests \
+            or warm_stats['bytes']:
+        problems.append(f"warm fetch: {warm_stats}, expected {expected_requests} 304s and no bytes")
+    if warm != cold:
+        problems.append("warm fetch: cached documents differ from the cold fetch")
+
+    if retried is not None:
+        if retry_stats['retries'] != fail_first * paths or \
+                retry_stats['requests'] != expected_requests + fail_first * paths:
+            problems.append(f"retried fetch: {retry_stats}, expected {fail_first * paths} retries")
+        if retried != cold:
+            problems.append("retried fetch: documents differ from the cold fetch")
+
+    versions = {row['FlightNumber']: row['BoosterVersion'] for row in launch_rows(cold)}
+    mislabelled = [row['FlightNumber'] for row in launch_rows(partial)
+                   if row['BoosterVersion'] != versions[row['FlightNumber']]]
+    if mislabelled:
+        problems.append(f"incremental fetch: booster versions differ on flights {mislabelled}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect launch data from the SpaceX API")
+    commands = parser.add_subparsers(dest='command', required=True)
+    fetch_parser = commands.add_parser('fetch', help="Fetch launches with their payloads and cores")
+    fetch_parser.add_argument('--base-url', default=None, help=f"API root (default: {API_URL})")
+    fetch_parser.add_argument('--connections', type=int, default=MAX_CONNECTIONS)
+    fetch_parser.add_argument('--output', help="Write the launch table to this CSV file")
+    check_parser = commands.add_parser('check', help="Check the client against the fixture replay server")
+    check_parser.add_argument('--dir', default=None, help="Fixture directory")
+    check_parser.add_argument('--batch-size', type=int, default=7, help="IDs per batched query")
+    check_parser.add_argument('--fail-first', type=int, default=2, help="Injected 503s per path")
+    args = parser.parse_args()
+
+    try:
+        _httpx()
+    except ImportError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.command == 'check':
+        start = time.perf_counter()
+        problems = check(args.dir, args.batch_size, args.fail_first)
+        print(f"Ran the client against the fixture server in {time.perf_counter() - start:.2f}s")
+        for problem in problems:
+            print(f"  {problem}")
+        print("Revalidation, retries and batching all behave" if not problems else f"{len(problems)} checks failed")
+        return 1 if problems else 0
+
+    start = time.perf_counter()
+    documents, stats = fetch_launch_documents(args.base_url, max_connections=args.connections)
+    elapsed = time.perf_counter() - start
+    df = launch_frame(launch_rows(documents))
+
+    print(f"Fetched {len(documents['launches'])} launches, {len(documents['payloads'])} payloads and "
+          f"{len(documents['cores'])} cores in {elapsed:.2f}s")
+    print(f"{stats['requests']} requests, {stats['not_modified']} not modified, {stats['retries']} retries, "
+          f"{stats['bytes'] / 1024:.1f} KiB downloaded")
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"Wrote {len(df)} launches to {args.output}")
+    else:
+        print(df.tail(10).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
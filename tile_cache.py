@@ -0,0 +1,315 @@
+"""
+Offline Map Tile Cache
+
+Keeps web map tiles in MBTiles files (one SQLite database per tile source,
+tiles stored under TMS row numbering as the MBTiles spec requires), so maps
+and snapshots can be rendered without going back to the tile servers.
+
+- TileCache.tile() returns a tile from the store, downloading and storing it
+  on a miss unless the cache is opened offline.
+- prefetch() downloads every tile of an area over a range of zoom levels in
+  a thread pool, e.g. once before a release build.
+- serve() runs a small HTTP server that answers /<source>/{z}/{x}/{y}.png
+  from the cache. When SPACEX_TILE_SERVER points at it, map_tiles() makes
+  the Folium map scripts load their tiles from there instead of from
+  OpenStreetMap / CARTO.
+
+Usage:
+    python tile_cache.py prefetch --source OpenStreetMap --bounds 24 -125 50 -66 --zooms 3-8
+    python tile_cache.py serve --port 8765
+    SPACEX_TILE_SERVER=http://localhost:8765 python create_launch_sites_map.py
+"""
+
+import argparse
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Where the .mbtiles files live (override with SPACEX_TILE_CACHE)
+CACHE_DIR = os.environ.get('SPACEX_TILE_CACHE', '.tile_cache')
+
+# Local tile server the map scripts should use, e.g. http://localhost:8765
+TILE_SERVER = os.environ.get('SPACEX_TILE_SERVER')
+
+TILE_SIZE = 256
+
+# Tile sources the map scripts use, by their Folium tiles name
+TILE_SOURCES = {
+    'OpenStreetMap': {
+        'url': 'https://tile.openstreetmap.org/{z}/{x}/{y}.png',
+        'attribution': '&copy; OpenStreetMap contributors',
+        'max_zoom': 19
+    },
+    'CartoDB positron': {
+        'url': 'https://a.basemaps.cartocdn.com/light_all/{z}/{x}/{y}.png',
+        'attribution': '&copy; OpenStreetMap contributors &copy; CARTO',
+        'max_zoom': 20
+    }
+}
+
+# Tile servers ask clients to identify themselves
+USER_AGENT = 'spacex-launch-analysis-tile-cache/1.0'
+
+# Seconds to wait for a tile download
+FETCH_TIMEOUT = 10
+
+# Concurrent downloads when prefetching
+PREFETCH_WORKERS = 8
+
+
+def source_slug(source):
+    """Return the file and URL name of a tile source, e.g. 'cartodb_positron'."""
+    return re.sub(r'[^a-z0-9]+', '_', source.lower()).strip('_')
+
+
+def _source(source):
+    if source not in TILE_SOURCES:
+        raise KeyError(f"Unknown tile source '{source}' (known: {', '.join(TILE_SOURCES)})")
+    return TILE_SOURCES[source]
+
+
+def lat_lon_to_pixel(lat, lon, zoom):
+    """Return the Web Mercator pixel (x, y) of a point at a zoom level."""
+    scale = TILE_SIZE * 2 ** zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = (lon + 180) / 360 * scale
+    sin_lat = math.sin(math.radians(lat))
+    y = (0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * scale
+    return x, y
+
+
+def tiles_for_bounds(lat_min, lon_min, lat_max, lon_max, zoom):
+    """Return the (x, y) tiles at zoom that cover a bounding box."""
+    x0, y0 = lat_lon_to_pixel(lat_max, lon_min, zoom)
+    x1, y1 = lat_lon_to_pixel(lat_min, lon_max, zoom)
+    last = 2 ** zoom - 1
+    columns = range(max(int(x0 // TILE_SIZE), 0), min(int(x1 // TILE_SIZE), last) + 1)
+    rows = range(max(int(y0 // TILE_SIZE), 0), min(int(y1 // TILE_SIZE), last) + 1)
+    return [(x, y) for x in columns for y in rows]
+
+
+class TileCache:
+    """The MBTiles store of one tile source."""
+
+    def __init__(self, source='OpenStreetMap', cache_dir=None, offline=False):
+        """
+        Args:
+            source (str): Name of a tile source in TILE_SOURCES
+            cache_dir (str, optional): Directory of the .mbtiles files, defaults to CACHE_DIR
+            offline (bool): Never download; missing tiles come back as None
+        """
+        self.source = source
+        self.url = _source(source)['url']
+        self.offline = offline
+        cache_dir = cache_dir or CACHE_DIR
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{source_slug(source)}.mbtiles")
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._session = None
+
+        db = self._db()
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tiles (zoom_level INTEGER, tile_column INTEGER,
+                                              tile_row INTEGER, tile_data BLOB);
+            CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles (zoom_level, tile_column, tile_row);
+        """)
+        db.executemany("INSERT OR IGNORE INTO metadata VALUES (?, ?)", [
+            ('name', source), ('format', 'png'), ('type', 'baselayer'), ('version', '1'),
+            ('attribution', _source(source)['attribution'])
+        ])
+        db.commit()
+
+    def _db(self):
+        # SQLite connections cannot be shared across threads, so each thread gets one
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            self._local.db = db
+        return db
+
+    def get(self, z, x, y):
+        """Return the cached PNG of tile (z, x, y) in XYZ numbering, or None."""
+        row = self._db().execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+            (z, x, 2 ** z - 1 - y)).fetchone()
+        return row[0] if row else None
+
+    def put(self, z, x, y, data):
+        """Store the PNG of tile (z, x, y) in XYZ numbering."""
+        with self._write_lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", (z, x, 2 ** z - 1 - y, data))
+            db.commit()
+
+    def fetch(self, z, x, y):
+        """Download tile (z, x, y) from its source; returns the PNG or None on failure."""
+        import requests
+
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers['User-Agent'] = USER_AGENT
+        try:
+            response = self._session.get(self.url.format(z=z, x=x, y=y), timeout=FETCH_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException:
+            return None
+        return response.content
+
+    def tile(self, z, x, y):
+        """Return tile (z, x, y) from the cache, downloading it on a miss unless offline."""
+        data = self.get(z, x, y)
+        if data is None and not self.offline:
+            data = self.fetch(z, x, y)
+            if data is not None:
+                self.put(z, x, y, data)
+        return data
+
+    def count(self):
+        """Return the number of cached tiles."""
+        return self._db().execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
+
+    def close(self):
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+def prefetch(bounds, zooms, source='OpenStreetMap', cache_dir=None, workers=PREFETCH_WORKERS):
+    """
+    Download the tiles of an area at several zoom levels into the cache.
+
+    Args:
+        bounds (tuple): (lat_min, lon_min, lat_max, lon_max)
+        zooms (iterable): Zoom levels
+        source (str): Tile source name
+        cache_dir (str, optional): Cache directory
+        workers (int): Concurrent downloads
+
+    Returns:
+        tuple: (tiles already cached, tiles downloaded, tiles that failed)
+    """
+    cache = TileCache(source, cache_dir)
+    wanted = [(z, x, y) for z in zooms for x, y in tiles_for_bounds(*bounds, z)]
+    missing = [tile for tile in wanted if cache.get(*tile) is None]
+
+    downloaded = failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for tile, data in zip(missing, pool.map(lambda tile: cache.fetch(*tile), missing)):
+            if data is None:
+                failed += 1
+            else:
+                cache.put(*tile, data)
+                downloaded += 1
+    cache.close()
+    return len(wanted) - len(missing), downloaded, failed
+
+
+def map_tiles(source):
+    """
+    Folium tile arguments for a map, pointing at the local tile server when
+    SPACEX_TILE_SERVER is set.
+
+    Args:
+        source (str): Tile source name, as passed to folium.Map(tiles=...)
+
+    Returns:
+        dict: Keyword arguments for folium.Map
+    """
+    if not TILE_SERVER:
+        return {'tiles': source}
+    return {
+        'tiles': f"{TILE_SERVER.rstrip('/')}/{source_slug(source)}/{{z}}/{{x}}/{{y}}.png",
+        'attr': _source(source)['attribution'],
+        'max_zoom': _source(source)['max_zoom']
+    }
+
+
+def serve(port=8765, cache_dir=None, offline=False):
+    """
+    Serve cached tiles at http://localhost:<port>/<source>/{z}/{x}/{y}.png.
+
+    Tiles missing from the cache are downloaded and stored unless offline.
+    """
+    caches = {source_slug(source): TileCache(source, cache_dir, offline) for source in TILE_SOURCES}
+    pattern = re.compile(r'^/([a-z0-9_]+)/(\d+)/(\d+)/(\d+)\.png$')
+
+    class TileHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            match = pattern.match(self.path.split('?')[0])
+            if not match or match.group(1) not in caches:
+                self.send_error(404)
+                return
+            z, x, y = (int(value) for value in match.groups()[1:])
+            data = caches[match.group(1)].tile(z, x, y)
+            if data is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('Cache-Control', 'max-age=86400')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), TileHandler)
+    print(f"Serving cached tiles at http://localhost:{port}/<source>/{{z}}/{{x}}/{{y}}.png "
+          f"(sources: {', '.join(caches)})")
+    print(f"Point the map scripts at it with SPACEX_TILE_SERVER=http://localhost:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _zoom_range(text):
+    low, _, high = text.partition('-')
+    return range(int(low), int(high or low) + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the offline map tile cache")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fetch_parser = commands.add_parser('prefetch', help="Download the tiles of an area")
+    fetch_parser.add_argument('--source', default='OpenStreetMap', choices=list(TILE_SOURCES))
+    fetch_parser.add_argument('--bounds', nargs=4, type=float, required=True,
+                              metavar=('LAT_MIN', 'LON_MIN', 'LAT_MAX', 'LON_MAX'))
+    fetch_parser.add_argument('--zooms', type=_zoom_range, default=range(3, 9), help="e.g. 3-8 (default)")
+    fetch_parser.add_argument('--workers', type=int, default=PREFETCH_WORKERS)
+
+    serve_parser = commands.add_parser('serve', help="Serve cached tiles over HTTP")
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--offline', action='store_true', help="Never download missing tiles")
+
+    commands.add_parser('info', help="Show how many tiles are cached per source")
+    args = parser.parse_args()
+
+    if args.command == 'prefetch':
+        cached, downloaded, failed = prefetch(args.bounds, args.zooms, args.source, workers=args.workers)
+        print(f"{args.source}: {cached} tiles already cached, {downloaded} downloaded, {failed} failed")
+        return 1 if failed else 0
+    if args.command == 'serve':
+        serve(args.port, offline=args.offline)
+        return 0
+    for source in TILE_SOURCES:
+        cache = TileCache(source, offline=True)
+        print(f"{source:<20} {cache.count():>8} tiles  {cache.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,588 @@
+"""
+Wikipedia Falcon 9 Launch Scraper
+
+Scrapes the Falcon 9 launch tables of Wikipedia's "List of Falcon 9 and
+Falcon Heavy launches" pages into the launch table layout the find_* and
+calculate_* scripts use.
+
+- Fetching: pages are downloaded concurrently in a thread pool, one
+  requests session per thread.
+- Caching: every page is kept in an on-disk HTTP cache
+  (spacex_api.ResponseCache). Pages younger than MAX_AGE are not requested
+  at all. Older pages are revalidated with If-None-Match /
+  If-Modified-Since. With offline=True only the cache is used. A page that
+  cannot be fetched falls back to its cached copy, however old, or is
+  skipped and reported; the other pages are still scraped.
+- Parsing: tables go through lxml's C HTML parser. rowspan and colspan are
+  expanded into a full grid, footnote markers and hidden sort keys are
+  dropped, and the per-launch description rows are skipped.
+- Output: rows are yielded as each page finishes parsing, so they reach the
+  DataFrame (or the launch store, via launch_sync's 'wikipedia' source)
+  without holding whole pages of parsed markup.
+
+Saved pages can be scraped straight from a directory. fixtures/wikipedia
+holds pages generated from the synthetic launch table in Wikipedia's
+markup, and `check` scrapes them and compares the result with that table.
+
+Usage:
+    python wiki_scraper.py scrape --output launches.csv
+    python wiki_scraper.py scrape --offline            # cache only
+    python wiki_scraper.py save --dir saved_pages       # keep pages as .html
+    python wiki_scraper.py scrape --pages-dir saved_pages
+    python wiki_scraper.py check                        # against the fixtures
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html import escape
+
+import lxml.html
+
+from instrumentation import timed
+from spacex_api import LAUNCH_COLUMNS, ResponseCache
+
+# Pages holding the Falcon 9 launch tables, oldest first, with the last
+# launch year each one covers (None for the current-year page)
+PAGES = [
+    ('https://en.wikipedia.org/wiki/List_of_Falcon_9_and_Falcon_Heavy_launches_(2010%E2%80%932019)', 2019),
+    ('https://en.wikipedia.org/wiki/List_of_Falcon_9_and_Falcon_Heavy_launches_(2020%E2%80%932022)', 2022),
+    ('https://en.wikipedia.org/wiki/List_of_Falcon_9_and_Falcon_Heavy_launches_(2023)', 2023),
+    ('https://en.wikipedia.org/wiki/List_of_Falcon_9_and_Falcon_Heavy_launches_(2024)', 2024),
+    ('https://en.wikipedia.org/wiki/List_of_Falcon_9_and_Falcon_Heavy_launches', None),
+]
+
+# Page cache (override with SPACEX_SCRAPE_CACHE)
+CACHE_PATH = os.environ.get('SPACEX_SCRAPE_CACHE', os.path.join('.scrape_cache', 'pages.sqlite'))
+
+# Saved pages generated from the synthetic launch table
+FIXTURE_DIR = os.path.join('fixtures', 'wikipedia')
+
+# Wikipedia asks clients to identify themselves
+USER_AGENT = 'spacex-launch-analysis-scraper/1.0 (launch history research)'
+
+# Cached pages younger than this (s) are used without a request
+MAX_AGE = 24 * 3600
+
+FETCH_WORKERS = 4
+FETCH_TIMEOUT = 30
+
+# Scraped columns: the launch table plus what the tables add
+SCRAPE_COLUMNS = LAUNCH_COLUMNS + ['Orbit', 'Customer']
+
+# Table header text -> field, matched on the start of the lowercased header
+HEADER_FIELDS = [
+    ('flight', 'flight'), ('date', 'date'), ('version', 'version'), ('launch site', 'site'),
+    ('payload mass', 'mass'), ('payload', 'payload'), ('orbit', 'orbit'), ('customer', 'customer'),
+    ('launch outcome', 'outcome'), ('booster landing', 'landing'), ('booster', 'landing'),
+]
+
+MONTHS = {name: number for number, name in enumerate(
+    ['january', 'february', 'march', 'april', 'may', 'june', 'july', 'august',
+     'september', 'october', 'november', 'december'], 1)}
+
+# Launch site prefixes as the launch table names them
+SITE_PREFIXES = [
+    (re.compile(r'^(CCAFS|CCSFS|Cape Canaveral)', re.I), 'CCAFS'),
+    (re.compile(r'^(KSC|Kennedy)', re.I), 'KSC'),
+    (re.compile(r'^(VAFB|VSFB|Vandenberg)', re.I), 'VAFB'),
+]
+
+LANDING_TYPES = [('drone ship', 'Drone Ship'), ('ASDS', 'Drone Ship'), ('ground pad', 'Ground Pad'),
+                 ('RTLS', 'Ground Pad'), ('ocean', 'Ocean'), ('parachute', 'Ocean')]
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+_local = threading.local()
+
+
+def page_urls(since_year=None):
+    """Return the URLs of the pages with launches from since_year on (all when None)."""
+    return [url for url, last_year in PAGES if since_year is None or last_year is None or last_year >= since_year]
+
+
+def _session():
+    import requests
+
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers['User-Agent'] = USER_AGENT
+        _local.session = session
+    return session
+
+
+def _download(url, validators):
+    # Runs in a worker thread; returns (status, etag, last_modified, text)
+    headers = {}
+    if validators:
+        etag, last_modified = validators
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+    response = _session().get(url, headers=headers, timeout=FETCH_TIMEOUT)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return (response.status_code, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+            response.text if response.status_code != 304 else None)
+
+
+def fetch_pages(urls=None, cache_path=None, workers=FETCH_WORKERS, max_age=MAX_AGE, offline=False,
+                failures=None):
+    """
+    Yield (url, html) for each page as soon as it is available.
+
+    Fresh cached pages come first, without a request. The rest are fetched
+    concurrently and revalidated when a cached copy exists. The SQLite cache
+    is only touched from the calling thread. A page whose request fails
+    (HTTP error, timeout, connection error) is served from its cached copy
+    if there is one and skipped otherwise.
+
+    Args:
+        urls (list, optional): Page URLs, defaults to every page
+        cache_path (str, optional): Cache file, defaults to CACHE_PATH
+        workers (int): Concurrent downloads
+        max_age (float): Seconds a cached page is used without revalidation
+        offline (bool): Only use cached pages; missing ones are skipped
+        failures (list, optional): Receives (url, error, used_cache) for
+            every page that could not be fetched
+    """
+    cache = ResponseCache(cache_path or CACHE_PATH)
+    try:
+        stale = []
+        for url in urls or page_urls():
+            key = ResponseCache.key('GET', url)
+            cached = cache.get(key)
+            if cached and (offline or cache.age(key) < max_age):
+                yield url, cached[2]
+            elif not offline:
+                stale.append((url, key, cached))
+
+        if not stale:
+            return
+        import requests
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_download, url, cached[:2] if cached else None): (url, key, cached)
+                       for url, key, cached in stale}
+            for future in as_completed(futures):
+                url, key, cached = futures[future]
+                try:
+                    status, etag, last_modified, text = future.result()
+                except requests.RequestException as e:
+                    # One unreachable page must not cost the others
+                    if failures is not None:
+                        failures.append((url, str(e), cached is not None))
+                    if cached:
+                        yield url, cached[2]
+                    continue
+                if status == 304:
+                    etag, last_modified, text = etag or cached[0], last_modified or cached[1], cached[2]
+                cache.put(key, etag, last_modified, text)
+                yield url, text
+    finally:
+        cache.close()
+
+
+def read_pages(directory):
+    """Yield (path, html) for every saved .html page in a directory."""
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            yield path, f.read()
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def _cell_text(cell):
+    # Text of a cell with line breaks kept, footnotes and hidden sort keys dropped
+    for node in cell.xpath('.//sup[contains(@class, "reference")] | .//*[contains(@style, "display:none")]'):
+        node.drop_tree()
+    for br in cell.xpath('.//br'):
+        br.tail = '\n' + (br.tail or '')
+    text = re.sub(r'\[\w+\]', '', cell.text_content())
+    lines = [re.sub(r'\s+', ' ', line).strip() for line in text.split('\n')]
+    return '\n'.join(line for line in lines if line)
+
+
+def _span(cell, attribute):
+    # Spans are sometimes written as "2;" or "2 "
+    return int(re.sub(r'\D', '', cell.get(attribute, '1')) or 1)
+
+
+def table_grid(table):
+    """
+    Expand a table's rowspan and colspan cells into full rows.
+
+    Yields:
+        tuple: (cells, own, colspans) per row: the cell texts of the full
+        row, the number of cells the row itself declared, and their colspans
+    """
+    pending = {}   # column -> [rows left, text]
+    for tr in table.xpath('./tr | ./tbody/tr | ./thead/tr'):
+        cells = []
+        own = tr.xpath('./th | ./td')
+        colspans = [_span(cell, 'colspan') for cell in own]
+        column = 0
+        queue = list(own)
+        while queue or column in pending:
+            if column in pending:
+                rows_left, text = pending[column]
+                cells.append(text)
+                if rows_left <= 1:
+                    del pending[column]
+                else:
+                    pending[column][0] -= 1
+                column += 1
+                continue
+            cell = queue.pop(0)
+            text = _cell_text(cell)
+            rowspan = _span(cell, 'rowspan')
+            for _ in range(_span(cell, 'colspan')):
+                if rowspan > 1:
+                    pending[column] = [rowspan - 1, text]
+                cells.append(text)
+                column += 1
+        yield cells, len(own), colspans
+
+
+def _fields(header):
+    fields = []
+    for text in header:
+        name = text.lower()
+        fields.append(next((field for prefix, field in HEADER_FIELDS if name.startswith(prefix)), None))
+    return fields
+
+
+def parse_date(text):
+    """Return ISO 'YYYY-MM-DDTHH:MM:SS' for '4 June 2010, 18:45' style text, or None."""
+    match = re.search(r'(\d{1,2}) ([A-Za-z]+),? (\d{4})', text)
+    if not match or match.group(2).lower() not in MONTHS:
+        return None
+    day, month, year = int(match.group(1)), MONTHS[match.group(2).lower()], int(match.group(3))
+    clock = re.search(r'(\d{1,2}):(\d{2})(?::(\d{2}))?', text[match.end():])
+    hour, minute, second = (int(clock.group(1)), int(clock.group(2)), int(clock.group(3) or 0)) if clock else (0, 0, 0)
+    return f"{year:04d}-{month:02d}-{day:02d}T{hour:02d}:{minute:02d}:{second:02d}"
+
+
+def booster_version(text):
+    """Return the launch table's (BoosterVersion, BoosterID) for a version cell."""
+    serial = re.search(r'\bB(\d{4})', text)
+    if 'v1.0' in text:
+        version = 'F9 v1.0'
+    elif 'v1.1' in text:
+        version = 'F9 v1.1'
+    elif re.search(r'\bB(lock ?)?5\b', text):
+        version = 'F9 Block 5'
+    else:
+        version = 'F9 FT'
+    return version, f"B{serial.group(1)}" if serial else None
+
+
+def site_code(text):
+    """Return the launch table's site code for a cell like 'CCAFS,\\nSLC-40'."""
+    flat = text.replace('\n', ' ')
+    pad = re.search(r'\b(S?LC-\d+[A-Z]?)\b', flat)
+    for pattern, prefix in SITE_PREFIXES:
+        if pattern.match(flat) and pad:
+            return f"{prefix} {pad.group(1)}"
+    return flat.split(',')[0].strip()
+
+
+def payload_mass(text):
+    """Return the first mass in kg in a cell, or NaN when none is given."""
+    match = re.search(r'([\d,]+(?:\.\d+)?)\s*kg', text)
+    return float(match.group(1).replace(',', '')) if match else float('nan')
+
+
+def landing(text):
+    """Return (LandingOutcome, LandingType) for a booster landing cell."""
+    lowered = text.lower()
+    if not text or lowered.startswith(('no attempt', 'precluded', 'n/a')):
+        return float('nan'), 'Expendable'
+    landing_type = next((name for key, name in LANDING_TYPES if key.lower() in lowered), 'Expendable')
+    if landing_type == 'Expendable':
+        return float('nan'), landing_type
+    return (1.0 if lowered.startswith(('success', 'controlled')) else 0.0), landing_type
+
+
+def parse_page(html):
+    """
+    Yield a launch table row for every Falcon 9 launch in a page.
+
+    Tables without flight, date and launch site columns are ignored, as are
+    rows whose flight number is not a plain number (Falcon Heavy flights,
+    upcoming launches) and the description rows under each launch.
+
+    Args:
+        html (str): Page markup
+
+    Yields:
+        dict: Row with SCRAPE_COLUMNS keys (Date as ISO text)
+    """
+    document = lxml.html.fromstring(html)
+    for table in document.xpath('//table[contains(concat(" ", normalize-space(@class), " "), " wikitable ")]'):
+        rows = table_grid(table)
+        header = next(rows, None)
+        if header is None:
+            continue
+        fields = _fields(header[0])
+        if not {'flight', 'date', 'site'} <= set(fields):
+            continue
+        for cells, own, colspans in rows:
+            # A description row is one cell spanning the rest of the table
+            if own == 1 and colspans[0] > 1:
+                continue
+            values = {field: text for field, text in zip(fields, cells) if field}
+            flight = values.get('flight', '')
+            date = parse_date(values.get('date', ''))
+            if not flight.isdigit() or date is None:
+                continue
+            version, booster = booster_version(values.get('version', ''))
+            landing_outcome, landing_type = landing(values.get('landing', ''))
+            yield {
+                'FlightNumber': int(flight),
+                'Date': date,
+                'BoosterVersion': version,
+                'BoosterID': booster,
+                'LaunchSite': site_code(values.get('site', '')),
+                'PayloadMass': payload_mass(values.get('mass', '')),
+                'MissionName': values.get('payload', '').split('\n')[0] or None,
+                'MissionOutcome': int(values.get('outcome', '').lower().startswith('success')),
+                'LandingOutcome': landing_outcome,
+                'LandingType': landing_type,
+                'Orbit': values.get('orbit', '').split('\n')[0] or None,
+                'Customer': values.get('customer', '').split('\n')[0] or None
+            }
+
+
+def iter_launch_rows(pages):
+    """Yield the launch rows of (name, html) pages, page by page as they arrive."""
+    for _, html in pages:
+        yield from parse_page(html)
+
+
+@timed()
+def scrape(urls=None, pages_dir=None, offline=False, workers=FETCH_WORKERS, cache_path=None, failures=None):
+    """
+    Scrape the launch tables into a launch DataFrame.
+
+    Args:
+        urls (list, optional): Page URLs, defaults to every page
+        pages_dir (str, optional): Read saved .html pages from here instead
+        offline (bool): Only use cached pages
+        workers (int): Concurrent downloads
+        cache_path (str, optional): Page cache file
+        failures (list, optional): Receives the pages that could not be
+            fetched (see fetch_pages)
+
+    Returns:
+        pandas.DataFrame: SCRAPE_COLUMNS, one row per flight number, in
+        flight order
+    """
+    import pandas as pd
+    from launch_schema import cast_launches
+
+    if pages_dir:
+        pages = read_pages(pages_dir)
+    else:
+        pages = fetch_pages(urls, cache_path, workers, offline=offline, failures=failures)
+    df = pd.DataFrame.from_records(iter_launch_rows(pages), columns=SCRAPE_COLUMNS)
+    df['Date'] = pd.to_datetime(df['Date'])
+    # A launch listed on two pages (e.g. the current-year page and its archive) is kept once
+    df = df.drop_duplicates('FlightNumber').sort_values('FlightNumber', ignore_index=True)
+    return cast_launches(df, 'wikipedia launches')
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+FIXTURE_PAGES = [('falcon9_2010_2019.html', 2010, 2019), ('falcon9_2020_2022.html', 2020, 2022)]
+
+FIXTURE_HEADER = ['Flight No.', 'Date and time (UTC)', 'Version, booster', 'Launch site', 'Payload',
+                  'Payload mass', 'Orbit', 'Customer', 'Launch outcome', 'Booster landing']
+
+FIXTURE_SITES = {'CCAFS': 'CCAFS', 'KSC': 'Kennedy', 'VAFB': 'Vandenberg'}
+
+FIXTURE_LANDINGS = {'Drone Ship': 'drone ship', 'Ground Pad': 'ground pad'}
+
+
+def _fixture_row(row, orbit, customer, note):
+    site = row.LaunchSite
+    for code, name in FIXTURE_SITES.items():
+        if site.startswith(code + ' '):
+            site = f"{name},<br>{site[len(code) + 1:]}"
+    version = row.BoosterVersion.replace('Block 5', 'B5')
+    if row.LandingType == 'Expendable':
+        landing_cell = 'No attempt'
+    else:
+        landing_cell = (f"{'Success' if row.LandingOutcome == 1 else 'Failure'} "
+                        f"({FIXTURE_LANDINGS[row.LandingType]})")
+    cells = [
+        f'{row.Date.day} {row.Date.strftime("%B %Y")},<br>{row.Date.strftime("%H:%M")}'
+        f'<sup class="reference">[{note}]</sup>',
+        f"{escape(version)}<br>{row.BoosterID}.1",
+        site,
+        escape(row.MissionName),
+        f'<span style="display:none" data-sort-value="{row.PayloadMass:.0f}">{row.PayloadMass:09.0f}</span>'
+        f"{row.PayloadMass:,.0f} kg ({row.PayloadMass * 2.20462:,.0f} lb)",
+        orbit,
+        escape(customer),
+        'Success' if row.MissionOutcome == 1 else 'Failure',
+        landing_cell,
+    ]
+    return (f'<tr><th scope="row" rowspan="2">{row.FlightNumber}</th>'
+            + ''.join(f'<td>{cell}</td>' for cell in cells) + '</tr>\n'
+            f'<tr><td colspan="{len(cells)}">Flight {row.FlightNumber} carried {escape(row.MissionName)}.</td></tr>\n')
+
+
+def write_fixtures(directory=FIXTURE_DIR, num_launches=100, seed=42):
+    """
+    Write Wikipedia-style launch pages generated from the synthetic table.
+
+    The pages use the live tables' markup: flight numbers as rowspan row
+    headers, description rows, <br> separated cells, footnote markers,
+    hidden sort keys, and a Falcon Heavy table to be ignored.
+
+    Returns:
+        list: Paths written
+    """
+    import numpy as np
+    from launch_data import CUSTOMERS, generate_launches
+    from api_fixtures import SAMPLE_ORBITS
+
+    df = generate_launches(num_launches, seed=seed)
+    rng = np.random.default_rng(seed)
+    orbits = rng.choice(SAMPLE_ORBITS, size=len(df))
+    customers = rng.choice(CUSTOMERS, size=len(df))
+
+    os.makedirs(directory, exist_ok=True)
+    header = ''.join(f'<th scope="col">{name}</th>' for name in FIXTURE_HEADER)
+    paths = []
+    for name, first_year, last_year in FIXTURE_PAGES:
+        years = df['Date'].dt.year
+        rows = ''.join(_fixture_row(row, orbits[i], customers[i], i + 1)
+                       for i, row in enumerate(df.itertuples(index=False))
+                       if first_year <= years.iloc[i] <= last_year)
+        path = os.path.join(directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+                    f'<title>List of Falcon 9 launches ({first_year}-{last_year})</title></head><body>\n'
+                    f'<table class="wikitable plainrowheaders collapsible" style="width: 100%;">\n'
+                    f'<tbody><tr>{header}</tr>\n{rows}</tbody></table>\n'
+                    f'<h2>Falcon Heavy</h2>\n<table class="wikitable plainrowheaders">\n'
+                    f'<tbody><tr>{header}</tr>\n<tr><th scope="row">FH 1</th>'
+                    f'<td>6 February {first_year}</td><td>Falcon Heavy</td><td>Kennedy,<br>LC-39A</td>'
+                    f'<td>Test flight</td><td>1,250 kg</td><td>Heliocentric</td><td>SpaceX</td>'
+                    f'<td>Success</td><td>Failure (drone ship)</td></tr>\n</tbody></table>\n'
+                    f'</body></html>\n')
+        paths.append(path)
+    return paths
+
+
+def check(directory=FIXTURE_DIR, num_launches=100, seed=42):
+    """
+    Scrape the fixture pages and compare them with the table they came from.
+
+    Returns:
+        list: Descriptions of mismatching columns (empty when they agree)
+    """
+    import numpy as np
+    from launch_data import generate_launches
+
+    scraped = scrape(pages_dir=directory)
+    expected = generate_launches(num_launches, seed=seed)
+    if len(scraped) != len(expected):
+        return [f"scraped {len(scraped)} launches, expected {len(expected)}"]
+
+    problems = []
+    for column in LAUNCH_COLUMNS:
+        got, want = scraped[column], expected[column]
+        if column == 'Date':
+            same = got.to_numpy() == want.dt.floor('min').to_numpy()
+        elif column == 'PayloadMass':
+            same = np.abs(got.to_numpy() - np.round(want.to_numpy())) < 0.5
+        elif column in ('MissionOutcome', 'LandingOutcome'):
+            got, want = got.to_numpy(dtype=float, na_value=np.nan), want.to_numpy(dtype=float, na_value=np.nan)
+            same = (got == want) | (np.isnan(got) & np.isnan(want))
+        else:
+            same = got.astype(object).to_numpy() == want.astype(object).to_numpy()
+        if not same.all():
+            problems.append(f"{column}: {(~same).sum()} rows differ, first at flight "
+                            f"{scraped['FlightNumber'][~same].iloc[0]}")
+    return problems
+
+
+def report_failures(failures):
+    """Print the pages that could not be fetched to stderr; returns how many were skipped."""
+    for url, error, used_cache in failures:
+        print(f"Could not fetch {url} ({error}); "
+              f"{'used the cached copy' if used_cache else 'skipped it'}", file=sys.stderr)
+    return sum(not used_cache for _, _, used_cache in failures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape the Wikipedia Falcon 9 launch tables")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scrape_parser = commands.add_parser('scrape', help="Scrape launches into a table")
+    scrape_parser.add_argument('--pages-dir', help="Scrape saved .html pages instead of fetching")
+    scrape_parser.add_argument('--offline', action='store_true', help="Only use cached pages")
+    scrape_parser.add_argument('--workers', type=int, default=FETCH_WORKERS)
+    scrape_parser.add_argument('--output', help="Write the table to this CSV file")
+
+    save_parser = commands.add_parser('save', help="Fetch the pages and save them as .html files")
+    save_parser.add_argument('--dir', required=True)
+
+    fixtures_parser = commands.add_parser('fixtures', help="Regenerate the fixture pages")
+    fixtures_parser.add_argument('--dir', default=FIXTURE_DIR)
+
+    check_parser = commands.add_parser('check', help="Scrape the fixture pages and verify the rows")
+    check_parser.add_argument('--dir', default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'fixtures':
+        print(f"Wrote {', '.join(write_fixtures(args.dir))}")
+        return 0
+    if args.command == 'check':
+        start = time.perf_counter()
+        problems = check(args.dir)
+        print(f"Scraped the fixture pages in {time.perf_counter() - start:.2f}s")
+        for problem in problems:
+            print(f"  {problem}")
+        print("All rows match the synthetic table" if not problems else f"{len(problems)} columns differ")
+        return 1 if problems else 0
+    failures = []
+    if args.command == 'save':
+        os.makedirs(args.dir, exist_ok=True)
+        for url, html in fetch_pages(failures=failures):
+            name = re.sub(r'[^A-Za-z0-9]+', '_', url.rsplit('/', 1)[-1]).strip('_') + '.html'
+            with open(os.path.join(args.dir, name), 'w', encoding='utf-8') as f:
+                f.write(html)
+            print(f"Saved {url} as {name}")
+        return 1 if report_failures(failures) else 0
+
+    start = time.perf_counter()
+    df = scrape(pages_dir=args.pages_dir, offline=args.offline, workers=args.workers, failures=failures)
+    print(f"Scraped {len(df)} Falcon 9 launches in {time.perf_counter() - start:.2f}s")
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"Wrote {args.output}")
+    else:
+        print(df.tail(10).to_string(index=False))
+    return 1 if report_failures(failures) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())